@@ -12,7 +12,11 @@ from alphavault.ai._errors import (
     format_llm_error_one_line,
 )
 from alphavault.ai._extract import _collect_streamed_ai_text, _extract_ai_text
-from alphavault.ai._openai import _build_openai_client, _resolve_openai_model_name
+from alphavault.ai._openai import (
+    _pooled_openai_client,
+    _release_request_gate,
+    _resolve_openai_model_name,
+)
 from alphavault.ai._text import parse_json_text
 from alphavault.logging_config import get_logger
 
@@ -95,19 +99,10 @@ def _to_one_line_tail(text: str, *, max_chars: int) -> str:
     return s[-int(max_chars) :]
 
 
-def _close_if_possible(resource: Any) -> None:
-    close_fn = getattr(resource, "close", None)
-    if callable(close_fn):
-        close_fn()
-
-
 def _load_raw_ai_text(response: Any, *, ai_stream: bool, api_mode: str) -> str:
     if not ai_stream:
         return _extract_ai_text(response)
-    try:
-        return _collect_streamed_ai_text(response, api_mode=api_mode)
-    finally:
-        _close_if_possible(response)
+    return _collect_streamed_ai_text(response, api_mode=api_mode)
 
 
 def _clamp_retry_after_seconds(retry_after_seconds: int | float) -> int:
@@ -145,10 +140,11 @@ def _call_ai_with_openai(
         try:
             if request_gate is not None:
                 request_gate()
-            client = _build_openai_client(
+            client = _pooled_openai_client(
                 api_key=api_key,
                 base_url=base_url,
                 timeout_seconds=float(timeout_seconds),
+                request_gate=request_gate,
             )
             try:
                 response: Any
@@ -178,7 +174,7 @@ def _call_ai_with_openai(
                     api_mode=api_mode,
                 )
             finally:
-                _close_if_possible(client)
+                _release_request_gate(request_gate)
 
             try:
                 parsed = parse_json_text(raw_text)
@@ -216,6 +212,7 @@ def _call_ai_with_openai(
             )
             return parsed
         except Exception as exc:
+            _release_request_gate(request_gate)
             last_error = exc
             if isinstance(exc, AiValidationError):
                 tail = _to_one_line_tail(getattr(exc, "raw_ai_text", ""), max_chars=240)
@@ -123,14 +123,21 @@ def _extract_stream_text_delta(chunk: Any) -> str:
 
 
 def _collect_streamed_ai_text(stream_response: Any, *, api_mode: str) -> str:
+    """Read the whole stream; it is closed even when reading fails partway,
+    so its connection goes back to the shared pool."""
     chunks: List[Any] = []
     text_parts: List[str] = []
 
-    for chunk in stream_response:
-        chunks.append(chunk)
-        text_delta = _extract_stream_text_delta(chunk)
-        if text_delta:
-            text_parts.append(text_delta)
+    try:
+        for chunk in stream_response:
+            chunks.append(chunk)
+            text_delta = _extract_stream_text_delta(chunk)
+            if text_delta:
+                text_parts.append(text_delta)
+    finally:
+        close_fn = getattr(stream_response, "close", None)
+        if callable(close_fn):
+            close_fn()
 
     streamed_text = "".join(text_parts).strip()
     if streamed_text:
@@ -1,6 +1,17 @@
 from __future__ import annotations
 
-from typing import Any
+import atexit
+from dataclasses import dataclass
+import hashlib
+import threading
+from typing import Any, Callable
+
+from alphavault.logging_config import get_logger
+
+# Idle connections are kept this long; the SDK default (5s) drops them
+# between the seconds-apart calls a worker makes.
+OPENAI_KEEPALIVE_SECONDS = 30.0
+logger = get_logger(__name__)
 
 
 def _import_openai():
@@ -16,6 +27,7 @@ def _build_openai_client(
     api_key: str,
     base_url: str,
     timeout_seconds: float,
+    http_client: Any = None,
 ) -> Any:
     openai = _import_openai()
     client_kwargs: dict[str, Any] = {
@@ -26,11 +38,144 @@ def _build_openai_client(
     resolved_base_url = str(base_url or "").strip().rstrip("/")
     if resolved_base_url:
         client_kwargs["base_url"] = resolved_base_url
+    if http_client is not None:
+        client_kwargs["http_client"] = http_client
     return openai.OpenAI(**client_kwargs)
 
 
+# (base_url, api_key sha256 prefix, timeout_seconds, limit_group)
+_OpenAIClientKey = tuple[str, str, float, str]
+
+
+@dataclass
+class _PooledOpenAIClient:
+    client: Any
+    max_connections: int
+    requests: int = 0
+    connections_opened: int = 0
+
+
+_openai_clients: dict[_OpenAIClientKey, _PooledOpenAIClient] = {}
+_openai_clients_lock = threading.Lock()
+
+
+def _request_gate_owner(request_gate: Callable[[], None] | None) -> Any:
+    return getattr(request_gate, "__self__", request_gate)
+
+
+def _build_pooled_openai_client(
+    key: _OpenAIClientKey, *, api_key: str, max_connections: int
+) -> _PooledOpenAIClient:
+    import httpx
+
+    pooled = _PooledOpenAIClient(client=None, max_connections=max_connections)
+
+    def _trace(event_name: str, _info: dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with _openai_clients_lock:
+                pooled.connections_opened += 1
+
+    def _on_request(request: Any) -> None:
+        request.extensions["trace"] = _trace
+        with _openai_clients_lock:
+            pooled.requests += 1
+
+    openai = _import_openai()
+    http_kwargs: dict[str, Any] = {"event_hooks": {"request": [_on_request]}}
+    if max_connections > 0:
+        http_kwargs["limits"] = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=OPENAI_KEEPALIVE_SECONDS,
+        )
+    else:
+        http_kwargs["limits"] = httpx.Limits(
+            max_connections=None,
+            max_keepalive_connections=100,
+            keepalive_expiry=OPENAI_KEEPALIVE_SECONDS,
+        )
+    pooled.client = _build_openai_client(
+        api_key=api_key,
+        base_url=key[0],
+        timeout_seconds=key[2],
+        http_client=openai.DefaultHttpxClient(**http_kwargs),
+    )
+    return pooled
+
+
+def _pooled_openai_client(
+    *,
+    api_key: str,
+    base_url: str,
+    timeout_seconds: float,
+    request_gate: Callable[[], None] | None = None,
+) -> Any:
+    """
+    One long-lived client (and keep-alive HTTP pool) per endpoint and key.
+
+    Calls behind a limiter get a pool per limit group, capped at the group's
+    in-flight limit, so one lane cannot hold every connection to the proxy.
+    """
+    owner = _request_gate_owner(request_gate)
+    clean_api_key = str(api_key or "").strip()
+    key: _OpenAIClientKey = (
+        str(base_url or "").strip().rstrip("/"),
+        hashlib.sha256(clean_api_key.encode("utf-8")).hexdigest()[:16],
+        float(timeout_seconds),
+        str(getattr(owner, "name", "") or "").strip(),
+    )
+    with _openai_clients_lock:
+        pooled = _openai_clients.get(key)
+        if pooled is None:
+            pooled = _build_pooled_openai_client(
+                key,
+                api_key=clean_api_key,
+                max_connections=int(getattr(owner, "max_inflight", 0) or 0),
+            )
+            _openai_clients[key] = pooled
+        return pooled.client
+
+
+def openai_client_pool_stats() -> list[dict[str, object]]:
+    with _openai_clients_lock:
+        items = list(_openai_clients.items())
+        return [
+            {
+                "base_url": key[0] or "-",
+                "limit_group": key[3] or "-",
+                "max_connections": pooled.max_connections,
+                "requests": pooled.requests,
+                "connections_opened": pooled.connections_opened,
+                "reused": max(0, pooled.requests - pooled.connections_opened),
+            }
+            for key, pooled in items
+        ]
+
+
+def close_openai_clients() -> None:
+    with _openai_clients_lock:
+        clients = [pooled.client for pooled in _openai_clients.values()]
+        _openai_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as err:
+            logger.warning("[llm] client_close_error %s: %s", type(err).__name__, err)
+
+
+atexit.register(close_openai_clients)
+
+
 def _resolve_openai_model_name(model_name: str) -> str:
     resolved_model_name = str(model_name or "").strip()
     if resolved_model_name.startswith("openai/"):
         return resolved_model_name.removeprefix("openai/")
     return resolved_model_name
+
+
+def _release_request_gate(request_gate: Callable[[], None] | None) -> None:
+    """Tell a limiter-backed `request_gate` (e.g. `limiter.wait`) its request ended."""
+    owner = _request_gate_owner(request_gate)
+    release_fn = getattr(owner, "release_inflight", None)
+    if callable(release_fn):
+        release_fn()
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Callable
+from typing import Callable
 
 from alphavault.ai._errors import extract_retry_after_seconds
-from alphavault.ai._openai import _build_openai_client, _resolve_openai_model_name
+from alphavault.ai._openai import (
+    _pooled_openai_client,
+    _release_request_gate,
+    _resolve_openai_model_name,
+)
 from alphavault.logging_config import get_logger
 
 DEFAULT_EMBEDDING_RETRY_BACKOFF_SEC = 2.0
@@ -12,12 +16,6 @@ DEFAULT_EMBEDDING_RETRY_MAX_BACKOFF_SEC = 32.0
 logger = get_logger(__name__)
 
 
-def _close_if_possible(resource: Any) -> None:
-    close_fn = getattr(resource, "close", None)
-    if callable(close_fn):
-        close_fn()
-
-
 def _coerce_embedding_vector(value: object) -> list[float]:
     if isinstance(value, list):
         return [float(item) for item in value]
@@ -48,10 +46,11 @@ def embed_texts_with_openai(
         try:
             if request_gate is not None:
                 request_gate()
-            client = _build_openai_client(
+            client = _pooled_openai_client(
                 api_key=api_key,
                 base_url=base_url,
                 timeout_seconds=float(timeout_seconds),
+                request_gate=request_gate,
             )
             try:
                 response = client.embeddings.create(
@@ -60,7 +59,7 @@ def embed_texts_with_openai(
                     dimensions=max(1, int(dimensions)),
                 )
             finally:
-                _close_if_possible(client)
+                _release_request_gate(request_gate)
             response_data = list(getattr(response, "data", []) or [])
             embeddings = [
                 _coerce_embedding_vector(getattr(item, "embedding", None))
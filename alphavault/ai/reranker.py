@@ -6,6 +6,7 @@ from typing import Callable
 
 import requests
 
+from alphavault.ai._openai import _release_request_gate
 from alphavault.logging_config import get_logger
 
 DEFAULT_RERANKER_RETRY_BACKOFF_SEC = 2.0
@@ -111,12 +112,15 @@ def rerank_texts(
         try:
             if request_gate is not None:
                 request_gate()
-            response = requests.post(
-                url,
-                headers=headers,
-                json=payload,
-                timeout=float(timeout_seconds),
-            )
+            try:
+                response = requests.post(
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=float(timeout_seconds),
+                )
+            finally:
+                _release_request_gate(request_gate)
             response.raise_for_status()
             return _parse_rerank_results(response.json())
         except Exception as exc:
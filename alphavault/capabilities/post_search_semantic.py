@@ -35,18 +35,34 @@ from alphavault.db.zilliz_client import (
     semantic_search_in_zilliz,
     should_write_to_postgres,
 )
+from alphavault.infra.ai.distributed_limiter import (
+    EMBEDDING_LIMIT_KEY_PREFIX,
+    RERANKER_LIMIT_KEY_PREFIX,
+    build_ai_rate_limiter,
+)
 from alphavault.infra.ai.embedding_runtime_config import (
     EMBEDDING_TASK_SEMANTIC_QUERY,
     EmbeddingRuntimeConfig,
     embedding_task_runtime_config_from_env,
     embedding_task_runtime_config_is_configured,
 )
+from alphavault.infra.ai.query_embedding_cache import (
+    QueryEmbeddingCache,
+    normalize_embedding_query,
+    query_embedding_cache_from_env,
+    query_embedding_key,
+)
 from alphavault.infra.ai.reranker_runtime_config import (
     RERANKER_TASK_SEMANTIC_QUERY,
     RerankerRuntimeConfig,
     reranker_task_runtime_config_from_env,
     reranker_task_runtime_config_is_configured,
 )
+from alphavault.infra.search_snapshot_cache import (
+    SearchSnapshot,
+    SearchSnapshotStore,
+    search_snapshot_store_from_env,
+)
 from alphavault.rss.utils import RateLimiter
 
 DEFAULT_SEMANTIC_POST_CANDIDATE_LIMIT = 40
@@ -68,6 +84,7 @@ SEMANTIC_SEARCH_EXTENSION_ERROR_TEXT = "语义搜索依赖向量检索服务，
 class SemanticQueryEmbeddingRuntime:
     config: EmbeddingRuntimeConfig
     limiter: RateLimiter
+    cache: QueryEmbeddingCache
 
 
 @dataclass(frozen=True)
@@ -82,6 +99,7 @@ class SemanticSearchCursor:
     semantic_score: float
     created_at: str
     post_uid: str
+    session_id: str = ""
 
 
 def _coerce_float(value: object) -> float:
@@ -348,7 +366,15 @@ def semantic_query_embedding_runtime_from_env() -> SemanticQueryEmbeddingRuntime
     )
     return SemanticQueryEmbeddingRuntime(
         config=config,
-        limiter=RateLimiter(config.rpm),
+        limiter=build_ai_rate_limiter(
+            rpm=config.rpm,
+            burst=1.0,
+            limit_group_name=config.limit_group_name,
+            max_inflight=config.max_inflight,
+            timeout_seconds=config.timeout_seconds,
+            key_prefix=EMBEDDING_LIMIT_KEY_PREFIX,
+        ),
+        cache=query_embedding_cache_from_env(),
     )
 
 
@@ -365,7 +391,14 @@ def _semantic_query_reranker_runtime_from_env() -> SemanticQueryRerankerRuntime
     )
     return SemanticQueryRerankerRuntime(
         config=config,
-        limiter=RateLimiter(config.rpm),
+        limiter=build_ai_rate_limiter(
+            rpm=config.rpm,
+            burst=1.0,
+            limit_group_name=config.limit_group_name,
+            max_inflight=config.max_inflight,
+            timeout_seconds=config.timeout_seconds,
+            key_prefix=RERANKER_LIMIT_KEY_PREFIX,
+        ),
     )
 
 
@@ -374,19 +407,27 @@ def _embed_query(
     query: str,
     runtime: SemanticQueryEmbeddingRuntime,
 ) -> list[float]:
-    embeddings = embed_texts_with_openai(
-        texts=[query],
-        model_name=runtime.config.model,
+    def _embed(normalized_query: str) -> list[float]:
+        embeddings = embed_texts_with_openai(
+            texts=[normalized_query],
+            model_name=runtime.config.model,
+            dimensions=runtime.config.dimensions,
+            base_url=runtime.config.base_url,
+            api_key=runtime.config.api_key,
+            timeout_seconds=runtime.config.timeout_seconds,
+            retry_count=runtime.config.retries,
+            request_gate=runtime.limiter.wait,
+        )
+        if len(embeddings) != 1:
+            raise RuntimeError("semantic_query_embedding_missing")
+        return embeddings[0]
+
+    key = query_embedding_key(
+        query,
+        model=runtime.config.model,
         dimensions=runtime.config.dimensions,
-        base_url=runtime.config.base_url,
-        api_key=runtime.config.api_key,
-        timeout_seconds=runtime.config.timeout_seconds,
-        retry_count=runtime.config.retries,
-        request_gate=runtime.limiter.wait,
     )
-    if len(embeddings) != 1:
-        raise RuntimeError("semantic_query_embedding_missing")
-    return embeddings[0]
+    return runtime.cache.get_or_embed(key, _embed)
 
 
 def _load_candidate_rows(
@@ -456,13 +497,15 @@ def _format_row(row: dict[str, object], *, reranked: bool) -> PostSearchRow:
     }
 
 
-def _encode_cursor(row: dict[str, object]) -> str:
+def _encode_cursor(row: dict[str, object], *, session_id: str = "") -> str:
     payload = {
         "primary_score": _coerce_float(row.get("primary_score")),
         "semantic_score": _coerce_float(row.get("semantic_score")),
         "created_at": _clean_text(row.get("created_at")),
         "post_uid": _clean_text(row.get("post_uid")),
     }
+    if session_id:
+        payload["session"] = session_id
     return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
 
 
@@ -486,6 +529,7 @@ def _decode_cursor(cursor: str) -> SemanticSearchCursor:
         semantic_score=_coerce_float(payload.get("semantic_score")),
         created_at=_clean_text(payload.get("created_at")),
         post_uid=_clean_text(payload.get("post_uid")),
+        session_id=_clean_text(payload.get("session")),
     )
 
 
@@ -514,24 +558,42 @@ def _is_after_cursor(row: dict[str, object], cursor: SemanticSearchCursor) -> bo
 def _apply_cursor(
     rows: list[dict[str, object]],
     *,
-    cursor: str,
+    cursor: SemanticSearchCursor,
 ) -> list[dict[str, object]]:
-    decoded = _decode_cursor(cursor)
-    if not decoded.post_uid:
+    if not cursor.post_uid:
         return rows
-    return [row for row in rows if _is_after_cursor(row, decoded)]
+    return [row for row in rows if _is_after_cursor(row, cursor)]
 
 
 def _slice_page_rows(
     rows: list[dict[str, object]],
     *,
     limit: int,
+    session_id: str = "",
 ) -> tuple[list[dict[str, object]], str, bool]:
     clean_limit = _clean_limit(limit)
     if len(rows) <= clean_limit:
         return rows, "", False
     page_rows = rows[:clean_limit]
-    return page_rows, _encode_cursor(page_rows[-1]), True
+    return page_rows, _encode_cursor(page_rows[-1], session_id=session_id), True
+
+
+@lru_cache(maxsize=1)
+def _search_snapshot_store() -> SearchSnapshotStore:
+    return search_snapshot_store_from_env()
+
+
+def _load_search_snapshot(
+    *,
+    query: str,
+    cursor: SemanticSearchCursor,
+) -> SearchSnapshot | None:
+    if not cursor.session_id:
+        return None
+    snapshot = _search_snapshot_store().get(cursor.session_id)
+    if snapshot is None or snapshot.query != normalize_embedding_query(query):
+        return None
+    return snapshot
 
 
 def _sort_key(row: dict[str, object]) -> tuple[float, float, str, str]:
@@ -627,19 +689,34 @@ def search_posts_semantic(
             "error": message,
         }
     try:
-        embedding_runtime = semantic_query_embedding_runtime_from_env()
-        query_embedding = _embed_query(query=query, runtime=embedding_runtime)
-        rows = _load_candidate_rows(
-            query_embedding=query_embedding,
-            candidate_limit=_clean_candidate_limit(candidate_limit, limit=limit),
-        )
-        reranked_rows, reranked = _rerank_rows(
-            query=query,
-            rows=rows,
-            reranker_runtime=_semantic_query_reranker_runtime_from_env(),
-            limit=limit,
-        )
-        visible_rows = _apply_cursor(reranked_rows, cursor=cursor)
+        decoded_cursor = _decode_cursor(cursor)
+        snapshot = _load_search_snapshot(query=query, cursor=decoded_cursor)
+        if snapshot is not None:
+            session_id = decoded_cursor.session_id
+            reranked_rows, reranked = snapshot.rows, snapshot.reranked
+        else:
+            session_id = ""
+            embedding_runtime = semantic_query_embedding_runtime_from_env()
+            query_embedding = _embed_query(query=query, runtime=embedding_runtime)
+            rows = _load_candidate_rows(
+                query_embedding=query_embedding,
+                candidate_limit=_clean_candidate_limit(candidate_limit, limit=limit),
+            )
+            reranked_rows, reranked = _rerank_rows(
+                query=query,
+                rows=rows,
+                reranker_runtime=_semantic_query_reranker_runtime_from_env(),
+                limit=limit,
+            )
+        visible_rows = _apply_cursor(reranked_rows, cursor=decoded_cursor)
+        if snapshot is None and len(visible_rows) > _clean_limit(limit):
+            session_id = _search_snapshot_store().put(
+                SearchSnapshot(
+                    query=normalize_embedding_query(query),
+                    rows=reranked_rows,
+                    reranked=reranked,
+                )
+            )
     except BaseException as exc:
         if is_fatal_base_exception(exc):
             raise
@@ -649,7 +726,9 @@ def search_posts_semantic(
             "has_more": False,
             "error": _search_error_message(exc),
         }
-    page_rows, next_cursor, has_more = _slice_page_rows(visible_rows, limit=limit)
+    page_rows, next_cursor, has_more = _slice_page_rows(
+        visible_rows, limit=limit, session_id=session_id
+    )
     return {
         "rows": [_format_row(row, reranked=reranked) for row in page_rows],
         "next_cursor": next_cursor,
@@ -85,6 +85,7 @@ def get_stock_page(
     author: str = "",
     related_filter: str = "all",
     view_scope: str = DEFAULT_STOCK_VIEW_SCOPE,
+    enrich_reviews: bool = True,
 ) -> dict[str, object]:
     normalized_stock_key = normalize_stock_key(stock_key)
     author_filter = str(author or "").strip()
@@ -116,21 +117,36 @@ def get_stock_page(
             view_scope=normalized_view_scope,
             load_error=str(view.get("load_error") or "").strip(),
         )
+    if enrich_reviews:
+        view["signals"] = enrich_stock_page_signals(
+            view, stock_key=normalized_stock_key
+        )
+    return view
+
+
+def enrich_stock_page_signals(
+    view: dict[str, object], *, stock_key: str = ""
+) -> list[dict[str, object]]:
+    """Trade reviews for a page view's signals; slower than the page itself."""
     raw_covered_stock_keys = view.get("covered_stock_keys")
     covered_stock_keys: list[str] = []
     if isinstance(raw_covered_stock_keys, list):
         covered_stock_keys = [
-            stock_key
+            covered_key
             for item in raw_covered_stock_keys
-            for stock_key in [normalize_stock_key(str(item or "").strip())]
-            if stock_key
+            for covered_key in [normalize_stock_key(str(item or "").strip())]
+            if covered_key
         ]
-    view["signals"] = _load_trade_signal_review_module().enrich_trade_signal_rows(
-        [dict(row) for row in (view.get("signals") or []) if isinstance(row, dict)],
-        stock_key=str(view.get("entity_key") or normalized_stock_key),
+    raw_signals = view.get("signals")
+    return _load_trade_signal_review_module().enrich_trade_signal_rows(
+        [
+            dict(row)
+            for row in (raw_signals if isinstance(raw_signals, list) else [])
+            if isinstance(row, dict)
+        ],
+        stock_key=str(view.get("entity_key") or normalize_stock_key(stock_key)),
         related_stock_keys=covered_stock_keys,
     )
-    return view
 
 
 def get_stock_sidebar(stock_key: str) -> dict[str, object]:
@@ -151,6 +167,7 @@ def get_stock_sidebar(stock_key: str) -> dict[str, object]:
 __all__ = [
     "DEFAULT_SIGNAL_PAGE_SIZE",
     "MAX_SIGNAL_PAGE_SIZE",
+    "enrich_stock_page_signals",
     "get_stock_page",
     "get_stock_sidebar",
 ]
@@ -47,10 +47,16 @@ ENV_RSS_INTERVAL_SECONDS = "RSS_INTERVAL_SECONDS"
 ENV_RSS_TIMEOUT_SECONDS = "RSS_TIMEOUT_SECONDS"
 ENV_RSS_RETRIES = "RSS_RETRIES"
 ENV_RSS_FEED_SLEEP_SECONDS = "RSS_FEED_SLEEP_SECONDS"
+ENV_RSS_FETCH_CONCURRENCY = "RSS_FETCH_CONCURRENCY"
+ENV_RSS_HOST_CONCURRENCY = "RSS_HOST_CONCURRENCY"
+ENV_RSS_HOST_MIN_INTERVAL_SECONDS = "RSS_HOST_MIN_INTERVAL_SECONDS"
 ENV_WORKER_ADMIN_TRIGGER_KEY = "WORKER_ADMIN_TRIGGER_KEY"
 DEFAULT_RSS_TIMEOUT_SECONDS = 60.0
 DEFAULT_RSS_RETRIES = 5
 DEFAULT_RSS_FEED_SLEEP_SECONDS = 10.0
+DEFAULT_RSS_FETCH_CONCURRENCY = 1
+DEFAULT_RSS_HOST_CONCURRENCY = 2
+DEFAULT_RSS_HOST_MIN_INTERVAL_SECONDS = 1.0
 ENV_WEIBO_RSS_URLS = "WEIBO_RSS_URLS"
 ENV_WEIBO_RSS_URL = "WEIBO_RSS_URL"
 ENV_XUEQIU_RSS_URLS = "XUEQIU_RSS_URLS"
@@ -76,9 +82,14 @@ ENV_AI_TEMPERATURE = "AI_TEMPERATURE"
 ENV_AI_RETRIES = "AI_RETRIES"
 ENV_AI_RPM = "AI_RPM"
 ENV_AI_MAX_INFLIGHT = "AI_MAX_INFLIGHT"
+ENV_AI_BURST = "AI_BURST"
+ENV_AI_DISTRIBUTED_LIMIT = "AI_DISTRIBUTED_LIMIT"
+ENV_AI_SPECULATIVE = "AI_SPECULATIVE"
 ENV_AI_TRACE_OUT = "AI_TRACE_OUT"
 ENV_AI_REASONING_EFFORT = "AI_REASONING_EFFORT"
 ENV_AI_QUEUE_ACK_TIMEOUT_SEC = "AI_QUEUE_ACK_TIMEOUT_SEC"
+ENV_AI_DONE_WRITE_BATCH_SIZE = "AI_DONE_WRITE_BATCH_SIZE"
+ENV_AI_DONE_WRITE_MAX_LATENCY_SEC = "AI_DONE_WRITE_MAX_LATENCY_SEC"
 ENV_AI_TASK_PROFILE_PREFIX = "AI_TASK_"
 ENV_AI_PROFILE_PREFIX = "AI_PROFILE_"
 ENV_AI_LIMIT_GROUP_PREFIX = "AI_LIMIT_GROUP_"
@@ -86,6 +97,9 @@ DEFAULT_AI_PROFILE_NAME = "default"
 DEFAULT_AI_LIMIT_GROUP_NAME = "default"
 DEFAULT_AI_RPM = 12.0
 DEFAULT_AI_MAX_INFLIGHT = 12
+DEFAULT_AI_BURST = 1.0
+DEFAULT_AI_DONE_WRITE_BATCH_SIZE = 1
+DEFAULT_AI_DONE_WRITE_MAX_LATENCY_SECONDS = 0.05
 
 # Embedding
 ENV_EMBEDDING_API_KEY = "EMBEDDING_API_KEY"
@@ -109,6 +123,16 @@ DEFAULT_EMBEDDING_RPM = 120.0
 DEFAULT_EMBEDDING_MAX_INFLIGHT = 8
 DEFAULT_EMBEDDING_BATCH_SIZE = 32
 DEFAULT_SEMANTIC_DOC_EMBEDDING_DIMENSIONS = 2048
+ENV_SEMANTIC_DOC_EMBED_MAX_LATENCY_SEC = "SEMANTIC_DOC_EMBED_MAX_LATENCY_SEC"
+DEFAULT_SEMANTIC_DOC_EMBED_MAX_LATENCY_SECONDS = 1.0
+ENV_SEMANTIC_QUERY_EMBEDDING_CACHE_SIZE = "SEMANTIC_QUERY_EMBEDDING_CACHE_SIZE"
+ENV_SEMANTIC_QUERY_EMBEDDING_CACHE_TTL_SEC = "SEMANTIC_QUERY_EMBEDDING_CACHE_TTL_SEC"
+DEFAULT_SEMANTIC_QUERY_EMBEDDING_CACHE_SIZE = 512
+DEFAULT_SEMANTIC_QUERY_EMBEDDING_CACHE_TTL_SECONDS = 24 * 3600
+ENV_SEMANTIC_SEARCH_SNAPSHOT_TTL_SEC = "SEMANTIC_SEARCH_SNAPSHOT_TTL_SEC"
+DEFAULT_SEMANTIC_SEARCH_SNAPSHOT_TTL_SECONDS = 600
+ENV_STOCK_VIEW_CACHE_MAX_AGE_SEC = "STOCK_VIEW_CACHE_MAX_AGE_SEC"
+DEFAULT_STOCK_VIEW_CACHE_MAX_AGE_SECONDS = 300
 
 # Reranker
 ENV_RERANKER_API_KEY = "RERANKER_API_KEY"
@@ -0,0 +1,265 @@
+"""
+Persisted thread trees.
+
+A post's rendered `(tree_label, tree_text)` only changes when the post or its
+parent is (re-)ingested, so it is rendered once when the post is marked done and
+stored in `post_thread_trees`, keyed by (post_uid, render version). When a parent
+post is marked done later, the cached trees of its children are re-rendered.
+Readers fall back to live rendering for posts without a cached tree.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from alphavault.db.postgres_db import (
+    PostgresConnection,
+    PostgresEngine,
+    postgres_connect_autocommit,
+    qualify_postgres_table,
+    require_postgres_schema_name,
+    run_postgres_transaction,
+)
+from alphavault.db.sql import post_thread_trees as post_thread_trees_sql
+from alphavault.db.sql.common import make_in_params, make_in_placeholders
+from alphavault.db.sql_rows import read_sql_rows
+from alphavault.domains.thread_tree.parse import (
+    clean_id,
+    extract_parent_post_id,
+    parse_weibo_csv_raw_fields,
+)
+from alphavault.domains.thread_tree.service import (
+    THREAD_TREE_RENDER_VERSION,
+    build_post_tree,
+)
+from alphavault.logging_config import get_logger
+from alphavault.rss.utils import now_str
+
+logger = get_logger(__name__)
+
+_POSTS_TABLE_NAME = "posts"
+_POST_THREAD_TREES_TABLE_NAME = "post_thread_trees"
+
+
+def _clean_text(value: object) -> str:
+    return str(value or "").strip()
+
+
+def _dedupe_texts(values: Iterable[object]) -> list[str]:
+    return list(dict.fromkeys(text for text in map(_clean_text, values) if text))
+
+
+@contextmanager
+def _use_conn(
+    engine_or_conn: PostgresEngine | PostgresConnection,
+) -> Iterator[PostgresConnection]:
+    if isinstance(engine_or_conn, PostgresConnection):
+        yield engine_or_conn
+        return
+    with postgres_connect_autocommit(engine_or_conn) as conn:
+        yield conn
+
+
+def _source_table(engine_or_conn: object, table_name: str) -> str:
+    return qualify_postgres_table(
+        require_postgres_schema_name(engine_or_conn),
+        table_name,
+    )
+
+
+def _load_tree_posts(
+    conn: PostgresConnection,
+    *,
+    key_column: str,
+    values: list[str],
+) -> list[dict[str, object]]:
+    if not values:
+        return []
+    return read_sql_rows(
+        conn,
+        post_thread_trees_sql.select_tree_posts_sql(
+            _source_table(conn, _POSTS_TABLE_NAME),
+            key_column=key_column,
+            placeholders=make_in_placeholders(prefix="key", count=len(values)),
+        ),
+        params=make_in_params(prefix="key", values=values),
+    )
+
+
+def _load_cached_child_post_uids(
+    conn: PostgresConnection,
+    *,
+    parent_post_ids: list[str],
+) -> list[str]:
+    if not parent_post_ids:
+        return []
+    rows = read_sql_rows(
+        conn,
+        post_thread_trees_sql.select_cached_child_post_uids_sql(
+            _source_table(conn, _POST_THREAD_TREES_TABLE_NAME),
+            parent_post_id_placeholders=make_in_placeholders(
+                prefix="parent", count=len(parent_post_ids)
+            ),
+        ),
+        params=make_in_params(prefix="parent", values=parent_post_ids),
+    )
+    return _dedupe_texts(row.get("post_uid") for row in rows)
+
+
+def _parent_post_id(post: dict[str, object]) -> str:
+    csv_fields = parse_weibo_csv_raw_fields(str(post.get("raw_text") or ""))
+    if not isinstance(csv_fields, dict):
+        return ""
+    parent_id = clean_id(extract_parent_post_id(csv_fields=csv_fields))
+    if parent_id == clean_id(post.get("platform_post_id")):
+        return ""
+    return parent_id
+
+
+def render_post_thread_tree_rows(
+    posts: list[dict[str, object]],
+    *,
+    parents_by_id: dict[str, dict[str, object]],
+    updated_at: str = "",
+) -> list[dict[str, object]]:
+    """Render the root-to-leaf tree of each post from itself plus its parent."""
+    resolved_updated_at = updated_at or now_str()
+    out: list[dict[str, object]] = []
+    for post in posts:
+        post_uid = _clean_text(post.get("post_uid"))
+        if not post_uid:
+            continue
+        parent_id = _parent_post_id(post)
+        tree_posts = [post]
+        if parent_id in parents_by_id:
+            tree_posts.append(parents_by_id[parent_id])
+        tree_label, tree_text = build_post_tree(post_uid=post_uid, posts=tree_posts)
+        out.append(
+            {
+                "post_uid": post_uid,
+                "render_version": THREAD_TREE_RENDER_VERSION,
+                "platform_post_id": clean_id(post.get("platform_post_id")),
+                "parent_post_id": parent_id,
+                "tree_label": tree_label,
+                "tree_text": tree_text,
+                "updated_at": resolved_updated_at,
+            }
+        )
+    return out
+
+
+def refresh_post_thread_trees(
+    engine_or_conn: PostgresEngine | PostgresConnection,
+    *,
+    post_uids: Iterable[str],
+) -> int:
+    """
+    Render and store trees for done posts, plus cached children whose parent is
+    among them (the parent arrived after the child was rendered).
+    """
+    resolved_post_uids = _dedupe_texts(post_uids)
+    if not resolved_post_uids:
+        return 0
+
+    def _write(conn: PostgresConnection) -> int:
+        posts = _load_tree_posts(conn, key_column="post_uid", values=resolved_post_uids)
+        done_post_uids = set(resolved_post_uids)
+        child_post_uids = [
+            post_uid
+            for post_uid in _load_cached_child_post_uids(
+                conn,
+                parent_post_ids=_dedupe_texts(
+                    clean_id(post.get("platform_post_id")) for post in posts
+                ),
+            )
+            if post_uid not in done_post_uids
+        ]
+        posts.extend(
+            _load_tree_posts(conn, key_column="post_uid", values=child_post_uids)
+        )
+        parents_by_id = {
+            clean_id(parent.get("platform_post_id")): parent
+            for parent in _load_tree_posts(
+                conn,
+                key_column="platform_post_id",
+                values=_dedupe_texts(_parent_post_id(post) for post in posts),
+            )
+        }
+        rows = render_post_thread_tree_rows(posts, parents_by_id=parents_by_id)
+        if not rows:
+            return 0
+        trees_table = _source_table(conn, _POST_THREAD_TREES_TABLE_NAME)
+        rendered_post_uids = [str(row["post_uid"]) for row in rows]
+        conn.execute(
+            post_thread_trees_sql.delete_stale_post_thread_trees_sql(
+                trees_table,
+                post_uid_placeholders=make_in_placeholders(
+                    prefix="uid", count=len(rendered_post_uids)
+                ),
+            ),
+            {
+                "render_version": THREAD_TREE_RENDER_VERSION,
+                **make_in_params(prefix="uid", values=rendered_post_uids),
+            },
+        )
+        conn.execute(
+            post_thread_trees_sql.upsert_post_thread_tree_sql(trees_table), rows
+        )
+        return len(rows)
+
+    return run_postgres_transaction(engine_or_conn, _write)
+
+
+def refresh_post_thread_trees_best_effort(
+    engine_or_conn: PostgresEngine | PostgresConnection,
+    *,
+    post_uids: Iterable[str],
+) -> int:
+    """Readers render live on a miss, so a failed refresh must not fail the write."""
+    try:
+        return refresh_post_thread_trees(engine_or_conn, post_uids=post_uids)
+    except Exception as err:
+        logger.warning("[thread_tree] refresh_failed %s: %s", type(err).__name__, err)
+        return 0
+
+
+def load_post_thread_trees(
+    engine_or_conn: PostgresEngine | PostgresConnection,
+    *,
+    post_uids: Iterable[str],
+) -> dict[str, tuple[str, str]]:
+    """Cached `(tree_label, tree_text)` of the current render version by post_uid."""
+    resolved_post_uids = _dedupe_texts(post_uids)
+    if not resolved_post_uids:
+        return {}
+    with _use_conn(engine_or_conn) as conn:
+        rows = read_sql_rows(
+            conn,
+            post_thread_trees_sql.select_post_thread_trees_sql(
+                _source_table(conn, _POST_THREAD_TREES_TABLE_NAME),
+                post_uid_placeholders=make_in_placeholders(
+                    prefix="uid", count=len(resolved_post_uids)
+                ),
+            ),
+            params={
+                "render_version": THREAD_TREE_RENDER_VERSION,
+                **make_in_params(prefix="uid", values=resolved_post_uids),
+            },
+        )
+    return {
+        _clean_text(row.get("post_uid")): (
+            _clean_text(row.get("tree_label")),
+            _clean_text(row.get("tree_text")),
+        )
+        for row in rows
+        if _clean_text(row.get("post_uid"))
+    }
+
+
+__all__ = [
+    "load_post_thread_trees",
+    "refresh_post_thread_trees",
+    "refresh_post_thread_trees_best_effort",
+    "render_post_thread_tree_rows",
+]
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import atexit
+from contextlib import contextmanager
+import itertools
 import os
 import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from threading import Lock
-from typing import Any, Callable, Mapping, Sequence, TypeVar
+from typing import Any, Callable, Generator, Iterator, Mapping, Sequence, TypeVar
 
 import psycopg
 from psycopg_pool import ConnectionPool
@@ -14,13 +17,23 @@ import sqlparams
 from alphavault.constants import ENV_POSTGRES_POOL_MAX_SIZE
 
 _DEFAULT_POSTGRES_POOL_MAX_SIZE = 4
-_NAMED_TO_PYFORMAT = sqlparams.SQLParams("named", "pyformat", escape_char=True)
+_NAMED_TO_FORMAT = sqlparams.SQLParams(
+    "named", "format", escape_char=True, expand_tuples=False
+)
 _QMARK_TO_FORMAT = sqlparams.SQLParams("qmark", "format", escape_char=True)
+_STATEMENT_CACHE_MAX_SIZE = 512
+# Statements seen this often in the process get a server-side prepare right
+# away on every pooled connection instead of waiting for psycopg's threshold.
+_PREPARE_AFTER_HITS = 3
+_PREPARABLE_SQL_RE = re.compile(
+    r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE
+)
 _IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 _FATAL_BASE_EXCEPTIONS = (KeyboardInterrupt, SystemExit, GeneratorExit)
 _T = TypeVar("_T")
 _POSTGRES_ENGINE_CACHE: dict[tuple[str, str, int], "PostgresEngine"] = {}
 _POSTGRES_ENGINE_CACHE_LOCK = Lock()
+_STREAM_CURSOR_IDS = itertools.count(1)
 
 
 def is_fatal_base_exception(err: BaseException) -> bool:
@@ -40,37 +53,102 @@ def _to_sequence(values: Sequence[Any]) -> tuple[Any, ...]:
     return tuple(values)
 
 
-def _bind_single(
-    query: str, params: Any
-) -> tuple[str, Mapping[str, Any] | tuple[Any, ...] | None]:
-    if params is None:
-        return query, None
+@dataclass
+class _CompiledStatement:
+    query: str
+    # Mapping keys (named style) or positions (qmark style), in placeholder order.
+    param_order: tuple[Any, ...]
+    preparable: bool
+    hits: int = 0
+
+    def params_from(self, params: Any) -> tuple[Any, ...]:
+        return tuple(params[key] for key in self.param_order)
+
+
+class _StatementCache:
+    """LRU of sqlparams conversions keyed by (sql, param style, param keys)."""
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max(1, int(max_size))
+        self._items: OrderedDict[tuple[str, str, Any], _CompiledStatement] = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+
+    def get(self, query: str, style: str, shape: Any) -> _CompiledStatement:
+        key = (query, style, shape)
+        with self._lock:
+            compiled = self._items.get(key)
+            if compiled is not None:
+                self._items.move_to_end(key)
+                compiled.hits += 1
+                return compiled
+        compiled = _compile_statement(query, style, shape)
+        with self._lock:
+            self._items[key] = compiled
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+        return compiled
+
+
+def _compile_statement(query: str, style: str, shape: Any) -> _CompiledStatement:
+    if style == "named":
+        # Bind each key to its own name so the converted params list is the order.
+        converted_query, order = _NAMED_TO_FORMAT.format(
+            query, {key: key for key in shape}
+        )
+    else:
+        converted_query, order = _QMARK_TO_FORMAT.format(query, list(range(shape)))
+    return _CompiledStatement(
+        query=str(converted_query),
+        param_order=tuple(order),
+        preparable=_PREPARABLE_SQL_RE.match(query) is not None,
+    )
+
+
+_STATEMENT_CACHE = _StatementCache(_STATEMENT_CACHE_MAX_SIZE)
+
+
+def _compiled_for(query: str, params: Any) -> _CompiledStatement | None:
     if isinstance(params, Mapping):
-        converted_query, converted_params = _NAMED_TO_PYFORMAT.format(query, params)
-        return str(converted_query), converted_params
+        return _STATEMENT_CACHE.get(query, "named", frozenset(params))
     if isinstance(params, (list, tuple)):
         if "?" in query:
-            converted_query, converted_params = _QMARK_TO_FORMAT.format(query, params)
-            return str(converted_query), _to_sequence(converted_params)
-        return query, _to_sequence(params)
+            return _STATEMENT_CACHE.get(query, "qmark", len(params))
+        return None
     raise TypeError(f"unsupported_sql_params_type: {type(params).__name__}")
 
 
-def _bind_many(
-    query: str, items: Sequence[Any]
-) -> tuple[str, list[Mapping[str, Any] | tuple[Any, ...]]]:
+def _should_prepare(compiled: _CompiledStatement | None) -> bool | None:
+    if compiled is None or not compiled.preparable:
+        return None
+    if compiled.hits >= _PREPARE_AFTER_HITS:
+        return True
+    return None
+
+
+def _bind_single(
+    query: str, params: Any
+) -> tuple[str, tuple[Any, ...] | None, bool | None]:
+    if params is None:
+        return query, None, None
+    compiled = _compiled_for(query, params)
+    if compiled is None:
+        return query, _to_sequence(params), None
+    return compiled.query, compiled.params_from(params), _should_prepare(compiled)
+
+
+def _bind_many(query: str, items: Sequence[Any]) -> tuple[str, list[tuple[Any, ...]]]:
     if not items:
         return query, []
     first = items[0]
-    if isinstance(first, Mapping):
-        converted_query, converted_many = _NAMED_TO_PYFORMAT.formatmany(query, items)
-        return str(converted_query), list(converted_many)
-    if isinstance(first, (list, tuple)):
-        if "?" in query:
-            converted_query, converted_many = _QMARK_TO_FORMAT.formatmany(query, items)
-            return str(converted_query), [_to_sequence(item) for item in converted_many]
+    if not isinstance(first, (Mapping, list, tuple)):
+        raise TypeError(f"unsupported_sql_many_item_type: {type(first).__name__}")
+    compiled = _compiled_for(query, first)
+    if compiled is None:
         return query, [_to_sequence(item) for item in items]
-    raise TypeError(f"unsupported_sql_many_item_type: {type(first).__name__}")
+    return compiled.query, [compiled.params_from(item) for item in items]
 
 
 def _normalize_batch_params(params: Any) -> list[Any]:
@@ -229,8 +307,33 @@ class PostgresConnection:
             cursor.executemany(prepared_query, prepared_many)
             return PostgresCursorResult(cursor)
 
-        prepared_query, prepared_params = _bind_single(query, params)
-        return PostgresCursorResult(self._raw.execute(prepared_query, prepared_params))
+        prepared_query, prepared_params, prepare = _bind_single(query, params)
+        return PostgresCursorResult(
+            self._raw.execute(prepared_query, prepared_params, prepare=prepare)
+        )
+
+    def stream_mappings(
+        self, statement: Any, params: Any = None, *, page_size: int
+    ) -> Generator[list[dict[str, Any]], None, None]:
+        """
+        Yield result rows in pages from a server-side cursor.
+
+        The cursor lives in its own transaction, so only one page is held on
+        the client at a time; closing the iterator early discards the rest.
+        """
+        prepared_query, prepared_params, _prepare = _bind_single(
+            _to_sql_text(statement), params
+        )
+        size = max(1, int(page_size))
+        with self._raw.transaction():
+            with self._raw.cursor(name=f"av_stream_{next(_STREAM_CURSOR_IDS)}") as cur:
+                cur.execute(prepared_query, prepared_params)
+                keys = tuple(str(col.name) for col in cur.description or ())
+                while True:
+                    rows = cur.fetchmany(size)
+                    if not rows:
+                        return
+                    yield [dict(zip(keys, row, strict=False)) for row in rows]
 
     def transaction(self):
         return self._raw.transaction()
@@ -312,6 +415,28 @@ def postgres_connect_autocommit(engine: PostgresEngine) -> PostgresConnection:
     return engine.connect(autocommit=True)
 
 
+@contextmanager
+def postgres_statement_timeout(
+    conn: PostgresConnection, timeout_seconds: float
+) -> Iterator[PostgresConnection]:
+    """
+    Cap every statement on `conn` at `timeout_seconds` inside the block.
+
+    The server cancels a statement that runs longer, so a query nobody waits
+    for any more does not keep its pooled connection busy.
+    """
+    timeout_ms = max(1, int(float(timeout_seconds) * 1000))
+    conn.execute(
+        "SELECT set_config('statement_timeout', :timeout, false)",
+        {"timeout": f"{timeout_ms}ms"},
+    )
+    try:
+        yield conn
+    finally:
+        if not getattr(conn, "broken", False):
+            conn.execute("RESET statement_timeout")
+
+
 def run_postgres_transaction(
     engine_or_conn: PostgresEngine | PostgresConnection,
     fn: Callable[[PostgresConnection], _T],
@@ -368,6 +493,7 @@ __all__ = [
     "ensure_postgres_engine",
     "qualify_postgres_table",
     "postgres_connect_autocommit",
+    "postgres_statement_timeout",
     "require_postgres_schema_name",
     "run_postgres_transaction",
 ]
@@ -8,6 +8,8 @@ from typing import TYPE_CHECKING, Any, Iterator
 if TYPE_CHECKING:
     from redis import Redis
 
+    from alphavault.db.zilliz_writer import ZillizSemanticDocWriter
+
 from alphavault.db.postgres_db import (
     PostgresConnection,
     PostgresEngine,
@@ -397,6 +399,8 @@ def replace_semantic_docs(
     post_uid: str,
     rows: list[dict[str, object]],
     redis_client: Redis | Any = None,
+    zilliz_writer: ZillizSemanticDocWriter | None = None,
+    embeddings_by_doc_id: dict[str, list[float]] | None = None,
 ) -> int:
     """
     替换指定 post_uid 的所有 semantic_docs
@@ -407,6 +411,10 @@ def replace_semantic_docs(
         rows: 要插入的记录列表
         redis_client: Redis 客户端，用于 Zilliz 写入失败时加入重试队列（可选）
                       如果为 None 且 Zilliz 写入失败，将只记录警告日志
+        zilliz_writer: 批量写入器（可选）；传了就只放进它的缓冲区，
+                       由调用方 flush；flush 失败时按写入器的 redis_client 进重试队列
+        embeddings_by_doc_id: rows 对应的原始向量（可选），给 zilliz_writer 用，
+                              省掉向量文本再解析一遍
 
     Returns:
         插入的记录数（dual_write 模式返回 Postgres 写入数）
@@ -439,7 +447,13 @@ def replace_semantic_docs(
         pg_count = run_postgres_transaction(engine_or_conn, _write)
 
     # 2. 同步到 Zilliz Cloud（根据迁移模式决定）
-    if should_write_to_zilliz():
+    if zilliz_writer is not None:
+        zilliz_count = zilliz_writer.replace_post(
+            resolved_post_uid,
+            normalized_rows,
+            embeddings_by_doc_id=embeddings_by_doc_id,
+        )
+    elif should_write_to_zilliz():
         try:
             zilliz_count = replace_semantic_docs_in_zilliz(
                 schema,
@@ -8,7 +8,7 @@ as `weibo` and `xueqiu`.
 from __future__ import annotations
 
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional
 
 from alphavault.db.postgres_db import (
@@ -20,11 +20,13 @@ from alphavault.db.postgres_db import (
     require_postgres_schema_name,
     run_postgres_transaction,
 )
+from alphavault.db.post_thread_trees import refresh_post_thread_trees_best_effort
 from alphavault.db.sql import source_queue as source_queue_sql
 from alphavault.db.sql.common import make_in_params, make_in_placeholders
 from alphavault.db.sql_rows import read_sql_rows
 from alphavault.rss.utils import now_str
 from alphavault.search_text import build_sparse_search_text
+from alphavault.timeutil import parse_post_created_at
 
 if TYPE_CHECKING:
     from alphavault.domains.entity_match.resolve import EntityMatchResult
@@ -37,9 +39,68 @@ _POSTS_TABLE_NAME = "posts"
 _ASSERTIONS_TABLE_NAME = "assertions"
 _ASSERTION_MENTIONS_TABLE_NAME = "assertion_mentions"
 _ASSERTION_ENTITIES_TABLE_NAME = "assertion_entities"
+_ASSERTION_ROLLUPS_TABLE_NAME = "assertion_rollups"
 _POST_CONTEXT_RUNS_TABLE_NAME = "post_context_runs"
 _POST_CONTEXT_MENTIONS_TABLE_NAME = "post_context_mentions"
 _POST_CONTEXT_ENTITIES_TABLE_NAME = "post_context_entities"
+_STAGE_DONE_POSTS_TABLE = "_av_stage_done_posts"
+_STAGE_ASSERTIONS_TABLE = "_av_stage_assertions"
+_STAGE_ASSERTION_MENTIONS_TABLE = "_av_stage_assertion_mentions"
+_STAGE_ASSERTION_ENTITIES_TABLE = "_av_stage_assertion_entities"
+_STAGE_POST_CONTEXT_RUNS_TABLE = "_av_stage_post_context_runs"
+_STAGE_POST_CONTEXT_MENTIONS_TABLE = "_av_stage_post_context_mentions"
+_STAGE_POST_CONTEXT_ENTITIES_TABLE = "_av_stage_post_context_entities"
+_STAGE_DONE_POST_COLUMNS = (
+    "post_uid",
+    "final_status",
+    "invest_score",
+    "processed_at",
+    "model",
+    "prompt_version",
+    "archived_at",
+)
+_ASSERTION_COLUMNS = (
+    "assertion_id",
+    "post_uid",
+    "idx",
+    "action",
+    "action_strength",
+    "summary",
+    "evidence",
+)
+_ASSERTION_MENTION_COLUMNS = (
+    "assertion_id",
+    "mention_seq",
+    "mention_text",
+    "mention_norm",
+    "mention_type",
+    "evidence",
+    "confidence",
+)
+_ASSERTION_ENTITY_COLUMNS = (
+    "assertion_id",
+    "entity_key",
+    "entity_type",
+    "match_source",
+    "is_primary",
+)
+_POST_CONTEXT_RUN_COLUMNS = ("post_uid", "model", "prompt_version", "processed_at")
+_POST_CONTEXT_MENTION_COLUMNS = (
+    "post_uid",
+    "mention_seq",
+    "mention_text",
+    "mention_norm",
+    "mention_type",
+    "evidence",
+    "confidence",
+)
+_POST_CONTEXT_ENTITY_COLUMNS = (
+    "post_uid",
+    "entity_key",
+    "entity_type",
+    "match_source",
+    "is_primary",
+)
 
 
 class SourceQueueWriteError(RuntimeError):
@@ -70,6 +131,24 @@ class PostContextWriteRow:
     entity_match_result: EntityMatchResult | None = None
 
 
+@dataclass(frozen=True)
+class AssertionsDoneWriteRow:
+    post_uid: str
+    final_status: str
+    invest_score: Optional[float]
+    processed_at: str
+    model: str
+    prompt_version: str
+    archived_at: str
+    assertions: list[Dict[str, Any]]
+    entity_match_results: list[EntityMatchResult] = field(default_factory=list)
+    context_run: dict[str, object] | None = None
+    context_mentions: list[dict[str, object]] = field(default_factory=list)
+    context_entities: list[dict[str, object]] = field(default_factory=list)
+    prefetched_post: CloudPost | None = None
+    prefetched_ingested_at: int = 0
+
+
 def _source_table(engine_or_conn: object, table_name: str) -> str:
     return qualify_postgres_table(
         require_postgres_schema_name(engine_or_conn),
@@ -93,6 +172,28 @@ def _assertion_entities_table(engine_or_conn: object) -> str:
     return _source_table(engine_or_conn, _ASSERTION_ENTITIES_TABLE_NAME)
 
 
+def _assertion_rollups_table(engine_or_conn: object) -> str:
+    return _source_table(engine_or_conn, _ASSERTION_ROLLUPS_TABLE_NAME)
+
+
+def _refresh_assertion_rollups(
+    conn: PostgresConnection,
+    *,
+    post_filter_sql: str,
+    params: dict[str, object] | None = None,
+) -> None:
+    conn.execute(
+        source_queue_sql.upsert_assertion_rollups_sql(
+            assertion_rollups_table=_assertion_rollups_table(conn),
+            assertions_table=_assertions_table(conn),
+            assertion_entities_table=_assertion_entities_table(conn),
+            assertion_mentions_table=_assertion_mentions_table(conn),
+            post_filter_sql=post_filter_sql,
+        ),
+        params or {},
+    )
+
+
 def _post_context_runs_table(engine_or_conn: object) -> str:
     return _source_table(engine_or_conn, _POST_CONTEXT_RUNS_TABLE_NAME)
 
@@ -192,6 +293,31 @@ def get_research_workbench_engine_from_env() -> PostgresEngine:
     return load_engine()
 
 
+def invalidate_stock_hot_views(
+    entity_payloads: Iterable[object],
+    *,
+    assertions_written: bool = False,
+) -> None:
+    """Bump hot-view generations of every stock a write touched (best effort).
+
+    With `assertions_written`, sector views are dropped too.
+    """
+    from alphavault.infra.hot_view_cache import (
+        HOT_VIEW_ALL_SECTORS,
+        invalidate_hot_views_best_effort,
+    )
+
+    keys = [
+        str(payload.get("entity_key") or "").strip()
+        for payload in entity_payloads
+        if isinstance(payload, dict)
+        and str(payload.get("entity_type") or "").strip() == "stock"
+    ]
+    if assertions_written:
+        keys.append(HOT_VIEW_ALL_SECTORS)
+    invalidate_hot_views_best_effort(keys)
+
+
 def persist_entity_match_followups_batch(
     engine_or_conn: PostgresConnection | PostgresEngine,
     results: Iterable["EntityMatchResult"],
@@ -229,6 +355,7 @@ def _execute_upsert_pending_post(
             "platform_post_id": platform_post_id,
             "author": author,
             "created_at": created_at,
+            "created_at_ts": parse_post_created_at(created_at),
             "url": url,
             "raw_text": raw_text,
             "raw_text_search_norm": raw_text_search_norm,
@@ -639,6 +766,104 @@ def _replace_post_context_rows(
         )
 
 
+def _copy_rows(
+    conn: PostgresConnection,
+    *,
+    table: str,
+    columns: tuple[str, ...],
+    rows: Iterable[dict[str, object]],
+) -> None:
+    with conn.cursor() as cursor:
+        with cursor.copy(source_queue_sql.copy_from_stdin_sql(table, columns)) as copy:
+            for row in rows:
+                copy.write_row(tuple(row.get(column) for column in columns))
+
+
+def _prepare_stage_table(
+    conn: PostgresConnection,
+    *,
+    stage_table: str,
+    source_table: str,
+) -> None:
+    conn.execute(source_queue_sql.create_stage_like_sql(stage_table, source_table))
+    conn.execute(source_queue_sql.truncate_stage_sql(stage_table))
+
+
+def _bulk_insert_via_stage(
+    conn: PostgresConnection,
+    *,
+    target_table: str,
+    stage_table: str,
+    columns: tuple[str, ...],
+    rows: list[dict[str, object]],
+) -> None:
+    if not rows:
+        return
+    _prepare_stage_table(conn, stage_table=stage_table, source_table=target_table)
+    _copy_rows(conn, table=stage_table, columns=columns, rows=rows)
+    conn.execute(
+        source_queue_sql.insert_from_stage_sql(target_table, stage_table, columns)
+    )
+
+
+def _stage_done_posts(
+    conn: PostgresConnection,
+    rows: list[dict[str, object]],
+) -> None:
+    conn.execute(source_queue_sql.create_stage_done_posts_sql(_STAGE_DONE_POSTS_TABLE))
+    conn.execute(source_queue_sql.truncate_stage_sql(_STAGE_DONE_POSTS_TABLE))
+    _copy_rows(
+        conn,
+        table=_STAGE_DONE_POSTS_TABLE,
+        columns=_STAGE_DONE_POST_COLUMNS,
+        rows=rows,
+    )
+
+
+def _replace_post_context_rows_bulk(
+    conn: PostgresConnection,
+    *,
+    run_payloads: list[dict[str, object]],
+    mention_payloads: list[dict[str, object]],
+    entity_payloads: list[dict[str, object]],
+) -> None:
+    """Set-based `_replace_post_context_rows` for every post in the stage table."""
+    post_context_runs_table = _post_context_runs_table(conn)
+    post_context_mentions_table = _post_context_mentions_table(conn)
+    post_context_entities_table = _post_context_entities_table(conn)
+    for table in (
+        post_context_entities_table,
+        post_context_mentions_table,
+        post_context_runs_table,
+    ):
+        conn.execute(
+            source_queue_sql.delete_by_stage_post_uid_sql(
+                table, _STAGE_DONE_POSTS_TABLE
+            )
+        )
+    _bulk_insert_via_stage(
+        conn,
+        target_table=post_context_runs_table,
+        stage_table=_STAGE_POST_CONTEXT_RUNS_TABLE,
+        columns=_POST_CONTEXT_RUN_COLUMNS,
+        rows=run_payloads,
+    )
+    _bulk_insert_via_stage(
+        conn,
+        target_table=post_context_mentions_table,
+        stage_table=_STAGE_POST_CONTEXT_MENTIONS_TABLE,
+        columns=_POST_CONTEXT_MENTION_COLUMNS,
+        rows=mention_payloads,
+    )
+    _bulk_insert_via_stage(
+        conn,
+        target_table=post_context_entities_table,
+        stage_table=_STAGE_POST_CONTEXT_ENTITIES_TABLE,
+        columns=_POST_CONTEXT_ENTITY_COLUMNS,
+        rows=entity_payloads,
+    )
+
+
 def reset_ai_results_all(
     engine: PostgresEngine,
     *,
@@ -659,6 +884,11 @@ def reset_ai_results_all(
             ).scalar()
             or 0
         )
+        conn.execute(
+            source_queue_sql.delete_assertion_rollups_all_sql(
+                _assertion_rollups_table(conn)
+            )
+        )
         conn.execute(
             source_queue_sql.delete_assertion_entities_all_sql(
                 _assertion_entities_table(conn)
@@ -711,6 +941,7 @@ def reset_ai_results_for_post_uids(
         assertions_table = _assertions_table(conn)
         assertion_mentions_table = _assertion_mentions_table(conn)
         assertion_entities_table = _assertion_entities_table(conn)
+        assertion_rollups_table = _assertion_rollups_table(conn)
         post_context_runs_table = _post_context_runs_table(conn)
         post_context_mentions_table = _post_context_mentions_table(conn)
         post_context_entities_table = _post_context_entities_table(conn)
@@ -739,6 +970,13 @@ def reset_ai_results_for_post_uids(
                 ).scalar()
                 or 0
             )
+            conn.execute(
+                source_queue_sql.delete_assertion_rollups_by_post_uids_sql(
+                    assertion_rollups_table,
+                    placeholders,
+                ),
+                params,
+            )
             conn.execute(
                 source_queue_sql.delete_assertion_entities_by_post_uids_sql(
                     assertion_entities_table,
@@ -813,6 +1051,7 @@ def write_post_context_result(
     resolved_entity_match_results = (
         [entity_match_result] if entity_match_result is not None else []
     )
+    resolved_entities = list(entities)
 
     def _write(conn: PostgresConnection) -> None:
         _replace_post_context_rows(
@@ -824,10 +1063,11 @@ def write_post_context_result(
                 "processed_at": str(processed_at or "").strip(),
             },
             context_mentions=list(mentions),
-            context_entities=list(entities),
+            context_entities=resolved_entities,
         )
 
     run_postgres_transaction(engine, _write)
+    invalidate_stock_hot_views(resolved_entities)
     if persist_entity_match_followups and resolved_entity_match_results:
         persist_entity_match_followups_batch(
             get_research_workbench_engine_from_env(),
@@ -862,21 +1102,43 @@ def write_post_context_results_batch(
         if row.entity_match_result is not None
     ]
 
+    # Later rows win, same as replacing them one by one.
+    rows_by_post_uid = {row.post_uid: row for row in resolved_rows}
+
     def _write(conn: PostgresConnection) -> None:
-        for row in resolved_rows:
-            _replace_post_context_rows(
-                conn,
+        mention_payloads: list[dict[str, object]] = []
+        entity_payloads: list[dict[str, object]] = []
+        for row in rows_by_post_uid.values():
+            row_mentions, row_entities = _build_post_context_storage_payloads(
                 post_uid=row.post_uid,
-                context_run={
+                mentions=row.mentions,
+                entities=row.entities,
+            )
+            mention_payloads.extend(row_mentions)
+            entity_payloads.extend(row_entities)
+        _stage_done_posts(
+            conn,
+            [{"post_uid": post_uid} for post_uid in rows_by_post_uid],
+        )
+        _replace_post_context_rows_bulk(
+            conn,
+            run_payloads=[
+                {
+                    "post_uid": row.post_uid,
                     "model": row.model,
                     "prompt_version": row.prompt_version,
                     "processed_at": row.processed_at,
-                },
-                context_mentions=row.mentions,
-                context_entities=row.entities,
-            )
+                }
+                for row in rows_by_post_uid.values()
+            ],
+            mention_payloads=mention_payloads,
+            entity_payloads=entity_payloads,
+        )
 
     run_postgres_transaction(engine, _write)
+    invalidate_stock_hot_views(
+        entity for row in rows_by_post_uid.values() for entity in row.entities
+    )
     if persist_entity_match_followups and resolved_entity_match_results:
         persist_entity_match_followups_batch(
             get_research_workbench_engine_from_env(),
@@ -903,8 +1165,13 @@ def write_assertions_and_mark_done(
     prefetched_ingested_at: int = 0,
 ) -> None:
     resolved_entity_match_results = list(entity_match_results or [])
+    resolved_context_entities = (
+        list(context_entities) if context_entities is not None else None
+    )
+    touched_entities: list[dict[str, object]] = []
 
     def _write(conn: PostgresConnection) -> None:
+        touched_entities.clear()
         posts_table = _posts_table(conn)
         assertions_table = _assertions_table(conn)
         assertion_mentions_table = _assertion_mentions_table(conn)
@@ -921,7 +1188,13 @@ def write_assertions_and_mark_done(
             post_uid=str(post_uid or "").strip(),
             context_run=context_run,
             context_mentions=context_mentions,
-            context_entities=context_entities,
+            context_entities=resolved_context_entities,
+        )
+        conn.execute(
+            source_queue_sql.delete_assertion_rollups_by_post_uid_sql(
+                _assertion_rollups_table(conn)
+            ),
+            {"post_uid": post_uid},
         )
         conn.execute(
             source_queue_sql.delete_assertion_entities_by_post_uid_sql(
@@ -962,6 +1235,13 @@ def write_assertions_and_mark_done(
                 source_queue_sql.insert_assertion_entity_sql(assertion_entities_table),
                 entity_payloads,
             )
+        if assertion_payloads:
+            _refresh_assertion_rollups(
+                conn,
+                post_filter_sql="a.post_uid = :post_uid",
+                params={"post_uid": post_uid},
+            )
+        touched_entities.extend(entity_payloads)
         conn.execute(
             source_queue_sql.update_post_done_sql(posts_table),
             {
@@ -976,6 +1256,11 @@ def write_assertions_and_mark_done(
         )
 
     run_postgres_transaction(engine, _write)
+    refresh_post_thread_trees_best_effort(engine, post_uids=[post_uid])
+    invalidate_stock_hot_views(
+        [*touched_entities, *(resolved_context_entities or [])],
+        assertions_written=True,
+    )
     if resolved_entity_match_results:
         persist_entity_match_followups_batch(
             get_research_workbench_engine_from_env(),
@@ -983,6 +1268,169 @@ def write_assertions_and_mark_done(
         )
 
 
+def write_assertions_and_mark_done_batch(
+    engine: PostgresConnection | PostgresEngine,
+    *,
+    rows: Iterable[AssertionsDoneWriteRow],
+    persist_entity_match_followups: bool = True,
+) -> int:
+    """
+    Bulk `write_assertions_and_mark_done` for many posts in one transaction.
+
+    Rows are loaded with COPY into temp staging tables, then old assertions / context rows
+    are replaced and posts marked done with set-based statements.
+    """
+    rows_by_post_uid: dict[str, AssertionsDoneWriteRow] = {}
+    for row in rows:
+        resolved_post_uid = str(row.post_uid or "").strip()
+        if resolved_post_uid:
+            rows_by_post_uid[resolved_post_uid] = row
+    if not rows_by_post_uid:
+        return 0
+    resolved_entity_match_results = [
+        result
+        for row in rows_by_post_uid.values()
+        for result in row.entity_match_results
+    ]
+
+    touched_entities: list[dict[str, object]] = []
+
+    def _write(conn: PostgresConnection) -> None:
+        touched_entities.clear()
+        assertions_table = _assertions_table(conn)
+        done_posts: list[dict[str, object]] = []
+        assertion_payloads: list[dict[str, object]] = []
+        mention_payloads: list[dict[str, object]] = []
+        entity_payloads: list[dict[str, object]] = []
+        context_runs: list[dict[str, object]] = []
+        context_mentions: list[dict[str, object]] = []
+        context_entities: list[dict[str, object]] = []
+        for post_uid, row in rows_by_post_uid.items():
+            _ensure_post_row_exists_for_done(
+                conn,
+                post_uid=post_uid,
+                archived_at=str(row.archived_at or "").strip(),
+                prefetched_post=row.prefetched_post,
+                prefetched_ingested_at=int(row.prefetched_ingested_at),
+            )
+            done_posts.append(
+                {
+                    "post_uid": post_uid,
+                    "final_status": row.final_status,
+                    "invest_score": row.invest_score,
+                    "processed_at": row.processed_at,
+                    "model": row.model,
+                    "prompt_version": row.prompt_version,
+                    "archived_at": row.archived_at,
+                }
+            )
+            row_assertions, row_mentions, row_entities = (
+                _build_assertion_storage_payloads(
+                    post_uid=post_uid,
+                    assertions=row.assertions,
+                )
+            )
+            assertion_payloads.extend(row_assertions)
+            mention_payloads.extend(row_mentions)
+            entity_payloads.extend(row_entities)
+            if isinstance(row.context_run, dict):
+                context_runs.append(
+                    {
+                        "post_uid": post_uid,
+                        "model": str(row.context_run.get("model") or "").strip(),
+                        "prompt_version": str(
+                            row.context_run.get("prompt_version") or ""
+                        ).strip(),
+                        "processed_at": str(
+                            row.context_run.get("processed_at") or ""
+                        ).strip(),
+                    }
+                )
+                row_context_mentions, row_context_entities = (
+                    _build_post_context_storage_payloads(
+                        post_uid=post_uid,
+                        mentions=row.context_mentions,
+                        entities=row.context_entities,
+                    )
+                )
+                context_mentions.extend(row_context_mentions)
+                context_entities.extend(row_context_entities)
+
+        _stage_done_posts(conn, done_posts)
+        _replace_post_context_rows_bulk(
+            conn,
+            run_payloads=context_runs,
+            mention_payloads=context_mentions,
+            entity_payloads=context_entities,
+        )
+        conn.execute(
+            source_queue_sql.delete_by_stage_post_uid_sql(
+                _assertion_rollups_table(conn), _STAGE_DONE_POSTS_TABLE
+            )
+        )
+        for child_table in (
+            _assertion_entities_table(conn),
+            _assertion_mentions_table(conn),
+        ):
+            conn.execute(
+                source_queue_sql.delete_assertion_children_by_stage_sql(
+                    child_table,
+                    assertions_table,
+                    _STAGE_DONE_POSTS_TABLE,
+                )
+            )
+        conn.execute(
+            source_queue_sql.delete_by_stage_post_uid_sql(
+                assertions_table, _STAGE_DONE_POSTS_TABLE
+            )
+        )
+        _bulk_insert_via_stage(
+            conn,
+            target_table=assertions_table,
+            stage_table=_STAGE_ASSERTIONS_TABLE,
+            columns=_ASSERTION_COLUMNS,
+            rows=assertion_payloads,
+        )
+        _bulk_insert_via_stage(
+            conn,
+            target_table=_assertion_mentions_table(conn),
+            stage_table=_STAGE_ASSERTION_MENTIONS_TABLE,
+            columns=_ASSERTION_MENTION_COLUMNS,
+            rows=mention_payloads,
+        )
+        _bulk_insert_via_stage(
+            conn,
+            target_table=_assertion_entities_table(conn),
+            stage_table=_STAGE_ASSERTION_ENTITIES_TABLE,
+            columns=_ASSERTION_ENTITY_COLUMNS,
+            rows=entity_payloads,
+        )
+        if assertion_payloads:
+            _refresh_assertion_rollups(
+                conn,
+                post_filter_sql=(
+                    f"a.post_uid IN (SELECT post_uid FROM {_STAGE_DONE_POSTS_TABLE})"
+                ),
+            )
+        conn.execute(
+            source_queue_sql.update_posts_done_from_stage_sql(
+                _posts_table(conn), _STAGE_DONE_POSTS_TABLE
+            )
+        )
+        touched_entities.extend(entity_payloads)
+        touched_entities.extend(context_entities)
+
+    run_postgres_transaction(engine, _write)
+    refresh_post_thread_trees_best_effort(engine, post_uids=list(rows_by_post_uid))
+    invalidate_stock_hot_views(touched_entities, assertions_written=True)
+    if persist_entity_match_followups and resolved_entity_match_results:
+        persist_entity_match_followups_batch(
+            get_research_workbench_engine_from_env(),
+            resolved_entity_match_results,
+        )
+    return len(rows_by_post_uid)
+
+
 def mark_post_failed(
     engine: PostgresConnection | PostgresEngine,
     *,
@@ -1010,10 +1458,12 @@ def mark_post_failed(
 
 
 __all__ = [
+    "AssertionsDoneWriteRow",
     "CloudPost",
     "PostContextWriteRow",
     "SourceQueueWriteError",
     "get_research_workbench_engine_from_env",
+    "invalidate_stock_hot_views",
     "is_post_already_processed_success",
     "load_cloud_post",
     "load_cloud_posts",
@@ -1027,6 +1477,7 @@ __all__ = [
     "reset_ai_results_for_post_uids",
     "upsert_pending_post",
     "write_assertions_and_mark_done",
+    "write_assertions_and_mark_done_batch",
     "write_post_context_result",
     "write_post_context_results_batch",
 ]
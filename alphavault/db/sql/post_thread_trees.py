@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+
+def select_tree_posts_sql(
+    posts_table: str,
+    *,
+    key_column: str,
+    placeholders: str,
+) -> str:
+    """Done posts by `post_uid` or `platform_post_id`, with the columns trees need."""
+    return f"""
+SELECT post_uid, platform_post_id, author, created_at, url, raw_text
+FROM {posts_table}
+WHERE processed_at IS NOT NULL
+  AND {key_column} IN ({placeholders})
+""".strip()
+
+
+def select_cached_child_post_uids_sql(
+    post_thread_trees_table: str,
+    *,
+    parent_post_id_placeholders: str,
+) -> str:
+    return f"""
+SELECT DISTINCT post_uid
+FROM {post_thread_trees_table}
+WHERE parent_post_id IN ({parent_post_id_placeholders})
+""".strip()
+
+
+def select_post_thread_trees_sql(
+    post_thread_trees_table: str,
+    *,
+    post_uid_placeholders: str,
+) -> str:
+    return f"""
+SELECT post_uid, tree_label, tree_text
+FROM {post_thread_trees_table}
+WHERE render_version = :render_version
+  AND post_uid IN ({post_uid_placeholders})
+""".strip()
+
+
+def upsert_post_thread_tree_sql(post_thread_trees_table: str) -> str:
+    return f"""
+INSERT INTO {post_thread_trees_table} (
+    post_uid, render_version, platform_post_id, parent_post_id,
+    tree_label, tree_text, updated_at
+)
+VALUES (
+    :post_uid, :render_version, :platform_post_id, :parent_post_id,
+    :tree_label, :tree_text, :updated_at
+)
+ON CONFLICT (post_uid, render_version) DO UPDATE SET
+    platform_post_id = EXCLUDED.platform_post_id,
+    parent_post_id = EXCLUDED.parent_post_id,
+    tree_label = EXCLUDED.tree_label,
+    tree_text = EXCLUDED.tree_text,
+    updated_at = EXCLUDED.updated_at
+""".strip()
+
+
+def delete_stale_post_thread_trees_sql(
+    post_thread_trees_table: str,
+    *,
+    post_uid_placeholders: str,
+) -> str:
+    return f"""
+DELETE FROM {post_thread_trees_table}
+WHERE render_version <> :render_version
+  AND post_uid IN ({post_uid_placeholders})
+""".strip()
@@ -33,13 +33,13 @@ def select_assertion_count_by_post_uids_sql(
 def upsert_pending_post_sql(posts_table: str) -> str:
     return f"""
 INSERT INTO {posts_table} (
-    post_uid, platform, platform_post_id, author, created_at, url, raw_text,
-    raw_text_search_norm,
+    post_uid, platform, platform_post_id, author, created_at, created_at_ts, url,
+    raw_text, raw_text_search_norm,
     final_status, invest_score, processed_at, model, prompt_version, archived_at,
     ingested_at
 ) VALUES (
-    :post_uid, :platform, :platform_post_id, :author, :created_at, :url, :raw_text,
-    :raw_text_search_norm,
+    :post_uid, :platform, :platform_post_id, :author, :created_at, :created_at_ts,
+    :url, :raw_text, :raw_text_search_norm,
     :final_status, NULL, NULL, NULL, NULL, :archived_at,
     :ingested_at
 )
@@ -62,6 +62,12 @@ ON CONFLICT(post_uid) DO UPDATE SET
         THEN excluded.created_at
         ELSE {posts_table}.created_at
     END,
+    created_at_ts=CASE
+        WHEN {posts_table}.processed_at IS NULL
+             OR LOWER(COALESCE(excluded.platform, {posts_table}.platform, '')) = 'xueqiu'
+        THEN excluded.created_at_ts
+        ELSE {posts_table}.created_at_ts
+    END,
     url=CASE
         WHEN {posts_table}.processed_at IS NULL THEN excluded.url
         ELSE {posts_table}.url
@@ -197,6 +203,143 @@ def delete_assertion_entities_all_sql(assertion_entities_table: str) -> str:
     return f"DELETE FROM {assertion_entities_table}"
 
 
+def delete_assertion_rollups_by_post_uid_sql(assertion_rollups_table: str) -> str:
+    return f"DELETE FROM {assertion_rollups_table} WHERE post_uid = :post_uid"
+
+
+def delete_assertion_rollups_by_post_uids_sql(
+    assertion_rollups_table: str,
+    placeholders: str,
+) -> str:
+    return f"DELETE FROM {assertion_rollups_table} WHERE post_uid IN ({placeholders})"
+
+
+def delete_assertion_rollups_all_sql(assertion_rollups_table: str) -> str:
+    return f"DELETE FROM {assertion_rollups_table}"
+
+
+def upsert_assertion_rollups_sql(
+    *,
+    assertion_rollups_table: str,
+    assertions_table: str,
+    assertion_entities_table: str,
+    assertion_mentions_table: str,
+    post_filter_sql: str,
+) -> str:
+    """Recompute rollup rows for the assertions of posts matching `post_filter_sql`."""
+    return f"""
+INSERT INTO {assertion_rollups_table} (
+    assertion_id, post_uid, entity_key, confidence, stock_codes, stock_names,
+    industries_json, commodities_json, indices_json, keywords_json, topic_keys
+)
+SELECT
+    a.assertion_id,
+    a.post_uid,
+    er.entity_key,
+    mr.confidence,
+    er.stock_codes,
+    mr.stock_names,
+    er.industries_json,
+    er.commodities_json,
+    er.indices_json,
+    mr.keywords_json,
+    er.topic_keys
+FROM {assertions_table} a
+CROSS JOIN LATERAL (
+    SELECT
+        COALESCE(
+            MAX(CASE WHEN e.is_primary = 1 THEN e.entity_key END),
+            MAX(CASE WHEN e.entity_type = 'stock' THEN e.entity_key END),
+            MAX(e.entity_key),
+            ''
+        ) AS entity_key,
+        COALESCE(
+            CAST(
+                json_agg(DISTINCT SUBSTR(e.entity_key, 7) ORDER BY SUBSTR(e.entity_key, 7))
+                FILTER (
+                    WHERE e.entity_type = 'stock' AND e.entity_key LIKE 'stock:%'
+                ) AS TEXT
+            ),
+            '[]'
+        ) AS stock_codes,
+        COALESCE(
+            CAST(
+                json_agg(DISTINCT SUBSTR(e.entity_key, 10) ORDER BY SUBSTR(e.entity_key, 10))
+                FILTER (
+                    WHERE e.entity_type = 'industry' AND e.entity_key LIKE 'industry:%'
+                ) AS TEXT
+            ),
+            '[]'
+        ) AS industries_json,
+        COALESCE(
+            CAST(
+                json_agg(DISTINCT SUBSTR(e.entity_key, 11) ORDER BY SUBSTR(e.entity_key, 11))
+                FILTER (
+                    WHERE e.entity_type = 'commodity' AND e.entity_key LIKE 'commodity:%'
+                ) AS TEXT
+            ),
+            '[]'
+        ) AS commodities_json,
+        COALESCE(
+            CAST(
+                json_agg(DISTINCT SUBSTR(e.entity_key, 7) ORDER BY SUBSTR(e.entity_key, 7))
+                FILTER (
+                    WHERE e.entity_type = 'index' AND e.entity_key LIKE 'index:%'
+                ) AS TEXT
+            ),
+            '[]'
+        ) AS indices_json,
+        COALESCE(
+            ARRAY_AGG(DISTINCT e.entity_key ORDER BY e.entity_key) FILTER (
+                WHERE e.entity_type IN ('industry', 'commodity', 'index', 'keyword')
+            ),
+            CAST('{{}}' AS TEXT[])
+        ) AS topic_keys
+    FROM {assertion_entities_table} e
+    WHERE e.assertion_id = a.assertion_id
+) er
+CROSS JOIN LATERAL (
+    SELECT
+        COALESCE(MAX(m.confidence), 0.5) AS confidence,
+        COALESCE(
+            CAST(
+                json_agg(DISTINCT m.mention_text ORDER BY m.mention_text) FILTER (
+                    WHERE m.mention_type = 'stock_name'
+                      AND TRIM(COALESCE(m.mention_text, '')) <> ''
+                ) AS TEXT
+            ),
+            '[]'
+        ) AS stock_names,
+        COALESCE(
+            CAST(
+                json_agg(
+                    DISTINCT COALESCE(NULLIF(TRIM(m.mention_norm), ''), TRIM(m.mention_text))
+                    ORDER BY COALESCE(NULLIF(TRIM(m.mention_norm), ''), TRIM(m.mention_text))
+                ) FILTER (
+                    WHERE m.mention_type = 'keyword'
+                      AND TRIM(COALESCE(m.mention_norm, m.mention_text, '')) <> ''
+                ) AS TEXT
+            ),
+            '[]'
+        ) AS keywords_json
+    FROM {assertion_mentions_table} m
+    WHERE m.assertion_id = a.assertion_id
+) mr
+WHERE {post_filter_sql}
+ON CONFLICT (assertion_id) DO UPDATE SET
+    post_uid=excluded.post_uid,
+    entity_key=excluded.entity_key,
+    confidence=excluded.confidence,
+    stock_codes=excluded.stock_codes,
+    stock_names=excluded.stock_names,
+    industries_json=excluded.industries_json,
+    commodities_json=excluded.commodities_json,
+    indices_json=excluded.indices_json,
+    keywords_json=excluded.keywords_json,
+    topic_keys=excluded.topic_keys
+"""
+
+
 def delete_post_context_runs_by_post_uid_sql(post_context_runs_table: str) -> str:
     return f"DELETE FROM {post_context_runs_table} WHERE post_uid = :post_uid"
 
@@ -392,5 +535,81 @@ WHERE post_uid IN ({placeholders})
 """
 
 
+def create_stage_done_posts_sql(stage_table: str) -> str:
+    return f"""
+CREATE TEMP TABLE IF NOT EXISTS {stage_table} (
+    post_uid TEXT NOT NULL,
+    final_status TEXT,
+    invest_score REAL,
+    processed_at TEXT,
+    model TEXT,
+    prompt_version TEXT,
+    archived_at TEXT
+) ON COMMIT DROP
+"""
+
+
+def create_stage_like_sql(stage_table: str, source_table: str) -> str:
+    return (
+        f"CREATE TEMP TABLE IF NOT EXISTS {stage_table} "
+        f"(LIKE {source_table} INCLUDING DEFAULTS) ON COMMIT DROP"
+    )
+
+
+def truncate_stage_sql(stage_table: str) -> str:
+    return f"TRUNCATE {stage_table}"
+
+
+def copy_from_stdin_sql(table: str, columns: tuple[str, ...]) -> str:
+    return f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+
+
+def insert_from_stage_sql(
+    target_table: str,
+    stage_table: str,
+    columns: tuple[str, ...],
+) -> str:
+    column_list = ", ".join(columns)
+    return (
+        f"INSERT INTO {target_table} ({column_list}) "
+        f"SELECT {column_list} FROM {stage_table}"
+    )
+
+
+def delete_assertion_children_by_stage_sql(
+    child_table: str,
+    assertions_table: str,
+    stage_posts_table: str,
+) -> str:
+    return f"""
+DELETE FROM {child_table} AS child
+USING {assertions_table} AS a, {stage_posts_table} AS s
+WHERE child.assertion_id = a.assertion_id
+  AND a.post_uid = s.post_uid
+"""
+
+
+def delete_by_stage_post_uid_sql(table: str, stage_posts_table: str) -> str:
+    return f"""
+DELETE FROM {table} AS t
+USING {stage_posts_table} AS s
+WHERE t.post_uid = s.post_uid
+"""
+
+
+def update_posts_done_from_stage_sql(posts_table: str, stage_posts_table: str) -> str:
+    return f"""
+UPDATE {posts_table} AS p
+SET final_status=s.final_status,
+    invest_score=s.invest_score,
+    processed_at=s.processed_at,
+    model=s.model,
+    prompt_version=s.prompt_version,
+    archived_at=s.archived_at
+FROM {stage_posts_table} AS s
+WHERE p.post_uid = s.post_uid
+"""
+
+
 SELECT_POST_PROCESSED_AT = select_post_processed_at_sql(_POSTS_TABLE)
 UPDATE_POST_DONE = update_post_done_sql(_POSTS_TABLE)
@@ -10,6 +10,7 @@ CREATE TABLE IF NOT EXISTS {{schema_name}}.posts (
     platform_post_id TEXT NOT NULL,
     author TEXT NOT NULL,
     created_at TEXT NOT NULL,
+    created_at_ts TIMESTAMPTZ,
     url TEXT NOT NULL,
     raw_text TEXT NOT NULL,
     raw_text_search_norm TEXT NOT NULL DEFAULT '',
@@ -53,6 +54,33 @@ CREATE TABLE IF NOT EXISTS {{schema_name}}.assertion_entities (
     PRIMARY KEY (assertion_id, entity_key)
 );
 
+-- 每条观点的实体 / 提及汇总，由写入事务维护，读路径直接 JOIN
+CREATE TABLE IF NOT EXISTS {{schema_name}}.assertion_rollups (
+    assertion_id TEXT PRIMARY KEY,
+    post_uid TEXT NOT NULL,
+    entity_key TEXT NOT NULL DEFAULT '',
+    confidence REAL NOT NULL DEFAULT 0.5,
+    stock_codes TEXT NOT NULL DEFAULT '[]',
+    stock_names TEXT NOT NULL DEFAULT '[]',
+    industries_json TEXT NOT NULL DEFAULT '[]',
+    commodities_json TEXT NOT NULL DEFAULT '[]',
+    indices_json TEXT NOT NULL DEFAULT '[]',
+    keywords_json TEXT NOT NULL DEFAULT '[]',
+    topic_keys TEXT[] NOT NULL DEFAULT ARRAY[]::TEXT[]
+);
+
+-- 每个帖子渲染好的对话树（帖子 + 父帖），AI 处理完成时写入；父帖晚到时重渲染子帖
+CREATE TABLE IF NOT EXISTS {{schema_name}}.post_thread_trees (
+    post_uid TEXT NOT NULL,
+    render_version INTEGER NOT NULL,
+    platform_post_id TEXT NOT NULL DEFAULT '',
+    parent_post_id TEXT NOT NULL DEFAULT '',
+    tree_label TEXT NOT NULL DEFAULT '',
+    tree_text TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (post_uid, render_version)
+);
+
 CREATE TABLE IF NOT EXISTS {{schema_name}}.post_context_runs (
     post_uid TEXT PRIMARY KEY,
     model TEXT NOT NULL DEFAULT '',
@@ -160,6 +188,12 @@ CREATE INDEX IF NOT EXISTS idx_posts_author_created_at
 CREATE INDEX IF NOT EXISTS idx_posts_created_at_post_uid
     ON {{schema_name}}.posts(created_at, post_uid);
 
+CREATE INDEX IF NOT EXISTS idx_posts_created_at_ts_post_uid
+    ON {{schema_name}}.posts(created_at_ts, post_uid);
+
+CREATE INDEX IF NOT EXISTS idx_posts_author_created_at_ts
+    ON {{schema_name}}.posts(author, created_at_ts);
+
 CREATE INDEX IF NOT EXISTS idx_posts_platform_post_id
     ON {{schema_name}}.posts(platform_post_id);
 
@@ -216,6 +250,13 @@ CREATE INDEX IF NOT EXISTS idx_assertion_entities_key
 CREATE INDEX IF NOT EXISTS idx_assertion_entities_type_key
     ON {{schema_name}}.assertion_entities(entity_type, entity_key);
 
+CREATE INDEX IF NOT EXISTS idx_assertion_rollups_post_uid
+    ON {{schema_name}}.assertion_rollups(post_uid);
+
+CREATE INDEX IF NOT EXISTS idx_post_thread_trees_parent_post_id
+    ON {{schema_name}}.post_thread_trees(parent_post_id)
+    WHERE parent_post_id <> '';
+
 CREATE INDEX IF NOT EXISTS idx_post_context_mentions_text
     ON {{schema_name}}.post_context_mentions(mention_text);
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Generator
 
 
 def _columns_from_description(description: Any) -> list[str]:
@@ -32,4 +32,18 @@ def read_sql_rows(conn: Any, sql: str, params: Any = None) -> list[dict[str, Any
     return [dict(zip(cols, row, strict=False)) for row in rows]
 
 
-__all__ = ["read_sql_rows"]
+def iter_sql_row_pages(
+    conn: Any, sql: str, params: Any = None, *, page_size: int
+) -> Generator[list[dict[str, Any]], None, None]:
+    # Postgres connections stream through a server-side cursor; anything else
+    # only has execute(), so it comes back as a single page.
+    stream_mappings = getattr(conn, "stream_mappings", None)
+    if callable(stream_mappings):
+        yield from stream_mappings(sql, params, page_size=page_size)
+        return
+    rows = read_sql_rows(conn, sql, params=params)
+    if rows:
+        yield rows
+
+
+__all__ = ["iter_sql_row_pages", "read_sql_rows"]
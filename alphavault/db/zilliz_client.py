@@ -181,11 +181,32 @@ def _normalize_embedding(embedding: object) -> list[float]:
     return out
 
 
+def _semantic_doc_record(row: dict[str, Any], embedding: Any) -> dict[str, Any]:
+    """把一行 semantic_docs 转成 Zilliz 记录（embedding 由调用方解析好）"""
+    return {
+        "doc_id": _clean_text(row.get("doc_id")),
+        "post_uid": _clean_text(row.get("post_uid")),
+        "assertion_id": _clean_text(row.get("assertion_id")),
+        "doc_kind": _clean_text(row.get("doc_kind")),
+        "chunk_seq": _coerce_int(row.get("chunk_seq")),
+        "platform": _clean_text(row.get("platform")),
+        "author": _clean_text(row.get("author"))[:255],
+        "created_at": _clean_text(row.get("created_at")),
+        "action": _clean_text(row.get("action")),
+        "action_strength": _coerce_int(row.get("action_strength")),
+        "doc_text": _clean_text(row.get("doc_text"))[:65535],
+        "content_hash": _clean_text(row.get("content_hash")),
+        "embedding_model": _clean_text(row.get("embedding_model")),
+        "embedding": embedding,
+    }
+
+
 def replace_semantic_docs_in_zilliz(
     schema: str,
     *,
     post_uid: str,
     rows: list[dict[str, Any]],
+    timeout_seconds: float | None = None,
 ) -> int:
     """
     替换 Zilliz 中某个 post_uid 的所有 semantic_docs
@@ -194,6 +215,7 @@ def replace_semantic_docs_in_zilliz(
         schema: 数据库 schema 名称（xueqiu/weibo）
         post_uid: 帖子唯一标识
         rows: 要插入的记录列表（格式同 Postgres）
+        timeout_seconds: 每次请求的超时秒数（None 用客户端默认）
 
     Returns:
         插入的记录数
@@ -211,6 +233,7 @@ def replace_semantic_docs_in_zilliz(
         client.delete(
             collection_name=collection_name,
             filter=f'post_uid == "{safe_post_uid}"',
+            timeout=timeout_seconds,
         )
     except Exception as e:
         # 集合可能不存在，忽略错误
@@ -249,24 +272,7 @@ def replace_semantic_docs_in_zilliz(
                 continue
 
             # 构造单条记录
-            data.append(
-                {
-                    "doc_id": _clean_text(row.get("doc_id")),
-                    "post_uid": _clean_text(row.get("post_uid")),
-                    "assertion_id": _clean_text(row.get("assertion_id")),
-                    "doc_kind": _clean_text(row.get("doc_kind")),
-                    "chunk_seq": _coerce_int(row.get("chunk_seq")),
-                    "platform": _clean_text(row.get("platform")),
-                    "author": _clean_text(row.get("author"))[:255],
-                    "created_at": _clean_text(row.get("created_at")),
-                    "action": _clean_text(row.get("action")),
-                    "action_strength": _coerce_int(row.get("action_strength")),
-                    "doc_text": _clean_text(row.get("doc_text"))[:65535],
-                    "content_hash": _clean_text(row.get("content_hash")),
-                    "embedding_model": _clean_text(row.get("embedding_model")),
-                    "embedding": embedding,
-                }
-            )
+            data.append(_semantic_doc_record(row, embedding))
 
         except Exception as e:
             logger.warning(
@@ -278,7 +284,9 @@ def replace_semantic_docs_in_zilliz(
     # 批量插入
     if data:
         try:
-            client.insert(collection_name=collection_name, data=data)
+            client.insert(
+                collection_name=collection_name, data=data, timeout=timeout_seconds
+            )
         except Exception as e:
             logger.error(
                 "zilliz_batch_insert_failed collection=%s count=%d error=%s",
@@ -367,6 +375,7 @@ def delete_semantic_docs_by_post_uid_in_zilliz(
     schema: str,
     *,
     post_uid: str,
+    timeout_seconds: float | None = None,
 ) -> int:
     """
     删除 Zilliz 中某个 post_uid 的所有 semantic_docs
@@ -374,6 +383,7 @@ def delete_semantic_docs_by_post_uid_in_zilliz(
     Args:
         schema: 数据库 schema 名称（xueqiu/weibo）
         post_uid: 帖子唯一标识
+        timeout_seconds: 请求超时秒数（None 用客户端默认）
 
     Returns:
         删除的记录数（Zilliz 不返回准确数字，返回 1 表示成功）
@@ -390,6 +400,7 @@ def delete_semantic_docs_by_post_uid_in_zilliz(
         client.delete(
             collection_name=collection_name,
             filter=f'post_uid == "{safe_post_uid}"',
+            timeout=timeout_seconds,
         )
         return 1  # Zilliz 不返回准确删除数，返回 1 表示成功
     except Exception as e:
@@ -21,3 +21,19 @@ ZILLIZ_CLOUD_TOKEN = "ZILLIZ_CLOUD_TOKEN"
 # - "zilliz_only": 只写入 Zilliz（完全迁移后，可删除 Postgres semantic_docs 表）
 # - "postgres_only": 只写入 Postgres（禁用 Zilliz，回滚兼容）
 ZILLIZ_MIGRATION_MODE = "ZILLIZ_MIGRATION_MODE"
+
+# ============================================
+# Zilliz 重试队列后台线程（worker 内，不占 AI 调度）
+# ============================================
+
+# 同时重试几个帖子（可选，默认 2）
+ZILLIZ_RETRY_WORKERS = "ZILLIZ_RETRY_WORKERS"
+
+# 每次 Zilliz 写入/删除请求的超时秒数（可选，默认 10）
+ZILLIZ_RETRY_TIMEOUT_SEC = "ZILLIZ_RETRY_TIMEOUT_SEC"
+
+# 连续失败几次后熔断（可选，默认 5）
+ZILLIZ_RETRY_BREAKER_FAILURES = "ZILLIZ_RETRY_BREAKER_FAILURES"
+
+# 熔断后暂停多少秒，再放一条试探（可选，默认 60）
+ZILLIZ_RETRY_BREAKER_COOLDOWN_SEC = "ZILLIZ_RETRY_BREAKER_COOLDOWN_SEC"
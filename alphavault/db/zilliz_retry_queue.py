@@ -2,12 +2,12 @@
 Zilliz Cloud 写入重试队列（使用 Redis Sorted Set）
 
 当 Zilliz 写入/删除失败时，将任务放入 Redis Sorted Set 延迟重试队列。
-集成到 worker 主循环，每次调度时自动处理到期任务。
+worker 里由 ZillizRetryLane 在独立线程处理到期任务，不占 AI 调度。
 
 架构对齐：
 - 与现有 AI 队列重试机制一致
 - 使用 Sorted Set 实现延迟重试 + 指数退避
-- 集成到 scheduler.py，无需独立 cron job
+- 跑在 worker 进程内（alphavault/worker/zilliz_retry_lane.py），无需独立 cron job
 """
 
 from __future__ import annotations
@@ -19,7 +19,10 @@ from typing import TYPE_CHECKING, Any, Literal
 if TYPE_CHECKING:
     from redis import Redis
 
-from alphavault.db.zilliz_client import replace_semantic_docs_in_zilliz
+from alphavault.db.zilliz_client import (
+    delete_semantic_docs_by_post_uid_in_zilliz,
+    replace_semantic_docs_in_zilliz,
+)
 from alphavault.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -100,13 +103,136 @@ def enqueue_zilliz_retry(
         logger.warning("zilliz_retry enqueue_error post_uid=%s: %s", post_uid, e)
 
 
+ZillizRetryOutcome = Literal["success", "retry", "failed", "invalid"]
+
+
+def load_due_zilliz_retry_tasks(
+    redis_client: Redis | Any, *, max_batch_size: int = 50
+) -> list[Any]:
+    """取出到期任务（score <= now），按到期先后排列；任务仍留在队列里，成功后才删除"""
+    if not redis_client:
+        return []
+    due_tasks: Any = redis_client.zrangebyscore(
+        ZILLIZ_RETRY_SORTED_SET, 0, int(time.time()), start=0, num=max_batch_size
+    )
+    return list(due_tasks or [])
+
+
+def process_zilliz_retry_task(
+    redis_client: Redis | Any,
+    task_json: Any,
+    *,
+    timeout_seconds: float | None = None,
+) -> ZillizRetryOutcome:
+    """
+    重试一个到期任务，并按结果更新队列
+
+    Args:
+        redis_client: Redis 客户端
+        task_json: load_due_zilliz_retry_tasks 取出的原始任务
+        timeout_seconds: 每次 Zilliz 请求的超时秒数
+
+    Returns:
+        "success": 成功并已出队；"retry": 失败，已按退避重新排队；
+        "failed": 超过最大次数，已移入失败队列；
+        "invalid": 任务无法解析，原样移入失败队列（没有调用 Zilliz）
+    """
+    try:
+        task = json.loads(task_json)
+        schema = task["schema"]
+        post_uid = task["post_uid"]
+        rows = task["rows"]
+        retry_count = task.get("retry_count", 0)
+    except Exception as e:
+        # 解析不了的任务永远到期，必须出队，否则会一直占着队首
+        raw_task = (
+            task_json.decode("utf-8", errors="replace")
+            if isinstance(task_json, bytes)
+            else str(task_json)
+        )
+        redis_client.zrem(ZILLIZ_RETRY_SORTED_SET, task_json)
+        redis_client.rpush(
+            ZILLIZ_FAILED_LIST,
+            json.dumps(
+                {
+                    "raw_task": raw_task[:2000],
+                    "failed_at": time.time(),
+                    "final_error": f"invalid_task: {e}"[:500],
+                },
+                ensure_ascii=False,
+            ),
+        )
+        logger.warning("zilliz_retry invalid_task moved_to_failed: %s", e)
+        return "invalid"
+
+    # 重试写入或删除 Zilliz
+    operation = task.get("operation", "replace" if rows else "delete")
+    try:
+        if operation == "replace":
+            replace_semantic_docs_in_zilliz(
+                schema, post_uid=post_uid, rows=rows, timeout_seconds=timeout_seconds
+            )
+        else:
+            delete_semantic_docs_by_post_uid_in_zilliz(
+                schema, post_uid=post_uid, timeout_seconds=timeout_seconds
+            )
+    except Exception as e:
+        # 重试失败：增加重试次数
+        task["retry_count"] = retry_count + 1
+        task["last_error"] = str(e)[:500]
+
+        if task["retry_count"] < ZILLIZ_RETRY_MAX_COUNT:
+            # 未超过最大次数：更新时间戳，继续重试
+            backoff_seconds = _calculate_backoff_seconds(task["retry_count"])
+            next_retry_at = int(time.time()) + backoff_seconds
+
+            # 删除旧的，添加新的（更新 score）
+            redis_client.zrem(ZILLIZ_RETRY_SORTED_SET, task_json)
+            redis_client.zadd(
+                ZILLIZ_RETRY_SORTED_SET,
+                {json.dumps(task, ensure_ascii=False): next_retry_at},
+            )
+            logger.warning(
+                "zilliz_retry retry_later post_uid=%s retry_count=%d/%d next_retry_seconds=%d error=%s",
+                post_uid,
+                task["retry_count"],
+                ZILLIZ_RETRY_MAX_COUNT,
+                backoff_seconds,
+                str(e)[:100],
+            )
+            return "retry"
+
+        # 超过最大次数：移入失败队列
+        task["failed_at"] = time.time()
+        task["final_error"] = task["last_error"]
+
+        redis_client.zrem(ZILLIZ_RETRY_SORTED_SET, task_json)
+        redis_client.rpush(ZILLIZ_FAILED_LIST, json.dumps(task, ensure_ascii=False))
+        logger.error(
+            "zilliz_retry final_failure post_uid=%s retry_count=%d error=%s",
+            post_uid,
+            task["retry_count"],
+            task["final_error"][:100],
+        )
+        return "failed"
+
+    # 成功：从 Sorted Set 删除
+    redis_client.zrem(ZILLIZ_RETRY_SORTED_SET, task_json)
+    logger.info(
+        "zilliz_retry success operation=%s post_uid=%s retry_count=%d",
+        operation,
+        post_uid,
+        retry_count,
+    )
+    return "success"
+
+
 def process_zilliz_retry_queue(
     redis_client: Redis | Any, *, max_batch_size: int = 50
 ) -> dict[str, int]:
     """
-    处理 Zilliz 重试队列中到期的任务
+    同步处理 Zilliz 重试队列中到期的任务（worker 里由 ZillizRetryLane 在后台跑）
 
-    由 worker 主循环调用，每次调度 AI 任务前执行。
     通过任务的 operation 字段区分写入（"replace"）和删除（"delete"）。
 
     Args:
@@ -114,21 +240,17 @@ def process_zilliz_retry_queue(
         max_batch_size: 每次最多处理的任务数
 
     Returns:
-        统计信息 {"processed": 已处理, "success": 成功, "retry": 重试, "failed": 失败}
+        统计信息 {"processed": 已处理, "success": 成功, "retry": 重试,
+        "failed": 失败, "invalid": 无法解析}
     """
+    stats = {"processed": 0, "success": 0, "retry": 0, "failed": 0, "invalid": 0}
     if not redis_client:
-        return {"processed": 0, "success": 0, "retry": 0, "failed": 0}
-
-    stats = {"processed": 0, "success": 0, "retry": 0, "failed": 0}
+        return stats
 
     try:
-        now = int(time.time())
-
-        # 1. 获取所有到期任务（score <= now）
-        due_tasks = redis_client.zrangebyscore(
-            ZILLIZ_RETRY_SORTED_SET, 0, now, start=0, num=max_batch_size
+        due_tasks = load_due_zilliz_retry_tasks(
+            redis_client, max_batch_size=max_batch_size
         )
-
         if not due_tasks:
             return stats
 
@@ -137,100 +259,24 @@ def process_zilliz_retry_queue(
             len(due_tasks),
             max_batch_size,
         )
-
-        # 2. 批量处理到期任务
         for task_json in due_tasks:
             stats["processed"] += 1
-
             try:
-                task = json.loads(task_json)
-                schema = task["schema"]
-                post_uid = task["post_uid"]
-                rows = task["rows"]
-                retry_count = task.get("retry_count", 0)
-
-                # 重试写入或删除 Zilliz
-                operation = task.get("operation", "replace" if rows else "delete")
-                try:
-                    if operation == "replace":
-                        replace_semantic_docs_in_zilliz(
-                            schema, post_uid=post_uid, rows=rows
-                        )
-                    else:
-                        from alphavault.db.zilliz_client import (
-                            delete_semantic_docs_by_post_uid_in_zilliz,
-                        )
-
-                        delete_semantic_docs_by_post_uid_in_zilliz(
-                            schema, post_uid=post_uid
-                        )
-
-                    # 成功：从 Sorted Set 删除
-                    redis_client.zrem(ZILLIZ_RETRY_SORTED_SET, task_json)
-                    stats["success"] += 1
-                    logger.info(
-                        "zilliz_retry success operation=%s post_uid=%s retry_count=%d",
-                        operation,
-                        post_uid,
-                        retry_count,
-                    )
-
-                except Exception as e:
-                    # 重试失败：增加重试次数
-                    task["retry_count"] = retry_count + 1
-                    task["last_error"] = str(e)[:500]
-
-                    if task["retry_count"] < ZILLIZ_RETRY_MAX_COUNT:
-                        # 未超过最大次数：更新时间戳，继续重试
-                        stats["retry"] += 1
-                        backoff_seconds = _calculate_backoff_seconds(
-                            task["retry_count"]
-                        )
-                        next_retry_at = int(time.time()) + backoff_seconds
-
-                        # 删除旧的，添加新的（更新 score）
-                        redis_client.zrem(ZILLIZ_RETRY_SORTED_SET, task_json)
-                        redis_client.zadd(
-                            ZILLIZ_RETRY_SORTED_SET,
-                            {json.dumps(task, ensure_ascii=False): next_retry_at},
-                        )
-                        logger.warning(
-                            "zilliz_retry retry_later post_uid=%s retry_count=%d/%d next_retry_seconds=%d error=%s",
-                            post_uid,
-                            task["retry_count"],
-                            ZILLIZ_RETRY_MAX_COUNT,
-                            backoff_seconds,
-                            str(e)[:100],
-                        )
-                    else:
-                        # 超过最大次数：移入失败队列
-                        stats["failed"] += 1
-                        task["failed_at"] = time.time()
-                        task["final_error"] = task["last_error"]
-
-                        redis_client.zrem(ZILLIZ_RETRY_SORTED_SET, task_json)
-                        redis_client.rpush(
-                            ZILLIZ_FAILED_LIST, json.dumps(task, ensure_ascii=False)
-                        )
-                        logger.error(
-                            "zilliz_retry final_failure post_uid=%s retry_count=%d error=%s",
-                            post_uid,
-                            task["retry_count"],
-                            task["final_error"][:100],
-                        )
-
+                outcome = process_zilliz_retry_task(redis_client, task_json)
             except Exception as e:
                 logger.warning("zilliz_retry process_task_error: %s", e)
-                stats["failed"] += 1
-
-        if stats["processed"] > 0:
-            logger.info(
-                "zilliz_retry batch_done processed=%d success=%d retry=%d failed=%d",
-                stats["processed"],
-                stats["success"],
-                stats["retry"],
-                stats["failed"],
-            )
+                outcome = "failed"
+            stats[outcome] += 1
+
+        logger.info(
+            "zilliz_retry batch_done processed=%d success=%d retry=%d failed=%d "
+            "invalid=%d",
+            stats["processed"],
+            stats["success"],
+            stats["retry"],
+            stats["failed"],
+            stats["invalid"],
+        )
 
     except Exception as e:
         logger.error("zilliz_retry queue_processing_error: %s", e)
@@ -311,7 +357,9 @@ def clear_failed_queue(redis_client: Any) -> int:
 
 __all__ = [
     "enqueue_zilliz_retry",
+    "load_due_zilliz_retry_tasks",
     "process_zilliz_retry_queue",
+    "process_zilliz_retry_task",
     "get_zilliz_retry_queue_stats",
     "get_failed_tasks",
     "clear_failed_queue",
@@ -0,0 +1,414 @@
+"""
+Zilliz semantic_docs 跨帖子批量写入器
+
+回填 / 迁移时逐帖 delete + insert 会让网络请求数翻倍。这里把多个帖子的文档
+攒成一批：每批按主键 (doc_id) upsert 一次，再对这批帖子查一次已有 doc_id，
+只删除已经不在新文档里的那些（doc_id in [...]）。
+
+攒够 max_batch_docs 条，或最早一条等满 max_latency_seconds 秒，下一次写入时
+就会 flush；调用方结束前要调用 flush() / close()。
+向量统一转成 float32 数组写入，不再经过 list / 文本来回转换。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Mapping
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pymilvus import MilvusClient  # type: ignore[import-untyped]
+    from redis import Redis
+
+from alphavault.db.zilliz_client import (
+    _clean_text,
+    _escape_filter_string,
+    _get_collection_name,
+    _semantic_doc_record,
+    get_zilliz_client,
+)
+from alphavault.db.zilliz_retry_queue import enqueue_zilliz_retry
+from alphavault.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_ZILLIZ_WRITER_BATCH_DOCS = 500
+DEFAULT_ZILLIZ_WRITER_MAX_LATENCY_SECONDS = 5.0
+ZILLIZ_FILTER_IN_CHUNK_SIZE = 500  # 一个 in [...] 过滤最多带多少个值
+ZILLIZ_WRITER_RETRY_BACKOFF_SECONDS = 1.0
+
+_EMPTY_VECTOR = np.empty(0, dtype=np.float32)
+
+
+def semantic_doc_vector_float32(value: object) -> np.ndarray:
+    """
+    把各种来源的向量转成 float32 一维数组
+
+    - np.ndarray：float32 直接用，其他 dtype 转一次
+    - bytes / memoryview：pgvector 二进制（halfvec_send / vector_send，
+      2 字节维度 + 2 字节保留 + 大端 float16 / float32）
+    - list / tuple：直接转数组
+    - str：Postgres 向量文本 '[0.1,0.2,...]'（兼容旧数据）
+
+    无法解析时返回空数组
+    """
+    if isinstance(value, np.ndarray):
+        return value.astype(np.float32, copy=False).ravel()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        buf = bytes(value)
+        if len(buf) < 4:
+            return _EMPTY_VECTOR
+        dim = int.from_bytes(buf[:2], "big")
+        if len(buf) == 4 + 4 * dim:
+            return np.frombuffer(buf, dtype=">f4", offset=4).astype(np.float32)
+        if len(buf) == 4 + 2 * dim:
+            return np.frombuffer(buf, dtype=">f2", offset=4).astype(np.float32)
+        return _EMPTY_VECTOR
+    if isinstance(value, (list, tuple)):
+        try:
+            return np.asarray(value, dtype=np.float32)
+        except (TypeError, ValueError):
+            return _EMPTY_VECTOR
+    text = _clean_text(value)
+    if text.startswith("[") and text.endswith("]"):
+        text = text[1:-1]
+    if not text:
+        return _EMPTY_VECTOR
+    # np.fromstring(sep=",") stops at the first bad value and returns the
+    # prefix, so every element is parsed and any bad one rejects the vector.
+    try:
+        return np.array([float(part) for part in text.split(",")], dtype=np.float32)
+    except ValueError:
+        return _EMPTY_VECTOR
+
+
+def _in_filter(field: str, values: list[str]) -> str:
+    quoted = ", ".join(f'"{_escape_filter_string(value)}"' for value in values)
+    return f"{field} in [{quoted}]"
+
+
+def _chunks(values: list[Any], size: int) -> list[list[Any]]:
+    return [values[idx : idx + size] for idx in range(0, len(values), size)]
+
+
+class ZillizSemanticDocWriter:
+    """
+    按 collection 攒批写入 semantic_docs（线程安全）
+
+    - replace_post(): 整帖替换，flush 时删除该帖已不存在的 doc_id
+      （向量无效被跳过的 doc_id 不删，保留 Zilliz 里的旧版本）
+    - upsert_docs(): 只按 doc_id upsert（迁移用，不删旧文档）
+    - flush() 失败会抛出异常：传了 redis_client 时，整帖替换的帖子逐个放进
+      Zilliz 重试队列；其余文档留在缓冲区，下次 flush 再写。
+      调用方应在 flush 成功后再记进度
+    """
+
+    def __init__(
+        self,
+        schema: str,
+        *,
+        client: MilvusClient | Any = None,
+        max_batch_docs: int = DEFAULT_ZILLIZ_WRITER_BATCH_DOCS,
+        max_latency_seconds: float = DEFAULT_ZILLIZ_WRITER_MAX_LATENCY_SECONDS,
+        dimensions: int = 0,
+        timeout_seconds: float | None = None,
+        retries: int = 0,
+        dry_run: bool = False,
+        redis_client: Redis | Any = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.schema = schema
+        self.collection_name = _get_collection_name(schema)
+        self.max_batch_docs = max(1, int(max_batch_docs))
+        self.max_latency_seconds = max(0.0, float(max_latency_seconds))
+        self.dimensions = max(0, int(dimensions))
+        self.timeout_seconds = timeout_seconds
+        self.retries = max(0, int(retries))
+        self.dry_run = bool(dry_run)
+        self.redis_client = redis_client
+        self._client = client
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._records: dict[str, dict[str, Any]] = {}
+        # post_uid -> 本批里该帖要保留的 doc_id（新文档 + 被跳过的）；
+        # flush 时删掉不在其中的旧文档
+        self._replaced_doc_ids: dict[str, set[str]] = {}
+        # 本批里有文档被跳过的帖子：缓冲区里不是它的全部文档，不能进重试队列
+        self._partial_post_uids: set[str] = set()
+        self._oldest_at: float | None = None
+        self._started_at: float | None = None
+        self._write_seconds = 0.0
+        self._stats = {
+            "posts": 0,
+            "docs": 0,
+            "skipped": 0,
+            "flushes": 0,
+            "upsert_calls": 0,
+            "delete_calls": 0,
+            "deleted_docs": 0,
+            "failed_flushes": 0,
+            "retry_enqueued_posts": 0,
+        }
+
+    def _build_records(
+        self,
+        rows: list[dict[str, Any]],
+        embeddings_by_doc_id: Mapping[str, object] | None,
+    ) -> tuple[list[dict[str, Any]], set[str]]:
+        """返回 (Zilliz 记录, 被跳过的 doc_id)"""
+        records: list[dict[str, Any]] = []
+        skipped_doc_ids: set[str] = set()
+        skipped = 0
+        for row in rows:
+            doc_id = _clean_text(row.get("doc_id"))
+            raw = row.get("embedding")
+            if embeddings_by_doc_id is not None and doc_id in embeddings_by_doc_id:
+                raw = embeddings_by_doc_id[doc_id]
+            vector = semantic_doc_vector_float32(raw)
+            if (
+                not doc_id
+                or not vector.size
+                or (self.dimensions and vector.size != self.dimensions)
+            ):
+                logger.warning(
+                    "zilliz_writer_skip_doc doc_id=%s dim=%d", doc_id, vector.size
+                )
+                skipped += 1
+                if doc_id:
+                    skipped_doc_ids.add(doc_id)
+                continue
+            records.append(_semantic_doc_record(row, vector))
+        if skipped:
+            with self._lock:
+                self._stats["skipped"] += skipped
+        return records, skipped_doc_ids
+
+    def _add_locked(self, records: list[dict[str, Any]]) -> bool:
+        now = self._clock()
+        if self._started_at is None:
+            self._started_at = now
+        if self._oldest_at is None:
+            self._oldest_at = now
+        for record in records:
+            self._records[record["doc_id"]] = record
+        return len(self._records) >= self.max_batch_docs or (
+            now - self._oldest_at >= self.max_latency_seconds
+        )
+
+    def replace_post(
+        self,
+        post_uid: str,
+        rows: list[dict[str, Any]],
+        *,
+        embeddings_by_doc_id: Mapping[str, object] | None = None,
+    ) -> int:
+        """
+        缓冲一个帖子的全部文档（替换语义）
+
+        Args:
+            post_uid: 帖子唯一标识
+            rows: semantic_docs 行（格式同 Postgres）
+            embeddings_by_doc_id: 已有的向量（优先于行里的 embedding 文本）
+
+        Returns:
+            缓冲的文档数
+        """
+        resolved_post_uid = _clean_text(post_uid)
+        records, skipped_doc_ids = self._build_records(rows, embeddings_by_doc_id)
+        # 被跳过的文档不算“已不存在”：全跳过时也不会把这个帖子在 Zilliz 里删空
+        keep_doc_ids = {record["doc_id"] for record in records} | skipped_doc_ids
+        with self._lock:
+            # 同一帖子本批里再次替换：上一版多出来的文档不再写入
+            previous = self._replaced_doc_ids.get(resolved_post_uid, set())
+            for doc_id in previous - keep_doc_ids:
+                self._records.pop(doc_id, None)
+            self._replaced_doc_ids[resolved_post_uid] = keep_doc_ids
+            if skipped_doc_ids:
+                self._partial_post_uids.add(resolved_post_uid)
+            self._stats["posts"] += 1
+            due = self._add_locked(records)
+        if due:
+            self.flush()
+        return len(records)
+
+    def upsert_docs(self, rows: list[dict[str, Any]]) -> list[str]:
+        """缓冲文档，只按 doc_id upsert，不删除旧文档；返回缓冲的 doc_id（跳过的不在内）"""
+        records, _skipped_doc_ids = self._build_records(rows, None)
+        with self._lock:
+            due = self._add_locked(records)
+        if due:
+            self.flush()
+        return [record["doc_id"] for record in records]
+
+    def _call(self, fn: Callable[..., Any], **kwargs: Any) -> Any:
+        attempt = 0
+        while True:
+            try:
+                return fn(
+                    collection_name=self.collection_name,
+                    timeout=self.timeout_seconds,
+                    **kwargs,
+                )
+            except Exception as e:
+                if attempt >= self.retries:
+                    raise
+                wait_seconds = ZILLIZ_WRITER_RETRY_BACKOFF_SECONDS * (2**attempt)
+                attempt += 1
+                logger.warning(
+                    "zilliz_writer_retry collection=%s attempt=%d/%d wait=%.0fs error=%s",
+                    self.collection_name,
+                    attempt,
+                    self.retries,
+                    wait_seconds,
+                    str(e)[:200],
+                )
+                self._sleep(wait_seconds)
+
+    def _stale_doc_ids(
+        self, client: Any, replaced_doc_ids: dict[str, set[str]]
+    ) -> list[str]:
+        keep = set().union(*replaced_doc_ids.values())
+        stale: list[str] = []
+        for post_uids in _chunks(list(replaced_doc_ids), ZILLIZ_FILTER_IN_CHUNK_SIZE):
+            rows = self._call(
+                client.query,
+                filter=_in_filter("post_uid", post_uids),
+                output_fields=["doc_id"],
+            )
+            for row in rows or []:
+                doc_id = _clean_text(row.get("doc_id"))
+                if doc_id and doc_id not in keep:
+                    stale.append(doc_id)
+        return stale
+
+    def _write_locked(
+        self,
+        records: list[dict[str, Any]],
+        replaced_doc_ids: dict[str, set[str]],
+    ) -> int:
+        client = self._client or get_zilliz_client()
+        # 先 upsert 再删旧文档：中途失败时帖子不会出现文档全空的窗口
+        for chunk in _chunks(records, self.max_batch_docs):
+            self._call(client.upsert, data=chunk)
+            self._stats["upsert_calls"] += 1
+        if not replaced_doc_ids:
+            return 0
+        stale = self._stale_doc_ids(client, replaced_doc_ids)
+        for chunk in _chunks(stale, ZILLIZ_FILTER_IN_CHUNK_SIZE):
+            self._call(client.delete, filter=_in_filter("doc_id", chunk))
+            self._stats["delete_calls"] += 1
+        return len(stale)
+
+    def _enqueue_replaced_posts_locked(
+        self,
+        records: list[dict[str, Any]],
+        replaced_doc_ids: dict[str, set[str]],
+        partial_post_uids: set[str],
+        error: Exception,
+    ) -> set[str]:
+        """把整帖替换的帖子放进 Zilliz 重试队列，返回已入队的 post_uid"""
+        if not self.redis_client:
+            return set()
+        records_by_post_uid: dict[str, list[dict[str, Any]]] = {}
+        for record in records:
+            records_by_post_uid.setdefault(record["post_uid"], []).append(record)
+        enqueued: set[str] = set()
+        for post_uid in replaced_doc_ids:
+            if post_uid in partial_post_uids:
+                continue
+            enqueue_zilliz_retry(
+                self.redis_client,
+                operation="replace",
+                schema=self.schema,
+                post_uid=post_uid,
+                rows=[
+                    {**record, "embedding": record["embedding"].tolist()}
+                    for record in records_by_post_uid.get(post_uid, [])
+                ],
+                retry_count=0,
+                error=str(error),
+            )
+            enqueued.add(post_uid)
+        self._stats["retry_enqueued_posts"] += len(enqueued)
+        return enqueued
+
+    def flush(self) -> int:
+        """写出缓冲区，返回写入的文档数"""
+        with self._lock:
+            records = list(self._records.values())
+            replaced_doc_ids = self._replaced_doc_ids
+            partial_post_uids = self._partial_post_uids
+            oldest_at = self._oldest_at
+            self._records = {}
+            self._replaced_doc_ids = {}
+            self._partial_post_uids = set()
+            self._oldest_at = None
+            if not records and not replaced_doc_ids:
+                return 0
+            started = self._clock()
+            try:
+                deleted = (
+                    0 if self.dry_run else self._write_locked(records, replaced_doc_ids)
+                )
+            except Exception as e:
+                logger.error(
+                    "zilliz_writer_flush_failed collection=%s docs=%d posts=%d error=%s",
+                    self.collection_name,
+                    len(records),
+                    len(replaced_doc_ids),
+                    str(e)[:500],
+                )
+                self._stats["failed_flushes"] += 1
+                enqueued = self._enqueue_replaced_posts_locked(
+                    records, replaced_doc_ids, partial_post_uids, e
+                )
+                # Postgres 已经提交，丢掉就再也不会同步：没入队的留到下次 flush
+                self._records = {
+                    record["doc_id"]: record
+                    for record in records
+                    if record["post_uid"] not in enqueued
+                }
+                self._replaced_doc_ids = {
+                    post_uid: doc_ids
+                    for post_uid, doc_ids in replaced_doc_ids.items()
+                    if post_uid not in enqueued
+                }
+                self._partial_post_uids = partial_post_uids
+                if self._records or self._replaced_doc_ids:
+                    self._oldest_at = oldest_at
+                raise
+            finally:
+                self._write_seconds += self._clock() - started
+            self._stats["flushes"] += 1
+            self._stats["docs"] += len(records)
+            self._stats["deleted_docs"] += deleted
+        return len(records)
+
+    def close(self) -> int:
+        return self.flush()
+
+    def stats(self) -> dict[str, object]:
+        """累计统计；docs_per_sec 按第一条写入到现在的墙钟时间算"""
+        with self._lock:
+            out: dict[str, object] = dict(self._stats)
+            out["pending_docs"] = len(self._records)
+            out["write_seconds"] = round(self._write_seconds, 3)
+            elapsed = (
+                self._clock() - self._started_at
+                if self._started_at is not None
+                else 0.0
+            )
+            out["docs_per_sec"] = (
+                round(self._stats["docs"] / elapsed, 1) if elapsed > 0 else 0.0
+            )
+        return out
+
+
+__all__ = [
+    "ZillizSemanticDocWriter",
+    "semantic_doc_vector_float32",
+]
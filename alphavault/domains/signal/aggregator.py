@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
+from typing import Mapping
 
 from alphavault.domains.content.models import Post
 from alphavault.domains.content.row_mapper import index_posts_by_uid, post_to_row
@@ -91,6 +92,7 @@ def attach_signal_tree_context(
     signals: list[Signal],
     *,
     posts: list[Post],
+    cached_trees: Mapping[str, tuple[str, str]] | None = None,
 ) -> list[Signal]:
     if not signals:
         return []
@@ -102,6 +104,7 @@ def attach_signal_tree_context(
             if str(signal.post_uid or "").strip()
         ],
         posts=post_rows,
+        cached=cached_trees,
     )
     out: list[Signal] = []
     for signal in signals:
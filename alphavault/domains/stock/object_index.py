@@ -4,8 +4,8 @@ from dataclasses import dataclass
 
 from alphavault.domains.common.json_list import parse_json_list
 from alphavault.domains.stock.key_match import (
-    build_grouped_key_candidates,
     canonicalize_key,
+    has_bad_stock_separator,
     is_stock_code_value,
     normalize_stock_code,
 )
@@ -56,26 +56,400 @@ class StockObjectIndex:
         ).strip()
 
 
+def _best_count_key(counts: dict[str, int]) -> str:
+    return sorted(counts.items(), key=lambda kv: (-int(kv[1]), str(kv[0])))[0][0]
+
+
+def _bump(table: dict[str, dict[str, int]], key: str, value: str, delta: int) -> None:
+    counts = table.setdefault(key, {})
+    total = int(counts.get(value, 0)) + int(delta)
+    if total > 0:
+        counts[value] = total
+        return
+    counts.pop(value, None)
+    if not counts:
+        table.pop(key, None)
+
+
+@dataclass(frozen=True)
+class _RowStockStats:
+    """What one assertion row adds to the counts the index is built from."""
+
+    match_keys: tuple[str, ...]
+    name_by_code: tuple[str, str] | None
+    key_to_code: tuple[tuple[str, str], ...]
+    name_to_code: tuple[str, str] | None
+    alias_full_name: tuple[str, str] | None
+
+    def to_json(self) -> list[object]:
+        return [
+            list(self.match_keys),
+            list(self.name_by_code) if self.name_by_code else None,
+            [list(item) for item in self.key_to_code],
+            list(self.name_to_code) if self.name_to_code else None,
+            list(self.alias_full_name) if self.alias_full_name else None,
+        ]
+
+    @classmethod
+    def from_json(cls, data: list[object]) -> _RowStockStats:
+        def _pair(value: object) -> tuple[str, str] | None:
+            if not isinstance(value, list) or len(value) != 2:
+                return None
+            return str(value[0]), str(value[1])
+
+        match_keys, name_by_code, key_to_code, name_to_code, alias_full_name = data
+        return cls(
+            match_keys=tuple(
+                str(key) for key in (match_keys if isinstance(match_keys, list) else [])
+            ),
+            name_by_code=_pair(name_by_code),
+            key_to_code=tuple(
+                pair
+                for item in (key_to_code if isinstance(key_to_code, list) else [])
+                for pair in [_pair(item)]
+                if pair
+            ),
+            name_to_code=_pair(name_to_code),
+            alias_full_name=_pair(alias_full_name),
+        )
+
+
+def _row_stock_stats(row: dict[str, object]) -> _RowStockStats:
+    """Same per-row rules as `build_grouped_key_candidates` in key_match."""
+    raw_match_keys = row.get("match_keys")
+    match_keys = tuple(
+        text
+        for item in (raw_match_keys if isinstance(raw_match_keys, list) else [])
+        for text in [str(item).strip()]
+        if text
+    )
+
+    codes = row.get("stock_codes")
+    names = row.get("stock_names")
+    name_by_code: tuple[str, str] | None = None
+    name_to_code: tuple[str, str] | None = None
+    if isinstance(codes, list) and isinstance(names, list):
+        clean_codes = [str(x).strip() for x in codes if str(x).strip()]
+        clean_names = [str(x).strip() for x in names if str(x).strip()]
+        if len(clean_codes) == 1 and len(clean_names) == 1:
+            name_by_code = (clean_codes[0], clean_names[0])
+        if len(codes) == 1 and len(names) == 1:
+            code = normalize_stock_code(codes[0])
+            name = str(names[0] or "").strip()
+            if code and name:
+                name_to_code = (name, code)
+
+    row_codes: set[str] = set()
+    row_stock_keys: list[str] = []
+    for key in match_keys:
+        if not key.startswith(STOCK_KEY_PREFIX):
+            continue
+        value = key[len(STOCK_KEY_PREFIX) :].strip()
+        if not value:
+            continue
+        row_stock_keys.append(f"{STOCK_KEY_PREFIX}{value}")
+        if is_stock_code_value(value):
+            row_codes.add(normalize_stock_code(value))
+    key_to_code: tuple[tuple[str, str], ...] = ()
+    if len(row_codes) == 1:
+        code = next(iter(row_codes))
+        key_to_code = tuple(
+            (key, code)
+            for key in row_stock_keys
+            if not is_stock_code_value(key[len(STOCK_KEY_PREFIX) :].strip())
+        )
+
+    alias_full_name: tuple[str, str] | None = None
+    entity_key = str(row.get("entity_key") or "").strip()
+    if entity_key.startswith(STOCK_KEY_PREFIX) and isinstance(names, list):
+        alias = entity_key[len(STOCK_KEY_PREFIX) :].strip()
+        full_names = [str(x).strip() for x in names if str(x).strip()]
+        if (
+            alias
+            and not is_stock_code_value(alias)
+            and not has_bad_stock_separator(alias)
+            and ":" not in alias
+            and len(full_names) == 1
+        ):
+            alias_full_name = (alias, full_names[0])
+
+    return _RowStockStats(
+        match_keys=match_keys,
+        name_by_code=name_by_code,
+        key_to_code=key_to_code,
+        name_to_code=name_to_code,
+        alias_full_name=alias_full_name,
+    )
+
+
+def _assertion_identity(row: dict[str, object]) -> str:
+    post_uid = str(row.get("post_uid") or "").strip()
+    if not post_uid:
+        return ""
+    return "#".join(
+        [post_uid, str(row.get("idx") or "0").strip(), str(row.get("entity_key") or "")]
+    )
+
+
+class StockObjectIndexState:
+    """
+    Long-lived input of `StockObjectIndex`.
+
+    Keeps the key / name / code co-occurrence counts and the confirmed alias
+    relations instead of the assertion rows, so adding or dropping rows and
+    relations is proportional to the change. `index()` turns the counts into
+    a `StockObjectIndex` and caches it until the next change.
+    """
+
+    SNAPSHOT_VERSION = 2
+
+    def __init__(self) -> None:
+        self._key_counts: dict[str, int] = {}
+        self._name_by_code_counts: dict[str, dict[str, int]] = {}
+        self._key_to_code_counts: dict[str, dict[str, int]] = {}
+        self._name_to_code_counts: dict[str, dict[str, int]] = {}
+        self._alias_full_name_counts: dict[str, dict[str, int]] = {}
+        self._relation_counts: dict[tuple[str, str], int] = {}
+        self._rows_by_identity: dict[str, _RowStockStats] = {}
+        self._cached_indexes: dict[bool, StockObjectIndex] = {}
+
+    @property
+    def assertion_count(self) -> int:
+        return len(self._rows_by_identity)
+
+    def _apply_row(self, stats: _RowStockStats, delta: int) -> None:
+        for key in stats.match_keys:
+            total = int(self._key_counts.get(key, 0)) + delta
+            if total > 0:
+                self._key_counts[key] = total
+            else:
+                self._key_counts.pop(key, None)
+        if stats.name_by_code:
+            code, name = stats.name_by_code
+            _bump(self._name_by_code_counts, code, name, delta)
+        for key, code in stats.key_to_code:
+            _bump(self._key_to_code_counts, key, code, delta)
+        if stats.name_to_code:
+            name, code = stats.name_to_code
+            _bump(self._name_to_code_counts, name, code, delta)
+        if stats.alias_full_name:
+            alias, full_name = stats.alias_full_name
+            _bump(self._alias_full_name_counts, alias, full_name, delta)
+        self._cached_indexes = {}
+
+    def add_assertions(self, assertions: list[dict[str, object]]) -> int:
+        """Count rows as given; rows sharing an identity are all counted."""
+        rows = ensure_stock_columns(assertions)
+        for row in rows:
+            stats = _row_stock_stats(row)
+            self._apply_row(stats, 1)
+            identity = _assertion_identity(row)
+            if identity and identity not in self._rows_by_identity:
+                self._rows_by_identity[identity] = stats
+        return len(rows)
+
+    def sync_assertions(self, assertions: list[dict[str, object]]) -> tuple[int, int]:
+        """
+        Make the state match `assertions`, keyed by (post_uid, idx, entity_key):
+        new rows are added, rows no longer present are removed, and a row whose
+        stock columns changed is removed and added again. Returns (added, removed).
+        """
+        wanted: dict[str, _RowStockStats] = {}
+        for row in assertions:
+            identity = _assertion_identity(row)
+            if identity and identity not in wanted:
+                wanted[identity] = _row_stock_stats(ensure_stock_columns([row])[0])
+        removed = [
+            identity
+            for identity, stats in self._rows_by_identity.items()
+            if wanted.get(identity) != stats
+        ]
+        for identity in removed:
+            self._apply_row(self._rows_by_identity.pop(identity), -1)
+        added = 0
+        for identity, stats in wanted.items():
+            if identity in self._rows_by_identity:
+                continue
+            self._apply_row(stats, 1)
+            self._rows_by_identity[identity] = stats
+            added += 1
+        return added, len(removed)
+
+    def add_stock_relations(self, stock_relations: list[dict[str, object]]) -> int:
+        relations = _iter_stock_alias_relations(stock_relations)
+        for row in relations:
+            pair = (row["left_key"], row["right_key"])
+            self._relation_counts[pair] = int(self._relation_counts.get(pair, 0)) + 1
+        if relations:
+            self._cached_indexes = {}
+        return len(relations)
+
+    def sync_stock_relations(self, stock_relations: list[dict[str, object]]) -> bool:
+        relation_counts: dict[tuple[str, str], int] = {}
+        for row in _iter_stock_alias_relations(stock_relations):
+            pair = (row["left_key"], row["right_key"])
+            relation_counts[pair] = int(relation_counts.get(pair, 0)) + 1
+        if relation_counts == self._relation_counts:
+            return False
+        self._relation_counts = relation_counts
+        self._cached_indexes = {}
+        return True
+
+    def index(
+        self,
+        *,
+        ai_alias_map: dict[str, str] | None = None,
+        include_relations: bool = True,
+    ) -> StockObjectIndex:
+        if ai_alias_map:
+            return self._build_index(ai_alias_map, include_relations=include_relations)
+        cached = self._cached_indexes.get(include_relations)
+        if cached is None:
+            cached = self._build_index(None, include_relations=include_relations)
+            self._cached_indexes[include_relations] = cached
+        return cached
+
+    def _build_index(
+        self,
+        ai_alias_map: dict[str, str] | None,
+        *,
+        include_relations: bool,
+    ) -> StockObjectIndex:
+        if not self._key_counts:
+            return StockObjectIndex({}, {}, {}, {})
+        stock_name_by_code = {
+            code: _best_count_key(counts)
+            for code, counts in self._name_by_code_counts.items()
+        }
+        stock_key_to_code = {
+            key: normalize_stock_code(_best_count_key(counts))
+            for key, counts in self._key_to_code_counts.items()
+        }
+        name_code_counts = {
+            name: dict(counts) for name, counts in self._name_to_code_counts.items()
+        }
+        for code, name in stock_name_by_code.items():
+            normalized_code = normalize_stock_code(code)
+            clean_name = str(name or "").strip()
+            if normalized_code and clean_name:
+                _bump(name_code_counts, clean_name, normalized_code, 1)
+        base_code_by_name = {
+            name: normalize_stock_code(_best_count_key(counts))
+            for name, counts in name_code_counts.items()
+        }
+        for alias, full_name_counts in self._alias_full_name_counts.items():
+            for full_name, count in full_name_counts.items():
+                code = base_code_by_name.get(full_name, "")
+                if code:
+                    _bump(name_code_counts, alias, code, count)
+        stock_name_to_code = {
+            name: normalize_stock_code(_best_count_key(counts))
+            for name, counts in name_code_counts.items()
+        }
+
+        grouped_counts: dict[str, int] = {}
+        members_by_canon: dict[str, set[str]] = {}
+        for raw_key, count in self._key_counts.items():
+            canon = canonicalize_key(
+                raw_key,
+                stock_key_to_code=stock_key_to_code,
+                stock_name_to_code=stock_name_to_code,
+            )
+            if not canon:
+                continue
+            grouped_counts[canon] = int(grouped_counts.get(canon, 0)) + int(count)
+            members_by_canon.setdefault(canon, {canon}).add(raw_key)
+        return _build_index_from_groups(
+            grouped_counts,
+            members_by_canon,
+            stock_name_by_code=stock_name_by_code,
+            stock_key_to_code=stock_key_to_code,
+            stock_name_to_code=stock_name_to_code,
+            alias_pairs=list(self._relation_counts) if include_relations else [],
+            ai_alias_map=ai_alias_map,
+        )
+
+    def to_snapshot(self) -> dict[str, object]:
+        """JSON-ready counts; rows without an identity are kept only as counts."""
+        return {
+            "version": self.SNAPSHOT_VERSION,
+            "key_counts": self._key_counts,
+            "name_by_code_counts": self._name_by_code_counts,
+            "key_to_code_counts": self._key_to_code_counts,
+            "name_to_code_counts": self._name_to_code_counts,
+            "alias_full_name_counts": self._alias_full_name_counts,
+            "relations": [
+                [left, right, count]
+                for (left, right), count in self._relation_counts.items()
+            ],
+            "rows": {
+                identity: stats.to_json()
+                for identity, stats in self._rows_by_identity.items()
+            },
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: dict[str, object]) -> StockObjectIndexState:
+        """Raises ValueError for a snapshot written by another version."""
+        if int(str(data.get("version") or 0)) != cls.SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version: {data.get('version')}")
+
+        def _table(name: str) -> dict[str, dict[str, int]]:
+            raw = data.get(name)
+            if not isinstance(raw, dict):
+                return {}
+            return {
+                str(key): {str(value): int(count) for value, count in counts.items()}
+                for key, counts in raw.items()
+                if isinstance(counts, dict)
+            }
+
+        state = cls()
+        raw_key_counts = data.get("key_counts")
+        if isinstance(raw_key_counts, dict):
+            state._key_counts = {
+                str(key): int(count) for key, count in raw_key_counts.items()
+            }
+        state._name_by_code_counts = _table("name_by_code_counts")
+        state._key_to_code_counts = _table("key_to_code_counts")
+        state._name_to_code_counts = _table("name_to_code_counts")
+        state._alias_full_name_counts = _table("alias_full_name_counts")
+        raw_relations = data.get("relations")
+        for item in raw_relations if isinstance(raw_relations, list) else []:
+            if isinstance(item, list) and len(item) == 3:
+                state._relation_counts[(str(item[0]), str(item[1]))] = int(item[2])
+        raw_rows = data.get("rows")
+        if isinstance(raw_rows, dict):
+            state._rows_by_identity = {
+                str(identity): _RowStockStats.from_json(stats)
+                for identity, stats in raw_rows.items()
+                if isinstance(stats, list) and len(stats) == 5
+            }
+        return state
+
+
 def build_stock_object_index(
     assertions: list[dict[str, object]],
     *,
     stock_relations: list[dict[str, object]] | None = None,
     ai_alias_map: dict[str, str] | None = None,
 ) -> StockObjectIndex:
-    enriched = ensure_stock_columns(assertions)
-    if not enriched:
-        return StockObjectIndex({}, {}, {}, {})
+    state = StockObjectIndexState()
+    state.add_assertions(assertions)
+    state.add_stock_relations(stock_relations or [])
+    return state.index(ai_alias_map=ai_alias_map)
 
-    (
-        grouped_counts,
-        members_by_canon,
-        stock_name_by_code,
-        stock_key_to_code,
-        stock_name_to_code,
-    ) = build_grouped_key_candidates(enriched)
-    if not grouped_counts:
-        return StockObjectIndex({}, {}, {}, {})
 
+def _build_index_from_groups(
+    grouped_counts: dict[str, int],
+    members_by_canon: dict[str, set[str]],
+    *,
+    stock_name_by_code: dict[str, str],
+    stock_key_to_code: dict[str, str],
+    stock_name_to_code: dict[str, str],
+    alias_pairs: list[tuple[str, str]],
+    ai_alias_map: dict[str, str] | None,
+) -> StockObjectIndex:
     stock_canons = [
         str(item).strip()
         for item in grouped_counts.keys()
@@ -103,21 +477,7 @@ def build_stock_object_index(
             return
         parent[right_root] = left_root
 
-    for row in _iter_stock_alias_relations(stock_relations):
-        left = canonicalize_key(
-            str(row.get("left_key") or "").strip(),
-            stock_key_to_code=stock_key_to_code,
-            stock_name_to_code=stock_name_to_code,
-        )
-        right = canonicalize_key(
-            str(row.get("right_key") or "").strip(),
-            stock_key_to_code=stock_key_to_code,
-            stock_name_to_code=stock_name_to_code,
-        )
-        if left in parent and right in parent:
-            _union(left, right)
-
-    for alias_key, target_key in (ai_alias_map or {}).items():
+    for alias_key, target_key in [*alias_pairs, *(ai_alias_map or {}).items()]:
         left = canonicalize_key(
             str(alias_key or "").strip(),
             stock_key_to_code=stock_key_to_code,
@@ -131,11 +491,24 @@ def build_stock_object_index(
         if left in parent and right in parent:
             _union(left, right)
 
-    display_names_by_code_key = {
-        f"{STOCK_KEY_PREFIX}{normalize_stock_code(code)}": str(name or "").strip()
-        for code, name in stock_name_by_code.items()
-        if str(code or "").strip() and str(name or "").strip()
-    }
+    # Raw codes like "sh600001" and "600001.SH" share a key; sorted keeps it stable.
+    display_names_by_code_key: dict[str, str] = {}
+    for code, name in sorted(stock_name_by_code.items()):
+        if str(code or "").strip() and str(name or "").strip():
+            display_names_by_code_key.setdefault(
+                f"{STOCK_KEY_PREFIX}{normalize_stock_code(code)}",
+                str(name or "").strip(),
+            )
+    # code key -> name keys, so each component only looks up its own codes.
+    name_keys_by_code_key: dict[str, list[str]] = {}
+    for stock_name, code in stock_name_to_code.items():
+        name = str(stock_name or "").strip()
+        if not name:
+            continue
+        code_key = f"{STOCK_KEY_PREFIX}{normalize_stock_code(str(code or '').strip())}"
+        name_keys_by_code_key.setdefault(code_key, []).append(
+            f"{STOCK_KEY_PREFIX}{name}"
+        )
 
     canons_by_root: dict[str, set[str]] = {}
     for canon in stock_canons:
@@ -146,21 +519,22 @@ def build_stock_object_index(
     display_name_by_object_key: dict[str, str] = {}
     search_text_by_object_key: dict[str, str] = {}
 
+    # A name key can be a raw member of one object and a known name of another
+    # object's code; the raw member wins so the result does not depend on order.
+    name_key_owner: dict[str, str] = {}
     for component in canons_by_root.values():
         object_key = _choose_object_key(component, grouped_counts)
         member_keys: set[str] = set()
         for canon in component:
             member_keys |= set(members_by_canon.get(canon, set()))
             member_keys.add(canon)
-        for stock_name, code in stock_name_to_code.items():
-            code_key = (
-                f"{STOCK_KEY_PREFIX}{normalize_stock_code(str(code or '').strip())}"
-            )
-            if code_key in component and str(stock_name or "").strip():
-                member_keys.add(f"{STOCK_KEY_PREFIX}{str(stock_name).strip()}")
         object_key_by_member[object_key] = object_key
         for member in member_keys:
             object_key_by_member[str(member).strip()] = object_key
+        for canon in component:
+            for name_key in name_keys_by_code_key.get(canon, ()):
+                name_key_owner.setdefault(name_key, object_key)
+                member_keys.add(name_key)
         member_keys_by_object_key[object_key] = member_keys
         display_name_by_object_key[object_key] = _choose_display_name(
             object_key,
@@ -173,6 +547,9 @@ def build_stock_object_index(
             display_name_by_object_key[object_key],
         )
 
+    for name_key, object_key in name_key_owner.items():
+        object_key_by_member.setdefault(name_key, object_key)
+
     return StockObjectIndex(
         object_key_by_member=object_key_by_member,
         member_keys_by_object_key=member_keys_by_object_key,
@@ -229,8 +606,9 @@ def build_stock_search_rows(
     *,
     stock_relations: list[dict[str, object]] | None = None,
     ai_alias_map: dict[str, str] | None = None,
+    stock_index: StockObjectIndex | None = None,
 ) -> list[dict[str, str]]:
-    index = build_stock_object_index(
+    index = stock_index or build_stock_object_index(
         assertions,
         stock_relations=stock_relations,
         ai_alias_map=ai_alias_map,
@@ -426,6 +804,7 @@ def _build_search_text(
 
 __all__ = [
     "StockObjectIndex",
+    "StockObjectIndexState",
     "build_stock_object_index",
     "build_stock_search_rows",
     "ensure_stock_columns",
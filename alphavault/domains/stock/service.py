@@ -125,6 +125,7 @@ def build_stock_search_index(
     *,
     stock_relations: list[dict[str, object]] | None = None,
     ai_alias_map: dict[str, str] | None = None,
+    stock_index: StockObjectIndex | None = None,
 ) -> list[dict[str, str]]:
     from alphavault.domains.stock.object_index import build_stock_search_rows
 
@@ -132,6 +133,7 @@ def build_stock_search_index(
         map_assertion_rows(assertions),
         stock_relations=stock_relations,
         ai_alias_map=ai_alias_map,
+        stock_index=stock_index,
     )
 
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from typing import Mapping
 
 from alphavault.constants import PLATFORM_XUEQIU
 from alphavault.domains.thread_tree.api import build_weibo_thread_forest
@@ -9,6 +10,9 @@ from alphavault.domains.thread_tree.api import extract_platform_post_id
 
 _TRAILING_ESCAPED_TAB_RE = re.compile(r"(?:\\+t)+$")
 
+# Bump whenever build/render output changes so persisted trees are re-rendered.
+THREAD_TREE_RENDER_VERSION = 1
+
 
 def _clean_post_id(value: object) -> str:
     text = str(value or "").strip()
@@ -157,17 +161,19 @@ def build_post_tree(
 
 
 def build_post_tree_map(
-    *, post_uids: list[str], posts: list[dict[str, object]]
+    *,
+    post_uids: list[str],
+    posts: list[dict[str, object]],
+    cached: Mapping[str, tuple[str, str]] | None = None,
 ) -> dict[str, tuple[str, str]]:
     """
     Batch version of build_post_tree().
 
     Important for performance: building the thread forest walks the entire posts table,
-    so we should only do it once per page.
+    so we should only do it once per page. Trees found in `cached` (persisted at
+    AI-done time) are used as-is; only the rest are rendered live.
     """
-    if not posts or not post_uids:
-        return {}
-
+    out: dict[str, tuple[str, str]] = {}
     cleaned_uids: list[str] = []
     seen: set[str] = set()
     for raw in post_uids:
@@ -175,9 +181,12 @@ def build_post_tree_map(
         if not uid or uid in seen:
             continue
         seen.add(uid)
+        if cached and uid in cached:
+            out[uid] = cached[uid]
+            continue
         cleaned_uids.append(uid)
-    if not cleaned_uids:
-        return {}
+    if not posts or not cleaned_uids:
+        return out
 
     view_rows: list[dict[str, object]] = [
         {
@@ -191,9 +200,9 @@ def build_post_tree_map(
         posts_all=posts,
     )
     if not threads:
-        return {uid: ("", "") for uid in cleaned_uids}
+        out.update({uid: ("", "") for uid in cleaned_uids})
+        return out
 
-    out: dict[str, tuple[str, str]] = {}
     for uid in cleaned_uids:
         post_id = _resolve_platform_post_id(
             post_uid=uid, posts=posts
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from typing import Any, Callable
+from uuid import uuid4
+
+from alphavault.constants import ENV_AI_DISTRIBUTED_LIMIT
+from alphavault.logging_config import get_logger
+from alphavault.rss.utils import RateLimiter
+from alphavault.worker.redis_client import try_get_redis
+
+AI_LIMIT_KEY_PREFIX = "av:ai_limit"
+EMBEDDING_LIMIT_KEY_PREFIX = "av:embedding_limit"
+RERANKER_LIMIT_KEY_PREFIX = "av:reranker_limit"
+REDIS_RETRY_AFTER_ERROR_SECONDS = 30.0
+INFLIGHT_POLL_SECONDS = 0.25
+INFLIGHT_LEASE_MARGIN_SECONDS = 30.0
+logger = get_logger(__name__)
+
+# GCRA over Redis server time. Books the next slot when it comes due within
+# ARGV[3] ms (-1 = any wait) and returns how long to sleep in milliseconds,
+# or -1 without booking when it is further out.
+_GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then
+  tat = now
+end
+local wait = tat - tolerance - now
+if max_wait >= 0 and wait > max_wait then
+  return -1
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], new_tat, 'PX', math.max(1, new_tat - now + interval))
+if wait < 0 then
+  wait = 0
+end
+return wait
+"""
+
+# Give back one booked slot (a cancelled reservation).
+_GCRA_REFUND_SCRIPT = """
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat <= 0 then
+  return 0
+end
+local ttl = redis.call('PTTL', KEYS[1])
+redis.call('SET', KEYS[1], tat - tonumber(ARGV[1]), 'PX', math.max(1, ttl))
+return 1
+"""
+
+# Inflight leases live in a sorted set scored by expiry (ms, server time).
+# Expired leases are dropped first, so a crashed process frees its slots.
+_LEASE_ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local lease_ms = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZSCORE', KEYS[1], ARGV[3]) or redis.call('ZCARD', KEYS[1]) < limit then
+  redis.call('ZADD', KEYS[1], now + lease_ms, ARGV[3])
+  redis.call('PEXPIRE', KEYS[1], lease_ms)
+  return 1
+end
+return 0
+"""
+
+
+def distributed_ai_limit_enabled() -> bool:
+    raw = os.getenv(ENV_AI_DISTRIBUTED_LIMIT, "").strip().lower()
+    return raw in {"1", "true", "yes", "y", "on"}
+
+
+class DistributedRateLimiter(RateLimiter):
+    """RateLimiter whose budget is shared by every process in a limit group.
+
+    Rate is GCRA and in-flight requests are leases, both kept in Redis under
+    the limit-group name. While Redis is unreachable it falls back to the
+    inherited in-process token bucket and no shared in-flight cap.
+    """
+
+    def __init__(
+        self,
+        rpm: float,
+        *,
+        burst: float = 1.0,
+        name: str,
+        max_inflight: int,
+        lease_seconds: float,
+        key_prefix: str = AI_LIMIT_KEY_PREFIX,
+        redis_client_fn: Callable[[], Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        super().__init__(
+            rpm,
+            burst=burst,
+            name=name,
+            max_inflight=max(1, int(max_inflight)),
+            clock=clock,
+            sleep=sleep,
+        )
+        self._lease_ms = max(1000, int(float(lease_seconds) * 1000))
+        self._redis_client_fn = redis_client_fn or _default_redis_client
+        self._redis_lock = threading.Lock()
+        self._client: Any = None
+        self._redis_down_until = 0.0
+        self._redis_errors = 0
+        self._fallback_waits = 0
+        self._local = threading.local()
+        group = self.name or "default"
+        self._rate_key = f"{key_prefix}:{group}:rate"
+        self._inflight_key = f"{key_prefix}:{group}:inflight"
+
+    def _redis(self) -> Any:
+        with self._redis_lock:
+            if self._clock() < self._redis_down_until:
+                return None
+            if self._client is None:
+                self._client = self._redis_client_fn()
+            if self._client is None:
+                self._redis_down_until = self._clock() + REDIS_RETRY_AFTER_ERROR_SECONDS
+            return self._client
+
+    def _mark_redis_error(self, event: str, err: BaseException) -> None:
+        with self._redis_lock:
+            self._redis_errors += 1
+            self._client = None
+            self._redis_down_until = self._clock() + REDIS_RETRY_AFTER_ERROR_SECONDS
+        logger.warning(
+            "[ai_limit] %s group=%s %s: %s",
+            event,
+            self.name or "default",
+            type(err).__name__,
+            err,
+        )
+
+    def _gcra(self, client: Any, *, max_wait_seconds: float) -> float | None:
+        interval_ms = 60_000.0 / self.rpm
+        tolerance_ms = interval_ms * (self.burst - 1.0)
+        max_wait_ms = (
+            -1 if math.isinf(max_wait_seconds) else int(max_wait_seconds * 1000)
+        )
+        wait_ms = int(
+            client.eval(
+                _GCRA_SCRIPT,
+                1,
+                self._rate_key,
+                int(interval_ms),
+                int(tolerance_ms),
+                max_wait_ms,
+            )
+        )
+        if wait_ms < 0:
+            return None
+        return wait_ms / 1000.0
+
+    def _take_token(self, *, max_wait_seconds: float) -> float | None:
+        client = self._redis()
+        if client is not None:
+            try:
+                wait_seconds = self._gcra(client, max_wait_seconds=max_wait_seconds)
+            except Exception as err:
+                self._mark_redis_error("rate_error", err)
+            else:
+                if wait_seconds is not None:
+                    with self._lock:
+                        self._acquired += 1
+                return wait_seconds
+        with self._lock:
+            self._fallback_waits += 1
+        return super()._take_token(max_wait_seconds=max_wait_seconds)
+
+    def _hold_inflight(self) -> None:
+        """Wait for an in-flight lease, at most one lease length.
+
+        Every held lease expires within that time, so running out means the
+        group is stuck; the rate token is given back and TimeoutError raised.
+        """
+        client = self._redis()
+        if client is None:
+            return
+        lease_id = getattr(self._local, "lease_id", "") or uuid4().hex
+        deadline = self._clock() + self._lease_ms / 1000.0
+        try:
+            while not int(
+                client.eval(
+                    _LEASE_ACQUIRE_SCRIPT,
+                    1,
+                    self._inflight_key,
+                    self.max_inflight,
+                    self._lease_ms,
+                    lease_id,
+                )
+            ):
+                if self._clock() >= deadline:
+                    break
+                self._sleep(INFLIGHT_POLL_SECONDS)
+            else:
+                self._local.lease_id = lease_id
+                return
+        except Exception as err:
+            self._mark_redis_error("inflight_acquire_error", err)
+            return
+        self._refund_token()
+        self._count_rejected()
+        raise TimeoutError(f"ai_inflight_wait_timeout:{self.name or 'default'}")
+
+    def release_inflight(self) -> None:
+        lease_id = getattr(self._local, "lease_id", "")
+        if not lease_id:
+            return
+        self._local.lease_id = ""
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            client.zrem(self._inflight_key, lease_id)
+        except Exception as err:
+            self._mark_redis_error("inflight_release_error", err)
+
+    def _refund_token(self) -> None:
+        client = self._redis()
+        if client is None:
+            super()._refund_token()
+            return
+        try:
+            client.eval(_GCRA_REFUND_SCRIPT, 1, self._rate_key, int(60_000 / self.rpm))
+        except Exception as err:
+            self._mark_redis_error("rate_refund_error", err)
+
+    def wait(self) -> None:
+        super().wait()
+        self._hold_inflight()
+
+    def stats(self) -> dict[str, object]:
+        out = super().stats()
+        with self._redis_lock:
+            redis_up = self._clock() >= self._redis_down_until
+            out.update(
+                {
+                    "backend": "redis" if redis_up else "local",
+                    "max_inflight": self.max_inflight,
+                    "redis_errors": self._redis_errors,
+                    "fallback_waits": self._fallback_waits,
+                }
+            )
+        return out
+
+
+def _default_redis_client() -> Any:
+    client, _queue_key = try_get_redis()
+    return client
+
+
+def build_ai_rate_limiter(
+    *,
+    rpm: float,
+    burst: float,
+    limit_group_name: str,
+    max_inflight: int,
+    timeout_seconds: float,
+    key_prefix: str = AI_LIMIT_KEY_PREFIX,
+) -> RateLimiter:
+    """Process-local limiter, or the Redis-shared one when AI_DISTRIBUTED_LIMIT is on.
+
+    Embedding and reranker groups pass their own `key_prefix`, so a group
+    named like an LLM group does not share its budget.
+    """
+    if not distributed_ai_limit_enabled():
+        return RateLimiter(
+            rpm, burst=burst, name=limit_group_name, max_inflight=max_inflight
+        )
+    return DistributedRateLimiter(
+        rpm,
+        burst=burst,
+        name=limit_group_name,
+        max_inflight=max_inflight,
+        lease_seconds=float(timeout_seconds) + INFLIGHT_LEASE_MARGIN_SECONDS,
+        key_prefix=key_prefix,
+    )
+
+
+__all__ = [
+    "AI_LIMIT_KEY_PREFIX",
+    "EMBEDDING_LIMIT_KEY_PREFIX",
+    "RERANKER_LIMIT_KEY_PREFIX",
+    "DistributedRateLimiter",
+    "build_ai_rate_limiter",
+    "distributed_ai_limit_enabled",
+]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+from typing import Any, Callable
+
+from alphavault.constants import (
+    DEFAULT_SEMANTIC_QUERY_EMBEDDING_CACHE_SIZE,
+    DEFAULT_SEMANTIC_QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+    ENV_SEMANTIC_QUERY_EMBEDDING_CACHE_SIZE,
+    ENV_SEMANTIC_QUERY_EMBEDDING_CACHE_TTL_SEC,
+)
+from alphavault.logging_config import get_logger
+from alphavault.rss.utils import env_int
+from alphavault.worker.redis_client import try_get_redis
+
+QUERY_EMBEDDING_REDIS_KEY_PREFIX = "av:semantic_query_embedding"
+logger = get_logger(__name__)
+
+QueryEmbeddingKey = tuple[str, str, int]
+
+
+def normalize_embedding_query(query: object) -> str:
+    return " ".join(str(query or "").split())
+
+
+def query_embedding_key(
+    query: object, *, model: str, dimensions: int
+) -> QueryEmbeddingKey:
+    return (
+        normalize_embedding_query(query),
+        str(model or "").strip(),
+        int(dimensions),
+    )
+
+
+def _redis_key(key: QueryEmbeddingKey) -> str:
+    raw = json.dumps(list(key), ensure_ascii=False, separators=(",", ":"))
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return f"{QUERY_EMBEDDING_REDIS_KEY_PREFIX}:{digest}"
+
+
+def _parse_vector(value: object) -> list[float] | None:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        parsed = json.loads(text)
+    except Exception:
+        return None
+    if not isinstance(parsed, list) or not parsed:
+        return None
+    try:
+        return [float(item) for item in parsed]
+    except (TypeError, ValueError):
+        return None
+
+
+def resolve_query_embedding_cache_size() -> int:
+    value = env_int(ENV_SEMANTIC_QUERY_EMBEDDING_CACHE_SIZE)
+    if value is None:
+        return int(DEFAULT_SEMANTIC_QUERY_EMBEDDING_CACHE_SIZE)
+    return max(0, int(value))
+
+
+def resolve_query_embedding_cache_ttl_seconds() -> int:
+    value = env_int(ENV_SEMANTIC_QUERY_EMBEDDING_CACHE_TTL_SEC)
+    if value is None:
+        return int(DEFAULT_SEMANTIC_QUERY_EMBEDDING_CACHE_TTL_SECONDS)
+    return max(0, int(value))
+
+
+class QueryEmbeddingCache:
+    """In-process LRU of query embeddings, backed by an optional Redis TTL tier."""
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl_seconds: int,
+        redis_factory: Callable[[], tuple[Any, str]] | None = try_get_redis,
+    ) -> None:
+        self._max_size = max(0, int(max_size))
+        self._ttl_seconds = max(0, int(ttl_seconds))
+        self._redis_factory = redis_factory if self._ttl_seconds > 0 else None
+        self._redis_client: Any = None
+        self._items: OrderedDict[QueryEmbeddingKey, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _local_get(self, key: QueryEmbeddingKey) -> list[float] | None:
+        with self._lock:
+            vector = self._items.get(key)
+            if vector is not None:
+                self._items.move_to_end(key)
+            return vector
+
+    def _local_put(self, key: QueryEmbeddingKey, vector: list[float]) -> None:
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = vector
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+
+    def _redis(self) -> Any:
+        if self._redis_factory is None:
+            return None
+        if self._redis_client is None:
+            self._redis_client, _queue_key = self._redis_factory()
+        return self._redis_client
+
+    def _redis_get(self, key: QueryEmbeddingKey) -> list[float] | None:
+        client = self._redis()
+        if not client:
+            return None
+        try:
+            return _parse_vector(client.get(_redis_key(key)))
+        except Exception as err:
+            logger.warning(
+                "[embedding] query_cache_get_error %s: %s",
+                type(err).__name__,
+                err,
+            )
+            return None
+
+    def _redis_put(self, key: QueryEmbeddingKey, vector: list[float]) -> None:
+        client = self._redis()
+        if not client:
+            return
+        try:
+            client.set(
+                _redis_key(key),
+                json.dumps(vector, separators=(",", ":")),
+                ex=self._ttl_seconds,
+            )
+        except Exception as err:
+            logger.warning(
+                "[embedding] query_cache_set_error %s: %s",
+                type(err).__name__,
+                err,
+            )
+
+    def get_or_embed(
+        self,
+        key: QueryEmbeddingKey,
+        embed: Callable[[str], list[float]],
+    ) -> list[float]:
+        vector = self._local_get(key)
+        if vector is not None:
+            return vector
+        vector = self._redis_get(key)
+        if vector is None:
+            vector = embed(key[0])
+            self._redis_put(key, vector)
+        self._local_put(key, vector)
+        return vector
+
+
+def query_embedding_cache_from_env() -> QueryEmbeddingCache:
+    return QueryEmbeddingCache(
+        max_size=resolve_query_embedding_cache_size(),
+        ttl_seconds=resolve_query_embedding_cache_ttl_seconds(),
+    )
+
+
+__all__ = [
+    "QueryEmbeddingCache",
+    "normalize_embedding_query",
+    "query_embedding_cache_from_env",
+    "query_embedding_key",
+    "resolve_query_embedding_cache_size",
+    "resolve_query_embedding_cache_ttl_seconds",
+]
@@ -13,6 +13,7 @@ from alphavault.ai.analyze import (
     DEFAULT_MODEL,
 )
 from alphavault.constants import (
+    DEFAULT_AI_BURST,
     DEFAULT_AI_LIMIT_GROUP_NAME,
     DEFAULT_AI_MAX_INFLIGHT,
     DEFAULT_AI_PROFILE_NAME,
@@ -20,6 +21,7 @@ from alphavault.constants import (
     ENV_AI_API_KEY,
     ENV_AI_API_MODE,
     ENV_AI_BASE_URL,
+    ENV_AI_BURST,
     ENV_AI_LIMIT_GROUP_PREFIX,
     ENV_AI_MAX_INFLIGHT,
     ENV_AI_MODEL,
@@ -27,6 +29,7 @@ from alphavault.constants import (
     ENV_AI_REASONING_EFFORT,
     ENV_AI_RETRIES,
     ENV_AI_RPM,
+    ENV_AI_SPECULATIVE,
     ENV_AI_TASK_PROFILE_PREFIX,
     ENV_AI_TEMPERATURE,
     ENV_AI_TIMEOUT_SEC,
@@ -58,10 +61,12 @@ _PROFILE_FIELD_ENV_BY_SUFFIX = {
     "TEMPERATURE": ENV_AI_TEMPERATURE,
     "REASONING_EFFORT": ENV_AI_REASONING_EFFORT,
     "RETRIES": ENV_AI_RETRIES,
+    "SPECULATIVE": ENV_AI_SPECULATIVE,
 }
 _LIMIT_GROUP_FIELD_ENV_BY_SUFFIX = {
     "RPM": ENV_AI_RPM,
     "MAX_INFLIGHT": ENV_AI_MAX_INFLIGHT,
+    "BURST": ENV_AI_BURST,
 }
 
 
@@ -80,6 +85,8 @@ class AiRuntimeConfig:
     task_key: str = ""
     profile_name: str = DEFAULT_AI_PROFILE_NAME
     limit_group_name: str = DEFAULT_AI_LIMIT_GROUP_NAME
+    ai_burst: float = DEFAULT_AI_BURST
+    speculative: bool = False
 
 
 def _env_float(name: str, default: float) -> float:
@@ -102,6 +109,18 @@ def _env_int(name: str, default: int) -> int:
         return int(default)
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return bool(default)
+    value = str(raw).strip().lower()
+    if value in {"1", "true", "yes", "y", "on"}:
+        return True
+    if value in {"0", "false", "no", "n", "off"}:
+        return False
+    return bool(default)
+
+
 def _env_optional_text(name: str) -> str | None:
     raw = os.getenv(name)
     if raw is None:
@@ -241,6 +260,8 @@ def _build_default_runtime_config(*, timeout_seconds_default: float) -> AiRuntim
             1,
             _env_int(ENV_AI_MAX_INFLIGHT, DEFAULT_AI_MAX_INFLIGHT),
         ),
+        ai_burst=max(1.0, _env_float(ENV_AI_BURST, DEFAULT_AI_BURST)),
+        speculative=_env_bool(ENV_AI_SPECULATIVE, False),
         profile_name=DEFAULT_AI_PROFILE_NAME,
         limit_group_name=DEFAULT_AI_LIMIT_GROUP_NAME,
     )
@@ -267,6 +288,13 @@ def _apply_limit_group_runtime_config(
                 config.ai_max_inflight,
             ),
         ),
+        ai_burst=max(
+            1.0,
+            _env_float(
+                ai_limit_group_field_env_name(limit_group_name, "BURST"),
+                config.ai_burst,
+            ),
+        ),
         limit_group_name=_normalize_limit_group_name(limit_group_name),
     )
 
@@ -336,6 +364,11 @@ def ai_task_runtime_config_from_env(
         task_key=normalized_task_key,
         profile_name=profile_name,
         limit_group_name=base_config.limit_group_name,
+        ai_burst=base_config.ai_burst,
+        speculative=_env_bool(
+            ai_profile_field_env_name(profile_name, "SPECULATIVE"),
+            default_config.speculative,
+        ),
     )
 
 
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Iterable
+
+from alphavault.constants import (
+    DEFAULT_STOCK_VIEW_CACHE_MAX_AGE_SECONDS,
+    ENV_STOCK_VIEW_CACHE_MAX_AGE_SEC,
+)
+from alphavault.logging_config import get_logger
+from alphavault.worker.redis_client import try_get_redis
+
+HOT_VIEW_KEY_PREFIX = "av:hot_view"
+HOT_VIEW_GENERATION_TTL_SECONDS = 7 * 24 * 3600
+# Pseudo entity whose generation every cached view also records; bumping it
+# drops all views at once (e.g. after alias relations change).
+HOT_VIEW_ALL_ENTITIES = "*"
+# Sector membership comes from topic clusters joined at read time, so a write
+# cannot tell which sectors it touched; every assertion write bumps this one.
+HOT_VIEW_ALL_SECTORS = "cluster:*"
+logger = get_logger(__name__)
+
+_stats_lock = threading.Lock()
+_stats: dict[str, int] = {
+    "hits": 0,
+    "misses": 0,
+    "stale": 0,
+    "stores": 0,
+    "invalidations": 0,
+    "errors": 0,
+}
+_client_lock = threading.Lock()
+_client: Any = None
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] = int(_stats.get(name, 0)) + int(amount)
+
+
+def hot_view_cache_stats() -> dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def resolve_hot_view_max_age_seconds() -> int:
+    raw = os.getenv(ENV_STOCK_VIEW_CACHE_MAX_AGE_SEC, "").strip()
+    if not raw:
+        return int(DEFAULT_STOCK_VIEW_CACHE_MAX_AGE_SECONDS)
+    try:
+        value = int(raw)
+    except ValueError:
+        return int(DEFAULT_STOCK_VIEW_CACHE_MAX_AGE_SECONDS)
+    return max(0, value)
+
+
+def _shared_redis() -> Any:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client, _queue_key = try_get_redis()
+        return _client
+
+
+def get_hot_view_redis() -> Any:
+    """Shared Redis client for reading hot views; ``None`` when the cache is off."""
+    if resolve_hot_view_max_age_seconds() <= 0:
+        return None
+    return _shared_redis()
+
+
+def _generation_key(entity_key: str) -> str:
+    return f"{HOT_VIEW_KEY_PREFIX}:gen:{entity_key}"
+
+
+def _view_key(entity_key: str, variant: str) -> str:
+    digest = hashlib.sha1(f"{entity_key}\n{variant}".encode("utf-8")).hexdigest()
+    return f"{HOT_VIEW_KEY_PREFIX}:view:{digest[:20]}"
+
+
+def _clean_keys(entity_keys: Iterable[str]) -> list[str]:
+    out: list[str] = []
+    for raw in entity_keys:
+        key = str(raw or "").strip()
+        if key and key not in out:
+            out.append(key)
+    return out
+
+
+def _warn(event: str, err: BaseException) -> None:
+    _count("errors")
+    logger.warning(
+        "[hot_view] %s %s: %s",
+        event,
+        type(err).__name__,
+        err,
+    )
+
+
+def read_hot_view_generations(
+    client: Any, entity_keys: Iterable[str]
+) -> dict[str, str]:
+    keys = _clean_keys(entity_keys)
+    if not client or not keys:
+        return {}
+    try:
+        values = client.mget([_generation_key(key) for key in keys]) or []
+    except Exception as err:
+        _warn("generation_read_error", err)
+        return {}
+    return {
+        key: str(values[idx] if idx < len(values) and values[idx] else "0")
+        for idx, key in enumerate(keys)
+    }
+
+
+def load_hot_view(
+    client: Any,
+    *,
+    entity_key: str,
+    variant: str,
+    max_age_seconds: int,
+) -> dict[str, object] | None:
+    """Cached view, or ``None`` when missing, too old or any entity was rewritten."""
+    if not client:
+        return None
+    try:
+        raw = client.get(_view_key(entity_key, variant))
+    except Exception as err:
+        _warn("view_read_error", err)
+        return None
+    try:
+        record = json.loads(str(raw or "")) if raw else None
+    except Exception:
+        record = None
+    if not isinstance(record, dict) or not isinstance(record.get("view"), dict):
+        _count("misses")
+        return None
+    generations = record.get("generations")
+    if not isinstance(generations, dict):
+        generations = {}
+    built_at = float(record.get("built_at") or 0.0)
+    current = read_hot_view_generations(client, generations.keys())
+    if time.time() - built_at > max(0, int(max_age_seconds)) or any(
+        current.get(key) != str(value) for key, value in generations.items()
+    ):
+        _count("stale")
+        return None
+    _count("hits")
+    return record["view"]
+
+
+def store_hot_view(
+    client: Any,
+    *,
+    entity_key: str,
+    variant: str,
+    view: dict[str, object],
+    generations: dict[str, str],
+    max_age_seconds: int,
+) -> None:
+    if not client or int(max_age_seconds) <= 0:
+        return
+    record = {
+        "built_at": time.time(),
+        "generations": dict(generations),
+        "view": view,
+    }
+    try:
+        client.set(
+            _view_key(entity_key, variant),
+            json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str),
+            ex=int(max_age_seconds),
+        )
+    except Exception as err:
+        _warn("view_write_error", err)
+        return
+    _count("stores")
+
+
+def invalidate_hot_views(client: Any, entity_keys: Iterable[str]) -> None:
+    keys = _clean_keys(entity_keys)
+    if not client or not keys:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.incr(_generation_key(key))
+            pipe.expire(_generation_key(key), HOT_VIEW_GENERATION_TTL_SECONDS)
+        pipe.execute()
+    except Exception as err:
+        _warn("invalidate_error", err)
+        return
+    _count("invalidations", len(keys))
+
+
+def invalidate_hot_views_best_effort(entity_keys: Iterable[str]) -> None:
+    keys = _clean_keys(entity_keys)
+    if not keys:
+        return
+    invalidate_hot_views(_shared_redis(), keys)
+
+
+__all__ = [
+    "HOT_VIEW_ALL_ENTITIES",
+    "HOT_VIEW_ALL_SECTORS",
+    "get_hot_view_redis",
+    "hot_view_cache_stats",
+    "invalidate_hot_views",
+    "invalidate_hot_views_best_effort",
+    "load_hot_view",
+    "read_hot_view_generations",
+    "resolve_hot_view_max_age_seconds",
+    "store_hot_view",
+]
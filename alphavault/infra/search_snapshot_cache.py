@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import json
+import threading
+import time
+from typing import Any, Callable
+from uuid import uuid4
+
+from alphavault.constants import (
+    DEFAULT_SEMANTIC_SEARCH_SNAPSHOT_TTL_SECONDS,
+    ENV_SEMANTIC_SEARCH_SNAPSHOT_TTL_SEC,
+)
+from alphavault.logging_config import get_logger
+from alphavault.rss.utils import env_int
+from alphavault.worker.redis_client import try_get_redis
+
+SEARCH_SNAPSHOT_REDIS_KEY_PREFIX = "av:semantic_search_snapshot"
+SEARCH_SNAPSHOT_LOCAL_MAX_ITEMS = 128
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchSnapshot:
+    query: str
+    rows: list[dict[str, object]]
+    reranked: bool
+
+
+def _redis_key(session_id: str) -> str:
+    return f"{SEARCH_SNAPSHOT_REDIS_KEY_PREFIX}:{session_id}"
+
+
+def _encode_snapshot(snapshot: SearchSnapshot) -> str:
+    payload = {
+        "query": snapshot.query,
+        "rows": snapshot.rows,
+        "reranked": snapshot.reranked,
+    }
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _decode_snapshot(value: object) -> SearchSnapshot | None:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        payload = json.loads(text)
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get("rows"), list):
+        return None
+    return SearchSnapshot(
+        query=str(payload.get("query") or ""),
+        rows=[row for row in payload["rows"] if isinstance(row, dict)],
+        reranked=bool(payload.get("reranked")),
+    )
+
+
+def resolve_search_snapshot_ttl_seconds() -> int:
+    value = env_int(ENV_SEMANTIC_SEARCH_SNAPSHOT_TTL_SEC)
+    if value is None:
+        return int(DEFAULT_SEMANTIC_SEARCH_SNAPSHOT_TTL_SECONDS)
+    return max(0, int(value))
+
+
+class SearchSnapshotStore:
+    """Short-lived ranked candidate lists keyed by search-session id.
+
+    Kept in process memory first; Redis (when configured) lets another process
+    serve later pages of the same session.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int,
+        max_items: int = SEARCH_SNAPSHOT_LOCAL_MAX_ITEMS,
+        redis_factory: Callable[[], tuple[Any, str]] | None = try_get_redis,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = max(0, int(ttl_seconds))
+        self._max_items = max(1, int(max_items))
+        self._redis_factory = redis_factory
+        self._redis_client: Any = None
+        self._clock = clock
+        self._items: OrderedDict[str, tuple[float, SearchSnapshot]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0
+
+    def _redis(self) -> Any:
+        if self._redis_factory is None:
+            return None
+        if self._redis_client is None:
+            self._redis_client, _queue_key = self._redis_factory()
+        return self._redis_client
+
+    def put(self, snapshot: SearchSnapshot) -> str:
+        if not self.enabled:
+            return ""
+        session_id = uuid4().hex
+        with self._lock:
+            self._items[session_id] = (self._clock() + self._ttl_seconds, snapshot)
+            while len(self._items) > self._max_items:
+                self._items.popitem(last=False)
+        client = self._redis()
+        if client:
+            try:
+                client.set(
+                    _redis_key(session_id),
+                    _encode_snapshot(snapshot),
+                    ex=self._ttl_seconds,
+                )
+            except Exception as err:
+                logger.warning(
+                    "[search] snapshot_set_error %s: %s",
+                    type(err).__name__,
+                    err,
+                )
+        return session_id
+
+    def get(self, session_id: str) -> SearchSnapshot | None:
+        resolved_id = str(session_id or "").strip()
+        if not resolved_id or not self.enabled:
+            return None
+        with self._lock:
+            item = self._items.get(resolved_id)
+            if item is not None:
+                expires_at, snapshot = item
+                if expires_at > self._clock():
+                    return snapshot
+                self._items.pop(resolved_id, None)
+        client = self._redis()
+        if not client:
+            return None
+        try:
+            return _decode_snapshot(client.get(_redis_key(resolved_id)))
+        except Exception as err:
+            logger.warning(
+                "[search] snapshot_get_error %s: %s",
+                type(err).__name__,
+                err,
+            )
+            return None
+
+
+def search_snapshot_store_from_env() -> SearchSnapshotStore:
+    return SearchSnapshotStore(ttl_seconds=resolve_search_snapshot_ttl_seconds())
+
+
+__all__ = [
+    "SearchSnapshot",
+    "SearchSnapshotStore",
+    "resolve_search_snapshot_ttl_seconds",
+    "search_snapshot_store_from_env",
+]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import asdict
 from datetime import datetime
+from typing import Mapping
 
 from alphavault.domains.content.row_mapper import map_posts
 from alphavault.domains.signal.aggregator import (
@@ -24,11 +25,15 @@ from alphavault.domains.signal.view_rows import build_signal_row_views
 def merge_post_fields(
     assertions: list[dict[str, object]],
     posts: list[dict[str, object]],
+    *,
+    cached_trees: Mapping[str, tuple[str, str]] | None = None,
 ) -> list[dict[str, object]]:
     post_models = map_posts(posts)
     assertion_models = map_assertions(assertions)
     signals = merge_assertions_with_posts(assertion_models, post_models)
-    signals = attach_signal_tree_context(signals, posts=post_models)
+    signals = attach_signal_tree_context(
+        signals, posts=post_models, cached_trees=cached_trees
+    )
     return [
         _merge_signal_row(original_row, signal)
         for original_row, signal in zip(assertions, signals)
@@ -15,9 +15,12 @@ from alphavault.domains.stock.key_match import (
     is_stock_code_value,
     normalize_stock_code,
 )
+from alphavault.infra.ai.distributed_limiter import (
+    build_ai_rate_limiter,
+    distributed_ai_limit_enabled,
+)
 from alphavault.infra.ai.runtime_config import AiRuntimeConfig
 from alphavault.logging_config import get_logger
-from alphavault.rss.utils import RateLimiter
 
 from .alias_task_repo import (
     auto_confirm_alias_resolve_task_if_needed,
@@ -230,8 +233,18 @@ def enrich_alias_task_rows_with_ai(
         predictor_module or _load_alias_resolve_predictor_module()
     )
     request_gate: Callable[[], None] | None = None
-    limiter = RateLimiter(_runtime_ai_rpm(runtime_config))
-    if limiter.has_limit():
+    limiter = build_ai_rate_limiter(
+        rpm=_runtime_ai_rpm(runtime_config),
+        burst=runtime_config.ai_burst if runtime_config is not None else 1.0,
+        limit_group_name=(
+            runtime_config.limit_group_name if runtime_config is not None else ""
+        ),
+        max_inflight=_runtime_ai_max_inflight(runtime_config),
+        timeout_seconds=(
+            runtime_config.timeout_seconds if runtime_config is not None else 60.0
+        ),
+    )
+    if limiter.has_limit() or distributed_ai_limit_enabled():
         request_gate = limiter.wait
     batch_rows_list = _chunk_rows(target_rows, chunk_size=resolved_ai_batch_size)
     resolved_ai_max_inflight = _runtime_ai_max_inflight(runtime_config)
@@ -25,12 +25,15 @@ from alphavault.db.sql.common import make_in_params, make_in_placeholders
 from alphavault.db.sql_rows import read_sql_rows
 from alphavault.domains.signal.aggregator import coerce_signal_timestamp
 from alphavault.domains.stock.keys import normalize_stock_key
+from alphavault.infra.ai.distributed_limiter import (
+    build_ai_rate_limiter,
+    distributed_ai_limit_enabled,
+)
 from alphavault.infra.ai.runtime_config import (
     AI_TASK_TRADE_SIGNAL_REVIEW,
     AiRuntimeConfig,
     ai_task_runtime_config_from_env,
 )
-from alphavault.rss.utils import RateLimiter
 from alphavault.timeutil import now_cst_str
 
 from .service import get_research_workbench_engine_from_env
@@ -501,7 +504,7 @@ def _load_trade_history_rows(
         request.created_at,
         window_days=history_window_days,
     )
-    created_at_expr = _trade_board_created_at_sql_expr("p.created_at")
+    created_at_expr = "p.created_at_ts"
     time_clauses = ""
     if created_before:
         params["created_before"] = created_before
@@ -765,15 +768,6 @@ def _generate_review(
     )
 
 
-def _trade_board_created_at_sql_expr(column: str) -> str:
-    return _load_trade_board_loader_module().trade_board_created_at_sql_expr(column)
-
-
-@cache
-def _load_trade_board_loader_module() -> ModuleType:
-    return importlib.import_module("alphavault_reflex.services.trade_board_loader")
-
-
 def _source_table(source_name: str, table_name: str) -> str:
     return _load_source_loader_module().source_table(source_name, table_name)
 
@@ -864,8 +858,14 @@ def _run_pending_trade_reviews(
     if not pending_reviews:
         return {}
     request_gate: Callable[[], None] | None = None
-    limiter = RateLimiter(_runtime_ai_rpm(runtime_config))
-    if limiter.has_limit():
+    limiter = build_ai_rate_limiter(
+        rpm=_runtime_ai_rpm(runtime_config),
+        burst=runtime_config.ai_burst,
+        limit_group_name=runtime_config.limit_group_name,
+        max_inflight=_runtime_ai_max_inflight(runtime_config),
+        timeout_seconds=runtime_config.timeout_seconds,
+    )
+    if limiter.has_limit() or distributed_ai_limit_enabled():
         request_gate = limiter.wait
     resolved_ai_max_inflight = min(
         _runtime_ai_max_inflight(runtime_config),
@@ -0,0 +1,176 @@
+"""Bounded concurrent RSS fetching with per-host politeness."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from alphavault.rss.utils import ConditionalFeedFetch, build_rss_session
+
+RSS_FETCH_THREAD_NAME_PREFIX = "rss-fetch"
+
+
+@dataclass(frozen=True)
+class RssFetchResult:
+    rss_url: str
+    feed: Any
+    error: Optional[BaseException]
+    latency_seconds: float
+    # Set when the fetch was conditional; `feed` is then its parsed feed
+    # (None when the server said the feed is unchanged).
+    conditional: Optional[ConditionalFeedFetch] = None
+
+
+def fetch_rss_timed(
+    fetch_fn: Callable[..., Any], rss_url: str, **fetch_kwargs: Any
+) -> RssFetchResult:
+    """Run one fetch and time it; an error is returned in the result, not raised."""
+    started_at = time.monotonic()
+    try:
+        fetched = fetch_fn(rss_url, **fetch_kwargs)
+    except Exception as err:
+        return RssFetchResult(
+            rss_url=rss_url,
+            feed=None,
+            error=err,
+            latency_seconds=time.monotonic() - started_at,
+        )
+    latency_seconds = time.monotonic() - started_at
+    if isinstance(fetched, ConditionalFeedFetch):
+        return RssFetchResult(
+            rss_url=rss_url,
+            feed=fetched.feed,
+            error=None,
+            latency_seconds=latency_seconds,
+            conditional=fetched,
+        )
+    return RssFetchResult(
+        rss_url=rss_url,
+        feed=fetched,
+        error=None,
+        latency_seconds=latency_seconds,
+    )
+
+
+def rss_url_host(rss_url: str) -> str:
+    try:
+        host = urlparse(str(rss_url or "").strip()).netloc
+    except Exception:
+        host = ""
+    return str(host or "").strip().lower()
+
+
+class _HostFetchGate:
+    def __init__(self, *, max_concurrency: int, min_interval_seconds: float) -> None:
+        self._semaphore = threading.BoundedSemaphore(max(1, int(max_concurrency)))
+        self._min_interval_seconds = max(0.0, float(min_interval_seconds))
+        self._lock = threading.Lock()
+        self._next_start_at = 0.0
+
+    def __enter__(self) -> "_HostFetchGate":
+        self._semaphore.acquire()
+        if self._min_interval_seconds <= 0:
+            return self
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(self._next_start_at, now)
+            self._next_start_at = start_at + self._min_interval_seconds
+        wait_seconds = start_at - now
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._semaphore.release()
+
+
+class RssFetchPool:
+    def __init__(
+        self,
+        *,
+        max_workers: int,
+        host_concurrency: int,
+        host_min_interval_seconds: float,
+        fetch_fn: Callable[..., Any],
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self._host_concurrency = max(1, int(host_concurrency))
+        self._host_min_interval_seconds = max(0.0, float(host_min_interval_seconds))
+        self._fetch_fn = fetch_fn
+        self._host_gates: dict[str, _HostFetchGate] = {}
+        self._host_gates_lock = threading.Lock()
+
+    def _host_gate(self, rss_url: str) -> _HostFetchGate:
+        host = rss_url_host(rss_url)
+        with self._host_gates_lock:
+            gate = self._host_gates.get(host)
+            if gate is None:
+                gate = _HostFetchGate(
+                    max_concurrency=self._host_concurrency,
+                    min_interval_seconds=self._host_min_interval_seconds,
+                )
+                self._host_gates[host] = gate
+            return gate
+
+    def _fetch_one(
+        self,
+        rss_url: str,
+        *,
+        timeout: float,
+        retries: int,
+        session: requests.Session,
+    ) -> RssFetchResult:
+        with self._host_gate(rss_url):
+            return fetch_rss_timed(
+                self._fetch_fn,
+                rss_url,
+                timeout=timeout,
+                retries=retries,
+                session=session,
+            )
+
+    def fetch_in_order(
+        self,
+        rss_urls: list[str],
+        *,
+        timeout: float,
+        retries: int,
+    ) -> Iterator[RssFetchResult]:
+        """Fetch concurrently, but yield results in the same order as `rss_urls`."""
+        if not rss_urls:
+            return
+        session = build_rss_session(pool_size=self.max_workers)
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(rss_urls)),
+            thread_name_prefix=RSS_FETCH_THREAD_NAME_PREFIX,
+        )
+        try:
+            futures: list[Future[RssFetchResult]] = [
+                executor.submit(
+                    self._fetch_one,
+                    rss_url,
+                    timeout=timeout,
+                    retries=retries,
+                    session=session,
+                )
+                for rss_url in rss_urls
+            ]
+            for future in futures:
+                yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            session.close()
+
+
+__all__ = [
+    "RssFetchPool",
+    "RssFetchResult",
+    "fetch_rss_timed",
+    "rss_url_host",
+]
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import hashlib
+import math
 import os
 import re
 import threading
 import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from urllib.parse import urlparse
 
 import feedparser
@@ -67,90 +69,235 @@ def env_float(name: str) -> Optional[float]:
 
 
 class RateLimiter:
-    def __init__(self, rpm: float) -> None:
-        self.min_interval = 60.0 / rpm if rpm and rpm > 0 else 0.0
+    """Token bucket: `rpm` tokens refill per minute, up to `burst` saved tokens.
+
+    Blocking callers take a token (possibly going into debt) under the lock and
+    sleep outside it, so `try_reserve()` never queues behind a sleeper.
+    """
+
+    def __init__(
+        self,
+        rpm: float,
+        *,
+        burst: float = 1.0,
+        name: str = "",
+        max_inflight: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rpm = float(rpm) if rpm and rpm > 0 else 0.0
+        self.burst = max(1.0, float(burst or 1.0))
+        self.name = str(name or "").strip()
+        # In-flight cap of the limit group this limiter fronts (0 = unknown);
+        # HTTP client pools size themselves from it.
+        self.max_inflight = max(0, int(max_inflight or 0))
+        self._rate_per_second = self.rpm / 60.0
+        self._clock = clock
+        self._sleep = sleep
         self._lock = threading.Lock()
-        self._next_ts = 0.0
+        self._tokens = self.burst
+        self._updated_at = clock()
+        self._waiters = 0
+        self._acquired = 0
+        self._rejected = 0
+        self._total_wait_seconds = 0.0
 
     def has_limit(self) -> bool:
-        return self.min_interval > 0
+        return self._rate_per_second > 0
 
-    def _reserve_until(self, *, block: bool) -> float | None:
-        if self.min_interval <= 0:
-            return None
+    def _refill_locked(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated_at)
+        self._updated_at = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self._rate_per_second)
+
+    def _take_token(self, *, max_wait_seconds: float) -> float | None:
+        """Book one token due within `max_wait_seconds`; returns its wait or None."""
+        with self._lock:
+            self._refill_locked()
+            wait_seconds = max(0.0, (1.0 - self._tokens) / self._rate_per_second)
+            if wait_seconds > max_wait_seconds:
+                return None
+            self._tokens -= 1.0
+            self._acquired += 1
+            return wait_seconds
+
+    def _count_rejected(self) -> None:
+        with self._lock:
+            self._rejected += 1
+
+    def _refund_token(self) -> None:
+        if not self.has_limit():
+            return
         with self._lock:
-            now = time.time()
-            if now < self._next_ts:
-                if not block:
-                    return None
-                time.sleep(self._next_ts - now)
-                now = time.time()
-            reserved_until = max(self._next_ts, now) + self.min_interval
-            self._next_ts = reserved_until
-            return reserved_until
-
-    def _release_reserved_until(self, reserved_until: float) -> None:
-        if self.min_interval <= 0:
+            self._refill_locked()
+            self._tokens = min(self.burst, self._tokens + 1.0)
+
+    def _sleep_for(self, wait_seconds: float) -> None:
+        if wait_seconds <= 0:
             return
         with self._lock:
-            if self._next_ts != reserved_until:
-                return
-            self._next_ts = max(0.0, float(reserved_until) - self.min_interval)
+            self._waiters += 1
+            self._total_wait_seconds += wait_seconds
+        try:
+            self._sleep(wait_seconds)
+        finally:
+            with self._lock:
+                self._waiters -= 1
+
+    def _hold_inflight(self) -> None:
+        """Hook for limiters that also cap in-flight requests."""
 
-    def _acquire(self, *, block: bool) -> bool:
-        if self.min_interval <= 0:
-            return True
-        return self._reserve_until(block=block) is not None
+    def release_inflight(self) -> None:
+        """Called once a gated request finishes."""
 
     def try_reserve(self) -> _ReservedRateLimitSlot | None:
-        reserved_until = self._reserve_until(block=False)
-        if reserved_until is None:
-            return None
-        return _ReservedRateLimitSlot(self, reserved_until)
+        slots = self.try_reserve_many(1)
+        return slots[0] if slots else None
+
+    def try_reserve_many(
+        self, count: int, *, horizon_seconds: float = 0.0
+    ) -> list[_ReservedRateLimitSlot]:
+        """Book up to `count` slots coming due within `horizon_seconds`.
+
+        Each slot's first `wait()` sleeps until its own due time, so one
+        scheduler pass can hand out a whole batch of future-dated requests.
+        """
+        if not self.has_limit():
+            return []
+        slots: list[_ReservedRateLimitSlot] = []
+        for _ in range(max(0, int(count))):
+            wait_seconds = self._take_token(
+                max_wait_seconds=max(0.0, float(horizon_seconds))
+            )
+            if wait_seconds is None:
+                break
+            slots.append(
+                _ReservedRateLimitSlot(self, ready_at=self._clock() + wait_seconds)
+            )
+        if not slots:
+            self._count_rejected()
+        return slots
 
     def wait(self) -> None:
-        self._acquire(block=True)
+        if not self.has_limit():
+            return
+        self._sleep_for(self._take_token(max_wait_seconds=math.inf) or 0.0)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            if self.has_limit():
+                self._refill_locked()
+            return {
+                "name": self.name,
+                "rpm": self.rpm,
+                "burst": self.burst,
+                "tokens_available": round(max(0.0, self._tokens), 3),
+                "waiters": self._waiters,
+                "acquired": self._acquired,
+                "rejected": self._rejected,
+                "total_wait_seconds": round(self._total_wait_seconds, 3),
+            }
 
 
 class _ReservedRateLimitSlot:
-    def __init__(self, limiter: RateLimiter, reserved_until: float) -> None:
+    def __init__(self, limiter: RateLimiter, *, ready_at: float = 0.0) -> None:
         self._limiter = limiter
-        self._reserved_until = float(reserved_until)
+        self._ready_at = float(ready_at)
         self._closed = False
         self._used_reserved_slot = False
 
+    @property
+    def name(self) -> str:
+        return self._limiter.name
+
+    @property
+    def max_inflight(self) -> int:
+        return self._limiter.max_inflight
+
     def wait(self) -> None:
         if not self._used_reserved_slot:
             self._used_reserved_slot = True
             self._closed = True
+            self._limiter._sleep_for(self._ready_at - self._limiter._clock())
+            self._limiter._hold_inflight()
             return
         self._limiter.wait()
 
+    def release_inflight(self) -> None:
+        self._limiter.release_inflight()
+
     def cancel(self) -> None:
         if self._closed:
             return
         self._closed = True
-        self._limiter._release_reserved_until(self._reserved_until)
+        self._limiter._refund_token()
 
 
 def now_str() -> str:
     return now_cst_str()
 
 
-def fetch_feed(
-    url: str, timeout: float, *, retries: int = 2
-) -> feedparser.FeedParserDict:
-    headers = {
-        "User-Agent": "AlphaVault-RSS-Ingest/1.0",
-        "Accept": "application/rss+xml, application/atom+xml, application/xml, text/xml",
-    }
+RSS_REQUEST_HEADERS = {
+    "User-Agent": "AlphaVault-RSS-Ingest/1.0",
+    "Accept": "application/rss+xml, application/atom+xml, application/xml, text/xml",
+}
+
+
+def build_rss_session(*, pool_size: int = 1) -> requests.Session:
+    resolved_pool_size = max(1, int(pool_size))
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=resolved_pool_size,
+        pool_maxsize=resolved_pool_size,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(RSS_REQUEST_HEADERS)
+    return session
+
+
+FEED_UNCHANGED_NOT_MODIFIED = "not_modified"
+FEED_UNCHANGED_SAME_BODY = "same_body"
+
+
+@dataclass(frozen=True)
+class FeedValidators:
+    etag: str = ""
+    last_modified: str = ""
+    body_hash: str = ""
+
+
+@dataclass(frozen=True)
+class ConditionalFeedFetch:
+    feed: Optional[feedparser.FeedParserDict]
+    validators: FeedValidators
+    unchanged_reason: str = ""
+
+
+def _feed_body_hash(content: bytes) -> str:
+    return hashlib.sha1(content or b"").hexdigest()
+
+
+def _get_feed_response(
+    url: str,
+    timeout: float,
+    *,
+    retries: int,
+    session: Optional[requests.Session],
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> requests.Response:
+    headers = dict(RSS_REQUEST_HEADERS)
+    if extra_headers:
+        headers.update(extra_headers)
+    http_get = session.get if session is not None else requests.get
     last_err: Optional[BaseException] = None
     total_attempts = max(1, int(retries) + 1)
     for attempt in range(total_attempts):
         try:
-            resp = requests.get(url, headers=headers, timeout=timeout)
+            resp = http_get(url, headers=headers, timeout=timeout)
             resp.raise_for_status()
-            return feedparser.parse(resp.content)
+            return resp
         except Exception as e:
             last_err = e
             if attempt >= total_attempts - 1:
@@ -161,6 +308,71 @@ def fetch_feed(
     raise RuntimeError("rss_fetch_failed")
 
 
+def fetch_feed(
+    url: str,
+    timeout: float,
+    *,
+    retries: int = 2,
+    session: Optional[requests.Session] = None,
+) -> feedparser.FeedParserDict:
+    resp = _get_feed_response(url, timeout, retries=retries, session=session)
+    return feedparser.parse(resp.content)
+
+
+def fetch_feed_conditional(
+    url: str,
+    timeout: float,
+    *,
+    retries: int = 2,
+    validators: Optional[FeedValidators] = None,
+    session: Optional[requests.Session] = None,
+) -> ConditionalFeedFetch:
+    """Fetch with If-None-Match/If-Modified-Since; only parse a changed body."""
+    previous = validators or FeedValidators()
+    extra_headers: Dict[str, str] = {}
+    if previous.etag:
+        extra_headers["If-None-Match"] = previous.etag
+    if previous.last_modified:
+        extra_headers["If-Modified-Since"] = previous.last_modified
+    resp = _get_feed_response(
+        url,
+        timeout,
+        retries=retries,
+        session=session,
+        extra_headers=extra_headers,
+    )
+    if int(resp.status_code) == 304:
+        return ConditionalFeedFetch(
+            feed=None,
+            validators=previous,
+            unchanged_reason=FEED_UNCHANGED_NOT_MODIFIED,
+        )
+    content = resp.content or b""
+    current = FeedValidators(
+        etag=str(resp.headers.get("ETag") or "").strip(),
+        last_modified=str(resp.headers.get("Last-Modified") or "").strip(),
+        body_hash=_feed_body_hash(content),
+    )
+    if previous.body_hash and previous.body_hash == current.body_hash:
+        return ConditionalFeedFetch(
+            feed=None,
+            validators=current,
+            unchanged_reason=FEED_UNCHANGED_SAME_BODY,
+        )
+    return ConditionalFeedFetch(
+        feed=feedparser.parse(content),
+        validators=current,
+    )
+
+
+def entry_seen_key(entry: feedparser.FeedParserDict) -> str:
+    for key in ("id", "guid", "link"):
+        value = str(entry.get(key) or "").strip()
+        if value:
+            return value
+    return ""
+
+
 def get_entry_content(entry: feedparser.FeedParserDict) -> str:
     if "content" in entry and entry.content:
         for item in entry.content:
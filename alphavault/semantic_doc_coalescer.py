@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import atexit
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from alphavault.ai.embedding import embed_texts_with_openai
+from alphavault.constants import (
+    DEFAULT_SEMANTIC_DOC_EMBED_MAX_LATENCY_SECONDS,
+    ENV_SEMANTIC_DOC_EMBED_MAX_LATENCY_SEC,
+)
+from alphavault.db.postgres_db import PostgresConnection, PostgresEngine
+from alphavault.db.semantic_docs import SemanticAssertionSourceRow
+from alphavault.db.source_queue import CloudPost
+from alphavault.logging_config import get_logger
+from alphavault.rss.utils import env_float
+from alphavault.semantic_docs import (
+    SemanticDocEmbeddingRuntime,
+    SemanticDocSyncPlan,
+    SemanticDocSyncResult,
+    apply_semantic_doc_sync_plan,
+    plan_semantic_doc_sync,
+    semantic_doc_embedding_runtime_from_env,
+)
+
+if TYPE_CHECKING:
+    from alphavault.db.zilliz_writer import ZillizSemanticDocWriter
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _PendingSync:
+    engine_or_conn: PostgresEngine | PostgresConnection
+    plan: SemanticDocSyncPlan
+    redis_client: Any
+    future: Future[SemanticDocSyncResult]
+    enqueued_at: float
+
+
+class SemanticDocEmbeddingCoalescer:
+    """
+    Coalesce semantic-doc embedding requests across posts.
+
+    `submit()` plans a post sync in the caller's thread and queues the docs
+    that need embeddings. A flush thread sends one request once
+    `batch_size` texts are queued or the oldest post has waited
+    `max_latency_seconds`, then writes each post from its batch. A doc whose
+    content_hash was embedded in this batch or recently is not sent again,
+    and a post is never in two batches at once so its writes stay in order.
+    A new submit for a post replaces its queued sync and waits for its
+    in-flight batch, so a delete cannot be overtaken by an older write.
+    With a `zilliz_writer`, Zilliz writes go to that buffer instead of one
+    delete + insert per post; the caller flushes it.
+    """
+
+    def __init__(
+        self,
+        runtime: SemanticDocEmbeddingRuntime,
+        *,
+        max_latency_seconds: float = DEFAULT_SEMANTIC_DOC_EMBED_MAX_LATENCY_SECONDS,
+        zilliz_writer: ZillizSemanticDocWriter | None = None,
+    ) -> None:
+        self.runtime = runtime
+        self.zilliz_writer = zilliz_writer
+        self.batch_size = max(1, int(runtime.config.batch_size))
+        self.max_latency_seconds = max(0.0, float(max_latency_seconds))
+        self._cond = threading.Condition()
+        self._pending: deque[_PendingSync] = deque()
+        self._pending_texts = 0
+        self._inflight_post_uids: set[str] = set()
+        self._inflight_batches = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(runtime.config.max_inflight)),
+            thread_name_prefix="semantic-doc-embed",
+        )
+        self._stats = {
+            "posts": 0,
+            "requests": 0,
+            "texts": 0,
+            "reused": 0,
+        }
+        # content_hash -> embedding of recently embedded docs, so a post that
+        # is re-synced before its first write lands is not embedded twice.
+        self._recent_embeddings: OrderedDict[str, list[float]] = OrderedDict()
+        self._recent_capacity = self.batch_size * 4
+
+    def submit(
+        self,
+        engine_or_conn: PostgresEngine | PostgresConnection,
+        *,
+        post_uid: str,
+        final_status: str = "",
+        prefetched_post: CloudPost | None = None,
+        prefetched_assertion_rows: list[SemanticAssertionSourceRow] | None = None,
+        prefetched_stored_rows: list[dict[str, object]] | None = None,
+        redis_client: Any = None,
+    ) -> Future[SemanticDocSyncResult]:
+        future: Future[SemanticDocSyncResult] = Future()
+        self._settle_post(post_uid)
+        try:
+            plan = plan_semantic_doc_sync(
+                engine_or_conn,
+                post_uid=post_uid,
+                final_status=final_status,
+                prefetched_post=prefetched_post,
+                prefetched_assertion_rows=prefetched_assertion_rows,
+                prefetched_stored_rows=prefetched_stored_rows,
+                apply=True,
+                embedding_runtime=self.runtime,
+                redis_client=redis_client,
+            )
+        except Exception as err:
+            future.set_exception(err)
+            return future
+        if isinstance(plan, SemanticDocSyncResult):
+            future.set_result(plan)
+            return future
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("semantic_doc_coalescer_closed")
+            self._pending.append(
+                _PendingSync(
+                    engine_or_conn=engine_or_conn,
+                    plan=plan,
+                    redis_client=redis_client,
+                    future=future,
+                    enqueued_at=time.monotonic(),
+                )
+            )
+            self._pending_texts += len(plan.docs_needing_embedding)
+            self._stats["posts"] += 1
+            self._ensure_thread_locked()
+            self._cond.notify_all()
+        return future
+
+    def _settle_post(self, post_uid: str) -> None:
+        """Drop queued syncs for the post and wait out its in-flight batch."""
+        resolved_post_uid = str(post_uid or "").strip()
+        superseded: list[_PendingSync] = []
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("semantic_doc_coalescer_closed")
+            kept: deque[_PendingSync] = deque()
+            for item in self._pending:
+                if item.plan.post_uid == resolved_post_uid:
+                    superseded.append(item)
+                    self._pending_texts -= len(item.plan.docs_needing_embedding)
+                else:
+                    kept.append(item)
+            self._pending = kept
+            while resolved_post_uid in self._inflight_post_uids:
+                self._cond.wait()
+        for item in superseded:
+            item.future.set_result(
+                SemanticDocSyncResult(
+                    post_uid=resolved_post_uid,
+                    doc_count=0,
+                    embedded_count=0,
+                    reused_count=0,
+                    deleted_count=0,
+                    applied=False,
+                )
+            )
+
+    def _ensure_thread_locked(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="semantic-doc-coalescer", daemon=True
+        )
+        self._thread.start()
+
+    def _take_batch_locked(self) -> list[_PendingSync]:
+        batch: list[_PendingSync] = []
+        skipped: list[_PendingSync] = []
+        batch_post_uids: set[str] = set()
+        texts = 0
+        while self._pending and texts < self.batch_size:
+            item = self._pending.popleft()
+            post_uid = item.plan.post_uid
+            if post_uid in self._inflight_post_uids or post_uid in batch_post_uids:
+                skipped.append(item)
+                continue
+            batch.append(item)
+            batch_post_uids.add(post_uid)
+            texts += len(item.plan.docs_needing_embedding)
+        self._pending.extendleft(reversed(skipped))
+        self._pending_texts -= texts
+        self._inflight_post_uids |= batch_post_uids
+        return batch
+
+    def _flush_wait_seconds_locked(self) -> float | None:
+        """0 to flush now, None to wait for a submit, else seconds to wait."""
+        if not self._pending:
+            return None
+        if self._closed or self._pending_texts >= self.batch_size:
+            return 0.0
+        oldest = self._pending[0].enqueued_at
+        return max(0.0, oldest + self.max_latency_seconds - time.monotonic())
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    wait_seconds = self._flush_wait_seconds_locked()
+                    if wait_seconds == 0.0:
+                        batch = self._take_batch_locked()
+                        if batch:
+                            break
+                        # Everything queued belongs to posts still in flight.
+                        wait_seconds = None
+                    if (
+                        self._closed
+                        and not self._pending
+                        and self._inflight_batches == 0
+                    ):
+                        return
+                    self._cond.wait(timeout=wait_seconds)
+                self._inflight_batches += 1
+            try:
+                self._executor.submit(self._flush, batch)
+            except RuntimeError:
+                # Interpreter shutdown stops new pool work; flush here instead.
+                self._flush(batch)
+
+    def _finish_batch(self, batch: list[_PendingSync]) -> None:
+        with self._cond:
+            for item in batch:
+                self._inflight_post_uids.discard(item.plan.post_uid)
+            self._inflight_batches -= 1
+            self._cond.notify_all()
+
+    def _embed_unique_texts(self, batch: list[_PendingSync]) -> dict[str, list[float]]:
+        embedding_by_hash: dict[str, list[float]] = {}
+        text_by_hash: dict[str, str] = {}
+        requested = 0
+        with self._cond:
+            for item in batch:
+                for doc in item.plan.docs_needing_embedding:
+                    requested += 1
+                    recent = self._recent_embeddings.get(doc.content_hash)
+                    if recent is not None:
+                        embedding_by_hash[doc.content_hash] = recent
+                        continue
+                    text_by_hash.setdefault(doc.content_hash, doc.doc_text)
+        hashes = list(text_by_hash)
+        config = self.runtime.config
+        embeddings: list[list[float]] = []
+        requests = 0
+        for start_idx in range(0, len(hashes), self.batch_size):
+            chunk = hashes[start_idx : start_idx + self.batch_size]
+            embeddings.extend(
+                embed_texts_with_openai(
+                    texts=[text_by_hash[doc_hash] for doc_hash in chunk],
+                    model_name=config.model,
+                    dimensions=config.dimensions,
+                    base_url=config.base_url,
+                    api_key=config.api_key,
+                    timeout_seconds=config.timeout_seconds,
+                    retry_count=config.retries,
+                    request_gate=self.runtime.limiter.wait,
+                )
+            )
+            requests += 1
+        if len(embeddings) != len(hashes):
+            raise RuntimeError("embedding_count_mismatch")
+        for vector in embeddings:
+            if len(vector) != int(config.dimensions):
+                raise RuntimeError(
+                    f"semantic_doc_embedding_dimension_mismatch:{len(vector)}"
+                )
+        embedding_by_hash.update(zip(hashes, embeddings, strict=True))
+        with self._cond:
+            for doc_hash, vector in zip(hashes, embeddings, strict=True):
+                self._recent_embeddings[doc_hash] = vector
+                self._recent_embeddings.move_to_end(doc_hash)
+            while len(self._recent_embeddings) > self._recent_capacity:
+                self._recent_embeddings.popitem(last=False)
+            self._stats["requests"] += requests
+            self._stats["texts"] += len(hashes)
+            self._stats["reused"] += requested - len(hashes)
+        return embedding_by_hash
+
+    def _flush(self, batch: list[_PendingSync]) -> None:
+        try:
+            try:
+                embedding_by_hash = self._embed_unique_texts(batch)
+            except Exception as err:
+                logger.warning(
+                    "[semantic_docs] embed_batch_failed posts=%s %s: %s",
+                    len(batch),
+                    type(err).__name__,
+                    err,
+                )
+                for item in batch:
+                    item.future.set_exception(err)
+                return
+            for item in batch:
+                try:
+                    result = apply_semantic_doc_sync_plan(
+                        item.engine_or_conn,
+                        plan=item.plan,
+                        embeddings=[
+                            embedding_by_hash[doc.content_hash]
+                            for doc in item.plan.docs_needing_embedding
+                        ],
+                        redis_client=item.redis_client,
+                        zilliz_writer=self.zilliz_writer,
+                    )
+                except Exception as err:
+                    item.future.set_exception(err)
+                    continue
+                item.future.set_result(result)
+        finally:
+            self._finish_batch(batch)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            out = dict(self._stats)
+            out["pending_posts"] = len(self._pending)
+            out["pending_texts"] = self._pending_texts
+        return out
+
+    def close(self, *, timeout: float | None = None) -> None:
+        """Flush everything queued, then stop the flush thread and its pool."""
+        with self._cond:
+            self._closed = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout=timeout)
+        self._executor.shutdown(wait=True)
+
+
+@lru_cache(maxsize=1)
+def shared_semantic_doc_coalescer() -> SemanticDocEmbeddingCoalescer:
+    max_latency_seconds = env_float(ENV_SEMANTIC_DOC_EMBED_MAX_LATENCY_SEC)
+    coalescer = SemanticDocEmbeddingCoalescer(
+        semantic_doc_embedding_runtime_from_env(),
+        max_latency_seconds=(
+            DEFAULT_SEMANTIC_DOC_EMBED_MAX_LATENCY_SECONDS
+            if max_latency_seconds is None
+            else max_latency_seconds
+        ),
+    )
+    atexit.register(coalescer.close)
+    return coalescer
+
+
+__all__ = [
+    "SemanticDocEmbeddingCoalescer",
+    "shared_semantic_doc_coalescer",
+]
@@ -10,6 +10,8 @@ from typing import TYPE_CHECKING, Any, NamedTuple
 if TYPE_CHECKING:
     from redis import Redis
 
+    from alphavault.db.zilliz_writer import ZillizSemanticDocWriter
+
 from alphavault.ai.embedding import embed_texts_with_openai
 from alphavault.constants import (
     DEFAULT_EMBEDDING_TIMEOUT_SECONDS,
@@ -28,6 +30,10 @@ from alphavault.db.semantic_docs import (
 from alphavault.db.source_queue import CloudPost, load_cloud_post
 from alphavault.domains.signal.aggregator import coerce_signal_timestamp
 from alphavault.domains.thread_tree.parse import parse_thread_segments
+from alphavault.infra.ai.distributed_limiter import (
+    EMBEDDING_LIMIT_KEY_PREFIX,
+    build_ai_rate_limiter,
+)
 from alphavault.infra.ai.embedding_runtime_config import (
     EMBEDDING_TASK_SEMANTIC_DOC_SYNC,
     EmbeddingRuntimeConfig,
@@ -329,7 +335,14 @@ def semantic_doc_embedding_runtime_from_env() -> SemanticDocEmbeddingRuntime:
     )
     return SemanticDocEmbeddingRuntime(
         config=config,
-        limiter=RateLimiter(config.rpm),
+        limiter=build_ai_rate_limiter(
+            rpm=config.rpm,
+            burst=1.0,
+            limit_group_name=config.limit_group_name,
+            max_inflight=config.max_inflight,
+            timeout_seconds=config.timeout_seconds,
+            key_prefix=EMBEDDING_LIMIT_KEY_PREFIX,
+        ),
     )
 
 
@@ -370,7 +383,18 @@ def _build_insert_payload(
     }
 
 
-def sync_semantic_docs_for_post(
+@dataclass(frozen=True)
+class SemanticDocSyncPlan:
+    """Docs of one post whose embeddings still have to be fetched."""
+
+    post_uid: str
+    docs: list[SemanticDoc]
+    docs_needing_embedding: list[SemanticDoc]
+    reused_embeddings_by_doc_id: dict[str, list[float]]
+    embedding_model_signature: str
+
+
+def plan_semantic_doc_sync(
     engine_or_conn: PostgresEngine | PostgresConnection,
     *,
     post_uid: str,
@@ -381,23 +405,13 @@ def sync_semantic_docs_for_post(
     apply: bool = True,
     embedding_runtime: SemanticDocEmbeddingRuntime | None = None,
     redis_client: Redis | Any = None,
-) -> SemanticDocSyncResult:
+) -> SemanticDocSyncResult | SemanticDocSyncPlan:
     """
-    同步指定 post 的语义文档（semantic_docs）
-
-    Args:
-        engine_or_conn: Postgres 连接或引擎
-        post_uid: 帖子唯一标识
-        final_status: 最终状态（非 "relevant" 会删除所有 semantic_docs）
-        prefetched_post: 预取的 post 对象（可选）
-        prefetched_assertion_rows: 预取的断言行（可选）
-        prefetched_stored_rows: 预取的已存储记录（可选）
-        apply: 是否实际写入数据库（False 仅计算结果）
-        embedding_runtime: 自定义 embedding 运行时配置（可选）
-        redis_client: Redis 客户端，用于 Zilliz 失败重试（可选）
+    Everything in a post sync except the embedding request.
 
-    Returns:
-        同步结果（包含文档数量、嵌入数量、复用数量等统计信息）
+    Deletes, dry runs and posts whose stored docs are unchanged finish here
+    and return a SemanticDocSyncResult; otherwise the plan names the docs
+    that need embeddings (the rest reuse stored ones by content_hash).
     """
     resolved_post_uid = _clean_text(post_uid)
     resolved_final_status = _clean_text(final_status)
@@ -476,8 +490,7 @@ def sync_semantic_docs_for_post(
     )
     stored_by_doc_id = _stored_embedding_map(stored_rows)
     docs_needing_embedding: list[SemanticDoc] = []
-    embeddings_by_doc_id: dict[str, list[float]] = {}
-    reused_count = 0
+    reused_embeddings_by_doc_id: dict[str, list[float]] = {}
     embedding_model_signature = _embedding_model_signature(
         model_name=runtime.config.model,
         dimensions=runtime.config.dimensions,
@@ -494,14 +507,9 @@ def sync_semantic_docs_for_post(
             and stored_embedding
             and len(stored_embedding) == int(runtime.config.dimensions)
         ):
-            embeddings_by_doc_id[doc.doc_id] = stored_embedding
-            reused_count += 1
+            reused_embeddings_by_doc_id[doc.doc_id] = stored_embedding
             continue
         docs_needing_embedding.append(doc)
-    if docs_needing_embedding:
-        embeddings = _embed_docs(docs=docs_needing_embedding, runtime=runtime)
-        for doc, embedding in zip(docs_needing_embedding, embeddings, strict=True):
-            embeddings_by_doc_id[doc.doc_id] = embedding
     if not docs_needing_embedding and _stored_docs_match_current_docs(
         docs=docs,
         stored_by_doc_id=stored_by_doc_id,
@@ -512,43 +520,126 @@ def sync_semantic_docs_for_post(
             post_uid=resolved_post_uid,
             doc_count=len(docs),
             embedded_count=0,
-            reused_count=reused_count,
+            reused_count=len(reused_embeddings_by_doc_id),
             deleted_count=0,
             applied=True,
         )
+    return SemanticDocSyncPlan(
+        post_uid=resolved_post_uid,
+        docs=docs,
+        docs_needing_embedding=docs_needing_embedding,
+        reused_embeddings_by_doc_id=reused_embeddings_by_doc_id,
+        embedding_model_signature=embedding_model_signature,
+    )
+
+
+def apply_semantic_doc_sync_plan(
+    engine_or_conn: PostgresEngine | PostgresConnection,
+    *,
+    plan: SemanticDocSyncPlan,
+    embeddings: list[list[float]],
+    redis_client: Redis | Any = None,
+    zilliz_writer: ZillizSemanticDocWriter | None = None,
+) -> SemanticDocSyncResult:
+    """Write a plan's docs once `embeddings` (one per docs_needing_embedding) exist."""
+    embeddings_by_doc_id = dict(plan.reused_embeddings_by_doc_id)
+    for doc, embedding in zip(plan.docs_needing_embedding, embeddings, strict=True):
+        embeddings_by_doc_id[doc.doc_id] = embedding
     updated_at = now_cst_str()
     inserted_rows = [
         _build_insert_payload(
             doc=doc,
-            embedding_model=embedding_model_signature,
+            embedding_model=plan.embedding_model_signature,
             embedding=embeddings_by_doc_id[doc.doc_id],
             updated_at=updated_at,
         )
-        for doc in docs
+        for doc in plan.docs
     ]
     replace_semantic_docs(
         engine_or_conn,
-        post_uid=resolved_post_uid,
+        post_uid=plan.post_uid,
         rows=inserted_rows,
         redis_client=redis_client,  # 传递 redis_client
+        zilliz_writer=zilliz_writer,
+        embeddings_by_doc_id=embeddings_by_doc_id,
     )
     return SemanticDocSyncResult(
-        post_uid=resolved_post_uid,
-        doc_count=len(docs),
-        embedded_count=len(docs_needing_embedding),
-        reused_count=reused_count,
+        post_uid=plan.post_uid,
+        doc_count=len(plan.docs),
+        embedded_count=len(plan.docs_needing_embedding),
+        reused_count=len(plan.reused_embeddings_by_doc_id),
         deleted_count=0,
         applied=True,
     )
 
 
+def sync_semantic_docs_for_post(
+    engine_or_conn: PostgresEngine | PostgresConnection,
+    *,
+    post_uid: str,
+    final_status: str = "",
+    prefetched_post: CloudPost | None = None,
+    prefetched_assertion_rows: list[SemanticAssertionSourceRow] | None = None,
+    prefetched_stored_rows: list[dict[str, object]] | None = None,
+    apply: bool = True,
+    embedding_runtime: SemanticDocEmbeddingRuntime | None = None,
+    redis_client: Redis | Any = None,
+) -> SemanticDocSyncResult:
+    """
+    同步指定 post 的语义文档（semantic_docs）
+
+    Args:
+        engine_or_conn: Postgres 连接或引擎
+        post_uid: 帖子唯一标识
+        final_status: 最终状态（非 "relevant" 会删除所有 semantic_docs）
+        prefetched_post: 预取的 post 对象（可选）
+        prefetched_assertion_rows: 预取的断言行（可选）
+        prefetched_stored_rows: 预取的已存储记录（可选）
+        apply: 是否实际写入数据库（False 仅计算结果）
+        embedding_runtime: 自定义 embedding 运行时配置（可选）
+        redis_client: Redis 客户端，用于 Zilliz 失败重试（可选）
+
+    Returns:
+        同步结果（包含文档数量、嵌入数量、复用数量等统计信息）
+    """
+    runtime = (
+        embedding_runtime or semantic_doc_embedding_runtime_from_env()
+        if apply
+        else embedding_runtime
+    )
+    plan = plan_semantic_doc_sync(
+        engine_or_conn,
+        post_uid=post_uid,
+        final_status=final_status,
+        prefetched_post=prefetched_post,
+        prefetched_assertion_rows=prefetched_assertion_rows,
+        prefetched_stored_rows=prefetched_stored_rows,
+        apply=apply,
+        embedding_runtime=runtime,
+        redis_client=redis_client,
+    )
+    if isinstance(plan, SemanticDocSyncResult):
+        return plan
+    assert runtime is not None
+    embeddings = _embed_docs(docs=plan.docs_needing_embedding, runtime=runtime)
+    return apply_semantic_doc_sync_plan(
+        engine_or_conn,
+        plan=plan,
+        embeddings=embeddings,
+        redis_client=redis_client,
+    )
+
+
 __all__ = [
     "DOC_KIND_ASSERTION",
     "DOC_KIND_RAW_TAIL",
     "SemanticDoc",
     "SemanticDocEmbeddingRuntime",
+    "SemanticDocSyncPlan",
     "SemanticDocSyncResult",
+    "apply_semantic_doc_sync_plan",
     "build_semantic_docs",
+    "plan_semantic_doc_sync",
     "semantic_doc_embedding_is_configured",
     "semantic_doc_embedding_runtime_from_env",
     "sync_semantic_docs_for_post",
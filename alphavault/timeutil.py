@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+import re
 
 CST = timezone(timedelta(hours=8))
+_POST_CREATED_AT_RE = re.compile(
+    r"^(?P<local>\d{4}-\d{2}-\d{2} \d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)"
+    r"(?:(?P<utc>Z)|(?P<sign>[+-])(?P<hours>\d{2}):?(?P<minutes>\d{2})?)?$"
+)
 
 
 def format_cst_datetime(value: datetime) -> str:
@@ -16,3 +21,26 @@ def format_cst_datetime(value: datetime) -> str:
 
 def now_cst_str() -> str:
     return format_cst_datetime(datetime.now(CST))
+
+
+def parse_post_created_at(value: object) -> datetime | None:
+    """Aware datetime for a stored `posts.created_at`; naive text is read as CST."""
+    text = str(value or "").strip().replace("T", " ")
+    matched = _POST_CREATED_AT_RE.match(text)
+    if matched is None:
+        return None
+    try:
+        dt = datetime.fromisoformat(matched.group("local"))
+    except ValueError:
+        return None
+    if matched.group("utc"):
+        return dt.replace(tzinfo=timezone.utc)
+    if not matched.group("sign"):
+        return dt.replace(tzinfo=CST)
+    offset = timedelta(
+        hours=int(matched.group("hours")),
+        minutes=int(matched.group("minutes") or 0),
+    )
+    if matched.group("sign") == "-":
+        offset = -offset
+    return dt.replace(tzinfo=timezone(offset))
@@ -124,17 +124,23 @@ def _sorted_children(node: _TreeNode) -> list[_TreeNode]:
     return kids
 
 
-def _serialize_tree(node: _TreeNode) -> dict[str, Any]:
+def _serialize_tree(node: _TreeNode, *, max_text_chars: int) -> dict[str, Any]:
+    text, _truncated = _truncate_text(
+        str(node.payload.get("text") or ""), max_chars=max_text_chars
+    )
     out: dict[str, Any] = {
         "source_kind": str(node.payload.get("source_kind") or "").strip(),
         "source_id": str(node.payload.get("source_id") or "").strip(),
         "speaker": str(node.payload.get("speaker") or "").strip(),
-        "text": str(node.payload.get("text") or "").strip(),
+        "text": text.strip(),
     }
     quoted_text = str(node.payload.get("quoted_text") or "").strip()
     if quoted_text:
         out["quoted_text"] = quoted_text
-    children = [_serialize_tree(child) for child in _sorted_children(node)]
+    children = [
+        _serialize_tree(child, max_text_chars=max_text_chars)
+        for child in _sorted_children(node)
+    ]
     if children:
         out["children"] = children
     return out
@@ -155,7 +161,42 @@ def _insert_path(tree_root: _TreeNode, path_payloads: list[dict[str, Any]]) -> N
         current = existing
 
 
-def build_topic_runtime_context(
+@dataclass
+class TopicTreeDraft:
+    """
+    The thread tree before node-text truncation.
+
+    Tree shape does not depend on the truncation cap, so one draft can be
+    rendered at any cap without re-parsing the posts.
+    """
+
+    root_key: str
+    root_source_id: str
+    focus_username: str
+    root_node: _TreeNode
+    manual_feedback_hint: dict[str, object] | None
+    # One entry per text the cap applies to, duplicates included, so the
+    # truncated-nodes count matches what the posts would have produced.
+    text_lengths: list[int]
+
+    def truncated_nodes(self, max_node_text_chars: int) -> int:
+        cap = int(max_node_text_chars)
+        if cap <= 0:
+            return 0
+        return sum(1 for length in self.text_lengths if length > cap)
+
+    def node_texts(self) -> list[str]:
+        """Untruncated text of every node in the rendered tree."""
+        out: list[str] = []
+        stack = [self.root_node]
+        while stack:
+            node = stack.pop()
+            out.append(str(node.payload.get("text") or ""))
+            stack.extend(node.children.values())
+        return out
+
+
+def build_topic_tree_draft(
     *,
     root_key: str,
     root_segment: str,
@@ -164,10 +205,9 @@ def build_topic_runtime_context(
     posts: list[dict[str, object]],
     manual_feedback_hint: dict[str, object] | None = None,
     include_virtual_comments: bool = True,
-    max_node_text_chars: int = MAX_NODE_TEXT_CHARS,
-) -> tuple[AiTopicRuntimeContext, int]:
+) -> TopicTreeDraft:
     """
-    Build (runtime_context, truncated_nodes_count).
+    Parse posts into a TopicTreeDraft.
 
     posts: list of dicts (each needs platform_post_id/author/created_at/raw_text).
     include_virtual_comments: whether to reconstruct other speakers as virtual 'comment' nodes.
@@ -220,7 +260,7 @@ def build_topic_runtime_context(
                 or root_text
             )
 
-    root_text, root_truncated = _truncate_text(root_text, max_chars=max_node_text_chars)
+    text_lengths = [len(root_text)]
     root_node = _TreeNode(
         payload={
             "source_kind": "topic_post",
@@ -232,8 +272,6 @@ def build_topic_runtime_context(
         children={},
     )
 
-    truncated_nodes = 1 if root_truncated else 0
-
     for row in posts:
         platform_post_id = str(row.get("platform_post_id") or "").strip()
         if not platform_post_id:
@@ -254,11 +292,7 @@ def build_topic_runtime_context(
 
         last_seg = segments[-1]
         leaf_text = strip_leading_speaker(last_seg, author_hint=author) or ""
-        leaf_text, leaf_truncated = _truncate_text(
-            leaf_text, max_chars=max_node_text_chars
-        )
-        if leaf_truncated:
-            truncated_nodes += 1
+        text_lengths.append(len(leaf_text))
 
         leaf_payload = {
             "source_kind": "status",
@@ -284,11 +318,7 @@ def build_topic_runtime_context(
                 continue
 
             node_text = strip_leading_speaker(seg, author_hint=speaker) or ""
-            node_text, node_truncated = _truncate_text(
-                node_text, max_chars=max_node_text_chars
-            )
-            if node_truncated:
-                truncated_nodes += 1
+            text_lengths.append(len(node_text))
 
             source_kind = "comment"
             if focus and speaker == focus:
@@ -307,23 +337,67 @@ def build_topic_runtime_context(
         path_payloads.append(leaf_payload)
         _insert_path(root_node, path_payloads)
 
-    message_tree = _serialize_tree(root_node)
-    cleaned_feedback_hint = _clean_manual_feedback_hint(manual_feedback_hint)
-    ai_topic_package = AiTopicPackage(
-        topic_status_id=root_source_id,
+    return TopicTreeDraft(
+        root_key=str(root_key or "").strip(),
+        root_source_id=root_source_id,
         focus_username=focus,
+        root_node=root_node,
+        manual_feedback_hint=_clean_manual_feedback_hint(manual_feedback_hint),
+        text_lengths=text_lengths,
+    )
+
+
+def render_topic_tree_draft(
+    draft: TopicTreeDraft, *, max_node_text_chars: int = MAX_NODE_TEXT_CHARS
+) -> tuple[AiTopicRuntimeContext, int]:
+    """Build (runtime_context, truncated_nodes_count) with node texts capped."""
+    message_tree = _serialize_tree(
+        draft.root_node, max_text_chars=int(max_node_text_chars)
+    )
+    ai_topic_package = AiTopicPackage(
+        topic_status_id=draft.root_source_id,
+        focus_username=draft.focus_username,
         message_tree=message_tree,
-        manual_feedback_hint=cleaned_feedback_hint,
+        manual_feedback_hint=draft.manual_feedback_hint,
     )
     runtime_context = AiTopicRuntimeContext(
-        root_key=str(root_key or "").strip(),
-        root_source_id=root_source_id,
-        focus_username=focus,
+        root_key=draft.root_key,
+        root_source_id=draft.root_source_id,
+        focus_username=draft.focus_username,
         message_tree=message_tree,
         message_lookup=build_message_lookup_from_tree(message_tree),
         ai_topic_package=ai_topic_package,
     )
-    return runtime_context, truncated_nodes
+    return runtime_context, draft.truncated_nodes(max_node_text_chars)
+
+
+def build_topic_runtime_context(
+    *,
+    root_key: str,
+    root_segment: str,
+    root_content_key: str,
+    focus_username: str,
+    posts: list[dict[str, object]],
+    manual_feedback_hint: dict[str, object] | None = None,
+    include_virtual_comments: bool = True,
+    max_node_text_chars: int = MAX_NODE_TEXT_CHARS,
+) -> tuple[AiTopicRuntimeContext, int]:
+    """
+    Build (runtime_context, truncated_nodes_count).
+
+    posts: list of dicts (each needs platform_post_id/author/created_at/raw_text).
+    include_virtual_comments: whether to reconstruct other speakers as virtual 'comment' nodes.
+    """
+    draft = build_topic_tree_draft(
+        root_key=root_key,
+        root_segment=root_segment,
+        root_content_key=root_content_key,
+        focus_username=focus_username,
+        posts=posts,
+        manual_feedback_hint=manual_feedback_hint,
+        include_virtual_comments=include_virtual_comments,
+    )
+    return render_topic_tree_draft(draft, max_node_text_chars=max_node_text_chars)
 
 
 def build_message_lookup_from_tree(
@@ -361,6 +435,9 @@ __all__ = [
     "MAX_THREAD_POSTS",
     "MAX_NODE_TEXT_CHARS",
     "MAX_TOPIC_PROMPT_CHARS",
+    "TopicTreeDraft",
     "build_topic_runtime_context",
+    "build_topic_tree_draft",
+    "render_topic_tree_draft",
     "thread_root_info_for_post",
 ]
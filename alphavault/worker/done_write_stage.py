@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import atexit
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, fields
+from functools import lru_cache
+import threading
+import time
+
+from alphavault.constants import (
+    DEFAULT_AI_DONE_WRITE_BATCH_SIZE,
+    DEFAULT_AI_DONE_WRITE_MAX_LATENCY_SECONDS,
+    ENV_AI_DONE_WRITE_BATCH_SIZE,
+    ENV_AI_DONE_WRITE_MAX_LATENCY_SEC,
+)
+from alphavault.db.postgres_db import PostgresConnection, PostgresEngine
+from alphavault.db.source_queue import (
+    AssertionsDoneWriteRow,
+    write_assertions_and_mark_done,
+    write_assertions_and_mark_done_batch,
+)
+from alphavault.logging_config import get_logger
+from alphavault.rss.utils import env_float, env_int
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+    engine: PostgresEngine | PostgresConnection
+    row: AssertionsDoneWriteRow
+    future: Future[None]
+    enqueued_at: float
+
+
+def _write_one(
+    engine: PostgresEngine | PostgresConnection, row: AssertionsDoneWriteRow
+) -> None:
+    write_assertions_and_mark_done(
+        engine, **{field.name: getattr(row, field.name) for field in fields(row)}
+    )
+
+
+class DoneWriteCommitStage:
+    """
+    Group-commit done writes from concurrent worker threads.
+
+    `write()` queues the row and blocks until it is committed. A flush thread
+    takes up to `batch_size` rows for the same engine once that many are
+    queued or the oldest has waited `max_latency_seconds`, and writes them
+    with `write_assertions_and_mark_done_batch` in one transaction. A lone
+    row uses the per-post writer. If a batch fails, its rows are retried one
+    by one so each caller sees its own error.
+    """
+
+    def __init__(self, *, batch_size: int, max_latency_seconds: float) -> None:
+        self.batch_size = max(1, int(batch_size))
+        self.max_latency_seconds = max(0.0, float(max_latency_seconds))
+        self._cond = threading.Condition()
+        self._pending: deque[_PendingWrite] = deque()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._stats = {"posts": 0, "batches": 0, "batch_fallbacks": 0}
+
+    def write(
+        self,
+        engine: PostgresEngine | PostgresConnection,
+        row: AssertionsDoneWriteRow,
+    ) -> None:
+        future: Future[None] = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("done_write_stage_closed")
+            self._pending.append(
+                _PendingWrite(
+                    engine=engine,
+                    row=row,
+                    future=future,
+                    enqueued_at=time.monotonic(),
+                )
+            )
+            self._stats["posts"] += 1
+            self._ensure_thread_locked()
+            self._cond.notify_all()
+        future.result()
+
+    def _ensure_thread_locked(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="done-write-stage", daemon=True
+        )
+        self._thread.start()
+
+    def _take_batch_locked(self) -> list[_PendingWrite]:
+        """Rows for the oldest row's engine; a repeated post waits for the next batch."""
+        engine = self._pending[0].engine
+        batch: list[_PendingWrite] = []
+        skipped: list[_PendingWrite] = []
+        batch_post_uids: set[str] = set()
+        while self._pending and len(batch) < self.batch_size:
+            item = self._pending.popleft()
+            if item.engine is not engine or item.row.post_uid in batch_post_uids:
+                skipped.append(item)
+                continue
+            batch.append(item)
+            batch_post_uids.add(item.row.post_uid)
+        self._pending.extendleft(reversed(skipped))
+        return batch
+
+    def _flush_wait_seconds_locked(self) -> float | None:
+        """0 to flush now, None to wait for a write, else seconds to wait."""
+        if not self._pending:
+            return None
+        if self._closed or len(self._pending) >= self.batch_size:
+            return 0.0
+        oldest = self._pending[0].enqueued_at
+        return max(0.0, oldest + self.max_latency_seconds - time.monotonic())
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    wait_seconds = self._flush_wait_seconds_locked()
+                    if wait_seconds == 0.0:
+                        batch = self._take_batch_locked()
+                        break
+                    if self._closed and not self._pending:
+                        return
+                    self._cond.wait(timeout=wait_seconds)
+            self._flush(batch)
+
+    def _flush(self, batch: list[_PendingWrite]) -> None:
+        if len(batch) > 1:
+            try:
+                write_assertions_and_mark_done_batch(
+                    batch[0].engine, rows=[item.row for item in batch]
+                )
+            except Exception as err:
+                logger.warning(
+                    "[ai] done_write_batch_failed posts=%s %s: %s",
+                    len(batch),
+                    type(err).__name__,
+                    err,
+                )
+                with self._cond:
+                    self._stats["batch_fallbacks"] += 1
+            else:
+                with self._cond:
+                    self._stats["batches"] += 1
+                for item in batch:
+                    item.future.set_result(None)
+                return
+        for item in batch:
+            try:
+                _write_one(item.engine, item.row)
+            except BaseException as err:
+                item.future.set_exception(err)
+                continue
+            item.future.set_result(None)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            out = dict(self._stats)
+            out["pending_posts"] = len(self._pending)
+        return out
+
+    def close(self, *, timeout: float | None = None) -> None:
+        """Flush everything queued, then stop the flush thread."""
+        with self._cond:
+            self._closed = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout=timeout)
+
+
+@lru_cache(maxsize=1)
+def shared_done_write_stage() -> DoneWriteCommitStage | None:
+    """The process-wide stage, or None when `AI_DONE_WRITE_BATCH_SIZE` <= 1."""
+    batch_size = env_int(ENV_AI_DONE_WRITE_BATCH_SIZE)
+    if batch_size is None:
+        batch_size = DEFAULT_AI_DONE_WRITE_BATCH_SIZE
+    if batch_size <= 1:
+        return None
+    max_latency_seconds = env_float(ENV_AI_DONE_WRITE_MAX_LATENCY_SEC)
+    stage = DoneWriteCommitStage(
+        batch_size=batch_size,
+        max_latency_seconds=(
+            DEFAULT_AI_DONE_WRITE_MAX_LATENCY_SECONDS
+            if max_latency_seconds is None
+            else max_latency_seconds
+        ),
+    )
+    atexit.register(stage.close)
+    return stage
+
+
+__all__ = [
+    "DoneWriteCommitStage",
+    "shared_done_write_stage",
+]
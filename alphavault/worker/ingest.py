@@ -5,13 +5,31 @@ import time
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional, Tuple
 
+import requests
+
 from alphavault.ai.analyze import clean_text
-from alphavault.constants import PLATFORM_WEIBO, PLATFORM_XUEQIU
+from alphavault.constants import (
+    DEFAULT_RSS_FETCH_CONCURRENCY,
+    DEFAULT_RSS_HOST_CONCURRENCY,
+    DEFAULT_RSS_HOST_MIN_INTERVAL_SECONDS,
+    ENV_RSS_FETCH_CONCURRENCY,
+    ENV_RSS_HOST_CONCURRENCY,
+    ENV_RSS_HOST_MIN_INTERVAL_SECONDS,
+    PLATFORM_WEIBO,
+    PLATFORM_XUEQIU,
+)
 from alphavault.db.postgres_db import PostgresEngine
+from alphavault.rss.fetch_pool import RssFetchPool, RssFetchResult, fetch_rss_timed
 from alphavault.rss.utils import (
+    ConditionalFeedFetch,
+    FeedValidators,
     build_ids,
     choose_author,
+    entry_seen_key,
+    env_float,
+    env_int,
     fetch_feed,
+    fetch_feed_conditional,
     get_entry_content,
     infer_user_id_from_rss_url,
     parse_datetime,
@@ -24,13 +42,18 @@ from alphavault.weibo.thread_text import (
     format_weibo_thread_text,
     IMAGE_LINE_TEMPLATE,
 )
+from alphavault.worker.rss_feed_state import (
+    RssFeedState,
+    RssFeedStateStore,
+    try_load_rss_feed_states,
+)
 from alphavault.worker.redis_stream_queue import (
     REDIS_PUSH_STATUS_DUPLICATE,
     REDIS_PUSH_STATUS_ERROR,
     REDIS_PUSH_STATUS_PUSHED,
     resolve_redis_ai_queue_maxlen,
     resolve_redis_dedup_ttl_seconds,
-    redis_try_push_ai_message_status,
+    redis_try_push_ai_messages_status,
 )
 from alphavault.logging_config import get_logger
 
@@ -101,20 +124,20 @@ def _build_post_raw_text(
     return _append_image_labels(text=resolved_text, image_urls=image_urls)
 
 
-def _try_push_to_redis_status(
+def _try_push_many_to_redis_status(
     redis_client,
     redis_queue_key: str,
     *,
-    post_uid: str,
-    payload: Dict[str, Any],
-) -> str:
-    if not redis_client or not redis_queue_key or not post_uid:
-        return REDIS_PUSH_STATUS_ERROR
-    return redis_try_push_ai_message_status(
+    items: list[tuple[str, Dict[str, Any]]],
+) -> list[str]:
+    if not items:
+        return []
+    if not redis_client or not str(redis_queue_key or "").strip():
+        return [REDIS_PUSH_STATUS_ERROR] * len(items)
+    return redis_try_push_ai_messages_status(
         redis_client,
         redis_queue_key,
-        post_uid=post_uid,
-        payload=payload,
+        items=items,
         ttl_seconds=resolve_redis_dedup_ttl_seconds(),
         queue_maxlen=resolve_redis_ai_queue_maxlen(),
     )
@@ -192,17 +215,24 @@ def _build_rss_feed_done_log_line(
     entry_total: int,
     accepted_in_feed: int,
     source_error: bool,
+    fetch_seconds: float = 0.0,
+    skipped_seen: int = 0,
+    unchanged_reason: str = "",
 ) -> str:
-    return " ".join(
-        [
-            f"{RSS_LOG_PREFIX} {RSS_LOG_EVENT_FEED_DONE}",
-            f"platform={_clean_log_value(platform)}",
-            f"feed_progress={_format_progress(current=feed_index, total=feed_total)}",
-            f"entries={max(0, int(entry_total))}",
-            f"accepted={max(0, int(accepted_in_feed))}",
-            f"source_error={1 if source_error else 0}",
-        ]
-    )
+    parts = [
+        f"{RSS_LOG_PREFIX} {RSS_LOG_EVENT_FEED_DONE}",
+        f"platform={_clean_log_value(platform)}",
+        f"feed_progress={_format_progress(current=feed_index, total=feed_total)}",
+        f"entries={max(0, int(entry_total))}",
+        f"accepted={max(0, int(accepted_in_feed))}",
+        f"source_error={1 if source_error else 0}",
+        f"fetch={max(0.0, float(fetch_seconds)):.2f}s",
+    ]
+    if skipped_seen > 0:
+        parts.append(f"skipped_seen={int(skipped_seen)}")
+    if str(unchanged_reason or "").strip():
+        parts.append(f"unchanged={_clean_log_value(unchanged_reason)}")
+    return " ".join(parts)
 
 
 def _build_rss_feed_sleep_log_line(
@@ -228,7 +258,13 @@ def _build_rss_cycle_done_log_line(
     feed_total: int,
     accepted_total: int,
     enqueue_error: bool,
+    wall_seconds: float = 0.0,
+    feed_fetch_seconds: Optional[list[float]] = None,
+    fetch_concurrency: int = 1,
 ) -> str:
+    latencies = [max(0.0, float(value)) for value in (feed_fetch_seconds or [])]
+    fetch_avg = (sum(latencies) / len(latencies)) if latencies else 0.0
+    fetch_max = max(latencies) if latencies else 0.0
     return " ".join(
         [
             f"{RSS_LOG_PREFIX} {RSS_LOG_EVENT_CYCLE_DONE}",
@@ -236,6 +272,10 @@ def _build_rss_cycle_done_log_line(
             f"feeds={max(0, int(feed_total))}",
             f"accepted_total={max(0, int(accepted_total))}",
             f"enqueue_error={1 if enqueue_error else 0}",
+            f"wall={max(0.0, float(wall_seconds)):.1f}s",
+            f"fetch_avg={fetch_avg:.2f}s",
+            f"fetch_max={fetch_max:.2f}s",
+            f"concurrency={max(1, int(fetch_concurrency))}",
         ]
     )
 
@@ -247,6 +287,67 @@ def _coerce_nonnegative_float(value: object, *, default: float) -> float:
         return max(0.0, float(default))
 
 
+def resolve_rss_fetch_concurrency() -> int:
+    value = env_int(ENV_RSS_FETCH_CONCURRENCY)
+    if value is None:
+        return int(DEFAULT_RSS_FETCH_CONCURRENCY)
+    return max(1, int(value))
+
+
+def resolve_rss_host_concurrency() -> int:
+    value = env_int(ENV_RSS_HOST_CONCURRENCY)
+    if value is None:
+        return int(DEFAULT_RSS_HOST_CONCURRENCY)
+    return max(1, int(value))
+
+
+def resolve_rss_host_min_interval_seconds() -> float:
+    value = env_float(ENV_RSS_HOST_MIN_INTERVAL_SECONDS)
+    if value is None:
+        return float(DEFAULT_RSS_HOST_MIN_INTERVAL_SECONDS)
+    return max(0.0, float(value))
+
+
+def _fetch_feed_for_ingest(
+    rss_url: str,
+    *,
+    timeout: float,
+    retries: int,
+    session: Optional[requests.Session] = None,
+    feed_state: Optional[RssFeedState] = None,
+) -> ConditionalFeedFetch:
+    if feed_state is None:
+        # No feed state store: plain GET + parse, like before.
+        session_kwargs: Dict[str, Any] = {} if session is None else {"session": session}
+        feed = fetch_feed(rss_url, timeout=timeout, retries=retries, **session_kwargs)
+        return ConditionalFeedFetch(feed=feed, validators=FeedValidators())
+    return fetch_feed_conditional(
+        rss_url,
+        timeout=timeout,
+        retries=retries,
+        validators=feed_state.validators,
+        session=session,
+    )
+
+
+def _save_feed_state_best_effort(
+    store: RssFeedStateStore,
+    *,
+    rss_url: str,
+    validators: FeedValidators,
+    seen_entry_ids: list[str],
+) -> None:
+    try:
+        store.save(rss_url, validators=validators, seen_entry_ids=seen_entry_ids)
+    except Exception as err:
+        logger.warning(
+            "[rss] feed_state_save_error url=%s %s: %s",
+            rss_url,
+            type(err).__name__,
+            err,
+        )
+
+
 def _maybe_dispose_source_db_engine_on_transient_error(
     *, engine: PostgresEngine, err: BaseException
 ) -> None:
@@ -267,19 +368,27 @@ def ingest_rss_many_once(
     rss_timeout: float,
     rss_retries: int,
     rss_feed_sleep_seconds: float = 0.0,
+    rss_fetch_concurrency: Optional[int] = None,
     enqueue_spooled_payload: Optional[Callable[[Dict[str, Any]], None]] = None,
     on_item_ingested: Optional[Callable[[], None]] = None,
 ) -> Tuple[int, bool]:
     del engine
     del enqueue_spooled_payload
     del spool_dir
+    cycle_started_at = time.monotonic()
     accepted = 0
     accepted_per_user: dict[str, int] = {}
     enqueue_error = False
     seen_post_uids: set[str] = set()
     seen_urls: set[str] = set()
+    feed_fetch_seconds: list[float] = []
     normalized_platform = str(platform or PLATFORM_WEIBO).strip().lower()
     feed_sleep_seconds = _coerce_nonnegative_float(rss_feed_sleep_seconds, default=0.0)
+    fetch_concurrency = (
+        resolve_rss_fetch_concurrency()
+        if rss_fetch_concurrency is None
+        else max(1, int(rss_fetch_concurrency))
+    )
     feed_total = len(rss_urls)
     debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
@@ -317,7 +426,7 @@ def ingest_rss_many_once(
                 )
             )
 
-    for feed_index, rss_url in enumerate(rss_urls, start=1):
+    def _log_feed_start(*, feed_index: int, rss_url: str) -> None:
         logger.info(
             _build_rss_feed_start_log_line(
                 platform=normalized_platform,
@@ -327,6 +436,32 @@ def ingest_rss_many_once(
             )
         )
 
+    feed_state_store, feed_states = try_load_rss_feed_states(
+        redis_client, redis_queue_key, list(rss_urls)
+    )
+
+    def _feed_state_for(rss_url: str) -> Optional[RssFeedState]:
+        if feed_state_store is None:
+            return None
+        return feed_states.get(str(rss_url or "").strip()) or RssFeedState()
+
+    def _ingest_fetched_feed(*, feed_index: int, fetched: RssFetchResult) -> None:
+        nonlocal enqueue_error
+        rss_url = fetched.rss_url
+        conditional_fetch = fetched.conditional
+        feed = fetched.feed
+        unchanged_reason = (
+            conditional_fetch.unchanged_reason if conditional_fetch is not None else ""
+        )
+        feed_state = _feed_state_for(rss_url)
+        previous_seen_ids = (
+            feed_state.seen_entry_ids if feed_state is not None else frozenset()
+        )
+        handled_entry_ids: list[str] = []
+        skipped_seen = 0
+        feed_enqueue_error = False
+        entries_truncated = False
+        feed_fetch_seconds.append(float(fetched.latency_seconds))
         feed_user_id = user_id
         feed_counter_key = _build_accepted_user_counter_key(
             feed_user_id=feed_user_id,
@@ -335,6 +470,7 @@ def ingest_rss_many_once(
         feed_error = False
         feed_accepted_before = accepted
         entries: list[dict[str, Any]] = []
+        pending_pushes: list[tuple[str, Dict[str, Any], str, str, str, int]] = []
 
         try:
             if not feed_user_id:
@@ -343,9 +479,11 @@ def ingest_rss_many_once(
                 feed_user_id=feed_user_id,
                 rss_url=rss_url,
             )
-            feed = fetch_feed(rss_url, timeout=rss_timeout, retries=rss_retries)
-            entries = feed.entries or []
+            if fetched.error is not None:
+                raise fetched.error
+            entries = (feed.entries or []) if feed is not None else []
             if limit:
+                entries_truncated = len(entries) > int(limit)
                 entries = entries[:limit]
         except Exception as e:
             feed_error = True
@@ -358,6 +496,12 @@ def ingest_rss_many_once(
 
         entry_total = len(entries)
         for entry_index, entry in enumerate(entries, start=1):
+            seen_key = entry_seen_key(entry)
+            if seen_key and seen_key in previous_seen_ids:
+                # Already handled in an earlier cycle: skip before any HTML work.
+                skipped_seen += 1
+                handled_entry_ids.append(seen_key)
+                continue
             link = (entry.get("link") or entry.get("id") or "").strip()
             if not link:
                 continue
@@ -365,10 +509,13 @@ def ingest_rss_many_once(
                 entry, link, feed_user_id, platform=normalized_platform
             )
             if not post_uid or not platform_post_id:
+                handled_entry_ids.append(seen_key)
                 continue
             if post_uid in seen_post_uids:
+                handled_entry_ids.append(seen_key)
                 continue
             if link in seen_urls and normalized_platform == PLATFORM_WEIBO:
+                handled_entry_ids.append(seen_key)
                 continue
 
             raw_title = clean_text(entry.get("title") or "")
@@ -389,6 +536,7 @@ def ingest_rss_many_once(
                 image_urls=list(image_urls or []),
             )
             if not raw_text:
+                handled_entry_ids.append(seen_key)
                 continue
 
             payload: Dict[str, Any] = {
@@ -402,40 +550,55 @@ def ingest_rss_many_once(
                 "raw_text": raw_text,
                 "ingested_at": int(time.time()),
             }
-            has_redis_queue = bool(redis_client) and bool(
-                str(redis_queue_key or "").strip()
+            pending_pushes.append(
+                (post_uid, payload, link, seen_key, resolved_author, entry_index)
             )
-            redis_status = REDIS_PUSH_STATUS_ERROR
-            if has_redis_queue:
-                redis_status = _try_push_to_redis_status(
-                    redis_client,
-                    redis_queue_key,
+
+        # One Redis round trip per feed instead of one per entry.
+        redis_statuses = _try_push_many_to_redis_status(
+            redis_client,
+            redis_queue_key,
+            items=[(item[0], item[1]) for item in pending_pushes],
+        )
+        for pending, redis_status in zip(pending_pushes, redis_statuses):
+            post_uid, _payload, link, seen_key, resolved_author, entry_index = pending
+            if redis_status == REDIS_PUSH_STATUS_PUSHED:
+                _mark_item_accepted(
                     post_uid=post_uid,
-                    payload=payload,
+                    resolved_author=resolved_author,
+                    entry_index=entry_index,
+                    entry_total=entry_total,
+                    feed_index=feed_index,
+                    feed_total=feed_total,
+                    feed_counter_key=feed_counter_key,
                 )
-                if redis_status == REDIS_PUSH_STATUS_PUSHED:
-                    _mark_item_accepted(
-                        post_uid=post_uid,
-                        resolved_author=resolved_author,
-                        entry_index=entry_index,
-                        entry_total=entry_total,
-                        feed_index=feed_index,
-                        feed_total=feed_total,
-                        feed_counter_key=feed_counter_key,
-                    )
-                    seen_post_uids.add(post_uid)
-                    seen_urls.add(link)
-                    continue
-                if redis_status not in (
-                    REDIS_PUSH_STATUS_DUPLICATE,
-                    REDIS_PUSH_STATUS_PUSHED,
-                ):
-                    enqueue_error = True
+                seen_post_uids.add(post_uid)
+                seen_urls.add(link)
+                handled_entry_ids.append(seen_key)
                 continue
-
             if redis_status == REDIS_PUSH_STATUS_DUPLICATE:
+                handled_entry_ids.append(seen_key)
                 continue
             enqueue_error = True
+            feed_enqueue_error = True
+
+        if (
+            feed_state_store is not None
+            and conditional_fetch is not None
+            and not feed_error
+            and not unchanged_reason
+        ):
+            _save_feed_state_best_effort(
+                feed_state_store,
+                rss_url=rss_url,
+                # Keep re-parsing this body until every entry made it to Redis.
+                validators=(
+                    FeedValidators()
+                    if feed_enqueue_error or entries_truncated
+                    else conditional_fetch.validators
+                ),
+                seen_entry_ids=[item for item in handled_entry_ids if item],
+            )
 
         logger.info(
             _build_rss_feed_done_log_line(
@@ -445,25 +608,63 @@ def ingest_rss_many_once(
                 entry_total=entry_total,
                 accepted_in_feed=(accepted - feed_accepted_before),
                 source_error=feed_error,
+                fetch_seconds=fetched.latency_seconds,
+                skipped_seen=skipped_seen,
+                unchanged_reason=unchanged_reason,
             )
         )
 
-        if feed_index < feed_total and feed_sleep_seconds > 0:
-            logger.info(
-                _build_rss_feed_sleep_log_line(
-                    platform=normalized_platform,
-                    feed_index=feed_index,
-                    feed_total=feed_total,
-                    sleep_seconds=feed_sleep_seconds,
-                )
+    if fetch_concurrency > 1 and feed_total > 1:
+        # Fetch in parallel, but parse and enqueue strictly in feed order.
+        fetch_pool = RssFetchPool(
+            max_workers=fetch_concurrency,
+            host_concurrency=resolve_rss_host_concurrency(),
+            host_min_interval_seconds=resolve_rss_host_min_interval_seconds(),
+            fetch_fn=lambda rss_url, **kwargs: _fetch_feed_for_ingest(
+                rss_url,
+                feed_state=_feed_state_for(rss_url),
+                **kwargs,
+            ),
+        )
+        fetched_iter = fetch_pool.fetch_in_order(
+            list(rss_urls),
+            timeout=rss_timeout,
+            retries=rss_retries,
+        )
+        for feed_index, fetched in enumerate(fetched_iter, start=1):
+            _log_feed_start(feed_index=feed_index, rss_url=fetched.rss_url)
+            _ingest_fetched_feed(feed_index=feed_index, fetched=fetched)
+    else:
+        for feed_index, rss_url in enumerate(rss_urls, start=1):
+            _log_feed_start(feed_index=feed_index, rss_url=rss_url)
+            fetched = fetch_rss_timed(
+                _fetch_feed_for_ingest,
+                rss_url,
+                timeout=rss_timeout,
+                retries=rss_retries,
+                feed_state=_feed_state_for(rss_url),
             )
-            time.sleep(feed_sleep_seconds)
+            _ingest_fetched_feed(feed_index=feed_index, fetched=fetched)
+
+            if feed_index < feed_total and feed_sleep_seconds > 0:
+                logger.info(
+                    _build_rss_feed_sleep_log_line(
+                        platform=normalized_platform,
+                        feed_index=feed_index,
+                        feed_total=feed_total,
+                        sleep_seconds=feed_sleep_seconds,
+                    )
+                )
+                time.sleep(feed_sleep_seconds)
     logger.info(
         _build_rss_cycle_done_log_line(
             platform=normalized_platform,
             feed_total=feed_total,
             accepted_total=accepted,
             enqueue_error=enqueue_error,
+            wall_seconds=time.monotonic() - cycle_started_at,
+            feed_fetch_seconds=feed_fetch_seconds,
+            fetch_concurrency=fetch_concurrency,
         )
     )
 
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from alphavault.db.source_queue import CloudPost
+from alphavault.infra.ai.distributed_limiter import build_ai_rate_limiter
+from alphavault.infra.ai.runtime_config import AiRuntimeConfig
+from alphavault.logging_config import get_logger
+from alphavault.rss.utils import RateLimiter
+from alphavault.worker.post_context_tags import (
+    PostContextResult,
+    extract_post_context_result,
+)
+
+logger = get_logger(__name__)
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_limiters: dict[tuple[str, float, float, int], RateLimiter] = {}
+_warned_shared_groups: set[str] = set()
+_stats: dict[str, float] = {
+    "started": 0,
+    "used": 0,
+    "wasted": 0,
+    "cancelled_before_start": 0,
+    "failed": 0,
+    "saved_seconds": 0.0,
+    "wasted_seconds": 0.0,
+}
+
+
+def _count(name: str, amount: float = 1) -> None:
+    with _lock:
+        _stats[name] = _stats.get(name, 0) + amount
+
+
+def speculative_context_stats() -> dict[str, float]:
+    with _lock:
+        out = dict(_stats)
+    out["saved_seconds"] = round(float(out["saved_seconds"]), 3)
+    out["wasted_seconds"] = round(float(out["wasted_seconds"]), 3)
+    return out
+
+
+def _shared_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, int(max_workers)),
+                thread_name_prefix="ai-context-spec",
+            )
+        return _executor
+
+
+def _group_limiter(runtime_config: AiRuntimeConfig) -> RateLimiter:
+    key = (
+        runtime_config.limit_group_name,
+        float(runtime_config.ai_rpm),
+        float(runtime_config.ai_burst),
+        int(runtime_config.ai_max_inflight),
+    )
+    with _lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = build_ai_rate_limiter(
+                rpm=runtime_config.ai_rpm,
+                burst=runtime_config.ai_burst,
+                limit_group_name=runtime_config.limit_group_name,
+                max_inflight=runtime_config.ai_max_inflight,
+                timeout_seconds=runtime_config.timeout_seconds,
+            )
+            _limiters[key] = limiter
+        return limiter
+
+
+class SpeculativePostContext:
+    """A post-context call started alongside the topic call.
+
+    Exactly one of `result()` / `discard()` takes effect; a running call
+    cannot be interrupted, so a discard only drops its result.
+    """
+
+    def __init__(self, future: Future, *, post_uid: str) -> None:
+        self._future = future
+        self._post_uid = post_uid
+        self._started_at = time.monotonic()
+        self._finished_at: float | None = None
+        self._settled = False
+        future.add_done_callback(self._mark_finished)
+
+    def _mark_finished(self, _future: Future) -> None:
+        self._finished_at = time.monotonic()
+
+    def result(self, *, topic_finished_at: float) -> PostContextResult:
+        self._settled = True
+        try:
+            context_result = self._future.result()
+        except Exception:
+            _count("failed")
+            raise
+        finished_at = self._finished_at or time.monotonic()
+        # Sequential would have started the context call once the topic call
+        # returned; the overlap is what this post no longer waits for.
+        saved_seconds = max(0.0, min(topic_finished_at, finished_at) - self._started_at)
+        _count("used")
+        _count("saved_seconds", saved_seconds)
+        logger.info(
+            "[ai_context] speculative_used post_uid=%s saved=%.1fs",
+            self._post_uid,
+            saved_seconds,
+        )
+        return context_result
+
+    def discard(self, *, reason: str) -> None:
+        if self._settled:
+            return
+        self._settled = True
+        if self._future.cancel():
+            _count("cancelled_before_start")
+            return
+        _count("wasted")
+        self._future.add_done_callback(self._count_wasted_seconds)
+        logger.info(
+            "[ai_context] speculative_discard post_uid=%s reason=%s",
+            self._post_uid,
+            reason,
+        )
+
+    def _count_wasted_seconds(self, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        _count(
+            "wasted_seconds", (self._finished_at or time.monotonic()) - self._started_at
+        )
+
+
+def start_speculative_post_context(
+    engine: Any,
+    *,
+    post: CloudPost,
+    runtime_config: AiRuntimeConfig,
+    topic_limit_group_name: str,
+    trace_out: Path | None = None,
+) -> SpeculativePostContext | None:
+    """Start the context call now when its profile opts in; None otherwise."""
+    if not runtime_config.speculative:
+        return None
+    group = str(runtime_config.limit_group_name or "").strip()
+    if group == str(topic_limit_group_name or "").strip():
+        # Same budget as the topic call: racing it would only slow that down.
+        with _lock:
+            first_warning = group not in _warned_shared_groups
+            _warned_shared_groups.add(group)
+        if first_warning:
+            logger.warning(
+                "[ai_context] speculative_disabled shared_limit_group=%s", group
+            )
+        return None
+    limiter = _group_limiter(runtime_config)
+    future = _shared_executor(runtime_config.ai_max_inflight).submit(
+        extract_post_context_result,
+        engine,
+        post=post,
+        runtime_config=runtime_config,
+        request_gate=limiter.wait,
+        trace_out=trace_out,
+    )
+    _count("started")
+    return SpeculativePostContext(future, post_uid=str(post.post_uid or "").strip())
+
+
+__all__ = [
+    "SpeculativePostContext",
+    "speculative_context_stats",
+    "start_speculative_post_context",
+]
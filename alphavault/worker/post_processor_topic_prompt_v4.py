@@ -2,6 +2,7 @@ from __future__ import annotations
 import logging
 import threading
 import time
+from concurrent.futures import Future
 from typing import Any
 
 from alphavault.ai._client import AiInvalidJsonError, AiRetryLaterError
@@ -23,6 +24,7 @@ from alphavault.db.postgres_db import (
     run_postgres_transaction,
 )
 from alphavault.db.source_queue import (
+    AssertionsDoneWriteRow,
     CloudPost,
     load_cloud_post,
     write_assertions_and_mark_done,
@@ -40,6 +42,7 @@ from alphavault.research_workbench.sample_post_raw_text import (
 from alphavault.research_workbench.service import (
     get_research_workbench_engine_from_env,
 )
+from alphavault.semantic_doc_coalescer import shared_semantic_doc_coalescer
 from alphavault.semantic_docs import (
     semantic_doc_embedding_is_configured,
     sync_semantic_docs_for_post,
@@ -52,11 +55,16 @@ from alphavault.weibo.topic_prompt_tree import (
     MAX_TOPIC_PROMPT_CHARS,
     thread_root_info_for_post,
 )
+from alphavault.worker.done_write_stage import shared_done_write_stage
 from alphavault.worker.post_context_tags import (
     POST_CONTEXT_PROMPT_VERSION,
     PostContextResult,
     extract_post_context_result,
 )
+from alphavault.worker.post_context_speculation import (
+    SpeculativePostContext,
+    start_speculative_post_context,
+)
 from alphavault.worker.post_processor_utils import score_from_assertions
 from alphavault.worker.rss_ntfy import maybe_publish_rss_ntfy_notifications
 from alphavault.worker.runtime_models import LLMConfig, _clamp_float, _clamp_int
@@ -259,6 +267,42 @@ def _write_done_with_feedback_apply(
     prefetched_ingested_at: int,
     latest_pending_feedback: dict[str, str] | None,
 ) -> None:
+    done_write_stage = shared_done_write_stage()
+    if latest_pending_feedback is None and done_write_stage is not None:
+        done_write_stage.write(
+            engine,
+            AssertionsDoneWriteRow(
+                post_uid=post_uid,
+                final_status=final_status,
+                invest_score=invest_score,
+                processed_at=processed_at,
+                model=model,
+                prompt_version=prompt_version,
+                archived_at=archived_at,
+                assertions=list(assertions),
+                entity_match_results=list(entity_match_results),
+                context_run=(
+                    {
+                        "model": str(context_result.model or "").strip(),
+                        "prompt_version": str(
+                            context_result.prompt_version or ""
+                        ).strip(),
+                        "processed_at": str(context_result.processed_at or "").strip(),
+                    }
+                    if context_result is not None
+                    else None
+                ),
+                context_mentions=(
+                    list(context_result.mentions) if context_result is not None else []
+                ),
+                context_entities=(
+                    list(context_result.entities) if context_result is not None else []
+                ),
+                prefetched_post=prefetched_post,
+                prefetched_ingested_at=prefetched_ingested_at,
+            ),
+        )
+        return
     if latest_pending_feedback is None:
         write_assertions_and_mark_done(
             engine,
@@ -347,26 +391,53 @@ def _sync_semantic_docs_best_effort(
     redis_client: Any = None,  # 新增参数
 ) -> None:
     resolved_final_status = str(final_status or "").strip()
-    if resolved_final_status == "relevant":
-        configured, _ = semantic_doc_embedding_is_configured()
-        if not configured:
-            return
+    configured, _ = semantic_doc_embedding_is_configured()
+    if not configured and resolved_final_status == "relevant":
+        return
+
+    def _log_failure(semantic_docs_err: BaseException) -> None:
+        logger.warning(
+            "[semantic_docs] sync_failed post_uid=%s final_status=%s error=%s",
+            post_uid,
+            resolved_final_status,
+            format_llm_error_one_line(semantic_docs_err, limit=300),
+        )
+
+    if not configured:
+        # Only deletes docs, and nothing can be queued for this post.
+        try:
+            sync_semantic_docs_for_post(
+                engine,
+                post_uid=post_uid,
+                final_status=resolved_final_status,
+                prefetched_post=prefetched_post,
+                apply=True,
+                redis_client=redis_client,  # 传递 redis_client
+            )
+        except Exception as semantic_docs_err:
+            _log_failure(semantic_docs_err)
+        return
+
+    def _on_done(future: Future[Any]) -> None:
+        err = future.exception()
+        if err is not None:
+            _log_failure(err)
+
+    # Embedding is coalesced with other posts; the write lands when the
+    # shared batch flushes, so failures are logged from the callback. Deletes
+    # go through it too, so they land after any write still queued.
     try:
-        sync_semantic_docs_for_post(
+        future = shared_semantic_doc_coalescer().submit(
             engine,
             post_uid=post_uid,
             final_status=resolved_final_status,
             prefetched_post=prefetched_post,
-            apply=True,
             redis_client=redis_client,  # 传递 redis_client
         )
     except Exception as semantic_docs_err:
-        logger.warning(
-            "[semantic_docs] sync_failed post_uid=%s final_status=%s error=%s",
-            post_uid,
-            resolved_final_status,
-            format_llm_error_one_line(semantic_docs_err, limit=300),
-        )
+        _log_failure(semantic_docs_err)
+        return
+    future.add_done_callback(_on_done)
 
 
 def map_topic_prompt_assertions_to_rows(
@@ -669,8 +740,22 @@ def process_one_post_uid_topic_prompt_v4(
         )
     )
 
+    context_runtime_config = ai_task_runtime_config_from_env(
+        task_key=AI_TASK_POST_CONTEXT,
+        timeout_seconds_default=float(config.ai_timeout_seconds),
+    )
+    speculative_context: SpeculativePostContext | None = None
     try:
         start_ts = time.time()
+        speculative_context = start_speculative_post_context(
+            engine,
+            post=post,
+            runtime_config=context_runtime_config,
+            topic_limit_group_name=str(
+                getattr(config, "ai_limit_group_name", "") or ""
+            ),
+            trace_out=config.trace_out,
+        )
         parsed = _call_ai_with_openai(
             prompt=prompt,
             api_mode=str(config.api_mode or DEFAULT_AI_MODE),
@@ -687,6 +772,7 @@ def process_one_post_uid_topic_prompt_v4(
             validator=validate_topic_prompt_v4_ai_result,
             request_gate=limiter.wait,
         )
+        topic_finished_at = time.monotonic()
 
         cost = time.time() - start_ts
         logger.info(
@@ -725,13 +811,11 @@ def process_one_post_uid_topic_prompt_v4(
         current_post_uid = str(post.post_uid or "").strip()
         current_rows = assertions_by_post_uid.get(current_post_uid, [])
         if current_rows:
-            context_runtime_config = ai_task_runtime_config_from_env(
-                task_key=AI_TASK_POST_CONTEXT,
-                timeout_seconds_default=float(config.ai_timeout_seconds),
-            )
             try:
                 context_result_by_post_uid[current_post_uid] = (
-                    extract_post_context_result(
+                    speculative_context.result(topic_finished_at=topic_finished_at)
+                    if speculative_context is not None
+                    else extract_post_context_result(
                         engine,
                         post=post,
                         runtime_config=context_runtime_config,
@@ -747,6 +831,8 @@ def process_one_post_uid_topic_prompt_v4(
                     POST_CONTEXT_PROMPT_VERSION,
                     format_llm_error_one_line(context_err, limit=300),
                 )
+        elif speculative_context is not None:
+            speculative_context.discard(reason="irrelevant")
 
         for uid in locked_post_uids:
             rows = assertions_by_post_uid.get(uid, [])
@@ -836,6 +922,8 @@ def process_one_post_uid_topic_prompt_v4(
         clear_topic_prompt_failure_context()
         return True
     except Exception as err:
+        if speculative_context is not None:
+            speculative_context.discard(reason=type(err).__name__)
         if isinstance(err, AiRetryLaterError):
             set_topic_prompt_failure_context(
                 kind="retry_later",
@@ -3,6 +3,8 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import threading
+import weakref
 from typing import Any, NoReturn
 
 from alphavault.logging_config import get_logger
@@ -20,6 +22,94 @@ REDIS_PUSH_STATUS_ERROR = "error"
 REDIS_AI_CONSUMER_GROUP = "alphavault-ai"
 logger = get_logger(__name__)
 
+# KEYS: stream, retry zset, then one dedup key per message.
+# ARGV: dedup ttl, backlog maxlen (0 = unlimited), then post_uid/payload pairs.
+_AI_BATCH_PUSH_LUA = """
+local ttl = tonumber(ARGV[1])
+local maxlen = tonumber(ARGV[2])
+local backlog = 0
+if maxlen > 0 then
+  backlog = redis.call('XLEN', KEYS[1]) + redis.call('ZCARD', KEYS[2])
+end
+local statuses = {}
+for i = 3, #KEYS do
+  local arg_index = (i - 3) * 2 + 3
+  if not redis.call('SET', KEYS[i], '1', 'NX', 'EX', ttl) then
+    statuses[#statuses + 1] = 'duplicate'
+  elseif maxlen > 0 and backlog >= maxlen then
+    redis.call('DEL', KEYS[i])
+    statuses[#statuses + 1] = 'error'
+  else
+    redis.call(
+      'XADD', KEYS[1], '*',
+      'payload', ARGV[arg_index + 1],
+      'post_uid', ARGV[arg_index]
+    )
+    backlog = backlog + 1
+    statuses[#statuses + 1] = 'pushed'
+  end
+end
+return statuses
+"""
+
+# KEYS: retry zset, stream. ARGV: now epoch, max items.
+# Promotes due retries and drops unparsable ones; returns the moved count.
+# post_uid is only taken from a JSON string: retry payloads are written with
+# a string post_uid, and tostring() on a decoded number would not match str().
+_AI_MOVE_DUE_RETRIES_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+local moved = 0
+for _, member in ipairs(due) do
+  local payload_text = string.match(member, '^%s*(.-)%s*$')
+  if payload_text ~= '' then
+    local ok, payload = pcall(cjson.decode, payload_text)
+    -- cjson decodes arrays to tables too; only a JSON object is a payload.
+    if ok and type(payload) == 'table' and string.sub(payload_text, 1, 1) == '{' then
+      local post_uid = payload['post_uid']
+      if type(post_uid) ~= 'string' then
+        post_uid = ''
+      end
+      redis.call(
+        'XADD', KEYS[2], '*',
+        'payload', payload_text,
+        'post_uid', string.match(post_uid, '^%s*(.-)%s*$')
+      )
+      moved = moved + 1
+    end
+    redis.call('ZREM', KEYS[1], member)
+  end
+end
+return moved
+"""
+
+_ensured_consumer_groups: "weakref.WeakKeyDictionary[Any, set[str]]" = (
+    weakref.WeakKeyDictionary()
+)
+_ensured_consumer_groups_lock = threading.Lock()
+
+
+_REGISTERED_SCRIPTS_ATTR = "_alphavault_registered_scripts"
+_registered_scripts_lock = threading.Lock()
+
+
+def _registered_script(client, source: str) -> Any:
+    """`client.register_script(source)`, done once per client and script."""
+    with _registered_scripts_lock:
+        scripts = getattr(client, _REGISTERED_SCRIPTS_ATTR, None)
+        if not isinstance(scripts, dict):
+            scripts = {}
+            try:
+                # Kept on the client itself: a Script holds its client, so a
+                # weak-keyed map would never let the client go.
+                setattr(client, _REGISTERED_SCRIPTS_ATTR, scripts)
+            except AttributeError:
+                pass
+        script = scripts.get(source)
+        if script is None:
+            script = client.register_script(source)
+            scripts[source] = script
+    return script
+
 
 def _sha1_short(value: str) -> str:
     return hashlib.sha1(value.encode("utf-8")).hexdigest()[:20]
@@ -88,6 +178,41 @@ def redis_ensure_ai_consumer_group(client, queue_key: str) -> None:
             raise
 
 
+def _consumer_group_is_cached(client, queue_key: str) -> bool:
+    with _ensured_consumer_groups_lock:
+        try:
+            return queue_key in _ensured_consumer_groups.get(client, set())
+        except TypeError:
+            return False
+
+
+def _remember_consumer_group(client, queue_key: str) -> None:
+    with _ensured_consumer_groups_lock:
+        try:
+            _ensured_consumer_groups.setdefault(client, set()).add(queue_key)
+        except TypeError:
+            return
+
+
+def _forget_consumer_group(client, queue_key: str) -> None:
+    with _ensured_consumer_groups_lock:
+        try:
+            _ensured_consumer_groups.get(client, set()).discard(queue_key)
+        except TypeError:
+            return
+
+
+def redis_ensure_ai_consumer_group_cached(client, queue_key: str) -> None:
+    """Like `redis_ensure_ai_consumer_group`, but only hits Redis once per process."""
+    resolved_queue_key = str(queue_key or "").strip()
+    if not client or not resolved_queue_key:
+        return
+    if _consumer_group_is_cached(client, resolved_queue_key):
+        return
+    redis_ensure_ai_consumer_group(client, resolved_queue_key)
+    _remember_consumer_group(client, resolved_queue_key)
+
+
 def redis_ai_reset_consumer_group(client, queue_key: str) -> bool:
     """
     Reset consumer group metadata (pending list, consumers) for single-worker restarts.
@@ -99,6 +224,7 @@ def redis_ai_reset_consumer_group(client, queue_key: str) -> bool:
         return False
 
     stream_key = redis_ai_stream_key(resolved_queue_key)
+    _forget_consumer_group(client, resolved_queue_key)
     destroyed = 0
     try:
         destroyed = int(client.xgroup_destroy(stream_key, REDIS_AI_CONSUMER_GROUP) or 0)
@@ -177,7 +303,7 @@ def redis_try_push_ai_message_status(
         ):
             client.delete(dedup_key)
             return REDIS_PUSH_STATUS_ERROR
-        redis_ensure_ai_consumer_group(client, resolved_queue_key)
+        redis_ensure_ai_consumer_group_cached(client, resolved_queue_key)
         _xadd_payload(
             client,
             queue_key=resolved_queue_key,
@@ -195,6 +321,66 @@ def redis_try_push_ai_message_status(
     return REDIS_PUSH_STATUS_PUSHED
 
 
+def redis_try_push_ai_messages_status(
+    client,
+    queue_key: str,
+    *,
+    items: list[tuple[str, dict[str, Any]]],
+    ttl_seconds: int,
+    queue_maxlen: int | None = None,
+) -> list[str]:
+    """
+    Push many `(post_uid, payload)` pairs in one Lua call.
+
+    Dedup (SET NX) and XADD happen atomically per message on the server, so a
+    batch costs one round trip instead of ~5 per message. Returns one push
+    status per input item, in order.
+    """
+    resolved_queue_key = str(queue_key or "").strip()
+    statuses = [REDIS_PUSH_STATUS_ERROR] * len(items)
+    if not client or not resolved_queue_key or not items:
+        return statuses
+
+    keys = [
+        redis_ai_stream_key(resolved_queue_key),
+        redis_ai_retry_key(resolved_queue_key),
+    ]
+    args: list[object] = [max(1, int(ttl_seconds)), max(0, int(queue_maxlen or 0))]
+    item_indexes: list[int] = []
+    for idx, (post_uid, payload) in enumerate(items):
+        resolved_post_uid = str(post_uid or "").strip()
+        if not resolved_post_uid:
+            continue
+        keys.append(_redis_dedup_key(resolved_queue_key, resolved_post_uid))
+        args.append(resolved_post_uid)
+        args.append(json.dumps(payload, ensure_ascii=False))
+        item_indexes.append(idx)
+    if not item_indexes:
+        return statuses
+
+    try:
+        redis_ensure_ai_consumer_group_cached(client, resolved_queue_key)
+        script = _registered_script(client, _AI_BATCH_PUSH_LUA)
+        results = list(script(keys=keys, args=args) or [])
+    except Exception as err:
+        logger.warning(
+            "[redis] stream_batch_push_error size=%s %s: %s",
+            len(item_indexes),
+            type(err).__name__,
+            err,
+        )
+        return statuses
+    for item_index, result in zip(item_indexes, results):
+        status = str(result or "").strip()
+        if status in (
+            REDIS_PUSH_STATUS_PUSHED,
+            REDIS_PUSH_STATUS_DUPLICATE,
+            REDIS_PUSH_STATUS_ERROR,
+        ):
+            statuses[item_index] = status
+    return statuses
+
+
 def redis_force_push_ai_message(
     client,
     queue_key: str,
@@ -206,7 +392,7 @@ def redis_force_push_ai_message(
         raise RuntimeError("missing_redis_queue")
     payload_text = json.dumps(payload, ensure_ascii=False)
     post_uid = str(payload.get("post_uid") or "").strip()
-    redis_ensure_ai_consumer_group(client, resolved_queue_key)
+    redis_ensure_ai_consumer_group_cached(client, resolved_queue_key)
     return _xadd_payload(
         client,
         queue_key=resolved_queue_key,
@@ -348,6 +534,14 @@ def redis_ai_ack_and_clear_dedup(
     return int(acked), int(deleted)
 
 
+def _retry_payload_text(payload: dict[str, Any]) -> str:
+    """Retry payload JSON with post_uid as a string, as the promote script expects."""
+    if "post_uid" in payload and not isinstance(payload["post_uid"], str):
+        post_uid = payload["post_uid"]
+        payload = {**payload, "post_uid": "" if post_uid is None else str(post_uid)}
+    return json.dumps(payload, ensure_ascii=False)
+
+
 def redis_ai_push_retry(
     client,
     queue_key: str,
@@ -357,7 +551,7 @@ def redis_ai_push_retry(
 ) -> None:
     if not client or not str(queue_key or "").strip():
         raise RuntimeError("missing_redis_queue")
-    payload_text = json.dumps(payload, ensure_ascii=False)
+    payload_text = _retry_payload_text(payload)
     client.zadd(redis_ai_retry_key(queue_key), {payload_text: int(next_retry_at)})
 
 
@@ -373,7 +567,7 @@ def redis_ai_ack_and_push_retry(
     resolved_message_id = str(message_id or "").strip()
     if not client or not resolved_queue_key or not resolved_message_id:
         raise RuntimeError("missing_redis_queue")
-    payload_text = json.dumps(payload, ensure_ascii=False)
+    payload_text = _retry_payload_text(payload)
     pipe = client.pipeline(transaction=True)
     pipe.zadd(
         redis_ai_retry_key(resolved_queue_key), {payload_text: int(next_retry_at)}
@@ -399,43 +593,20 @@ def redis_ai_move_due_retries_to_stream(
 ) -> int:
     if not client or not str(queue_key or "").strip() or max_items <= 0:
         return 0
-    retry_key = redis_ai_retry_key(queue_key)
-    due_payloads = list(
-        client.zrangebyscore(
-            retry_key,
-            min="-inf",
-            max=int(now_epoch),
-            start=0,
-            num=max(1, int(max_items)),
+    resolved_queue_key = str(queue_key)
+    redis_ensure_ai_consumer_group_cached(client, resolved_queue_key)
+    # One atomic call: concurrent pollers can't promote the same retry twice.
+    script = _registered_script(client, _AI_MOVE_DUE_RETRIES_LUA)
+    moved = int(
+        script(
+            keys=[
+                redis_ai_retry_key(resolved_queue_key),
+                redis_ai_stream_key(resolved_queue_key),
+            ],
+            args=[int(now_epoch), max(1, int(max_items))],
         )
-        or []
+        or 0
     )
-    if not due_payloads:
-        return 0
-
-    redis_ensure_ai_consumer_group(client, str(queue_key))
-    moved = 0
-    for payload_text in due_payloads:
-        resolved_payload_text = str(payload_text or "").strip()
-        if not resolved_payload_text:
-            continue
-        try:
-            payload = json.loads(resolved_payload_text)
-        except Exception:
-            client.zrem(retry_key, payload_text)
-            continue
-        if not isinstance(payload, dict):
-            client.zrem(retry_key, payload_text)
-            continue
-        _xadd_payload(
-            client,
-            queue_key=str(queue_key),
-            payload_text=resolved_payload_text,
-            post_uid=str(payload.get("post_uid") or "").strip(),
-            queue_maxlen=resolve_redis_ai_queue_maxlen(),
-        )
-        client.zrem(retry_key, payload_text)
-        moved += 1
     if moved:
         logger.info("[redis] ai_retry_to_stream moved=%s", moved)
     return moved
@@ -581,8 +752,10 @@ __all__ = [
     "redis_ai_retry_key",
     "redis_ai_stream_key",
     "redis_ensure_ai_consumer_group",
+    "redis_ensure_ai_consumer_group_cached",
     "redis_force_push_ai_message",
     "redis_try_push_ai_message_status",
+    "redis_try_push_ai_messages_status",
     "resolve_redis_ai_queue_maxlen",
     "resolve_redis_dedup_ttl_seconds",
 ]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from alphavault.logging_config import get_logger
+from alphavault.rss.utils import FeedValidators
+
+RSS_FEED_STATE_KEY_PREFIX = "rss:feed_state"
+RSS_FEED_STATE_TTL_SECONDS = 30 * 24 * 3600
+RSS_FEED_SEEN_IDS_MAX = 500
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RssFeedState:
+    validators: FeedValidators = field(default_factory=FeedValidators)
+    seen_entry_ids: frozenset[str] = frozenset()
+
+
+def _sha1_short(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()[:20]
+
+
+def rss_feed_state_key(queue_key: str, rss_url: str) -> str:
+    resolved_url = str(rss_url or "").strip()
+    return f"{queue_key}:{RSS_FEED_STATE_KEY_PREFIX}:{_sha1_short(resolved_url)}"
+
+
+def _parse_seen_entry_ids(value: object) -> frozenset[str]:
+    text = str(value or "").strip()
+    if not text:
+        return frozenset()
+    try:
+        parsed = json.loads(text)
+    except Exception:
+        return frozenset()
+    if not isinstance(parsed, list):
+        return frozenset()
+    return frozenset(str(item).strip() for item in parsed if str(item).strip())
+
+
+def _state_from_hash(raw: object) -> RssFeedState:
+    if not isinstance(raw, dict) or not raw:
+        return RssFeedState()
+    return RssFeedState(
+        validators=FeedValidators(
+            etag=str(raw.get("etag") or "").strip(),
+            last_modified=str(raw.get("last_modified") or "").strip(),
+            body_hash=str(raw.get("body_hash") or "").strip(),
+        ),
+        seen_entry_ids=_parse_seen_entry_ids(raw.get("seen_ids")),
+    )
+
+
+class RssFeedStateStore:
+    """Per-feed conditional-GET validators + recently seen entry ids in Redis."""
+
+    def __init__(self, redis_client: Any, queue_key: str) -> None:
+        self._client = redis_client
+        self._queue_key = str(queue_key or "").strip()
+
+    def load_many(self, rss_urls: list[str]) -> dict[str, RssFeedState]:
+        urls = [str(url or "").strip() for url in rss_urls if str(url or "").strip()]
+        if not urls:
+            return {}
+        pipe = self._client.pipeline(transaction=False)
+        for url in urls:
+            pipe.hgetall(rss_feed_state_key(self._queue_key, url))
+        results = pipe.execute() or []
+        return {
+            url: _state_from_hash(results[idx] if idx < len(results) else None)
+            for idx, url in enumerate(urls)
+        }
+
+    def save(
+        self,
+        rss_url: str,
+        *,
+        validators: FeedValidators,
+        seen_entry_ids: list[str],
+    ) -> None:
+        resolved_url = str(rss_url or "").strip()
+        if not resolved_url:
+            return
+        kept_ids = [str(item).strip() for item in seen_entry_ids if str(item).strip()]
+        kept_ids = kept_ids[:RSS_FEED_SEEN_IDS_MAX]
+        key = rss_feed_state_key(self._queue_key, resolved_url)
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hset(
+            key,
+            mapping={
+                "etag": validators.etag,
+                "last_modified": validators.last_modified,
+                "body_hash": validators.body_hash,
+                "seen_ids": json.dumps(kept_ids, ensure_ascii=False),
+            },
+        )
+        pipe.expire(key, RSS_FEED_STATE_TTL_SECONDS)
+        pipe.execute()
+
+
+def try_load_rss_feed_states(
+    redis_client: Any,
+    queue_key: str,
+    rss_urls: list[str],
+) -> tuple[RssFeedStateStore | None, dict[str, RssFeedState]]:
+    if not redis_client or not str(queue_key or "").strip():
+        return None, {}
+    store = RssFeedStateStore(redis_client, queue_key)
+    try:
+        states = store.load_many(rss_urls)
+    except Exception as err:
+        logger.warning(
+            "[rss] feed_state_load_error %s: %s",
+            type(err).__name__,
+            err,
+        )
+        return None, {}
+    return store, states
+
+
+__all__ = [
+    "RssFeedState",
+    "RssFeedStateStore",
+    "rss_feed_state_key",
+    "try_load_rss_feed_states",
+]
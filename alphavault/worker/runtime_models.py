@@ -66,6 +66,8 @@ class LLMConfig:
     ai_timeout_seconds: float
     trace_out: Optional[Path] = None
     ai_max_inflight: int = 1
+    ai_burst: float = 1.0
+    ai_limit_group_name: str = ""
 
 
 def _clamp_float(value: object, low: float, high: float, default: float) -> float:
@@ -152,6 +154,8 @@ def _build_config(args: argparse.Namespace) -> LLMConfig:
         ai_rpm=max(0.0, float(runtime_config.ai_rpm)),
         ai_timeout_seconds=max(1.0, float(runtime_config.timeout_seconds)),
         ai_max_inflight=max(1, int(runtime_config.ai_max_inflight)),
+        ai_burst=max(1.0, float(runtime_config.ai_burst)),
+        ai_limit_group_name=str(runtime_config.limit_group_name or ""),
         trace_out=trace_out,
     )
 
@@ -9,6 +9,9 @@ from typing import Any, Callable, Sequence
 from alphavault.logging_config import get_logger
 
 AI_TRACE_LOG_PREFIX = "[ai_trace]"
+# How far ahead one pass may book rate slots; matches the longest idle wait
+# between worker ticks, so the next pass picks up before these come due.
+AI_RESERVE_HORIZON_SECONDS = 5.0
 logger = get_logger(__name__)
 
 
@@ -18,6 +21,31 @@ def _cancel_reserved_request_slot(limiter: Any) -> None:
         cancel_fn()
 
 
+def _cancel_reserved_request_slots(slots: Sequence[Any]) -> None:
+    for slot in slots:
+        _cancel_reserved_request_slot(slot)
+
+
+def _reserve_request_slots(limiter: Any, *, available: int) -> list[Any] | None:
+    """Rate slots for this pass; None when the limiter has no rate limit."""
+    has_limit_fn = getattr(limiter, "has_limit", None)
+    if callable(has_limit_fn) and not bool(has_limit_fn()):
+        return None
+    try_reserve_many_fn = getattr(limiter, "try_reserve_many", None)
+    if callable(try_reserve_many_fn):
+        return list(
+            try_reserve_many_fn(
+                int(available),
+                horizon_seconds=AI_RESERVE_HORIZON_SECONDS,
+            )
+        )
+    try_reserve_fn = getattr(limiter, "try_reserve", None)
+    if not callable(try_reserve_fn):
+        return None
+    reserved_slot = try_reserve_fn()
+    return [] if reserved_slot is None else [reserved_slot]
+
+
 def _trace_log_value(value: object) -> str:
     if value is None:
         return ""
@@ -232,18 +260,11 @@ def schedule_ai_from_stream(
     if available <= 0:
         return 0, False
 
-    task_limiter = limiter
-    try_reserve_fn = getattr(limiter, "try_reserve", None)
-    has_limit_fn = getattr(limiter, "has_limit", None)
-    limiter_has_limit = True
-    if callable(has_limit_fn):
-        limiter_has_limit = bool(has_limit_fn())
-    if limiter_has_limit and callable(try_reserve_fn):
-        reserved_slot = try_reserve_fn()
-        if reserved_slot is None:
+    reserved_slots = _reserve_request_slots(limiter, available=int(available))
+    if reserved_slots is not None:
+        if not reserved_slots:
             return 0, False
-        available = min(int(available), 1)
-        task_limiter = reserved_slot
+        available = min(int(available), len(reserved_slots))
 
     messages: list[tuple[str, dict[str, str]]] = []
     try:
@@ -264,21 +285,6 @@ def schedule_ai_from_stream(
             err,
         )
 
-    # Process Zilliz retry queue (新增)
-    try:
-        from alphavault.db.zilliz_retry_queue import process_zilliz_retry_queue
-
-        if redis_client:
-            process_zilliz_retry_queue(redis_client, max_batch_size=50)
-    except BaseException as err:
-        if isinstance(err, fatal_exceptions):
-            raise
-        logger.warning(
-            "[zilliz] retry_queue_error owner=%s %s: %s",
-            inflight_owner,
-            type(err).__name__,
-            err,
-        )
     try:
         claimed_messages = claim_stuck_messages_fn(
             redis_client,
@@ -309,7 +315,7 @@ def schedule_ai_from_stream(
             type(err).__name__,
             err,
         )
-        _cancel_reserved_request_slot(task_limiter)
+        _cancel_reserved_request_slots(reserved_slots or [])
         return 0, True
 
     remaining = max(0, int(available) - len(messages))
@@ -343,7 +349,7 @@ def schedule_ai_from_stream(
                 type(err).__name__,
                 err,
             )
-            _cancel_reserved_request_slot(task_limiter)
+            _cancel_reserved_request_slots(reserved_slots or [])
             return 0, True
 
     if (
@@ -371,7 +377,7 @@ def schedule_ai_from_stream(
             ),
         )
     if not messages:
-        _cancel_reserved_request_slot(task_limiter)
+        _cancel_reserved_request_slots(reserved_slots or [])
         return 0, bool(has_error)
 
     scheduled = 0
@@ -477,6 +483,7 @@ def schedule_ai_from_stream(
                 ),
             )
 
+        task_limiter = limiter if reserved_slots is None else reserved_slots[scheduled]
         try:
             fut = executor.submit(
                 process_one_redis_payload_fn,
@@ -493,8 +500,7 @@ def schedule_ai_from_stream(
                 max_retry_count=max(0, int(getattr(config, "ai_retries", 0) or 0)),
             )
         except BaseException:
-            if scheduled <= 0:
-                _cancel_reserved_request_slot(task_limiter)
+            _cancel_reserved_request_slots((reserved_slots or [])[scheduled:])
             raise
         fut.add_done_callback(lambda _f: wakeup_event.set())
         inflight_futures.add(fut)
@@ -514,8 +520,7 @@ def schedule_ai_from_stream(
                 ),
             )
         scheduled += 1
-    if scheduled <= 0:
-        _cancel_reserved_request_slot(task_limiter)
+    _cancel_reserved_request_slots((reserved_slots or [])[scheduled:])
     return scheduled, bool(has_error)
 
 
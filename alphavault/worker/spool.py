@@ -233,63 +233,36 @@ def _upsert_spool_payload(
     return post_uid
 
 
-def _try_push_payload_to_ai_ready(
+def _try_push_payloads_to_ai_ready_statuses(
     *,
     redis_client: Any,
     redis_queue_key: str,
-    post_uid: str,
-    payload: dict[str, Any],
-) -> tuple[int, bool]:
-    status = _try_push_payload_to_ai_ready_status(
-        redis_client=redis_client,
-        redis_queue_key=redis_queue_key,
-        post_uid=post_uid,
-        payload=payload,
-    )
-    if status == "error":
-        return 0, True
-    if status == "pushed":
-        return 1, False
-    return 0, False
-
-
-def _try_push_payload_to_ai_ready_status(
-    *,
-    redis_client: Any,
-    redis_queue_key: str,
-    post_uid: str,
-    payload: dict[str, Any],
-) -> str:
-    if not redis_client or not str(redis_queue_key or "").strip() or not post_uid:
-        return "error"
+    items: list[tuple[str, dict[str, Any]]],
+) -> list[str]:
+    if not items:
+        return []
+    if not redis_client or not str(redis_queue_key or "").strip():
+        return ["error"] * len(items)
     try:
         from alphavault.worker.redis_stream_queue import (
-            REDIS_PUSH_STATUS_DUPLICATE,
-            REDIS_PUSH_STATUS_ERROR,
-            REDIS_PUSH_STATUS_PUSHED,
-            redis_try_push_ai_message_status,
+            redis_try_push_ai_messages_status,
             resolve_redis_ai_queue_maxlen,
             resolve_redis_dedup_ttl_seconds,
         )
 
-        status = redis_try_push_ai_message_status(
+        statuses = redis_try_push_ai_messages_status(
             redis_client,
             str(redis_queue_key),
-            post_uid=post_uid,
-            payload=payload,
+            items=items,
             ttl_seconds=resolve_redis_dedup_ttl_seconds(),
             queue_maxlen=resolve_redis_ai_queue_maxlen(),
         )
     except Exception as e:
         logger.warning("[redis] ai_requeue_error %s: %s", type(e).__name__, e)
-        return "error"
-    if status == REDIS_PUSH_STATUS_PUSHED:
-        return REDIS_PUSH_STATUS_PUSHED
-    if status == REDIS_PUSH_STATUS_DUPLICATE:
-        return REDIS_PUSH_STATUS_DUPLICATE
-    if status == REDIS_PUSH_STATUS_ERROR:
-        return REDIS_PUSH_STATUS_ERROR
-    return "error"
+        return ["error"] * len(items)
+    return [
+        status if status in ("pushed", "duplicate") else "error" for status in statuses
+    ]
 
 
 def flush_spool_to_source_db(
@@ -418,65 +391,78 @@ def recover_spool_to_source_db_and_redis(
         paths = sorted(spool_dir.glob(SPOOL_FILE_GLOB))
         if not paths:
             return 0, 0, 0, False
-        with postgres_connect_autocommit(engine) as conn:
-            for path in paths[:max_batch]:
-                claimed_path = _claim_spool_file(path)
-                if claimed_path is None:
-                    continue
-                payload = _load_claimed_payload(
-                    claimed_path=claimed_path,
-                )
-                if payload is None:
-                    continue
-
-                post_uid = str(payload.get("post_uid") or "")
-                if not post_uid:
-                    _cleanup_spool_file(claimed_path)
-                    continue
-
-                try:
-                    processed_at = load_post_processed_at(conn, post_uid=post_uid)
-                except BaseException as e:
-                    if isinstance(e, _FATAL_BASE_EXCEPTIONS):
-                        raise
-                    _maybe_dispose_source_db_engine_on_transient_error(
-                        engine=engine, err=e
-                    )
-                    _restore_claimed_file_for_retry(
+        # Claimed files wait here so Redis sees one batched push per run.
+        pending: list[tuple[Path, Path, str, dict[str, Any]]] = []
+        db_error = False
+        try:
+            with postgres_connect_autocommit(engine) as conn:
+                for path in paths[:max_batch]:
+                    claimed_path = _claim_spool_file(path)
+                    if claimed_path is None:
+                        continue
+                    payload = _load_claimed_payload(
                         claimed_path=claimed_path,
-                        target_path=path,
                     )
-                    return handled_posts, queued_redis, deleted_done, True
+                    if payload is None:
+                        continue
 
-                if str(processed_at or "").strip():
-                    _cleanup_spool_file(claimed_path)
-                    handled_posts += 1
-                    deleted_done += 1
-                    continue
+                    post_uid = str(payload.get("post_uid") or "")
+                    if not post_uid:
+                        _cleanup_spool_file(claimed_path)
+                        continue
+
+                    try:
+                        processed_at = load_post_processed_at(conn, post_uid=post_uid)
+                    except BaseException as e:
+                        if isinstance(e, _FATAL_BASE_EXCEPTIONS):
+                            raise
+                        _maybe_dispose_source_db_engine_on_transient_error(
+                            engine=engine, err=e
+                        )
+                        _restore_claimed_file_for_retry(
+                            claimed_path=claimed_path,
+                            target_path=path,
+                        )
+                        db_error = True
+                        break
+
+                    if str(processed_at or "").strip():
+                        _cleanup_spool_file(claimed_path)
+                        handled_posts += 1
+                        deleted_done += 1
+                        continue
 
-                push_status = _try_push_payload_to_ai_ready_status(
-                    redis_client=redis_client,
-                    redis_queue_key=redis_queue_key,
-                    post_uid=post_uid,
-                    payload=payload,
+                    pending.append((path, claimed_path, post_uid, payload))
+        except BaseException:
+            for path, claimed_path, _post_uid, _payload in pending:
+                _restore_claimed_file_for_retry(
+                    claimed_path=claimed_path,
+                    target_path=path,
                 )
-                if push_status == "error":
-                    _restore_claimed_file_for_retry(
-                        claimed_path=claimed_path,
-                        target_path=path,
-                    )
-                    return handled_posts, queued_redis, deleted_done, True
-                if push_status == "duplicate":
-                    _restore_claimed_file_for_retry(
-                        claimed_path=claimed_path,
-                        target_path=path,
-                    )
-                    continue
+            raise
 
-                _cleanup_spool_file(claimed_path)
-                handled_posts += 1
-                if push_status == "pushed":
-                    queued_redis += 1
+        push_statuses = _try_push_payloads_to_ai_ready_statuses(
+            redis_client=redis_client,
+            redis_queue_key=redis_queue_key,
+            items=[(post_uid, payload) for _p, _c, post_uid, payload in pending],
+        )
+        push_error = False
+        for (path, claimed_path, _post_uid, _payload), push_status in zip(
+            pending, push_statuses
+        ):
+            if push_status != "pushed":
+                # error: retry later; duplicate: already queued, keep until done.
+                push_error = push_error or push_status == "error"
+                _restore_claimed_file_for_retry(
+                    claimed_path=claimed_path,
+                    target_path=path,
+                )
+                continue
+            _cleanup_spool_file(claimed_path)
+            handled_posts += 1
+            queued_redis += 1
+        if db_error or push_error:
+            return handled_posts, queued_redis, deleted_done, True
     except BaseException as e:
         if isinstance(e, _FATAL_BASE_EXCEPTIONS):
             raise
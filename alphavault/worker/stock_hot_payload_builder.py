@@ -4,6 +4,7 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from alphavault.db.sql.common import make_in_params, make_in_placeholders
+from alphavault.db.post_thread_trees import load_post_thread_trees
 from alphavault.db.postgres_db import (
     PostgresConnection,
     qualify_postgres_table,
@@ -340,8 +341,12 @@ def build_stock_hot_payload(
         if str(uid or "").strip()
     ]
     posts = _load_posts_for_assertions(conn, post_uids=post_uids)
-    rows = merge_post_fields(rows, posts)
-    tree_map = build_post_tree_map(post_uids=post_uids, posts=posts)
+    tree_map = build_post_tree_map(
+        post_uids=post_uids,
+        posts=posts,
+        cached=load_post_thread_trees(conn, post_uids=post_uids),
+    )
+    rows = merge_post_fields(rows, posts, cached_trees=tree_map)
     signals: list[dict[str, str]] = []
     reference_now = default_signal_reference_time()
     for row in rows:
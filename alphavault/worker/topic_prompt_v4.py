@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+from itertools import accumulate
+import re
 from typing import Optional
 
 from alphavault.ai.contracts import AiTopicRuntimeContext
 from alphavault.ai.topic_prompt_v4 import build_topic_prompt
-from alphavault.weibo.topic_prompt_tree import build_topic_runtime_context
+from alphavault.weibo.topic_prompt_tree import (
+    TopicTreeDraft,
+    build_topic_tree_draft,
+    render_topic_tree_draft,
+)
 
 
 LLM_LOG_PREFIX = "[llm]"
@@ -60,6 +66,61 @@ def max_message_tree_text_len(node: object) -> int:
     return max_len
 
 
+_JSON_ESCAPED_CHAR_RE = re.compile(r'[\x00-\x1f"\\]')
+_JSON_SHORT_ESCAPES = frozenset('"\\\b\f\n\r\t')
+
+
+def _json_char_len(ch: str) -> int:
+    # json.dumps(ensure_ascii=False) escapes only quotes, backslashes and
+    # control chars; the short forms are 2 chars, the rest \u00XX.
+    if ch in _JSON_SHORT_ESCAPES:
+        return 2
+    if ord(ch) < 0x20:
+        return 6
+    return 1
+
+
+class _CompactPromptSizeModel:
+    """
+    Compact prompt length as a function of the node-text cap.
+
+    Only node texts depend on the cap, and in compact JSON each one adds its
+    escaped length, so the prompt at cap c is the uncapped prompt minus what
+    each node loses. Per node we keep escaped-length prefix sums; a probe is
+    then a little arithmetic per node instead of a full rebuild.
+    """
+
+    def __init__(self, *, node_texts: list[str], uncapped_chars: int) -> None:
+        self._nodes: list[tuple[str, int, list[int] | None]] = []
+        uncapped_text_chars = 0
+        for text in node_texts:
+            lead = len(text) - len(text.lstrip())
+            prefix: list[int] | None = None
+            if _JSON_ESCAPED_CHAR_RE.search(text):
+                prefix = [0, *accumulate(_json_char_len(ch) for ch in text)]
+            self._nodes.append((text, lead, prefix))
+            uncapped_text_chars += self._node_chars(len(text), text, lead, prefix)
+        self._base_chars = int(uncapped_chars) - uncapped_text_chars
+
+    @staticmethod
+    def _node_chars(cap: int, text: str, lead: int, prefix: list[int] | None) -> int:
+        # Escaped length of text[:cap].strip().
+        end = min(int(cap), len(text))
+        while end > lead and text[end - 1].isspace():
+            end -= 1
+        if end <= lead:
+            return 0
+        if prefix is None:
+            return end - lead
+        return prefix[end] - prefix[lead]
+
+    def prompt_chars(self, cap: int) -> int:
+        return self._base_chars + sum(
+            self._node_chars(cap, text, lead, prefix)
+            for text, lead, prefix in self._nodes
+        )
+
+
 def build_topic_prompt_v4_with_prompt_chars_limit(
     *,
     root_key: str,
@@ -77,10 +138,8 @@ def build_topic_prompt_v4_with_prompt_chars_limit(
       (runtime_context, truncated_nodes, prompt, prompt_chars, node_chars_limit, compact_json, include_comments)
     """
 
-    def build_ctx(
-        *, node_chars: int, include_comments: bool
-    ) -> tuple[AiTopicRuntimeContext, int]:
-        return build_topic_runtime_context(
+    def build_draft(*, include_comments: bool) -> TopicTreeDraft:
+        return build_topic_tree_draft(
             root_key=root_key,
             root_segment=root_segment,
             root_content_key=root_content_key,
@@ -88,7 +147,6 @@ def build_topic_prompt_v4_with_prompt_chars_limit(
             posts=posts,
             manual_feedback_hint=manual_feedback_hint,
             include_virtual_comments=bool(include_comments),
-            max_node_text_chars=int(node_chars),
         )
 
     def build_prompt(
@@ -101,35 +159,35 @@ def build_topic_prompt_v4_with_prompt_chars_limit(
         return prompt, len(prompt)
 
     def search_best_cap(
-        *, include_comments: bool
+        draft: TopicTreeDraft,
+        *,
+        uncapped_ctx: AiTopicRuntimeContext,
+        uncapped_compact_chars: int,
     ) -> Optional[tuple[AiTopicRuntimeContext, int, str, int, int]]:
-        base_ctx, _base_truncated = build_ctx(
-            node_chars=0, include_comments=include_comments
+        size_model = _CompactPromptSizeModel(
+            node_texts=draft.node_texts(), uncapped_chars=uncapped_compact_chars
         )
-        max_len = max(1, max_message_tree_text_len(base_ctx.message_tree))
+        max_len = max(1, max_message_tree_text_len(uncapped_ctx.message_tree))
         lo = 1
         hi = int(max_len)
-        best: Optional[tuple[AiTopicRuntimeContext, int, str, int, int]] = None
+        best_cap = 0
         while lo <= hi:
             mid = (lo + hi) // 2
-            mid_ctx, mid_truncated = build_ctx(
-                node_chars=mid, include_comments=include_comments
-            )
-            mid_prompt, mid_chars = build_prompt(mid_ctx, compact_json=True)
-            if mid_chars <= max_prompt_chars:
-                best = (
-                    mid_ctx,
-                    int(mid_truncated),
-                    mid_prompt,
-                    int(mid_chars),
-                    int(mid),
-                )
+            if size_model.prompt_chars(mid) <= max_prompt_chars:
+                best_cap = mid
                 lo = mid + 1
                 continue
             hi = mid - 1
-        return best
+        if best_cap <= 0:
+            return None
+        best_ctx, best_truncated = render_topic_tree_draft(
+            draft, max_node_text_chars=best_cap
+        )
+        best_prompt, best_chars = build_prompt(best_ctx, compact_json=True)
+        return best_ctx, int(best_truncated), best_prompt, int(best_chars), best_cap
 
-    ctx_full, truncated_full = build_ctx(node_chars=0, include_comments=True)
+    draft_full = build_draft(include_comments=True)
+    ctx_full, truncated_full = render_topic_tree_draft(draft_full)
     pretty_prompt, pretty_chars = build_prompt(ctx_full, compact_json=False)
     if max_prompt_chars <= 0 or pretty_chars <= max_prompt_chars:
         return (
@@ -154,7 +212,9 @@ def build_topic_prompt_v4_with_prompt_chars_limit(
             True,
         )
 
-    best = search_best_cap(include_comments=True)
+    best = search_best_cap(
+        draft_full, uncapped_ctx=ctx_full, uncapped_compact_chars=compact_chars
+    )
     if best is not None:
         best_ctx, best_truncated, best_prompt, best_prompt_chars, best_cap = best
         return (
@@ -167,7 +227,8 @@ def build_topic_prompt_v4_with_prompt_chars_limit(
             True,
         )
 
-    ctx_no_comments, truncated_nc = build_ctx(node_chars=0, include_comments=False)
+    draft_nc = build_draft(include_comments=False)
+    ctx_no_comments, truncated_nc = render_topic_tree_draft(draft_nc)
     nc_pretty_prompt, nc_pretty_chars = build_prompt(
         ctx_no_comments, compact_json=False
     )
@@ -196,7 +257,9 @@ def build_topic_prompt_v4_with_prompt_chars_limit(
             False,
         )
 
-    best_nc = search_best_cap(include_comments=False)
+    best_nc = search_best_cap(
+        draft_nc, uncapped_ctx=ctx_no_comments, uncapped_compact_chars=nc_compact_chars
+    )
     if best_nc is not None:
         best_ctx, best_truncated, best_prompt, best_prompt_chars, best_cap = best_nc
         return (
@@ -16,8 +16,9 @@ from alphavault.constants import (
     ENV_RSS_INTERVAL_SECONDS,
 )
 from alphavault.error_alerts import install_ntfy_error_alerting
+from alphavault.infra.ai.distributed_limiter import build_ai_rate_limiter
 from alphavault.logging_config import configure_logging, get_logger
-from alphavault.rss.utils import RateLimiter, env_float, parse_active_hours
+from alphavault.rss.utils import env_float, parse_active_hours
 from alphavault.worker import worker_loop
 from alphavault.worker.cli import (
     _parse_worker_active_hours_from_args,
@@ -65,7 +66,13 @@ def main() -> None:
 
         config = _build_config(args)
         load_rss_ntfy_rules_from_env()
-        limiter = RateLimiter(config.ai_rpm)
+        limiter = build_ai_rate_limiter(
+            rpm=config.ai_rpm,
+            burst=config.ai_burst,
+            limit_group_name=config.ai_limit_group_name,
+            max_inflight=config.ai_max_inflight,
+            timeout_seconds=config.ai_timeout_seconds,
+        )
         ai_cap = max(1, int(getattr(config, "ai_max_inflight", 1) or 1))
 
         rss_active_hours = _resolve_rss_active_hours_from_env()
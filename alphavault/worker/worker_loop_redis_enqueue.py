@@ -5,7 +5,7 @@ import threading
 from typing import Any
 
 from alphavault.worker import periodic_jobs
-from alphavault.worker.spool import _try_push_payload_to_ai_ready
+from alphavault.worker.spool import _try_push_payloads_to_ai_ready_statuses
 from alphavault.worker.worker_constants import (
     REDIS_ENQUEUE_MAX_ITEMS_PER_RUN,
     REDIS_ENQUEUE_RETRY_INTERVAL_SECONDS,
@@ -19,12 +19,11 @@ def submit_redis_enqueue_job(
     redis_client: Any,
     redis_queue_key: str,
 ) -> dict[str, int | bool]:
-    attempted = 0
     pushed = 0
     duplicates = 0
-    has_error = False
     max_items = max(1, int(REDIS_ENQUEUE_MAX_ITEMS_PER_RUN))
 
+    batch: list[tuple[str, dict[str, Any]]] = []
     for _ in range(max_items):
         payload = periodic_jobs.pop_next_redis_enqueue_payload(source=source)
         if payload is None:
@@ -32,24 +31,29 @@ def submit_redis_enqueue_job(
         post_uid = str(payload.get("post_uid") or "")
         if not post_uid:
             continue
-        attempted += 1
-        pushed_count, push_error = _try_push_payload_to_ai_ready(
-            redis_client=redis_client,
-            redis_queue_key=redis_queue_key,
-            post_uid=post_uid,
+        batch.append((post_uid, payload))
+
+    attempted = len(batch)
+    statuses = _try_push_payloads_to_ai_ready_statuses(
+        redis_client=redis_client,
+        redis_queue_key=redis_queue_key,
+        items=batch,
+    )
+    failed: list[dict[str, Any]] = []
+    for (_post_uid, payload), status in zip(batch, statuses):
+        if status == "pushed":
+            pushed += 1
+        elif status == "duplicate":
+            duplicates += 1
+        else:
+            failed.append(payload)
+    # appendleft in reverse keeps the failed payloads in their original order.
+    for payload in reversed(failed):
+        periodic_jobs.restore_redis_enqueue_payload(
+            source=source,
             payload=payload,
         )
-        if push_error:
-            periodic_jobs.restore_redis_enqueue_payload(
-                source=source,
-                payload=payload,
-            )
-            has_error = True
-            break
-        if pushed_count > 0:
-            pushed += int(pushed_count)
-            continue
-        duplicates += 1
+    has_error = bool(failed)
 
     has_more = periodic_jobs.should_start_redis_enqueue(source=source)
     return {
@@ -8,9 +8,11 @@ import threading
 import time
 from typing import Any, Optional
 
+from alphavault.ai._openai import openai_client_pool_stats
 from alphavault.rss.utils import RateLimiter, sleep_until_active
 from alphavault.logging_config import get_logger
 from alphavault.worker import periodic_jobs
+from alphavault.worker.post_context_speculation import speculative_context_stats
 from alphavault.worker.runtime_models import LLMConfig, WorkerSourceRuntime
 from alphavault.worker.source_runtime import log_source_runtime
 from alphavault.worker.worker_loop_models import (
@@ -24,6 +26,10 @@ from alphavault.worker.worker_loop_source_tick import (
     prepare_source_tick,
     run_prepared_source_maintenance,
 )
+from alphavault.worker.zilliz_retry_lane import (
+    ZillizRetryLane,
+    zilliz_retry_lane_from_env,
+)
 
 logger = get_logger(__name__)
 
@@ -192,12 +198,87 @@ def _wait_after_tick(
         time.sleep(wait_seconds)
 
 
+def _log_limiter_stats(limiter: RateLimiter) -> None:
+    stats_fn = getattr(limiter, "stats", None)
+    if not callable(stats_fn):
+        return
+    stats = stats_fn()
+    if not float(stats.get("rpm") or 0.0):
+        return
+    logger.info(
+        "[ai] limiter name=%s rpm=%s burst=%s tokens=%s waiters=%s "
+        "acquired=%s rejected=%s wait_total=%.1fs",
+        stats.get("name") or "-",
+        stats.get("rpm"),
+        stats.get("burst"),
+        stats.get("tokens_available"),
+        stats.get("waiters"),
+        stats.get("acquired"),
+        stats.get("rejected"),
+        float(stats.get("total_wait_seconds") or 0.0),
+    )
+
+
+def _log_speculative_context_stats() -> None:
+    stats = speculative_context_stats()
+    if not stats.get("started"):
+        return
+    logger.info(
+        "[ai_context] speculative started=%s used=%s wasted=%s "
+        "cancelled=%s failed=%s saved=%.1fs wasted_time=%.1fs",
+        int(stats.get("started") or 0),
+        int(stats.get("used") or 0),
+        int(stats.get("wasted") or 0),
+        int(stats.get("cancelled_before_start") or 0),
+        int(stats.get("failed") or 0),
+        float(stats.get("saved_seconds") or 0.0),
+        float(stats.get("wasted_seconds") or 0.0),
+    )
+
+
+def _log_openai_client_pool_stats() -> None:
+    for stats in openai_client_pool_stats():
+        if not stats.get("requests"):
+            continue
+        logger.info(
+            "[ai] http_pool base_url=%s group=%s max_connections=%s "
+            "requests=%s connections=%s reused=%s",
+            stats.get("base_url"),
+            stats.get("limit_group"),
+            stats.get("max_connections") or "-",
+            stats.get("requests"),
+            stats.get("connections_opened"),
+            stats.get("reused"),
+        )
+
+
+def _log_zilliz_retry_lane_stats(lane: ZillizRetryLane | None) -> None:
+    if lane is None:
+        return
+    stats = lane.stats()
+    if not (stats.get("retry_queue_len") or stats.get("processed")):
+        return
+    logger.info(
+        "[zilliz] retry_lane backlog=%s failed_queue=%s processed=%s "
+        "success=%s retry=%s failed=%s deferred=%s breaker=%s",
+        stats.get("retry_queue_len"),
+        stats.get("failed_queue_len"),
+        stats.get("processed"),
+        stats.get("success"),
+        stats.get("retry"),
+        stats.get("failed"),
+        stats.get("deferred"),
+        stats.get("breaker"),
+    )
+
+
 def _run_worker_loop_tick(
     *,
     loop_ctx: WorkerLoopContext,
     maintenance_next_at: float,
     execs: SourceTickExecutors,
     state: SourceTickState,
+    zilliz_retry_lane: ZillizRetryLane | None = None,
 ) -> tuple[bool, float, float]:
     if loop_ctx.worker_active_hours is not None:
         sleep_until_active(loop_ctx.worker_active_hours)
@@ -213,6 +294,11 @@ def _run_worker_loop_tick(
         now=float(now),
         worker_interval_seconds=float(loop_ctx.worker_interval_seconds),
     )
+    if do_maintenance:
+        _log_limiter_stats(loop_ctx.limiter)
+        _log_speculative_context_stats()
+        _log_openai_client_pool_stats()
+        _log_zilliz_retry_lane_stats(zilliz_retry_lane)
     any_inflight = _run_sources_once(
         loop_ctx=loop_ctx,
         worker_interval_seconds=float(loop_ctx.worker_interval_seconds),
@@ -239,24 +325,32 @@ def _run_worker_loop_forever(
         inflight_owner_by_future={},
     )
     maintenance_next_at = 0.0
-    with _open_executors(
-        ai_cap=int(loop_ctx.ai_cap),
-        source_count=len(loop_ctx.sources),
-    ) as execs:
-        while True:
-            any_inflight, maintenance_next_at, next_maintenance_in = (
-                _run_worker_loop_tick(
-                    loop_ctx=loop_ctx,
-                    maintenance_next_at=float(maintenance_next_at),
-                    execs=execs,
-                    state=state,
+    zilliz_retry_lane = zilliz_retry_lane_from_env(loop_ctx.redis_client)
+    if zilliz_retry_lane is not None:
+        zilliz_retry_lane.start()
+    try:
+        with _open_executors(
+            ai_cap=int(loop_ctx.ai_cap),
+            source_count=len(loop_ctx.sources),
+        ) as execs:
+            while True:
+                any_inflight, maintenance_next_at, next_maintenance_in = (
+                    _run_worker_loop_tick(
+                        loop_ctx=loop_ctx,
+                        maintenance_next_at=float(maintenance_next_at),
+                        execs=execs,
+                        state=state,
+                        zilliz_retry_lane=zilliz_retry_lane,
+                    )
                 )
-            )
-            _wait_after_tick(
-                any_inflight=bool(any_inflight),
-                wakeup_event=state.wakeup_event,
-                next_maintenance_in=float(next_maintenance_in),
-            )
+                _wait_after_tick(
+                    any_inflight=bool(any_inflight),
+                    wakeup_event=state.wakeup_event,
+                    next_maintenance_in=float(next_maintenance_in),
+                )
+    finally:
+        if zilliz_retry_lane is not None:
+            zilliz_retry_lane.stop(timeout=5.0)
 
 
 def run_worker_forever(
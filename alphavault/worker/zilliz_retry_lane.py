@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import time
+from typing import Any, Callable
+
+from alphavault.db.zilliz_constants import (
+    ZILLIZ_RETRY_BREAKER_COOLDOWN_SEC,
+    ZILLIZ_RETRY_BREAKER_FAILURES,
+    ZILLIZ_RETRY_TIMEOUT_SEC,
+    ZILLIZ_RETRY_WORKERS,
+)
+from alphavault.db.zilliz_retry_queue import (
+    get_zilliz_retry_queue_stats,
+    load_due_zilliz_retry_tasks,
+    process_zilliz_retry_task,
+)
+from alphavault.logging_config import get_logger
+from alphavault.rss.utils import env_float, env_int
+
+logger = get_logger(__name__)
+
+DEFAULT_ZILLIZ_RETRY_WORKERS = 2
+DEFAULT_ZILLIZ_RETRY_TIMEOUT_SECONDS = 10.0
+DEFAULT_ZILLIZ_RETRY_BREAKER_FAILURES = 5
+DEFAULT_ZILLIZ_RETRY_BREAKER_COOLDOWN_SECONDS = 60.0
+ZILLIZ_RETRY_INTERVAL_SECONDS = 5.0
+ZILLIZ_RETRY_BATCH_SIZE = 50
+ZILLIZ_RETRY_PASS_DEADLINE_SECONDS = 30.0
+
+
+def _task_post_uid(task_json: Any) -> str:
+    try:
+        return str(json.loads(task_json).get("post_uid") or "")
+    except Exception:
+        return ""
+
+
+def _group_tasks_by_post_uid(due_tasks: list[Any]) -> list[list[Any]]:
+    groups: dict[str, list[Any]] = {}
+    for idx, task_json in enumerate(due_tasks):
+        post_uid = _task_post_uid(task_json)
+        groups.setdefault(post_uid or f"#{idx}", []).append(task_json)
+    return list(groups.values())
+
+
+class ZillizRetryLane:
+    """
+    Drains the Zilliz retry queue on its own thread so the AI scheduler
+    never waits on Zilliz.
+
+    Each pass takes up to `batch_size` due tasks and runs them on a small
+    pool, one post_uid per job so a post's tasks keep their order. Every
+    Zilliz call gets `timeout_seconds`, and tasks not started within
+    `pass_deadline_seconds` stay queued for the next pass. After
+    `breaker_failures` failed tasks in a row the breaker opens for
+    `breaker_cooldown_seconds`; then a single task is tried and a success
+    closes it again. Unparsable tasks are moved to the failed list and do
+    not count as breaker failures.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        workers: int = DEFAULT_ZILLIZ_RETRY_WORKERS,
+        timeout_seconds: float = DEFAULT_ZILLIZ_RETRY_TIMEOUT_SECONDS,
+        breaker_failures: int = DEFAULT_ZILLIZ_RETRY_BREAKER_FAILURES,
+        breaker_cooldown_seconds: float = DEFAULT_ZILLIZ_RETRY_BREAKER_COOLDOWN_SECONDS,
+        interval_seconds: float = ZILLIZ_RETRY_INTERVAL_SECONDS,
+        batch_size: int = ZILLIZ_RETRY_BATCH_SIZE,
+        pass_deadline_seconds: float = ZILLIZ_RETRY_PASS_DEADLINE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.redis_client = redis_client
+        self.workers = max(1, int(workers))
+        self.timeout_seconds = max(0.1, float(timeout_seconds))
+        self.breaker_failures = max(1, int(breaker_failures))
+        self.breaker_cooldown_seconds = max(0.0, float(breaker_cooldown_seconds))
+        self.interval_seconds = max(0.1, float(interval_seconds))
+        self.batch_size = max(1, int(batch_size))
+        self.pass_deadline_seconds = max(0.0, float(pass_deadline_seconds))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="zilliz-retry"
+        )
+        self._consecutive_failures = 0
+        self._breaker_open_until: float | None = None
+        self._stats = {
+            "passes": 0,
+            "processed": 0,
+            "success": 0,
+            "retry": 0,
+            "failed": 0,
+            "invalid": 0,
+            "deferred": 0,
+            "breaker_opened": 0,
+            "breaker_skipped_passes": 0,
+        }
+
+    def _breaker_state_locked(self) -> str:
+        if self._breaker_open_until is None:
+            return "closed"
+        if self._clock() < self._breaker_open_until:
+            return "open"
+        return "half_open"
+
+    def _record_outcome(self, outcome: str) -> None:
+        with self._lock:
+            self._stats["processed"] += 1
+            self._stats[outcome] += 1
+            if outcome == "success":
+                self._consecutive_failures = 0
+                self._breaker_open_until = None
+                return
+            if outcome == "invalid":
+                # Bad task data, not a Zilliz failure; the probe goes again.
+                return
+            self._consecutive_failures += 1
+            state = self._breaker_state_locked()
+            if state == "open":
+                return
+            if state == "closed" and self._consecutive_failures < self.breaker_failures:
+                return
+            self._breaker_open_until = self._clock() + self.breaker_cooldown_seconds
+            self._stats["breaker_opened"] += 1
+            failures = self._consecutive_failures
+        logger.warning(
+            "[zilliz] retry_breaker_open failures=%s cooldown=%.0fs",
+            failures,
+            self.breaker_cooldown_seconds,
+        )
+
+    def _run_group(self, tasks: list[Any], deadline: float) -> None:
+        for idx, task_json in enumerate(tasks):
+            with self._lock:
+                blocked = self._breaker_state_locked() == "open"
+            if blocked or self._stop_event.is_set() or self._clock() > deadline:
+                with self._lock:
+                    self._stats["deferred"] += len(tasks) - idx
+                return
+            try:
+                outcome = process_zilliz_retry_task(
+                    self.redis_client, task_json, timeout_seconds=self.timeout_seconds
+                )
+            except Exception as err:
+                logger.warning(
+                    "[zilliz] retry_task_error %s: %s", type(err).__name__, err
+                )
+                outcome = "failed"
+            self._record_outcome(outcome)
+
+    def run_pass(self) -> None:
+        """Retry one batch of due tasks and wait for it; the lane thread calls this."""
+        with self._lock:
+            state = self._breaker_state_locked()
+            if state == "open":
+                self._stats["breaker_skipped_passes"] += 1
+                return
+            self._stats["passes"] += 1
+        due_tasks = load_due_zilliz_retry_tasks(
+            self.redis_client,
+            max_batch_size=1 if state == "half_open" else self.batch_size,
+        )
+        if not due_tasks:
+            return
+        deadline = self._clock() + self.pass_deadline_seconds
+        futures = [
+            self._executor.submit(self._run_group, group, deadline)
+            for group in _group_tasks_by_post_uid(due_tasks)
+        ]
+        for future in futures:
+            future.result()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.run_pass()
+            except Exception as err:
+                logger.warning(
+                    "[zilliz] retry_pass_error %s: %s", type(err).__name__, err
+                )
+            self._stop_event.wait(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="zilliz-retry-lane", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, *, timeout: float | None = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, object]:
+        out: dict[str, object] = dict(get_zilliz_retry_queue_stats(self.redis_client))
+        with self._lock:
+            out.update(self._stats)
+            out["breaker"] = self._breaker_state_locked()
+            out["consecutive_failures"] = self._consecutive_failures
+        return out
+
+
+def zilliz_retry_lane_from_env(redis_client: Any) -> ZillizRetryLane | None:
+    if not redis_client:
+        return None
+    workers = env_int(ZILLIZ_RETRY_WORKERS)
+    timeout_seconds = env_float(ZILLIZ_RETRY_TIMEOUT_SEC)
+    breaker_failures = env_int(ZILLIZ_RETRY_BREAKER_FAILURES)
+    breaker_cooldown_seconds = env_float(ZILLIZ_RETRY_BREAKER_COOLDOWN_SEC)
+    return ZillizRetryLane(
+        redis_client,
+        workers=DEFAULT_ZILLIZ_RETRY_WORKERS if workers is None else workers,
+        timeout_seconds=(
+            DEFAULT_ZILLIZ_RETRY_TIMEOUT_SECONDS
+            if timeout_seconds is None
+            else timeout_seconds
+        ),
+        breaker_failures=(
+            DEFAULT_ZILLIZ_RETRY_BREAKER_FAILURES
+            if breaker_failures is None
+            else breaker_failures
+        ),
+        breaker_cooldown_seconds=(
+            DEFAULT_ZILLIZ_RETRY_BREAKER_COOLDOWN_SECONDS
+            if breaker_cooldown_seconds is None
+            else breaker_cooldown_seconds
+        ),
+    )
+
+
+__all__ = ["ZillizRetryLane", "zilliz_retry_lane_from_env"]
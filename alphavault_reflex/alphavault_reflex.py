@@ -10,6 +10,7 @@ from starlette.responses import JSONResponse
 
 from alphavault.env import load_dotenv_if_present
 from alphavault.error_alerts import install_ntfy_error_alerting
+from alphavault.infra.hot_view_cache import hot_view_cache_stats
 from alphavault.logging_config import get_logger
 from alphavault.mcp_server.http_app import (
     MCP_ROUTE_MOUNT_PATH,
@@ -37,6 +38,10 @@ from alphavault_reflex.research_state import stock_browser_title_var
 from alphavault_reflex.services.original_link import ORIGINAL_LINK_SCRIPT_PATH
 from alphavault_reflex.services.process_metrics import load_container_memory_metrics
 from alphavault_reflex.services.process_metrics import load_process_metrics
+from alphavault_reflex.services.resident_cache import resident_cache_stats
+from alphavault_reflex.services.stock_object_index_cache import (
+    stock_object_index_stats,
+)
 
 _FATAL_BASE_EXCEPTIONS = (KeyboardInterrupt, SystemExit, GeneratorExit)
 HEALTHCHECK_API_PATH = "/api/healthz"
@@ -272,6 +277,9 @@ async def _manual_process_metrics_get(request: Request) -> JSONResponse:
     try:
         result: dict[str, object] = {"processes": load_process_metrics()}
         result.update(load_container_memory_metrics())
+        result["stock_view_cache"] = hot_view_cache_stats()
+        result["source_row_cache"] = resident_cache_stats()
+        result["stock_object_index"] = stock_object_index_stats()
     except BaseException as err:
         if isinstance(err, _FATAL_BASE_EXCEPTIONS):
             raise
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from dataclasses import dataclass, field
 import importlib
 from functools import cache
 import reflex as rx
@@ -57,6 +59,7 @@ class HomeworkState(rx.State):
     loaded_once: bool = False
     load_error: str = ""
     caption: str = ""
+    load_request_id: int = 0
 
     window_start_local: str = ""
     window_end_local: str = ""
@@ -147,108 +150,82 @@ class HomeworkState(rx.State):
     def selected_tree_render_lines(self) -> list[dict[str, str]]:
         return build_tree_render_lines(self.selected_tree_render_text)
 
-    def _refresh(self, *, selected_range: HomeworkTimeRange) -> None:
-        from alphavault_reflex.services.homework_board import TRADE_FILTER_ALL_OPINIONS
-
-        # Determine whether to load only trade actions or all actions
-        trade_only = self.trade_filter != TRADE_FILTER_ALL_OPINIONS
-
-        assertions, stock_relations, err = (
-            _load_source_read_module().load_homework_board_payload_from_env(
-                format_homework_query_datetime(selected_range.start_utc),
-                format_homework_query_datetime(selected_range.end_exclusive_utc),
-                trade_only=trade_only,
-            )
-        )
-        if err:
-            self.load_error = err
+    def _apply_board(self, board: _HomeworkBoard) -> None:
+        if board.load_error:
+            self.load_error = board.load_error
             self.caption = ""
             self.rows = []
             _clear_selected_tree(self)
             return
+        self.author_options = board.author_options
+        self.author_filter = board.author_filter
+        _apply_homework_rows(self, caption=board.caption, rows=board.rows)
 
-        board_assertions, board_topic_labels = prepare_board_assertion_rows(
-            assertions,
-            stock_relations=stock_relations,
+    def _refresh(self, *, selected_range: HomeworkTimeRange) -> None:
+        self._apply_board(
+            _load_homework_board(
+                selected_range,
+                trade_filter=str(self.trade_filter),
+                author_filter=str(self.author_filter),
+            )
         )
 
-        authors = extract_authors_from_assertions(board_assertions)
-        self.author_options = [AUTHOR_FILTER_ALL] + authors
-        if self.author_filter not in self.author_options:
-            self.author_filter = AUTHOR_FILTER_ALL
-
-        result = build_board(
-            board_assertions,
-            [],
-            group_col="board_group_key",
-            group_label="主题",
-            range_start_utc=selected_range.start_utc,
-            range_end_exclusive_utc=selected_range.end_exclusive_utc,
-            range_caption=selected_range.caption,
-            age_reference_utc=selected_range.end_reference_utc,
-            trade_filter=str(self.trade_filter),
-            author_filter=str(self.author_filter),
-        )
-        _fill_trade_board_urls(result.rows)
-        for row in result.rows:
-            topic_key = str(row.get("topic") or "").strip()
-            stock_slug = (
-                topic_key.removeprefix(STOCK_KEY_PREFIX)
-                if topic_key.startswith(STOCK_KEY_PREFIX)
-                else ""
-            )
-            sector_slug = (
-                topic_key.removeprefix(CLUSTER_KEY_PREFIX)
-                if topic_key.startswith(CLUSTER_KEY_PREFIX)
-                else ""
+    async def _refresh_with_loading(self) -> None:
+        """Load the board off the state lock; a newer refresh drops this one."""
+        async with self:
+            self.loading = True
+            self.load_error = ""
+            self.tree_dialog_open = False
+            self.tree_loading = False
+            self.selected_tree_debug_text = ""
+            self.load_request_id = max(int(self.load_request_id), 0) + 1
+            request_id = int(self.load_request_id)
+            _ensure_homework_time_range_inputs(self)
+            selected_range, time_range_error = _selected_homework_time_range(self)
+            if time_range_error or selected_range is None:
+                self.caption = ""
+                self.rows = []
+                self.load_error = time_range_error
+                self.loaded_once = True
+                self.loading = False
+                _clear_selected_tree(self)
+                return
+            trade_filter = str(self.trade_filter)
+            author_filter = str(self.author_filter)
+
+        def _run_job() -> _HomeworkBoard:
+            _load_source_read_module().clear_reflex_source_caches()
+            return _load_homework_board(
+                selected_range,
+                trade_filter=trade_filter,
+                author_filter=author_filter,
             )
-            row["topic_label"] = str(
-                board_topic_labels.get(topic_key) or _topic_label(topic_key)
-            ).strip()
-            row["stock_slug"] = stock_slug
-            row["sector_slug"] = sector_slug
-            row["stock_route"] = build_stock_route(topic_key) if stock_slug else ""
-            row["sector_route"] = build_sector_route(topic_key) if sector_slug else ""
-
-        _apply_homework_rows(
-            self,
-            caption=result.caption,
-            rows=result.rows,
-        )
 
-    def _refresh_with_loading(self):
-        self.loading = True
-        self.load_error = ""
-        self.tree_dialog_open = False
-        self.tree_loading = False
-        self.selected_tree_debug_text = ""
-        _ensure_homework_time_range_inputs(self)
-        selected_range, time_range_error = _selected_homework_time_range(self)
-        if time_range_error:
-            self.caption = ""
-            self.rows = []
-            self.load_error = time_range_error
+        try:
+            board = await rx.run_in_thread(_run_job)
+        except BaseException as err:
+            if isinstance(
+                err,
+                (KeyboardInterrupt, SystemExit, GeneratorExit, asyncio.CancelledError),
+            ):
+                raise
+            board = _HomeworkBoard(load_error=str(err))
+        async with self:
+            if int(self.load_request_id) != request_id:
+                return
+            self._apply_board(board)
             self.loaded_once = True
             self.loading = False
-            _clear_selected_tree(self)
-            yield
-            return
-        _load_source_read_module().clear_reflex_source_caches()
-        yield
-        if selected_range is not None:
-            self._refresh(selected_range=selected_range)
-        self.loaded_once = True
-        self.loading = False
 
-    @rx.event
-    def load_data(self):
-        yield from self._refresh_with_loading()
+    @rx.event(background=True)
+    async def load_data(self):
+        await self._refresh_with_loading()
 
     @rx.event
     def load_data_if_needed(self):
         if self.loaded_once:
             return
-        yield from self._refresh_with_loading()
+        return HomeworkState.load_data()
 
     @rx.event
     def set_window_start_local(self, value: str) -> None:
@@ -266,17 +243,17 @@ class HomeworkState(rx.State):
         self.window_start_local = selected_range.start_local
         self.window_end_local = selected_range.end_local
         self.load_error = ""
-        yield from self._refresh_with_loading()
+        return HomeworkState.load_data()
 
     @rx.event
     def set_trade_filter(self, value: str):
         self.trade_filter = str(value or TRADE_FILTER_OPTIONS[0])
-        yield from self._refresh_with_loading()
+        return HomeworkState.load_data()
 
     @rx.event
     def set_author_filter(self, value: str):
         self.author_filter = str(value or AUTHOR_FILTER_ALL)
-        yield from self._refresh_with_loading()
+        return HomeworkState.load_data()
 
     @rx.event
     def set_tree_dialog_open(self, value: bool) -> None:
@@ -456,6 +433,87 @@ class HomeworkState(rx.State):
         self.tree_loading = False
 
 
+@dataclass(frozen=True)
+class _HomeworkBoard:
+    caption: str = ""
+    rows: list[dict[str, str]] = field(default_factory=list)
+    author_options: list[str] = field(default_factory=list)
+    author_filter: str = AUTHOR_FILTER_ALL
+    load_error: str = ""
+
+
+def _load_homework_board(
+    selected_range: HomeworkTimeRange,
+    *,
+    trade_filter: str,
+    author_filter: str,
+) -> _HomeworkBoard:
+    from alphavault_reflex.services.homework_board import TRADE_FILTER_ALL_OPINIONS
+
+    # Determine whether to load only trade actions or all actions
+    trade_only = trade_filter != TRADE_FILTER_ALL_OPINIONS
+
+    assertions, stock_relations, err = (
+        _load_source_read_module().load_homework_board_payload_from_env(
+            format_homework_query_datetime(selected_range.start_utc),
+            format_homework_query_datetime(selected_range.end_exclusive_utc),
+            trade_only=trade_only,
+        )
+    )
+    if err:
+        return _HomeworkBoard(load_error=err)
+
+    board_assertions, board_topic_labels = prepare_board_assertion_rows(
+        assertions,
+        stock_relations=stock_relations,
+    )
+
+    author_options = [AUTHOR_FILTER_ALL] + extract_authors_from_assertions(
+        board_assertions
+    )
+    if author_filter not in author_options:
+        author_filter = AUTHOR_FILTER_ALL
+
+    result = build_board(
+        board_assertions,
+        [],
+        group_col="board_group_key",
+        group_label="主题",
+        range_start_utc=selected_range.start_utc,
+        range_end_exclusive_utc=selected_range.end_exclusive_utc,
+        range_caption=selected_range.caption,
+        age_reference_utc=selected_range.end_reference_utc,
+        trade_filter=trade_filter,
+        author_filter=author_filter,
+    )
+    _fill_trade_board_urls(result.rows)
+    for row in result.rows:
+        topic_key = str(row.get("topic") or "").strip()
+        stock_slug = (
+            topic_key.removeprefix(STOCK_KEY_PREFIX)
+            if topic_key.startswith(STOCK_KEY_PREFIX)
+            else ""
+        )
+        sector_slug = (
+            topic_key.removeprefix(CLUSTER_KEY_PREFIX)
+            if topic_key.startswith(CLUSTER_KEY_PREFIX)
+            else ""
+        )
+        row["topic_label"] = str(
+            board_topic_labels.get(topic_key) or _topic_label(topic_key)
+        ).strip()
+        row["stock_slug"] = stock_slug
+        row["sector_slug"] = sector_slug
+        row["stock_route"] = build_stock_route(topic_key) if stock_slug else ""
+        row["sector_route"] = build_sector_route(topic_key) if sector_slug else ""
+    return _HomeworkBoard(
+        caption=str(result.caption or ""),
+        rows=result.rows,
+        author_options=author_options,
+        author_filter=author_filter,
+    )
+
+
 def _topic_label(topic_key: str) -> str:
     value = str(topic_key or "").strip()
     if ":" not in value:
@@ -175,6 +175,13 @@ def _load_stock_object_index_module() -> ModuleType:
     return importlib.import_module("alphavault.domains.stock.object_index")
 
 
+@cache
+def _load_stock_object_index_cache_module() -> ModuleType:
+    return importlib.import_module(
+        "alphavault_reflex.services.stock_object_index_cache"
+    )
+
+
 @cache
 def _load_organizer_candidates_module() -> ModuleType:
     return importlib.import_module("alphavault_reflex.services.organizer_candidates")
@@ -1633,7 +1640,7 @@ class OrganizerState(rx.State):
 
 def load_search_results(query: str) -> tuple[list[dict[str, str]], str]:
     source_read = _load_source_read_module()
-    posts, assertions, err = source_read.load_sources_from_env()
+    assertions, err = source_read.load_trade_assertions_from_env()
     if err:
         return [], err
     needle = str(query or "").strip()
@@ -1641,9 +1648,12 @@ def load_search_results(query: str) -> tuple[list[dict[str, str]], str]:
     if relation_err:
         return [], relation_err
     rows = _load_research_data_module().build_search_index(
-        posts,
+        [],
         assertions,
         stock_relations=stock_relations,
+        stock_index=_load_stock_object_index_cache_module().load_shared_stock_object_index(
+            assertions, stock_relations=stock_relations
+        ),
     )
     needle = needle.lower()
     if not needle:
@@ -1714,8 +1724,7 @@ def load_pending_rows(
             stock_alias_rows.append(_decorate_stock_alias_row(stock_alias_row))
         return stock_alias_rows[: max(1, int(stock_alias_limit))], ""
 
-    posts, assertions, err = _load_source_read_module().load_sources_from_env()
-    del posts
+    assertions, err = _load_source_read_module().load_trade_assertions_from_env()
     if err:
         return [], err
     section_candidate_rows = _build_section_candidates(assertions, section_key)
@@ -1776,6 +1785,9 @@ def _build_section_candidates(
             limit=SECTION_CANDIDATE_LIMIT,
             candidate_builders_module=_load_candidate_builders_module(),
             stock_object_index_module=_load_stock_object_index_module(),
+            stock_index=_load_stock_object_index_cache_module().load_shared_stock_object_index(
+                assertions
+            ),
         )
     )
 
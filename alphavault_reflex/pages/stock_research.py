@@ -32,6 +32,7 @@ PAGE_ACTION_LOADING = ResearchState.loading
 PAGINATION_ACTION_LOADING = ResearchState.show_signal_pagination_loading
 PAGE_CONTROL_DISABLED = PAGE_LOADING | PAGINATION_ACTION_LOADING
 SIDEBAR_ACTION_LOADING = ResearchState.extras_loading
+RELATED_POSTS_LOADING = ResearchState.related_loading
 PAGE_TITLE = stock_page_title_var()
 HELP_MARK_TEXT = "?"
 SIDEBAR_TOGGLE_TEXT = "关系"
@@ -646,7 +647,7 @@ def stock_research_page() -> rx.Component:
                     width="100%",
                 ),
                 rx.cond(
-                    PAGE_LOADING,
+                    PAGE_LOADING | RELATED_POSTS_LOADING,
                     _section_loading(),
                     rx.cond(
                         ResearchState.has_related_posts,
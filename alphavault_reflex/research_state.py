@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+from dataclasses import dataclass
 import importlib
-from functools import cache
+from functools import cache, partial
+from typing import Callable, TypeVar
 from urllib.parse import parse_qs
 from urllib.parse import urlparse
 import reflex as rx
@@ -11,6 +14,7 @@ from types import ModuleType
 from alphavault_reflex.services.research_page_loader import (
     load_sector_page_view,
     load_stock_page_cached_view,
+    load_stock_page_review_signals,
     load_stock_sidebar_cached_view,
     load_stock_signal_detail_view,
 )
@@ -51,6 +55,54 @@ from alphavault_reflex.services.thread_tree_lines import build_tree_render_lines
 PAGINATION_LOADING_DIRECTION_PREV = "prev"
 PAGINATION_LOADING_DIRECTION_NEXT = "next"
 
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class _StockPageRequest:
+    request_id: int
+    stock_slug: str
+    author_filter: str
+    signal_page: int
+    signal_page_size: int
+    related_filter: str
+
+
+def _load_stock_page_base_view(request: _StockPageRequest) -> dict[str, object]:
+    # Trade reviews are filled in after the signals are on screen.
+    return load_stock_page_cached_view(
+        request.stock_slug,
+        signal_page=request.signal_page,
+        signal_page_size=request.signal_page_size,
+        author=request.author_filter,
+        related_filter=request.related_filter,
+        enrich_reviews=False,
+    )
+
+
+def _build_related_post_rows(
+    signals: list[dict[str, str]], *, stock_key: str
+) -> list[StockRelatedPostRow]:
+    feed = build_related_feed(
+        signals=signals,
+        related_filter=RELATED_FILTER_ALL,
+        limit=max(len(signals), 1),
+    )
+    return [
+        {
+            **row,
+            "author_href": (
+                build_stock_route(
+                    stock_key,
+                    author=str(row.get("author") or "").strip(),
+                )
+                if str(row.get("author") or "").strip()
+                else ""
+            ),
+        }
+        for row in feed.rows
+    ]
+
 
 @cache
 def _load_source_read_module() -> ModuleType:
@@ -94,7 +146,7 @@ class ResearchState(rx.State):
     entity_type: str = ""
     load_error: str = ""
     stock_load_warning: str = ""
-    stock_load_request_id: int = 0
+    page_load_request_id: int = 0
     primary_signals: list[dict[str, str]] = []
     related_items: list[dict[str, str]] = []
     same_company_items: list[dict[str, str]] = []
@@ -102,6 +154,7 @@ class ResearchState(rx.State):
     signal_page_size: int = DEFAULT_SIGNAL_PAGE_SIZE
     signal_total: int = 0
     related_posts: list[StockRelatedPostRow] = []
+    related_loading: bool = False
     related_total: int = 0
     related_filter: str = RELATED_FILTER_ALL
     related_limit: int = DEFAULT_RELATED_LIMIT
@@ -147,6 +200,7 @@ class ResearchState(rx.State):
         return bool(
             self.loaded_once
             and (not self.loading)
+            and (not self.related_loading)
             and (str(self.load_error or "").strip() == "")
             and (not self.related_posts)
         )
@@ -276,41 +330,70 @@ class ResearchState(rx.State):
             == _normalize_author_filter(self.author_filter)
         )
 
-    def _load_stock_page_view(
+    def _is_current_page_load(self, request_id: int) -> bool:
+        return int(self.page_load_request_id) == int(request_id)
+
+    def _next_page_load_request_id(self) -> int:
+        self.page_load_request_id = max(int(self.page_load_request_id), 0) + 1
+        return int(self.page_load_request_id)
+
+    def _fail_page_load(self, err: BaseException) -> None:
+        self.load_error = str(err)
+        self.loading = False
+        self.related_loading = False
+        self.extras_loading = False
+        self.signal_pagination_loading_direction = ""
+
+    async def _run_page_load_step(
+        self,
+        job: Callable[[], _T],
+        apply: Callable[[_T], None],
+        *,
+        is_current: Callable[[], bool],
+    ) -> bool:
+        """Run `job` off the state lock; apply its result unless a newer load won."""
+        try:
+            result = await rx.run_in_thread(job)
+        except BaseException as err:
+            if isinstance(
+                err,
+                (KeyboardInterrupt, SystemExit, GeneratorExit, asyncio.CancelledError),
+            ):
+                raise
+            async with self:
+                if is_current():
+                    self._fail_page_load(err)
+            return False
+        async with self:
+            if not is_current():
+                return False
+            apply(result)
+        return True
+
+    def _next_stock_page_request(
         self,
         stock_slug: str,
         *,
         author_filter: str,
         signal_page: int | None = None,
-    ) -> tuple[dict[str, object], str]:
-        stock_key = _normalize_stock_key(stock_slug)
-        normalized_signal_page = _normalize_signal_page(
-            self.signal_page if signal_page is None else signal_page
+    ) -> _StockPageRequest:
+        return _StockPageRequest(
+            request_id=self._next_page_load_request_id(),
+            stock_slug=stock_slug,
+            author_filter=author_filter,
+            signal_page=_normalize_signal_page(
+                self.signal_page if signal_page is None else signal_page
+            ),
+            signal_page_size=_normalize_signal_page_size(self.signal_page_size),
+            related_filter=normalize_related_filter(self.related_filter),
         )
-        normalized_signal_page_size = _normalize_signal_page_size(self.signal_page_size)
-        normalized_related_filter = normalize_related_filter(self.related_filter)
-        if author_filter:
-            view = load_stock_page_cached_view(
-                stock_slug,
-                signal_page=normalized_signal_page,
-                signal_page_size=normalized_signal_page_size,
-                author=author_filter,
-                related_filter=normalized_related_filter,
-            )
-        else:
-            view = load_stock_page_cached_view(
-                stock_slug,
-                signal_page=normalized_signal_page,
-                signal_page_size=normalized_signal_page_size,
-                related_filter=normalized_related_filter,
-            )
-        return view, stock_key
 
     def _apply_stock_page_view(
         self, view: dict[str, object], *, fallback_stock_key: str
     ) -> None:
         self._apply_stock_primary_view(view, fallback_stock_key=fallback_stock_key)
-        self._refresh_related_posts()
+        self.related_filter = normalize_related_filter(self.related_filter)
+        self.related_total = max(int(self.signal_total or 0), 0)
         self.worker_status_text = str(view.get("worker_status_text") or "").strip()
         self.worker_next_run_at = str(view.get("worker_next_run_at") or "").strip()
         self.worker_cycle_updated_at = str(
@@ -329,75 +412,118 @@ class ResearchState(rx.State):
             or (self.stock_sidebar_loaded and (not self.extras_loading))
         )
 
-    def _load_stock_page_with_pagination_loading(
-        self,
-        *,
-        stock_slug: str,
-        author_filter: str,
-        target_page: int,
-        direction: str,
-    ):
-        self.signal_pagination_loading_direction = direction
-        self.load_error = ""
-        yield
-        try:
-            view, stock_key = self._load_stock_page_view(
-                stock_slug,
-                author_filter=author_filter,
-                signal_page=target_page,
-            )
-            self._apply_stock_page_view(view, fallback_stock_key=stock_key)
-        finally:
+    async def _run_stock_page_load(self, request: _StockPageRequest) -> None:
+        """
+        Signals first, then the related feed and trade reviews side by side.
+        Every step drops its result when a newer page load has started.
+        """
+        is_current = partial(self._is_current_page_load, request.request_id)
+        fallback_stock_key = _normalize_stock_key(request.stock_slug)
+        loaded: list[dict[str, object]] = []
+
+        def _apply_primary(view: dict[str, object]) -> None:
+            self._apply_stock_page_view(view, fallback_stock_key=fallback_stock_key)
+            self.related_loading = True
+            self.loading = False
             self.signal_pagination_loading_direction = ""
+            loaded.append(view)
 
-    @rx.event
-    def load_stock_page(self, stock_slug: str | None = None, author: str | None = None):
-        self.loading = True
-        self.signal_pagination_loading_direction = ""
-        slug = _resolve_route_slug(
-            self, explicit_slug=stock_slug, route_key="stock_slug"
-        )
-        author_filter = _normalize_author_filter(
-            _resolve_query_value(self, explicit_value=author, query_key="author")
-        )
-        is_new_stock = bool(
-            self.entity_type != "stock" or _normalize_stock_key(slug) != self.entity_key
-        )
-        author_changed = author_filter != _normalize_author_filter(self.author_filter)
-        if is_new_stock or author_changed:
-            self.signal_page = 1
-            self.related_limit = DEFAULT_RELATED_LIMIT
-            self.related_tree_expanded = True
-            self._reset_feedback_state(close_dialog=True, clear_success=True)
-            self._reset_signal_detail_state(close_dialog=True)
-        if is_new_stock:
-            self.related_filter = RELATED_FILTER_ALL
-            self._reset_stock_sidebar_state(close_sidebar=True)
-        stock_key = _normalize_stock_key(slug)
-        self.stock_load_request_id = max(int(self.stock_load_request_id), 0) + 1
-        self.entity_type = "stock"
-        self.entity_key = stock_key
-        self.author_filter = author_filter
-        self.load_error = ""
-        self.stock_load_warning = ""
-        self.signals_ready = False
-        self.worker_status_text = ""
-        self.worker_next_run_at = ""
-        self.worker_cycle_updated_at = ""
-        self.worker_running = False
-        self.related_posts = []
-        self.related_total = 0
-        try:
-            view, fallback_stock_key = self._load_stock_page_view(
-                slug,
-                author_filter=author_filter,
+        if not await self._run_page_load_step(
+            partial(_load_stock_page_base_view, request),
+            _apply_primary,
+            is_current=is_current,
+        ):
+            return
+        view = loaded[0]
+        signals = _coerce_rows(view.get("signals"))
+        stock_key = str(
+            view.get("requested_stock_key")
+            or view.get("entity_key")
+            or fallback_stock_key
+        ).strip()
+
+        def _apply_related_posts(rows: list[StockRelatedPostRow]) -> None:
+            self.related_posts = rows
+            self.related_loading = False
+
+        def _apply_review_signals(rows: list[dict[str, object]]) -> None:
+            self.primary_signals = _coerce_rows(rows)
+
+        steps = [
+            self._run_page_load_step(
+                partial(_build_related_post_rows, signals, stock_key=stock_key),
+                _apply_related_posts,
+                is_current=is_current,
             )
-            self._apply_stock_page_view(
-                view,
-                fallback_stock_key=fallback_stock_key,
+        ]
+        if signals and not str(view.get("load_error") or "").strip():
+            steps.append(
+                self._run_page_load_step(
+                    partial(load_stock_page_review_signals, view),
+                    _apply_review_signals,
+                    is_current=is_current,
+                )
             )
-        finally:
-            self.loading = False
+        await asyncio.gather(*steps)
+
+    @rx.event(background=True)
+    async def load_stock_page(
+        self, stock_slug: str | None = None, author: str | None = None
+    ):
+        async with self:
+            self.loading = True
+            self.signal_pagination_loading_direction = ""
+            slug = _resolve_route_slug(
+                self, explicit_slug=stock_slug, route_key="stock_slug"
+            )
+            author_filter = _normalize_author_filter(
+                _resolve_query_value(self, explicit_value=author, query_key="author")
+            )
+            is_new_stock = bool(
+                self.entity_type != "stock"
+                or _normalize_stock_key(slug) != self.entity_key
+            )
+            author_changed = author_filter != _normalize_author_filter(
+                self.author_filter
+            )
+            if is_new_stock or author_changed:
+                self.signal_page = 1
+                self.related_limit = DEFAULT_RELATED_LIMIT
+                self.related_tree_expanded = True
+                self._reset_feedback_state(close_dialog=True, clear_success=True)
+                self._reset_signal_detail_state(close_dialog=True)
+            if is_new_stock:
+                self.related_filter = RELATED_FILTER_ALL
+                self._reset_stock_sidebar_state(close_sidebar=True)
+            request = self._next_stock_page_request(slug, author_filter=author_filter)
+            self.entity_type = "stock"
+            self.entity_key = _normalize_stock_key(slug)
+            self.author_filter = author_filter
+            self.load_error = ""
+            self.stock_load_warning = ""
+            self.signals_ready = False
+            self.worker_status_text = ""
+            self.worker_next_run_at = ""
+            self.worker_cycle_updated_at = ""
+            self.worker_running = False
+            self.related_posts = []
+            self.related_total = 0
+            self.related_loading = False
+        await self._run_stock_page_load(request)
+
+    @rx.event(background=True)
+    async def load_stock_signal_page(self, signal_page: int):
+        async with self:
+            if not self.entity_key.startswith("stock:"):
+                self.signal_pagination_loading_direction = ""
+                return
+            request = self._next_stock_page_request(
+                self.entity_key.removeprefix("stock:"),
+                author_filter=_normalize_author_filter(self.author_filter),
+                signal_page=signal_page,
+            )
+            self.load_error = ""
+        await self._run_stock_page_load(request)
 
     @rx.event
     def load_stock_page_if_needed(self, stock_slug: str | None = None):
@@ -418,8 +544,8 @@ class ResearchState(rx.State):
         self.stock_sidebar_open = False
         self.stock_sidebar_loaded = False
         if author_filter:
-            return self.load_stock_page(slug, author=author_filter)
-        return self.load_stock_page(slug)
+            return ResearchState.load_stock_page(slug, author=author_filter)
+        return ResearchState.load_stock_page(slug)
 
     @rx.event
     def prepare_stock_href_navigation(self, href: str) -> None:
@@ -528,12 +654,12 @@ class ResearchState(rx.State):
         self._reset_feedback_state(close_dialog=True, clear_success=False)
         _load_source_read_module().clear_reflex_source_caches()
         _load_stock_hot_read_module().clear_stock_hot_read_caches()
+        self.feedback_success = success_message
         if self.entity_key.startswith("stock:"):
-            self.load_stock_page(
+            return ResearchState.load_stock_page(
                 self.entity_key.removeprefix("stock:"),
                 author=self.author_filter or None,
             )
-        self.feedback_success = success_message
 
     @rx.event
     def open_stock_sidebar(self):
@@ -545,43 +671,33 @@ class ResearchState(rx.State):
         ):
             return
         self.extras_loading = True
-        return self.load_stock_sidebar(self.entity_key)
+        return ResearchState.load_stock_sidebar(self.entity_key)
 
-    @rx.event
-    def load_stock_sidebar(self, stock_slug: str | None = None):
-        target = str(stock_slug or self.entity_key or "").strip()
-        if not target:
-            self.extras_loading = False
-            return
-        view = load_stock_sidebar_cached_view(target)
+    def _apply_stock_sidebar_view(self, view: dict[str, object]) -> None:
         self.related_items = _prepare_sector_links(view.get("related_sectors"))
         self.extras_updated_at = str(view.get("extras_updated_at") or "").strip()
         self.stock_sidebar_loaded = True
         self.extras_ready = True
         self.extras_loading = False
 
-    def _refresh_related_posts(self) -> None:
-        self.related_filter = normalize_related_filter(self.related_filter)
-        feed = build_related_feed(
-            signals=self.primary_signals,
-            related_filter=RELATED_FILTER_ALL,
-            limit=max(len(self.primary_signals), 1),
+    @rx.event(background=True)
+    async def load_stock_sidebar(self, stock_slug: str | None = None):
+        async with self:
+            target = str(stock_slug or self.entity_key or "").strip()
+            if not target:
+                self.extras_loading = False
+                return
+            # Page loads of the same stock keep the sidebar; only a new stock drops it.
+            entity_key = str(self.entity_key or "").strip()
+
+        def _same_stock() -> bool:
+            return self.entity_type == "stock" and self.entity_key == entity_key
+
+        await self._run_page_load_step(
+            partial(load_stock_sidebar_cached_view, target),
+            self._apply_stock_sidebar_view,
+            is_current=_same_stock,
         )
-        self.related_posts = [
-            {
-                **row,
-                "author_href": (
-                    build_stock_route(
-                        self.entity_key,
-                        author=str(row.get("author") or "").strip(),
-                    )
-                    if str(row.get("author") or "").strip()
-                    else ""
-                ),
-            }
-            for row in feed.rows
-        ]
-        self.related_total = max(int(self.signal_total or 0), 0)
 
     def _apply_stock_primary_view(
         self, view: dict[str, object], *, fallback_stock_key: str
@@ -631,12 +747,8 @@ class ResearchState(rx.State):
             return
         if not self.entity_key.startswith("stock:"):
             return
-        yield from self._load_stock_page_with_pagination_loading(
-            stock_slug=self.entity_key.removeprefix("stock:"),
-            author_filter=_normalize_author_filter(self.author_filter),
-            target_page=page - 1,
-            direction=PAGINATION_LOADING_DIRECTION_PREV,
-        )
+        self.signal_pagination_loading_direction = PAGINATION_LOADING_DIRECTION_PREV
+        return ResearchState.load_stock_signal_page(page - 1)
 
     @rx.event
     def next_signal_page(self):
@@ -648,18 +760,14 @@ class ResearchState(rx.State):
             return
         if not self.entity_key.startswith("stock:"):
             return
-        yield from self._load_stock_page_with_pagination_loading(
-            stock_slug=self.entity_key.removeprefix("stock:"),
-            author_filter=_normalize_author_filter(self.author_filter),
-            target_page=page + 1,
-            direction=PAGINATION_LOADING_DIRECTION_NEXT,
-        )
+        self.signal_pagination_loading_direction = PAGINATION_LOADING_DIRECTION_NEXT
+        return ResearchState.load_stock_signal_page(page + 1)
 
     @rx.event
     def set_signal_page_size(self, value: str):
         self.signal_page_size = _normalize_signal_page_size(value)
         self.signal_page = 1
-        return self.load_stock_page(
+        return ResearchState.load_stock_page(
             self.entity_key.removeprefix("stock:"),
             author=self.author_filter or None,
         )
@@ -669,7 +777,7 @@ class ResearchState(rx.State):
         self.related_filter = normalize_related_filter(value)
         self.signal_page = 1
         if self.entity_key.startswith("stock:"):
-            return self.load_stock_page(
+            return ResearchState.load_stock_page(
                 self.entity_key.removeprefix("stock:"),
                 author=self.author_filter or None,
             )
@@ -682,7 +790,7 @@ class ResearchState(rx.State):
             current + int(RELATED_LIMIT_STEP),
         )
         if self.entity_key.startswith("stock:"):
-            return self.load_stock_page(
+            return ResearchState.load_stock_page(
                 self.entity_key.removeprefix("stock:"),
                 author=self.author_filter or None,
             )
@@ -692,23 +800,14 @@ class ResearchState(rx.State):
         _load_source_read_module().clear_reflex_source_caches()
         _load_stock_hot_read_module().clear_stock_hot_read_caches()
         if self.entity_key.startswith("stock:"):
-            return self.load_stock_page(
+            return ResearchState.load_stock_page(
                 self.entity_key.removeprefix("stock:"),
                 author=self.author_filter or None,
             )
 
-    @rx.event
-    def load_sector_page(self, sector_slug: str | None = None) -> None:
-        self.loading = True
-        self._reset_feedback_state(close_dialog=True, clear_success=True)
-        self._reset_signal_detail_state(close_dialog=True)
-        slug = _resolve_route_slug(
-            self,
-            explicit_slug=sector_slug,
-            route_key="sector_slug",
-        )
-        sector_key = str(slug or "").strip()
-        view = load_sector_page_view(sector_key)
+    def _apply_sector_page_view(
+        self, view: dict[str, object], *, sector_key: str
+    ) -> None:
         self.page_title = str(view.get("page_title") or "").strip()
         self.entity_key = f"cluster:{sector_key}" if sector_key else ""
         self.entity_type = "sector"
@@ -727,8 +826,28 @@ class ResearchState(rx.State):
         self.same_company_items = []
         self.related_items = _prepare_stock_links(view.get("related_stocks"))
         self.loaded_once = True
+        self.related_loading = False
         self.loading = False
 
+    @rx.event(background=True)
+    async def load_sector_page(self, sector_slug: str | None = None):
+        async with self:
+            self.loading = True
+            self._reset_feedback_state(close_dialog=True, clear_success=True)
+            self._reset_signal_detail_state(close_dialog=True)
+            slug = _resolve_route_slug(
+                self,
+                explicit_slug=sector_slug,
+                route_key="sector_slug",
+            )
+            sector_key = str(slug or "").strip()
+            request_id = self._next_page_load_request_id()
+        await self._run_page_load_step(
+            partial(load_sector_page_view, sector_key),
+            partial(self._apply_sector_page_view, sector_key=sector_key),
+            is_current=partial(self._is_current_page_load, request_id),
+        )
+
     @rx.event
     def load_sector_page_if_needed(self, sector_slug: str | None = None) -> None:
         slug = _resolve_route_slug(
@@ -744,7 +863,7 @@ class ResearchState(rx.State):
             and target_entity_key == self.entity_key
         ):
             return
-        return self.load_sector_page(slug)
+        return ResearchState.load_sector_page(slug)
 
 
 _RESEARCH_ROUTE_ARGS = {
@@ -14,6 +14,7 @@ def build_section_candidates(
     limit: int,
     candidate_builders_module,
     stock_object_index_module,
+    stock_index=None,
 ) -> list[dict[str, str]]:
     if section == SECTION_STOCK_ALIAS:
         return _stock_candidates_for_relation_type(
@@ -22,6 +23,7 @@ def build_section_candidates(
             limit=limit,
             candidate_builders_module=candidate_builders_module,
             stock_object_index_module=stock_object_index_module,
+            stock_index=stock_index,
         )
     if section == SECTION_STOCK_SECTOR:
         return _stock_candidates_for_relation_type(
@@ -30,6 +32,7 @@ def build_section_candidates(
             limit=limit,
             candidate_builders_module=candidate_builders_module,
             stock_object_index_module=stock_object_index_module,
+            stock_index=stock_index,
         )
     return _sector_relation_candidates(
         assertions,
@@ -45,8 +48,10 @@ def _stock_candidates_for_relation_type(
     limit: int,
     candidate_builders_module,
     stock_object_index_module,
+    stock_index=None,
 ) -> list[dict[str, str]]:
-    stock_index = stock_object_index_module.build_stock_object_index(assertions)
+    if stock_index is None:
+        stock_index = stock_object_index_module.build_stock_object_index(assertions)
     out: list[dict[str, str]] = []
     for stock_key in unique_stock_keys(assertions):
         out.extend(
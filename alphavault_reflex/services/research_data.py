@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 from alphavault.domains.content.row_mapper import map_posts
 from alphavault.domains.signal.aggregator import (
@@ -27,6 +28,9 @@ from alphavault_reflex.services.research_models import (
     build_stock_route,
 )
 
+if TYPE_CHECKING:
+    from alphavault.domains.stock.object_index import StockObjectIndex
+
 
 def build_search_index(
     posts: list[dict[str, object]],
@@ -34,6 +38,7 @@ def build_search_index(
     *,
     stock_relations: list[dict[str, object]] | None = None,
     ai_alias_map: dict[str, str] | None = None,
+    stock_index: StockObjectIndex | None = None,
 ) -> list[dict[str, str]]:
     del posts
     if not assertions:
@@ -43,6 +48,7 @@ def build_search_index(
         assertion_models,
         stock_relations=stock_relations,
         ai_alias_map=ai_alias_map,
+        stock_index=stock_index,
     )
     sector_hits: dict[str, dict[str, str]] = {}
 
@@ -2,8 +2,17 @@ from __future__ import annotations
 
 from alphavault.capabilities.post_detail import PostDetailResult
 from alphavault.capabilities.post_detail import get_post_detail
-from alphavault.capabilities.stock_page import get_stock_page, get_stock_sidebar
+from alphavault.capabilities.stock_page import (
+    enrich_stock_page_signals,
+    get_stock_page,
+    get_stock_sidebar,
+)
 from alphavault.domains.stock.view_scope import STOCK_VIEW_SCOPE_COMPANY
+from alphavault.domains.thread_tree.parse import (
+    clean_id,
+    extract_parent_post_id,
+    parse_weibo_csv_raw_fields,
+)
 from dataclasses import asdict
 import importlib
 from functools import cache
@@ -20,6 +29,14 @@ def _load_source_read_module() -> ModuleType:
     return importlib.import_module("alphavault_reflex.services.source_read")
 
 
+@cache
+def _load_hot_view_cache_module() -> ModuleType:
+    return importlib.import_module("alphavault.infra.hot_view_cache")
+
+
+_SECTOR_VIEW_VARIANT = "sector_page"
+
+
 def load_stock_page_cached_view(
     stock_slug: str,
     *,
@@ -27,6 +44,7 @@ def load_stock_page_cached_view(
     signal_page_size: int,
     author: str = "",
     related_filter: str = "all",
+    enrich_reviews: bool = True,
 ) -> dict[str, object]:
     return get_stock_page(
         stock_slug,
@@ -35,9 +53,14 @@ def load_stock_page_cached_view(
         author=author,
         related_filter=related_filter,
         view_scope=STOCK_VIEW_SCOPE_COMPANY,
+        enrich_reviews=enrich_reviews,
     )
 
 
+def load_stock_page_review_signals(view: dict[str, object]) -> list[dict[str, object]]:
+    return enrich_stock_page_signals(view)
+
+
 def load_stock_sidebar_cached_view(stock_slug: str) -> dict[str, object]:
     return get_stock_sidebar(stock_slug)
 
@@ -48,7 +71,56 @@ def load_stock_signal_detail_view(post_uid: str) -> PostDetailResult:
 
 def load_sector_page_view(sector_slug: str) -> dict[str, object]:
     sector_key = str(sector_slug or "").strip()
-    posts, assertions, err = _load_source_read_module().load_sources_from_env()
+    hot_view_cache = _load_hot_view_cache_module()
+    client = hot_view_cache.get_hot_view_redis()
+    max_age_seconds = hot_view_cache.resolve_hot_view_max_age_seconds()
+    entity_key = f"cluster:{sector_key}"
+    cached = hot_view_cache.load_hot_view(
+        client,
+        entity_key=entity_key,
+        variant=_SECTOR_VIEW_VARIANT,
+        max_age_seconds=max_age_seconds,
+    )
+    if cached is not None:
+        return cached
+    # Read before the SQL so a write landing mid-query still drops the view.
+    generations = hot_view_cache.read_hot_view_generations(
+        client,
+        [hot_view_cache.HOT_VIEW_ALL_ENTITIES, hot_view_cache.HOT_VIEW_ALL_SECTORS],
+    )
+    result = _load_sector_page_view(sector_key)
+    if generations and not result["load_error"]:
+        hot_view_cache.store_hot_view(
+            client,
+            entity_key=entity_key,
+            variant=_SECTOR_VIEW_VARIANT,
+            view=result,
+            generations=generations,
+            max_age_seconds=max_age_seconds,
+        )
+    return result
+
+
+def _load_sector_page_view(sector_key: str) -> dict[str, object]:
+    source_read = _load_source_read_module()
+    assertions, err = source_read.load_trade_assertions_from_env()
+    # Only this sector's posts are fetched: the page never shows the rest.
+    sector_assertions = [
+        row
+        for row in assertions
+        if sector_key
+        in {str(item or "").strip() for item in row.get("cluster_keys") or []}
+    ]
+    posts: list[dict[str, object]] = []
+    if not err and sector_assertions:
+        posts, err = source_read.load_trade_posts_by_uid_from_env(
+            [str(row.get("post_uid") or "") for row in sector_assertions]
+        )
+    parent_post_uids = _thread_parent_post_uids(posts) if not err else []
+    if parent_post_uids:
+        # Parents complete the threads; they need no sector assertion.
+        parents, err = source_read.load_trade_posts_by_uid_from_env(parent_post_uids)
+        posts = [*posts, *parents]
     if err:
         return {
             "page_title": sector_key,
@@ -58,7 +130,7 @@ def load_sector_page_view(sector_slug: str) -> dict[str, object]:
         }
     view = _load_research_data_module().build_sector_research_page_view(
         posts,
-        assertions,
+        sector_assertions,
         sector_key=sector_key,
     )
     result = asdict(view)
@@ -66,9 +138,27 @@ def load_sector_page_view(sector_slug: str) -> dict[str, object]:
     return result
 
 
+def _thread_parent_post_uids(posts: list[dict[str, object]]) -> list[str]:
+    """Uids of the reposted parents named in the posts' raw CSV fields."""
+    loaded = {str(post.get("post_uid") or "").strip() for post in posts}
+    out: list[str] = []
+    for post in posts:
+        post_uid = str(post.get("post_uid") or "").strip()
+        platform, sep, _post_id = post_uid.partition(":")
+        csv_fields = parse_weibo_csv_raw_fields(str(post.get("raw_text") or ""))
+        parent_id = clean_id(extract_parent_post_id(csv_fields=csv_fields))
+        if not sep or not parent_id:
+            continue
+        parent_uid = f"{platform}:{parent_id}"
+        if parent_uid not in loaded and parent_uid not in out:
+            out.append(parent_uid)
+    return out
+
+
 __all__ = [
     "load_sector_page_view",
     "load_stock_page_cached_view",
+    "load_stock_page_review_signals",
     "load_stock_sidebar_cached_view",
     "load_stock_signal_detail_view",
 ]
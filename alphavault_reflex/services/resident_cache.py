@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import sys
+import threading
+from types import MappingProxyType
+from typing import Callable, Hashable, Iterable, Mapping
+
+RowTuple = tuple[Mapping[str, object], ...]
+
+_registry_lock = threading.Lock()
+_registry: dict[str, "ResidentRowCache"] = {}
+
+
+def estimate_rows_resident_bytes(rows: Iterable[dict[str, object]]) -> int:
+    """Rough bytes held by row dicts; keys are shared column names, so skipped."""
+    rows = tuple(rows)
+    total = sys.getsizeof(rows)
+    for row in rows:
+        total += sys.getsizeof(row)
+        for value in row.values():
+            total += sys.getsizeof(value)
+            if isinstance(value, (list, tuple)):
+                total += sum(sys.getsizeof(item) for item in value)
+    return total
+
+
+class ResidentRowCache:
+    """
+    Bounded LRU of row tuples that keeps a running size estimate.
+
+    Rows are copied once on `put` and handed out as read-only mappings, so
+    every caller shares the cached tuple without being able to change it.
+    Entries are evicted oldest first once either `max_entries` or
+    `max_bytes` (0 = no byte cap) is exceeded.
+    """
+
+    def __init__(self, name: str, *, max_entries: int, max_bytes: int = 0) -> None:
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[RowTuple, int]] = OrderedDict()
+        self._resident_bytes = 0
+        self._rows = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> RowTuple | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key: Hashable, rows: Iterable[Mapping[str, object]]) -> RowTuple:
+        owned = [dict(row) for row in rows]
+        size = estimate_rows_resident_bytes(owned)
+        frozen: RowTuple = tuple(MappingProxyType(row) for row in owned)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._resident_bytes -= old[1]
+                self._rows -= len(old[0])
+            self._entries[key] = (frozen, size)
+            self._resident_bytes += size
+            self._rows += len(frozen)
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes and self._resident_bytes > self.max_bytes)
+            ):
+                _old_key, (old_rows, old_size) = self._entries.popitem(last=False)
+                self._resident_bytes -= old_size
+                self._rows -= len(old_rows)
+                self._stats["evictions"] += 1
+        return frozen
+
+    def get_or_load(
+        self, key: Hashable, load_fn: Callable[[], Iterable[Mapping[str, object]]]
+    ) -> RowTuple:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return self.put(key, load_fn())
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._resident_bytes = 0
+            self._rows = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            out["entries"] = len(self._entries)
+            out["rows"] = self._rows
+            out["resident_bytes"] = self._resident_bytes
+        return out
+
+
+def register_resident_cache(
+    name: str, *, max_entries: int, max_bytes: int = 0
+) -> ResidentRowCache:
+    with _registry_lock:
+        cache = _registry.get(name)
+        if cache is None:
+            cache = ResidentRowCache(name, max_entries=max_entries, max_bytes=max_bytes)
+            _registry[name] = cache
+        return cache
+
+
+def resident_cache_stats() -> dict[str, dict[str, int]]:
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+__all__ = [
+    "ResidentRowCache",
+    "estimate_rows_resident_bytes",
+    "register_resident_cache",
+    "resident_cache_stats",
+]
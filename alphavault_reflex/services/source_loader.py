@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from functools import lru_cache
+import os
 
 from alphavault.constants import (
     ENV_POSTGRES_DSN,
@@ -18,11 +19,16 @@ from alphavault.db.postgres_db import (
 from alphavault.db.postgres_env import (
     load_configured_postgres_sources_from_env,
     PostgresSource,
+    infer_platform_from_post_uid,
 )
 from alphavault.db.sql.common import make_in_params, make_in_placeholders
-from alphavault.db.sql.ui import build_assertions_query
-from alphavault.db.sql_rows import read_sql_rows
+from alphavault.db.sql.ui import (
+    build_assertion_projection_expr,
+    build_assertion_rollup_joins,
+)
+from alphavault.db.sql_rows import iter_sql_row_pages, read_sql_rows
 from alphavault.env import load_dotenv_if_present
+from alphavault.logging_config import get_logger
 from alphavault.research_workbench import (
     RESEARCH_RELATIONS_TABLE,
     get_official_names_by_stock_keys,
@@ -34,6 +40,12 @@ from alphavault_reflex.services.source_read_utils import (
     normalize_posts_datetime_rows,
     parse_json_list,
 )
+from alphavault_reflex.services.resident_cache import (
+    RowTuple,
+    register_resident_cache,
+)
+
+logger = get_logger(__name__)
 
 _FATAL_BASE_EXCEPTIONS = (KeyboardInterrupt, SystemExit, GeneratorExit)
 _SOURCE_SCHEMA_NAMES = frozenset((SCHEMA_WEIBO, SCHEMA_XUEQIU))
@@ -42,6 +54,21 @@ MISSING_POSTGRES_DSN_ERROR = f"Missing {ENV_POSTGRES_DSN}"
 SOURCE_SCHEMAS_EMPTY_ERROR = "source_schemas_empty"
 STOCK_ALIAS_FAST_WINDOW_DAYS = 30
 STOCK_ALIAS_FAST_LIMIT = 30
+ENV_REFLEX_TRADE_SOURCE_WINDOW_DAYS = "REFLEX_TRADE_SOURCE_WINDOW_DAYS"
+DEFAULT_REFLEX_TRADE_SOURCE_WINDOW_DAYS = 180
+ENV_REFLEX_TRADE_SOURCE_MAX_ROWS = "REFLEX_TRADE_SOURCE_MAX_ROWS"
+DEFAULT_REFLEX_TRADE_SOURCE_MAX_ROWS = 50000
+TRADE_SOURCE_PAGE_SIZE = 2000
+TRADE_POST_CACHE_MAX_POSTS = 4096
+TRADE_POST_LOOKUP_CHUNK_SIZE = 500
+
+# One shared copy per (db, source, window); posts are cached one uid each.
+_TRADE_ASSERTION_WINDOWS = register_resident_cache(
+    "trade_assertion_windows", max_entries=2
+)
+_TRADE_POSTS_BY_UID = register_resident_cache(
+    "trade_posts_by_uid", max_entries=TRADE_POST_CACHE_MAX_POSTS
+)
 
 WANTED_TRADE_ASSERTION_COLUMNS = [
     "post_uid",
@@ -214,8 +241,8 @@ def standardize_assertions_rows(
         post_row = posts_by_uid.get(post_uid, {})
         row["post_uid"] = post_uid
         row["source"] = resolved_source_name
-        row["url"] = _clean_text(post_row.get("url"))
-        row["raw_text"] = _clean_text(post_row.get("raw_text"))
+        row["url"] = _clean_text(post_row.get("url") or row.get("url"))
+        row["raw_text"] = _clean_text(post_row.get("raw_text") or row.get("raw_text"))
 
         if _is_missing_value(row.get("author")):
             row["author"] = post_row.get("author", "")
@@ -237,70 +264,158 @@ def standardize_assertions_rows(
     return normalized
 
 
-@lru_cache(maxsize=2)
-def load_trade_sources_rows_cached(
+def resolve_trade_source_window_days() -> int:
+    raw = os.getenv(ENV_REFLEX_TRADE_SOURCE_WINDOW_DAYS, "").strip()
+    try:
+        days = int(raw) if raw else DEFAULT_REFLEX_TRADE_SOURCE_WINDOW_DAYS
+    except ValueError:
+        days = DEFAULT_REFLEX_TRADE_SOURCE_WINDOW_DAYS
+    return max(1, days)
+
+
+def resolve_trade_source_max_rows() -> int:
+    raw = os.getenv(ENV_REFLEX_TRADE_SOURCE_MAX_ROWS, "").strip()
+    try:
+        rows = int(raw) if raw else DEFAULT_REFLEX_TRADE_SOURCE_MAX_ROWS
+    except ValueError:
+        rows = DEFAULT_REFLEX_TRADE_SOURCE_MAX_ROWS
+    return max(1, rows)
+
+
+def _trade_assertion_window_query(schema_name: str) -> str:
+    # Author and url come from the joined post so the window never needs the
+    # posts themselves; raw_text is fetched per displayed post instead.
+    projection = build_assertion_projection_expr(
+        [col for col in WANTED_TRADE_ASSERTION_COLUMNS if col != "author"]
+    )
+    assertion_rollup_joins = build_assertion_rollup_joins(
+        "a",
+        assertion_rollups_table=source_table(schema_name, "assertion_rollups"),
+        topic_cluster_topics_table=source_table(schema_name, "topic_cluster_topics"),
+    )
+    return f"""
+SELECT {projection}, p.author AS author, p.url AS url
+FROM {source_table(schema_name, "assertions")} a
+JOIN {source_table(schema_name, "posts")} p ON p.post_uid = a.post_uid
+{assertion_rollup_joins}
+WHERE p.processed_at IS NOT NULL
+  AND a.action LIKE 'trade.%'
+  AND p.created_at_ts >= CAST(:cutoff AS timestamptz)
+ORDER BY p.created_at_ts DESC, a.post_uid DESC, a.idx DESC
+"""
+
+
+def _load_trade_assertion_window(
+    db_url: str, schema_name: str, window_days: int
+) -> tuple[dict[str, object], ...]:
+    engine = ensure_postgres_engine(db_url, schema_name=schema_name)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=window_days)
+    max_rows = resolve_trade_source_max_rows()
+    rows: list[dict[str, object]] = []
+    truncated = False
+    with postgres_connect_autocommit(engine) as conn:
+        pages = iter_sql_row_pages(
+            conn,
+            _trade_assertion_window_query(schema_name),
+            params={"cutoff": cutoff},
+            page_size=TRADE_SOURCE_PAGE_SIZE,
+        )
+        try:
+            for page in pages:
+                page = normalize_assertions_datetime_rows(
+                    standardize_assertions_rows(page, [], source_name=schema_name)
+                )
+                rows.extend(page[: max_rows - len(rows)])
+                if len(rows) >= max_rows:
+                    truncated = True
+                    break
+        finally:
+            # End the cursor's transaction before the connection goes back.
+            pages.close()
+    if truncated:
+        logger.warning(
+            "[reflex] trade_source_window_truncated source=%s window_days=%s "
+            "max_rows=%s",
+            schema_name,
+            window_days,
+            max_rows,
+        )
+    return tuple(rows)
+
+
+def load_trade_assertion_rows_cached(
     db_url: str, auth_token: str, source_name: str
-) -> tuple[tuple[dict[str, object], ...], tuple[dict[str, object], ...]]:
+) -> RowTuple:
+    """
+    Trade assertions of the recent window, newest first.
+
+    Rows are streamed page by page and kept once in a shared resident cache;
+    the returned tuple is that cached copy of read-only rows.
+    """
     del auth_token
     schema_name = source_schema_name(source_name)
+    window_days = resolve_trade_source_window_days()
+    return _TRADE_ASSERTION_WINDOWS.get_or_load(
+        (db_url, schema_name, window_days),
+        lambda: _load_trade_assertion_window(db_url, schema_name, window_days),
+    )
+
+
+def _query_trade_posts(
+    db_url: str, schema_name: str, post_uids: list[str]
+) -> list[dict[str, object]]:
     engine = ensure_postgres_engine(db_url, schema_name=schema_name)
-    posts_table = source_table(schema_name, "posts")
-    assertions_table = source_table(schema_name, "assertions")
-    assertion_entities_table = source_table(schema_name, "assertion_entities")
-    assertion_mentions_table = source_table(schema_name, "assertion_mentions")
-    topic_cluster_topics_table = source_table(schema_name, "topic_cluster_topics")
+    rows: list[dict[str, object]] = []
     with postgres_connect_autocommit(engine) as conn:
-        posts_query = f"""
+        for start_idx in range(0, len(post_uids), TRADE_POST_LOOKUP_CHUNK_SIZE):
+            chunk = post_uids[start_idx : start_idx + TRADE_POST_LOOKUP_CHUNK_SIZE]
+            placeholders = make_in_placeholders(prefix="post_uid_", count=len(chunk))
+            sql = f"""
 SELECT {", ".join(WANTED_POST_COLUMNS_FOR_TREE)}
-FROM {posts_table}
+FROM {source_table(schema_name, "posts")}
 WHERE processed_at IS NOT NULL
+  AND post_uid IN ({placeholders})
 """
-        base_query = build_assertions_query(
-            WANTED_TRADE_ASSERTION_COLUMNS,
-            posts_table=posts_table,
-            assertions_table=assertions_table,
-            assertion_entities_table=assertion_entities_table,
-            assertion_mentions_table=assertion_mentions_table,
-            topic_cluster_topics_table=topic_cluster_topics_table,
-        )
-        trade_query = f"{base_query} WHERE action LIKE 'trade.%'"
-
-        posts = read_sql_rows(conn, posts_query)
-        assertions = read_sql_rows(conn, trade_query)
-
-    normalized_posts = standardize_posts_rows(posts, source_name=schema_name)
-    normalized_posts = normalize_posts_datetime_rows(normalized_posts)
-    normalized_posts = ensure_platform_post_id_rows(normalized_posts)
-    normalized_assertions = standardize_assertions_rows(
-        assertions,
-        normalized_posts,
-        source_name=schema_name,
-    )
-    normalized_assertions = normalize_assertions_datetime_rows(normalized_assertions)
-    return tuple(dict(row) for row in normalized_posts), tuple(
-        dict(row) for row in normalized_assertions
-    )
-
-
-@lru_cache(maxsize=2)
-def load_trade_sources_cached(
-    db_url: str, auth_token: str, source_name: str
-) -> tuple[tuple[dict[str, object], ...], tuple[dict[str, object], ...]]:
-    return load_trade_sources_rows_cached(db_url, auth_token, source_name)
+            rows.extend(
+                read_sql_rows(
+                    conn, sql, params=make_in_params(prefix="post_uid_", values=chunk)
+                )
+            )
+    posts = standardize_posts_rows(rows, source_name=schema_name)
+    posts = normalize_posts_datetime_rows(posts)
+    return ensure_platform_post_id_rows(posts)
 
 
-@lru_cache(maxsize=2)
-def load_trade_assertion_rows_cached(
-    db_url: str, auth_token: str, source_name: str
-) -> tuple[dict[str, object], ...]:
-    _, assertions = load_trade_sources_rows_cached(db_url, auth_token, source_name)
-    return tuple(dict(row) for row in assertions)
+def load_trade_posts_by_uid_cached(
+    db_url: str, auth_token: str, source_name: str, post_uids: list[str]
+) -> RowTuple:
+    """Posts for the given uids, fetching only the ones not cached yet."""
+    del auth_token
+    schema_name = source_schema_name(source_name)
+    wanted = [
+        uid for uid in dict.fromkeys(_clean_text(uid) for uid in post_uids) if uid
+    ]
+    found: dict[str, RowTuple] = {}
+    missing: list[str] = []
+    for uid in wanted:
+        cached = _TRADE_POSTS_BY_UID.get((db_url, schema_name, uid))
+        if cached is None:
+            missing.append(uid)
+        else:
+            found[uid] = cached
+    if missing:
+        loaded: dict[str, tuple[dict[str, object], ...]] = {uid: () for uid in missing}
+        for row in _query_trade_posts(db_url, schema_name, missing):
+            loaded[_clean_text(row.get("post_uid"))] = (row,)
+        for uid, rows in loaded.items():
+            # Unprocessed uids are cached empty so they are not queried again.
+            found[uid] = _TRADE_POSTS_BY_UID.put((db_url, schema_name, uid), rows)
+    return tuple(row for uid in wanted for row in found.get(uid, ()))
 
 
-def load_trade_assertions_cached(
-    db_url: str, auth_token: str, source_name: str
-) -> tuple[dict[str, object], ...]:
-    return load_trade_assertion_rows_cached(db_url, auth_token, source_name)
+def clear_trade_source_caches() -> None:
+    _TRADE_ASSERTION_WINDOWS.cache_clear()
+    _TRADE_POSTS_BY_UID.cache_clear()
 
 
 def _stock_alias_candidate_query(schema_name: str) -> str:
@@ -499,7 +614,7 @@ def load_stock_alias_candidate_rows_cached(
     return _normalize_stock_alias_candidate_rows(rows)
 
 
-def load_trade_assertion_rows_from_env(
+def load_trade_assertions_from_env(
     *,
     load_cached_fn=load_trade_assertion_rows_cached,
 ) -> tuple[list[dict[str, object]], str]:
@@ -525,29 +640,44 @@ def load_trade_assertion_rows_from_env(
     return rows, ""
 
 
-def load_trade_assertions_from_env(
+def load_trade_posts_by_uid_from_env(
+    post_uids: list[str],
     *,
-    load_cached_fn=load_trade_assertions_cached,
+    load_cached_fn=load_trade_posts_by_uid_cached,
 ) -> tuple[list[dict[str, object]], str]:
+    wanted = [
+        uid for uid in dict.fromkeys(_clean_text(uid) for uid in post_uids) if uid
+    ]
+    if not wanted:
+        return [], ""
     load_dotenv_if_present()
     sources = load_configured_source_schemas_from_env()
     if not sources:
         return [], MISSING_POSTGRES_DSN_ERROR
 
+    platform_by_uid = {uid: infer_platform_from_post_uid(uid) for uid in wanted}
+    source_names = {source.name for source in sources}
     rows: list[dict[str, object]] = []
     for source in sources:
+        # Uids name their platform; only ask other sources about unknown ones.
+        source_uids = [
+            uid
+            for uid, platform in platform_by_uid.items()
+            if platform == source.name or platform not in source_names
+        ]
+        if not source_uids:
+            continue
         try:
             rows.extend(
                 dict(row)
-                for row in load_cached_fn(source.url, source.token, source.name)
+                for row in load_cached_fn(
+                    source.url, source.token, source.name, source_uids
+                )
             )
         except BaseException as err:
             if isinstance(err, _FATAL_BASE_EXCEPTIONS):
                 raise
             return [], f"postgres_connect_error:{source.name}:{type(err).__name__}"
-
-    if not rows:
-        return [], SOURCE_SCHEMAS_EMPTY_ERROR
     return rows, ""
 
 
@@ -610,53 +740,26 @@ def load_stock_alias_candidates_from_env(
     ], ""
 
 
-def load_sources_rows_from_env(
-    *,
-    load_posts_for_tree_from_env_fn,
-    load_trade_assertions_from_env_fn=load_trade_assertion_rows_from_env,
-) -> tuple[list[dict[str, object]], list[dict[str, object]], str]:
-    load_dotenv_if_present()
-    posts, posts_err = load_posts_for_tree_from_env_fn()
-    if posts_err:
-        return [], [], posts_err
-    assertions, assertions_err = load_trade_assertions_from_env_fn()
-    if assertions_err:
-        return [], [], assertions_err
-    return posts, assertions, ""
-
-
-def load_sources_from_env(
-    *,
-    load_posts_for_tree_from_env_fn,
-    load_trade_assertions_from_env_fn=load_trade_assertions_from_env,
-) -> tuple[list[dict[str, object]], list[dict[str, object]], str]:
-    load_dotenv_if_present()
-    posts, posts_err = load_posts_for_tree_from_env_fn()
-    if posts_err:
-        return [], [], posts_err
-    assertions, assertions_err = load_trade_assertions_from_env_fn()
-    if assertions_err:
-        return [], [], assertions_err
-    return posts, assertions, ""
-
-
 __all__ = [
     "DEFAULT_FATAL_EXCEPTIONS",
+    "DEFAULT_REFLEX_TRADE_SOURCE_MAX_ROWS",
+    "DEFAULT_REFLEX_TRADE_SOURCE_WINDOW_DAYS",
+    "ENV_REFLEX_TRADE_SOURCE_MAX_ROWS",
+    "ENV_REFLEX_TRADE_SOURCE_WINDOW_DAYS",
     "MISSING_POSTGRES_DSN_ERROR",
     "SOURCE_SCHEMAS_EMPTY_ERROR",
     "WANTED_POST_COLUMNS_FOR_TREE",
     "WANTED_TRADE_ASSERTION_COLUMNS",
+    "clear_trade_source_caches",
     "load_configured_source_schemas_from_env",
-    "load_sources_from_env",
-    "load_sources_rows_from_env",
     "load_stock_alias_candidate_rows_cached",
     "load_stock_alias_candidates_from_env",
     "load_trade_assertion_rows_cached",
-    "load_trade_assertion_rows_from_env",
-    "load_trade_assertions_cached",
     "load_trade_assertions_from_env",
-    "load_trade_sources_cached",
-    "load_trade_sources_rows_cached",
+    "load_trade_posts_by_uid_cached",
+    "load_trade_posts_by_uid_from_env",
+    "resolve_trade_source_max_rows",
+    "resolve_trade_source_window_days",
     "source_schema_name",
     "source_table",
     "standardize_assertions_rows",
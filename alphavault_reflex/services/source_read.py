@@ -35,9 +35,7 @@ _CACHE_CLEAR_TARGETS = (
     (
         "alphavault_reflex.services.source_loader",
         (
-            "load_trade_sources_cached",
-            "load_trade_sources_rows_cached",
-            "load_trade_assertion_rows_cached",
+            "clear_trade_source_caches",
             "load_stock_alias_candidate_rows_cached",
         ),
     ),
@@ -59,10 +57,6 @@ _CACHE_CLEAR_TARGETS = (
             "load_stock_alias_relation_rows_cached",
         ),
     ),
-    (
-        "alphavault_reflex.services.tree_loader",
-        ("load_single_post_for_tree_cached",),
-    ),
     (
         "alphavault_reflex.services.url_loader",
         ("load_post_urls_cached",),
@@ -134,12 +128,17 @@ def _load_url_loader_module() -> ModuleType:
     return importlib.import_module("alphavault_reflex.services.url_loader")
 
 
-def load_sources_from_env() -> tuple[
-    list[dict[str, object]], list[dict[str, object]], str
-]:
+def load_trade_posts_by_uid_from_env(
+    post_uids: list[str],
+    *,
+    load_cached_fn=None,
+) -> tuple[list[dict[str, object]], str]:
     source_loader = _load_source_loader_module()
-    return source_loader.load_sources_from_env(
-        load_posts_for_tree_from_env_fn=load_posts_for_tree_from_env
+    if load_cached_fn is None:
+        return source_loader.load_trade_posts_by_uid_from_env(post_uids)
+    return source_loader.load_trade_posts_by_uid_from_env(
+        post_uids,
+        load_cached_fn=load_cached_fn,
     )
 
 
@@ -428,16 +427,6 @@ def load_trade_assertions_from_env(
     return source_loader.load_trade_assertions_from_env(load_cached_fn=load_cached_fn)
 
 
-def load_posts_for_tree_from_env(
-    *,
-    load_cached_fn=None,
-) -> tuple[list[dict[str, object]], str]:
-    tree_loader = _load_tree_loader_module()
-    if load_cached_fn is None:
-        return tree_loader.load_posts_for_tree_from_env()
-    return tree_loader.load_posts_for_tree_from_env(load_cached_fn=load_cached_fn)
-
-
 def load_single_post_for_tree_from_env(
     post_uid: str,
     *,
@@ -483,16 +472,15 @@ __all__ = [
     "load_homework_board_payload_from_env",
     "load_homework_trade_feed_from_env",
     "load_post_urls_from_env",
-    "load_posts_for_tree_from_env",
     "load_source_engines_from_env",
     "load_single_post_for_tree_from_env",
     "load_stock_alias_candidates_from_env",
     "load_stock_official_names_from_env",
-    "load_sources_from_env",
     "load_stock_same_company_keys_from_env",
     "save_homework_trade_feed_from_env",
     "load_stock_alias_relations_from_env",
     "load_stock_sources_fast_from_env",
     "load_trade_assertions_from_env",
     "load_trade_board_assertions_from_env",
+    "load_trade_posts_by_uid_from_env",
 ]
@@ -8,7 +8,6 @@ from alphavault.constants import SCHEMA_WEIBO, SCHEMA_XUEQIU
 from alphavault.db.sql.common import make_in_params, make_in_placeholders
 from alphavault.db.sql.ui import (
     build_assertion_projection_expr,
-    build_assertion_rollup_ctes,
     build_assertion_rollup_joins,
 )
 from alphavault.db.postgres_db import (
@@ -155,7 +154,7 @@ def load_stock_trade_sources_fast_cached(
     posts_table = source_table(source_name, "posts")
     assertions_table = source_table(source_name, "assertions")
     assertion_entities_table = source_table(source_name, "assertion_entities")
-    assertion_mentions_table = source_table(source_name, "assertion_mentions")
+    assertion_rollups_table = source_table(source_name, "assertion_rollups")
     topic_cluster_topics_table = source_table(source_name, "topic_cluster_topics")
     with postgres_connect_autocommit(engine) as conn:
         params: dict[str, object] = {"stock_key": stock_keys[0], "limit": limit}
@@ -175,14 +174,13 @@ def load_stock_trade_sources_fast_cached(
             ]
         )
         assertions_query = (
-            f"{build_assertion_rollup_ctes(assertion_entities_table=assertion_entities_table, assertion_mentions_table=assertion_mentions_table, topic_cluster_topics_table=topic_cluster_topics_table)}\n"
             f"SELECT {select_expr}\n"
             f"FROM {assertions_table} a\n"
             f"JOIN {posts_table} p\n"
             "  ON p.post_uid = a.post_uid\n"
             f"JOIN {assertion_entities_table} ae_filter\n"
             "  ON ae_filter.assertion_id = a.assertion_id\n"
-            f"{build_assertion_rollup_joins('a')}\n"
+            f"{build_assertion_rollup_joins('a', assertion_rollups_table=assertion_rollups_table, topic_cluster_topics_table=topic_cluster_topics_table)}\n"
             "WHERE a.action LIKE 'trade.%'\n"
             "  AND ae_filter.entity_type = 'stock'\n"
             f"  AND {key_clause}\n"
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-from typing import TypedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+import json
+import logging
+import os
+from typing import Callable, Iterator, TypedDict, TypeVar
 
 from alphavault.constants import SCHEMA_WEIBO, SCHEMA_XUEQIU
 from alphavault.db.postgres_db import (
     PostgresConnection,
     ensure_postgres_engine,
     postgres_connect_autocommit,
+    postgres_statement_timeout,
     qualify_postgres_table,
     require_postgres_schema_name,
 )
+from alphavault.db.post_thread_trees import load_post_thread_trees
 from alphavault.db.postgres_env import (
     PostgresSource,
     load_configured_postgres_sources_from_env,
@@ -28,6 +35,15 @@ from alphavault.domains.stock.view_scope import (
     normalize_stock_view_scope,
 )
 from alphavault.env import load_dotenv_if_present
+from alphavault.infra.hot_view_cache import (
+    HOT_VIEW_ALL_ENTITIES,
+    get_hot_view_redis,
+    invalidate_hot_views,
+    load_hot_view,
+    read_hot_view_generations,
+    resolve_hot_view_max_age_seconds,
+    store_hot_view,
+)
 from alphavault.research_signal_view import (
     coerce_signal_timestamp,
     default_signal_reference_time,
@@ -41,6 +57,7 @@ from alphavault_reflex.services.source_read import (
     load_stock_same_company_keys_from_env,
 )
 from alphavault_reflex.services.source_loader import (
+    DEFAULT_FATAL_EXCEPTIONS,
     WANTED_POST_COLUMNS_FOR_TREE,
     standardize_posts_rows,
 )
@@ -48,9 +65,6 @@ from alphavault_reflex.services.source_read_utils import (
     ensure_platform_post_id_rows,
     normalize_posts_datetime_rows,
 )
-from alphavault_reflex.services.trade_board_loader import (
-    trade_board_created_at_sql_expr,
-)
 
 _SOURCE_SCHEMA_NAMES = frozenset((SCHEMA_WEIBO, SCHEMA_XUEQIU))
 _DEFAULT_STOCK_POST_WINDOW_DAYS = 0
@@ -60,6 +74,13 @@ _RELATED_SECTOR_LIMIT = 100
 _RELATED_SECTOR_WINDOW_DAYS = 30
 _MATCH_KIND_ASSERTION = "assertion"
 _MATCH_KIND_CONTEXT = "context"
+ENV_REFLEX_STOCK_SOURCE_TIMEOUT_SEC = "REFLEX_STOCK_SOURCE_TIMEOUT_SEC"
+DEFAULT_REFLEX_STOCK_SOURCE_TIMEOUT_SECONDS = 8.0
+_SIDEBAR_VIEW_VARIANT = "sidebar"
+_SOURCE_TIMEOUT_WARNING_PREFIX = "部分来源读取超时，先展示其它来源："
+
+_logger = logging.getLogger(__name__)
+_T = TypeVar("_T")
 
 
 class StockQueryContext(TypedDict):
@@ -80,6 +101,67 @@ def _load_source_schemas_from_env() -> list[PostgresSource]:
     ]
 
 
+def resolve_stock_source_timeout_seconds() -> float:
+    raw = os.getenv(ENV_REFLEX_STOCK_SOURCE_TIMEOUT_SEC, "").strip()
+    if not raw:
+        return float(DEFAULT_REFLEX_STOCK_SOURCE_TIMEOUT_SECONDS)
+    try:
+        wanted = float(raw)
+    except ValueError:
+        return float(DEFAULT_REFLEX_STOCK_SOURCE_TIMEOUT_SECONDS)
+    return max(0.1, wanted)
+
+
+def _fan_out_sources(
+    sources: list[PostgresSource],
+    load_one: Callable[[PostgresSource], _T],
+    *,
+    timeout_seconds: float,
+) -> tuple[list[_T], list[str], list[str]]:
+    """Run ``load_one`` for every source at once; slow sources are left behind.
+
+    Returns (results in source order, error codes, timed-out source names).
+    """
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, len(sources)),
+        thread_name_prefix="stock-source",
+    )
+    try:
+        futures = [(pool.submit(load_one, source), source) for source in sources]
+        done, _not_done = wait(
+            [future for future, _source in futures],
+            timeout=max(0.0, float(timeout_seconds)),
+        )
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    results: list[_T] = []
+    errors: list[str] = []
+    timed_out: list[str] = []
+    for future, source in futures:
+        if future not in done:
+            _logger.warning(
+                "[stock_hot_read] source_timeout source=%s timeout_seconds=%s",
+                source.name,
+                timeout_seconds,
+            )
+            timed_out.append(str(source.name or "").strip())
+            errors.append(f"postgres_timeout:{source.name}")
+            continue
+        try:
+            results.append(future.result())
+        except BaseException as err:
+            if isinstance(err, DEFAULT_FATAL_EXCEPTIONS):
+                raise
+            errors.append(f"postgres_connect_error:{source.name}:{type(err).__name__}")
+    return results, errors, timed_out
+
+
+def _source_timeout_warning(timed_out: list[str]) -> str:
+    if not timed_out:
+        return ""
+    return _SOURCE_TIMEOUT_WARNING_PREFIX + "、".join(timed_out)
+
+
 def _build_source_engine(db_url: str, *, source_name: str):
     try:
         return ensure_postgres_engine(db_url, schema_name=source_name)
@@ -87,6 +169,15 @@ def _build_source_engine(db_url: str, *, source_name: str):
         return ensure_postgres_engine(db_url)
 
 
+@contextmanager
+def _connect_source(source: PostgresSource) -> Iterator[PostgresConnection]:
+    """Source connection whose statements stop at the fan-out deadline."""
+    engine = _build_source_engine(source.url, source_name=source.name)
+    with postgres_connect_autocommit(engine) as conn:
+        with postgres_statement_timeout(conn, resolve_stock_source_timeout_seconds()):
+            yield conn
+
+
 def _source_table(conn: PostgresConnection, table_name: str) -> str:
     return qualify_postgres_table(
         require_postgres_schema_name(conn),
@@ -353,7 +444,7 @@ def _count_stock_signals(
     posts_table = _source_table(conn, "posts")
     assertions_table = _source_table(conn, "assertions")
     assertion_entities_table = _source_table(conn, "assertion_entities")
-    created_at_expr = trade_board_created_at_sql_expr("p.created_at")
+    created_at_expr = "p.created_at_ts"
     author_clause = ""
     author_filter = str(author or "").strip()
     if author_filter:
@@ -453,7 +544,7 @@ def _load_stock_signal_rows(
     posts_table = _source_table(conn, "posts")
     assertions_table = _source_table(conn, "assertions")
     assertion_entities_table = _source_table(conn, "assertion_entities")
-    created_at_expr = trade_board_created_at_sql_expr("p.created_at")
+    created_at_expr = "p.created_at_ts"
     author_clause = ""
     author_filter = str(author or "").strip()
     if author_filter:
@@ -563,7 +654,7 @@ def _load_stock_context_rows(
     posts_table = _source_table(conn, "posts")
     assertions_table = _source_table(conn, "assertions")
     post_context_entities_table = _source_table(conn, "post_context_entities")
-    created_at_expr = trade_board_created_at_sql_expr("p.created_at")
+    created_at_expr = "p.created_at_ts"
     author_clause = ""
     author_filter = str(author or "").strip()
     if author_filter:
@@ -644,7 +735,7 @@ def _load_stock_related_sectors(
     assertions_table = _source_table(conn, "assertions")
     assertion_entities_table = _source_table(conn, "assertion_entities")
     topic_cluster_topics_table = _source_table(conn, "topic_cluster_topics")
-    created_at_expr = trade_board_created_at_sql_expr("p.created_at")
+    created_at_expr = "p.created_at_ts"
     query = f"""
 WITH matched_posts AS (
     SELECT DISTINCT a.post_uid
@@ -722,20 +813,23 @@ def _enrich_signal_rows_with_tree(
     rows: list[dict[str, str]],
     *,
     posts: list[dict[str, object]],
+    cached_trees: dict[str, tuple[str, str]] | None = None,
 ) -> list[dict[str, str]]:
     if not rows:
         return []
-    merged_rows = merge_post_fields(
-        [dict(row) for row in rows],
-        posts,
-    )
     tree_map = build_post_tree_map(
         post_uids=[
             str(row.get("post_uid") or "").strip()
-            for row in merged_rows
+            for row in rows
             if str(row.get("post_uid") or "").strip()
         ],
         posts=posts,
+        cached=cached_trees,
+    )
+    merged_rows = merge_post_fields(
+        [dict(row) for row in rows],
+        posts,
+        cached_trees=tree_map,
     )
     reference_now = default_signal_reference_time()
     out: list[dict[str, str]] = []
@@ -852,9 +946,8 @@ def _load_source_signal_page(
     signal_window_days: int,
     related_filter: str,
 ) -> tuple[list[dict[str, str]], int]:
-    engine = _build_source_engine(source.url, source_name=source.name)
     fetch_limit = max(1, int(signal_page or 1) * max(int(signal_page_size or 1), 1))
-    with postgres_connect_autocommit(engine) as conn:
+    with _connect_source(source) as conn:
         assertion_rows = _load_stock_signal_rows(
             conn,
             stock_keys=stock_keys,
@@ -883,6 +976,9 @@ def _load_source_signal_page(
             source_name=source.name,
             rows=rows,
         )
+        cached_trees = load_post_thread_trees(
+            conn, post_uids=[str(row.get("post_uid") or "") for row in rows]
+        )
         total = _count_stock_signals(
             conn,
             stock_keys=stock_keys,
@@ -890,10 +986,13 @@ def _load_source_signal_page(
             signal_window_days=signal_window_days,
             related_filter=related_filter,
         )
-    return _enrich_signal_rows_with_tree(rows, posts=posts), total
+    return (
+        _enrich_signal_rows_with_tree(rows, posts=posts, cached_trees=cached_trees),
+        total,
+    )
 
 
-def load_stock_page_rows_from_env(
+def _load_stock_page_view(
     stock_key: str,
     *,
     signal_page: int,
@@ -902,7 +1001,14 @@ def load_stock_page_rows_from_env(
     signal_window_days: int = _DEFAULT_STOCK_POST_WINDOW_DAYS,
     related_filter: str = _DEFAULT_RELATED_FILTER,
     view_scope: str = DEFAULT_STOCK_VIEW_SCOPE,
-) -> dict[str, object]:
+    hot_view_client: object = None,
+) -> tuple[dict[str, object], dict[str, str]]:
+    """The view plus the hot-view generations read right before the source
+    queries, tagged for the requested stock and every key it was read for.
+
+    Generations are empty without `hot_view_client` or when any source failed
+    or timed out, so a partial view is never cached.
+    """
     normalized = _normalize_stock_key(stock_key)
     normalized_view_scope = normalize_stock_view_scope(view_scope)
     if not normalized:
@@ -912,7 +1018,7 @@ def load_stock_page_rows_from_env(
             view_scope=normalized_view_scope,
             page_title="",
             signal_page_size=signal_page_size,
-        )
+        ), {}
     load_dotenv_if_present()
     sources = _load_source_schemas_from_env()
     if not sources:
@@ -923,7 +1029,7 @@ def load_stock_page_rows_from_env(
             page_title=normalized.removeprefix("stock:"),
             signal_page_size=signal_page_size,
             load_error=MISSING_POSTGRES_DSN_ERROR,
-        )
+        ), {}
     query_context, relation_err = _resolve_stock_query_context(
         normalized,
         view_scope=normalized_view_scope,
@@ -936,28 +1042,32 @@ def load_stock_page_rows_from_env(
             page_title=normalized.removeprefix("stock:"),
             signal_page_size=signal_page_size,
             load_error=relation_err,
-        )
+        ), {}
     query_keys = list(query_context["query_keys"])
     normalized_related_filter = _normalize_related_filter(related_filter)
     selected_rows: list[dict[str, str]] = []
     selected_total = 0
-    selected_errors: list[str] = []
-    for source in sources:
-        try:
-            rows, total = _load_source_signal_page(
-                source,
-                stock_keys=query_keys,
-                author=str(author or "").strip(),
-                signal_page=signal_page,
-                signal_page_size=signal_page_size,
-                signal_window_days=signal_window_days,
-                related_filter=normalized_related_filter,
-            )
-        except BaseException as err:
-            selected_errors.append(
-                f"postgres_connect_error:{source.name}:{type(err).__name__}"
-            )
-            continue
+
+    def _load_one(source: PostgresSource) -> tuple[list[dict[str, str]], int]:
+        return _load_source_signal_page(
+            source,
+            stock_keys=query_keys,
+            author=str(author or "").strip(),
+            signal_page=signal_page,
+            signal_page_size=signal_page_size,
+            signal_window_days=signal_window_days,
+            related_filter=normalized_related_filter,
+        )
+
+    generations = read_hot_view_generations(
+        hot_view_client, [HOT_VIEW_ALL_ENTITIES, normalized, *query_keys]
+    )
+    source_pages, selected_errors, timed_out = _fan_out_sources(
+        sources,
+        _load_one,
+        timeout_seconds=resolve_stock_source_timeout_seconds(),
+    )
+    for rows, total in source_pages:
         selected_rows.extend(rows)
         selected_total += max(int(total), 0)
     selected_rows = _sort_signal_rows(selected_rows)
@@ -966,7 +1076,7 @@ def load_stock_page_rows_from_env(
         signal_page=signal_page,
         signal_page_size=signal_page_size,
     )
-    return {
+    view: dict[str, object] = {
         "entity_key": normalized,
         "requested_stock_key": query_context["requested_stock_key"] or normalized,
         "view_scope": normalized_view_scope,
@@ -981,12 +1091,37 @@ def load_stock_page_rows_from_env(
         "load_error": ""
         if signal_slice or selected_total > 0
         else (selected_errors[0] if selected_errors else ""),
-        "load_warning": "",
+        "load_warning": _source_timeout_warning(timed_out)
+        if signal_slice or selected_total > 0
+        else "",
         "worker_status_text": "",
         "worker_next_run_at": "",
         "worker_cycle_updated_at": "",
         "worker_running": False,
     }
+    return view, ({} if selected_errors else generations)
+
+
+def load_stock_page_rows_from_env(
+    stock_key: str,
+    *,
+    signal_page: int,
+    signal_page_size: int,
+    author: str = "",
+    signal_window_days: int = _DEFAULT_STOCK_POST_WINDOW_DAYS,
+    related_filter: str = _DEFAULT_RELATED_FILTER,
+    view_scope: str = DEFAULT_STOCK_VIEW_SCOPE,
+) -> dict[str, object]:
+    view, _generations = _load_stock_page_view(
+        stock_key,
+        signal_page=signal_page,
+        signal_page_size=signal_page_size,
+        author=author,
+        signal_window_days=signal_window_days,
+        related_filter=related_filter,
+        view_scope=view_scope,
+    )
+    return view
 
 
 def load_stock_cached_view_from_env(
@@ -1008,13 +1143,75 @@ def load_stock_cached_view_from_env(
             page_title="",
             signal_page_size=signal_page_size,
         )
-    return load_stock_page_rows_from_env(
+    variant = json.dumps(
+        {
+            "kind": "page",
+            "signal_page": int(signal_page or 1),
+            "signal_page_size": int(signal_page_size or 1),
+            "author": str(author or "").strip(),
+            "related_filter": _normalize_related_filter(related_filter),
+            "view_scope": normalized_view_scope,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    client = get_hot_view_redis()
+    max_age_seconds = resolve_hot_view_max_age_seconds()
+    cached = load_hot_view(
+        client,
+        entity_key=normalized,
+        variant=variant,
+        max_age_seconds=max_age_seconds,
+    )
+    if cached is not None:
+        return cached
+    view, generations = _load_stock_page_view(
         normalized,
         signal_page=signal_page,
         signal_page_size=signal_page_size,
         author=str(author or "").strip(),
         related_filter=related_filter,
         view_scope=normalized_view_scope,
+        hot_view_client=client,
+    )
+    _store_stock_view(
+        client,
+        entity_key=normalized,
+        variant=variant,
+        view=view,
+        generations=generations,
+        max_age_seconds=max_age_seconds,
+    )
+    return view
+
+
+def _store_stock_view(
+    client: object,
+    *,
+    entity_key: str,
+    variant: str,
+    view: dict[str, object],
+    generations: dict[str, str],
+    max_age_seconds: int,
+) -> None:
+    """Cache complete views only, tagged with generations read before the SQL
+    ran, so a write that lands mid-query still invalidates the stored view.
+    """
+    if not client or not generations:
+        return
+    if str(view.get("load_error") or "").strip():
+        return
+    if str(view.get("load_warning") or "").strip():
+        return
+    if HOT_VIEW_ALL_ENTITIES not in generations or entity_key not in generations:
+        return
+    store_hot_view(
+        client,
+        entity_key=entity_key,
+        variant=variant,
+        view=view,
+        generations=generations,
+        max_age_seconds=max_age_seconds,
     )
 
 
@@ -1022,37 +1219,66 @@ def load_stock_sidebar_cached_view(stock_slug: str) -> dict[str, object]:
     normalized = _normalize_stock_key(stock_slug)
     if not normalized:
         return {"related_sectors": [], "load_error": ""}
+    client = get_hot_view_redis()
+    max_age_seconds = resolve_hot_view_max_age_seconds()
+    cached = load_hot_view(
+        client,
+        entity_key=normalized,
+        variant=_SIDEBAR_VIEW_VARIANT,
+        max_age_seconds=max_age_seconds,
+    )
+    if cached is not None:
+        return cached
+    view, generations = _load_stock_sidebar_view(normalized, hot_view_client=client)
+    _store_stock_view(
+        client,
+        entity_key=normalized,
+        variant=_SIDEBAR_VIEW_VARIANT,
+        view=view,
+        generations=generations,
+        max_age_seconds=max_age_seconds,
+    )
+    return view
+
+
+def _load_stock_sidebar_view(
+    normalized: str,
+    *,
+    hot_view_client: object = None,
+) -> tuple[dict[str, object], dict[str, str]]:
+    """Like `_load_stock_page_view`: generations are empty unless every source answered."""
     load_dotenv_if_present()
     sources = _load_source_schemas_from_env()
     if not sources:
         return {
             "related_sectors": [],
             "load_error": MISSING_POSTGRES_DSN_ERROR,
-        }
+        }, {}
     query_context, relation_err = _resolve_stock_query_context(
         normalized,
         view_scope=STOCK_VIEW_SCOPE_COMPANY,
     )
     if relation_err:
-        return {"related_sectors": [], "load_error": relation_err}
-    selected_rows: list[dict[str, str]] = []
-    selected_errors: list[str] = []
-    for source in sources:
-        try:
-            engine = _build_source_engine(source.url, source_name=source.name)
-            with postgres_connect_autocommit(engine) as conn:
-                selected_rows.extend(
-                    _load_stock_related_sectors(
-                        conn,
-                        stock_keys=list(query_context["query_keys"]),
-                        signal_window_days=_RELATED_SECTOR_WINDOW_DAYS,
-                    )
-                )
-        except BaseException as err:
-            selected_errors.append(
-                f"postgres_connect_error:{source.name}:{type(err).__name__}"
+        return {"related_sectors": [], "load_error": relation_err}, {}
+
+    def _load_one(source: PostgresSource) -> list[dict[str, str]]:
+        with _connect_source(source) as conn:
+            return _load_stock_related_sectors(
+                conn,
+                stock_keys=list(query_context["query_keys"]),
+                signal_window_days=_RELATED_SECTOR_WINDOW_DAYS,
             )
-            continue
+
+    generations = read_hot_view_generations(
+        hot_view_client,
+        [HOT_VIEW_ALL_ENTITIES, normalized, *query_context["query_keys"]],
+    )
+    source_rows, selected_errors, timed_out = _fan_out_sources(
+        sources,
+        _load_one,
+        timeout_seconds=resolve_stock_source_timeout_seconds(),
+    )
+    selected_rows = [row for rows in source_rows for row in rows]
     if selected_rows:
         counts: dict[str, int] = {}
         for row in selected_rows:
@@ -1069,21 +1295,27 @@ def load_stock_sidebar_cached_view(stock_slug: str) -> dict[str, object]:
             {"sector_key": sector_key, "mention_count": str(count)}
             for sector_key, count in ranked
         ]
-    return {
+    view: dict[str, object] = {
         "related_sectors": selected_rows,
         "load_error": ""
         if selected_rows
         else (selected_errors[0] if selected_errors else ""),
     }
+    if timed_out:
+        view["load_warning"] = _source_timeout_warning(timed_out)
+    return view, ({} if selected_errors else generations)
 
 
 def clear_stock_hot_read_caches() -> None:
-    return None
+    invalidate_hot_views(get_hot_view_redis(), [HOT_VIEW_ALL_ENTITIES])
 
 
 __all__ = [
+    "DEFAULT_REFLEX_STOCK_SOURCE_TIMEOUT_SECONDS",
+    "ENV_REFLEX_STOCK_SOURCE_TIMEOUT_SEC",
     "clear_stock_hot_read_caches",
     "load_stock_cached_view_from_env",
     "load_stock_page_rows_from_env",
     "load_stock_sidebar_cached_view",
+    "resolve_stock_source_timeout_seconds",
 ]
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+from functools import cache
+from pathlib import Path
+import threading
+import time
+from types import ModuleType
+from typing import TYPE_CHECKING, Sequence
+
+from alphavault.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from alphavault.domains.stock.object_index import (
+        StockObjectIndex,
+        StockObjectIndexState,
+    )
+
+ENV_REFLEX_STOCK_INDEX_SNAPSHOT_PATH = "REFLEX_STOCK_INDEX_SNAPSHOT_PATH"
+SNAPSHOT_MIN_INTERVAL_SECONDS = 60.0
+logger = get_logger(__name__)
+
+# One state for the whole process, fed from the shared trade-assertion window.
+_lock = threading.Lock()
+_state: StockObjectIndexState | None = None
+_last_saved_at = 0.0
+_stats = {
+    "syncs": 0,
+    "added_rows": 0,
+    "removed_rows": 0,
+    "relation_changes": 0,
+    "snapshot_loads": 0,
+    "snapshot_saves": 0,
+}
+
+
+@cache
+def _load_object_index_module() -> ModuleType:
+    return importlib.import_module("alphavault.domains.stock.object_index")
+
+
+def resolve_stock_index_snapshot_path() -> Path | None:
+    raw = os.getenv(ENV_REFLEX_STOCK_INDEX_SNAPSHOT_PATH, "").strip()
+    return Path(raw) if raw else None
+
+
+def load_stock_index_snapshot(path: Path) -> StockObjectIndexState | None:
+    state_cls = _load_object_index_module().StockObjectIndexState
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return state_cls.from_snapshot(data)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError) as err:
+        logger.warning(
+            "[stock_index] snapshot_load_failed path=%s %s: %s",
+            path,
+            type(err).__name__,
+            err,
+        )
+        return None
+
+
+def save_stock_index_snapshot(state: StockObjectIndexState, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f"{path.suffix}.tmp")
+    tmp.write_text(
+        json.dumps(state.to_snapshot(), ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    tmp.replace(path)
+
+
+def _ensure_state() -> StockObjectIndexState:
+    global _state
+    if _state is not None:
+        return _state
+    path = resolve_stock_index_snapshot_path()
+    loaded = load_stock_index_snapshot(path) if path is not None else None
+    if loaded is not None:
+        _stats["snapshot_loads"] += 1
+        logger.info(
+            "[stock_index] snapshot_loaded path=%s rows=%s",
+            path,
+            loaded.assertion_count,
+        )
+    _state = loaded or _load_object_index_module().StockObjectIndexState()
+    return _state
+
+
+def _maybe_save_snapshot(state: StockObjectIndexState) -> None:
+    global _last_saved_at
+    path = resolve_stock_index_snapshot_path()
+    now = time.monotonic()
+    if path is None or now - _last_saved_at < SNAPSHOT_MIN_INTERVAL_SECONDS:
+        return
+    _last_saved_at = now
+    try:
+        save_stock_index_snapshot(state, path)
+    except OSError as err:
+        logger.warning(
+            "[stock_index] snapshot_save_failed path=%s %s: %s",
+            path,
+            type(err).__name__,
+            err,
+        )
+        return
+    _stats["snapshot_saves"] += 1
+
+
+def load_shared_stock_object_index(
+    assertions: Sequence[dict[str, object]],
+    *,
+    stock_relations: list[dict[str, object]] | None = None,
+) -> StockObjectIndex:
+    """
+    Bring the shared state in line with the current window and relations and
+    return its index. Only rows that entered or left the window, or whose
+    stock columns changed, are counted; an unchanged window reuses the cached
+    index. Without `stock_relations`
+    the index ignores confirmed relations, like `build_stock_object_index`.
+    """
+    with _lock:
+        state = _ensure_state()
+        added, removed = state.sync_assertions(list(assertions))
+        relations_changed = stock_relations is not None and state.sync_stock_relations(
+            stock_relations
+        )
+        _stats["syncs"] += 1
+        _stats["added_rows"] += added
+        _stats["removed_rows"] += removed
+        _stats["relation_changes"] += int(relations_changed)
+        if added or removed or relations_changed:
+            _maybe_save_snapshot(state)
+        return state.index(include_relations=stock_relations is not None)
+
+
+def stock_object_index_stats() -> dict[str, int]:
+    with _lock:
+        out = dict(_stats)
+        out["rows"] = _state.assertion_count if _state is not None else 0
+    return out
+
+
+__all__ = [
+    "ENV_REFLEX_STOCK_INDEX_SNAPSHOT_PATH",
+    "load_shared_stock_object_index",
+    "load_stock_index_snapshot",
+    "resolve_stock_index_snapshot_path",
+    "save_stock_index_snapshot",
+    "stock_object_index_stats",
+]
@@ -11,7 +11,6 @@ import time
 from alphavault.constants import SCHEMA_WEIBO, SCHEMA_XUEQIU
 from alphavault.db.sql.ui import (
     build_assertion_projection_expr,
-    build_assertion_rollup_ctes,
     build_assertion_rollup_joins,
 )
 from alphavault.db.postgres_db import (
@@ -107,31 +106,6 @@ def _clean_text(value: object) -> str:
     return str(value or "").strip()
 
 
-def trade_board_created_at_sql_expr(column: str) -> str:
-    as_text = f"CAST({column} AS text)"
-    normalized = f"btrim(replace({as_text}, 'T', ' '))"
-    normalized_utc = f"replace({normalized}, 'Z', '+00:00')"
-    with_timezone = (
-        f"{normalized} ~ "
-        "'^[0-9]{4}-[0-9]{2}-[0-9]{2} "
-        "[0-9]{2}:[0-9]{2}(:[0-9]{2}(\\.[0-9]+)?)?"
-        "(Z|[+-][0-9]{2}(:?[0-9]{2})?)$'"
-    )
-    without_timezone = (
-        f"{normalized} ~ "
-        "'^[0-9]{4}-[0-9]{2}-[0-9]{2} "
-        "[0-9]{2}:[0-9]{2}(:[0-9]{2}(\\.[0-9]+)?)?$'"
-    )
-    return (
-        "CASE "
-        f"WHEN {normalized} = '' THEN NULL "
-        f"WHEN {with_timezone} THEN CAST({normalized_utc} AS timestamptz) "
-        f"WHEN {without_timezone} THEN CAST(({normalized} || '+08:00') AS timestamptz) "
-        "ELSE NULL "
-        "END"
-    )
-
-
 def _normalize_trade_board_assertion_rows(
     rows: list[dict[str, object]],
     *,
@@ -186,20 +160,18 @@ def query_trade_board_assertion_rows(
 ) -> list[dict[str, object]]:
     posts_table = source_table(source_name, "posts")
     assertions_table = source_table(source_name, "assertions")
-    assertion_entities_table = source_table(source_name, "assertion_entities")
-    assertion_mentions_table = source_table(source_name, "assertion_mentions")
+    assertion_rollups_table = source_table(source_name, "assertion_rollups")
     topic_cluster_topics_table = source_table(source_name, "topic_cluster_topics")
-    created_at_expr = trade_board_created_at_sql_expr("p.created_at")
+    created_at_expr = "p.created_at_ts"
 
     # Build WHERE clause based on trade_only parameter
     action_filter = "AND a.action LIKE 'trade.%'" if trade_only else ""
 
     sql = f"""
-{build_assertion_rollup_ctes(assertion_entities_table=assertion_entities_table, assertion_mentions_table=assertion_mentions_table, topic_cluster_topics_table=topic_cluster_topics_table)}
 SELECT {trade_board_select_expr()}
 FROM {posts_table} p
 JOIN {assertions_table} a ON a.post_uid = p.post_uid
-{build_assertion_rollup_joins("a")}
+{build_assertion_rollup_joins("a", assertion_rollups_table=assertion_rollups_table, topic_cluster_topics_table=topic_cluster_topics_table)}
 WHERE p.processed_at IS NOT NULL
   AND {created_at_expr} >= CAST(:start_time AS timestamptz)
   AND {created_at_expr} < CAST(:end_time AS timestamptz)
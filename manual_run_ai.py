@@ -27,13 +27,14 @@ from alphavault.db.postgres_env import (
     require_postgres_source_platform,
     require_postgres_source_from_env,
 )
+from alphavault.infra.ai.distributed_limiter import build_ai_rate_limiter
 from alphavault.infra.ai.runtime_config import (
     AI_REASONING_EFFORT_CHOICES,
     AI_TASK_POST_ANALYSIS,
     ai_task_runtime_config_from_env,
     apply_ai_runtime_config_overrides,
 )
-from alphavault.rss.utils import RateLimiter, env_bool
+from alphavault.rss.utils import env_bool
 from alphavault.worker.post_processor import process_one_post_uid
 from alphavault.worker.runtime_models import LLMConfig
 
@@ -180,6 +181,8 @@ def _build_config(args: argparse.Namespace) -> LLMConfig:
         ai_rpm=max(0.0, float(runtime_config.ai_rpm)),
         ai_timeout_seconds=max(1.0, float(runtime_config.timeout_seconds)),
         trace_out=trace_out,
+        ai_burst=max(1.0, float(runtime_config.ai_burst)),
+        ai_limit_group_name=str(runtime_config.limit_group_name or ""),
     )
 
 
@@ -198,7 +201,13 @@ def main() -> None:
         raise SystemExit("缺参数：请传 --post-uids")
 
     config = _build_config(args)
-    limiter = RateLimiter(config.ai_rpm)
+    limiter = build_ai_rate_limiter(
+        rpm=config.ai_rpm,
+        burst=config.ai_burst,
+        limit_group_name=config.ai_limit_group_name,
+        max_inflight=config.ai_max_inflight,
+        timeout_seconds=config.ai_timeout_seconds,
+    )
     engine_by_platform: dict[str, PostgresEngine] = {}
 
     ok = 0
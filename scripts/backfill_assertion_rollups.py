@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from alphavault.constants import SCHEMA_WEIBO, SCHEMA_XUEQIU  # noqa: E402
+from alphavault.db.postgres_db import (  # noqa: E402
+    PostgresConnection,
+    ensure_postgres_engine,
+    postgres_connect_autocommit,
+    qualify_postgres_table,
+)
+from alphavault.db.postgres_env import PostgresSource  # noqa: E402
+from alphavault.db.postgres_env import load_configured_postgres_sources_from_env  # noqa: E402
+from alphavault.db.sql import source_queue as source_queue_sql  # noqa: E402
+from alphavault.db.sql.common import make_in_params, make_in_placeholders  # noqa: E402
+from alphavault.db.sql_rows import read_sql_rows  # noqa: E402
+from alphavault.env import load_dotenv_if_present  # noqa: E402
+from alphavault.logging_config import add_log_level_argument  # noqa: E402
+from alphavault.logging_config import configure_logging  # noqa: E402
+from alphavault.logging_config import get_logger  # noqa: E402
+
+DEFAULT_BATCH_SIZE = 500
+SOURCE_SCHEMAS = frozenset((SCHEMA_WEIBO, SCHEMA_XUEQIU))
+logger = get_logger(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="回填 assertion_rollups 汇总表")
+    parser.add_argument(
+        "--schema",
+        choices=(*sorted(SOURCE_SCHEMAS), "all"),
+        default="all",
+        help="只处理某个 source schema，默认 all",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="每批处理多少个帖子，默认 500",
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="真的写库；默认只做 dry-run",
+    )
+    add_log_level_argument(parser)
+    return parser.parse_args(argv)
+
+
+def _configured_sources(target_schema: str) -> list[PostgresSource]:
+    sources = [
+        source
+        for source in load_configured_postgres_sources_from_env()
+        if source.schema in SOURCE_SCHEMAS
+    ]
+    if target_schema == "all":
+        return sources
+    return [source for source in sources if source.schema == target_schema]
+
+
+def _table(source: PostgresSource, table_name: str) -> str:
+    return qualify_postgres_table(source.schema, table_name)
+
+
+def _scan_post_uids(
+    conn: PostgresConnection,
+    *,
+    source: PostgresSource,
+    after_post_uid: str,
+    batch_size: int,
+) -> list[str]:
+    sql = f"""
+SELECT DISTINCT post_uid
+FROM {_table(source, "assertions")}
+WHERE post_uid > :after_post_uid
+ORDER BY post_uid ASC
+LIMIT :limit
+"""
+    rows = read_sql_rows(
+        conn,
+        sql,
+        params={
+            "after_post_uid": after_post_uid,
+            "limit": max(1, int(batch_size)),
+        },
+    )
+    return [str(row.get("post_uid") or "") for row in rows]
+
+
+def _refresh_rollups(
+    conn: PostgresConnection,
+    *,
+    source: PostgresSource,
+    post_uids: list[str],
+) -> None:
+    placeholders = make_in_placeholders(prefix="uid", count=len(post_uids))
+    conn.execute(
+        source_queue_sql.upsert_assertion_rollups_sql(
+            assertion_rollups_table=_table(source, "assertion_rollups"),
+            assertions_table=_table(source, "assertions"),
+            assertion_entities_table=_table(source, "assertion_entities"),
+            assertion_mentions_table=_table(source, "assertion_mentions"),
+            post_filter_sql=f"a.post_uid IN ({placeholders})",
+        ),
+        make_in_params(prefix="uid", values=post_uids),
+    )
+
+
+def _delete_orphan_rollups(conn: PostgresConnection, *, source: PostgresSource) -> int:
+    sql = f"""
+DELETE FROM {_table(source, "assertion_rollups")} r
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM {_table(source, "assertions")} a
+    WHERE a.assertion_id = r.assertion_id
+)
+"""
+    return int(conn.execute(sql).rowcount or 0)
+
+
+def _backfill_source(
+    source: PostgresSource,
+    *,
+    batch_size: int,
+    apply: bool,
+) -> int:
+    engine = ensure_postgres_engine(source.url, schema_name=source.schema)
+    scanned_posts = 0
+    after_post_uid = ""
+    with postgres_connect_autocommit(engine) as conn:
+        while True:
+            post_uids = _scan_post_uids(
+                conn,
+                source=source,
+                after_post_uid=after_post_uid,
+                batch_size=batch_size,
+            )
+            if not post_uids:
+                break
+            after_post_uid = post_uids[-1]
+            scanned_posts += len(post_uids)
+            if apply:
+                _refresh_rollups(conn, source=source, post_uids=post_uids)
+            logger.info(
+                "schema=%s scanned_posts=%s dry_run=%s",
+                source.schema,
+                scanned_posts,
+                "0" if apply else "1",
+            )
+        if apply:
+            deleted = _delete_orphan_rollups(conn, source=source)
+            logger.info("schema=%s orphan_deleted=%s", source.schema, deleted)
+    return scanned_posts
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    configure_logging(level=args.log_level)
+    load_dotenv_if_present()
+    sources = _configured_sources(args.schema)
+    if not sources:
+        logger.error("没有可用的 source schema，先检查 POSTGRES_DSN。")
+        return 1
+
+    total_scanned = 0
+    for source in sources:
+        total_scanned += _backfill_source(
+            source,
+            batch_size=max(1, int(args.batch_size)),
+            apply=bool(args.apply),
+        )
+    logger.info(
+        "finished scanned_posts=%s dry_run=%s",
+        total_scanned,
+        "0" if args.apply else "1",
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
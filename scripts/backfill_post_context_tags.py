@@ -35,6 +35,7 @@ from alphavault.db.source_queue import (  # noqa: E402
 from alphavault.db.sql.common import make_in_params, make_in_placeholders  # noqa: E402
 from alphavault.db.sql_rows import read_sql_rows  # noqa: E402
 from alphavault.env import load_dotenv_if_present  # noqa: E402
+from alphavault.infra.ai.distributed_limiter import build_ai_rate_limiter  # noqa: E402
 from alphavault.infra.ai.runtime_config import (  # noqa: E402
     AI_REASONING_EFFORT_CHOICES,
     AI_TASK_POST_CONTEXT,
@@ -777,7 +778,13 @@ def main(argv: list[str] | None = None) -> int:
     from_created_at = _clean_text(args.from_created_at)
     print_result = bool(args.print_result)
     runtime_config = _build_runtime_config(args)
-    limiter = RateLimiter(float(runtime_config.ai_rpm))
+    limiter = build_ai_rate_limiter(
+        rpm=float(runtime_config.ai_rpm),
+        burst=runtime_config.ai_burst,
+        limit_group_name=runtime_config.limit_group_name,
+        max_inflight=runtime_config.ai_max_inflight,
+        timeout_seconds=runtime_config.timeout_seconds,
+    )
     cursor_file = _resolve_cursor_file(args)
     use_cursor = not cleaned_post_uids
     cursor_state: dict[str, object] = {}
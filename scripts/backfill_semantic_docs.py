@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import argparse
-from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import Future
 import json
 from pathlib import Path
 import sys
@@ -25,18 +25,24 @@ from alphavault.db.semantic_docs import (  # noqa: E402
     scan_relevant_post_uids,
 )
 from alphavault.db.source_queue import load_cloud_posts  # noqa: E402
+from alphavault.db.zilliz_client import should_write_to_zilliz  # noqa: E402
+from alphavault.db.zilliz_writer import ZillizSemanticDocWriter  # noqa: E402
 from alphavault.env import load_dotenv_if_present  # noqa: E402
 from alphavault.logging_config import (  # noqa: E402
     add_log_level_argument,
     configure_logging,
     get_logger,
 )
+from alphavault.semantic_doc_coalescer import (  # noqa: E402
+    SemanticDocEmbeddingCoalescer,
+)
 from alphavault.semantic_docs import (  # noqa: E402
     SemanticDocSyncResult,
     semantic_doc_embedding_is_configured,
     semantic_doc_embedding_runtime_from_env,
     sync_semantic_docs_for_post,
 )
+from alphavault.worker.redis_client import try_get_redis  # noqa: E402
 
 DEFAULT_BATCH_SIZE = 100
 DEFAULT_LIMIT = 0
@@ -121,25 +127,6 @@ def _chunk_post_uids(post_uids: list[str], *, chunk_size: int) -> list[list[str]
     ]
 
 
-def _resolve_worker_count(
-    *,
-    engine_max_connections: int,
-    embedding_runtime_max_inflight: int,
-    chunk_size: int,
-    apply: bool,
-) -> int:
-    if not apply:
-        return 1
-    return max(
-        1,
-        min(
-            max(1, int(engine_max_connections)),
-            max(1, int(embedding_runtime_max_inflight)),
-            max(1, int(chunk_size)),
-        ),
-    )
-
-
 def _load_progress_state(progress_file: Path) -> dict[str, str]:
     if not progress_file.is_file():
         return {}
@@ -273,74 +260,93 @@ def _backfill_source(
     scanned_posts = 0
     synced_docs = 0
     embedded_docs = 0
-    worker_count = _resolve_worker_count(
-        engine_max_connections=engine.max_connections,
-        embedding_runtime_max_inflight=(
-            embedding_runtime.config.max_inflight
-            if embedding_runtime is not None
-            else 1
-        ),
-        chunk_size=batch_size,
-        apply=apply,
+    # Zilliz writes of many posts share one upsert instead of delete + insert
+    # per post; flushed at the end of every chunk, before progress is saved.
+    # Postgres is already written by then, so posts of a flush that still
+    # fails go to the Zilliz retry queue.
+    zilliz_writer = (
+        ZillizSemanticDocWriter(
+            source.schema,
+            retries=2,
+            redis_client=try_get_redis()[0],
+        )
+        if embedding_runtime is not None and should_write_to_zilliz()
+        else None
+    )
+    # Same coalescer as the worker: posts of a chunk share embedding requests.
+    coalescer = (
+        SemanticDocEmbeddingCoalescer(embedding_runtime, zilliz_writer=zilliz_writer)
+        if embedding_runtime is not None
+        else None
     )
     logger.info(
-        "schema=%s batch_size=%s worker_count=%s dry_run=%s",
+        "schema=%s batch_size=%s embed_batch_size=%s max_inflight=%s dry_run=%s",
         source.schema,
         batch_size,
-        worker_count,
+        coalescer.batch_size if coalescer is not None else 0,
+        embedding_runtime.config.max_inflight if embedding_runtime is not None else 0,
         "0" if apply else "1",
     )
-    for post_uid_chunk in _chunk_post_uids(post_uids, chunk_size=batch_size):
-        try:
-            with postgres_connect_autocommit(engine) as conn:
-                posts_by_post_uid = load_cloud_posts(
-                    conn,
-                    post_uids=post_uid_chunk,
-                )
-                assertion_rows_by_post_uid = load_assertion_semantic_rows_by_post_uids(
-                    conn,
-                    post_uids=post_uid_chunk,
-                )
-                stored_rows_by_post_uid = (
-                    load_stored_semantic_doc_embeddings_by_post_uids(
+    try:
+        for post_uid_chunk in _chunk_post_uids(post_uids, chunk_size=batch_size):
+            try:
+                with postgres_connect_autocommit(engine) as conn:
+                    posts_by_post_uid = load_cloud_posts(
                         conn,
                         post_uids=post_uid_chunk,
                     )
-                    if apply
-                    else {}
-                )
-            futures: list[tuple[str, Future[SemanticDocSyncResult]]] = []
-            with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                    assertion_rows_by_post_uid = (
+                        load_assertion_semantic_rows_by_post_uids(
+                            conn,
+                            post_uids=post_uid_chunk,
+                        )
+                    )
+                    stored_rows_by_post_uid = (
+                        load_stored_semantic_doc_embeddings_by_post_uids(
+                            conn,
+                            post_uids=post_uid_chunk,
+                        )
+                        if apply
+                        else {}
+                    )
+                futures: list[tuple[str, Future[SemanticDocSyncResult]]] = []
                 for post_uid in post_uid_chunk:
                     prefetched_post = posts_by_post_uid.get(post_uid)
                     if prefetched_post is None:
                         raise RuntimeError(f"cloud_post_not_found:{post_uid}")
-                    future = executor.submit(
-                        sync_semantic_docs_for_post,
-                        engine,
-                        post_uid=post_uid,
-                        final_status="relevant",
-                        prefetched_post=prefetched_post,
-                        prefetched_assertion_rows=assertion_rows_by_post_uid.get(
-                            post_uid,
-                            [],
-                        ),
-                        prefetched_stored_rows=stored_rows_by_post_uid.get(
-                            post_uid,
-                            [],
-                        ),
-                        apply=apply,
-                        embedding_runtime=embedding_runtime,
+                    prefetched_assertion_rows = assertion_rows_by_post_uid.get(
+                        post_uid, []
                     )
+                    if coalescer is not None:
+                        future = coalescer.submit(
+                            engine,
+                            post_uid=post_uid,
+                            final_status="relevant",
+                            prefetched_post=prefetched_post,
+                            prefetched_assertion_rows=prefetched_assertion_rows,
+                            prefetched_stored_rows=stored_rows_by_post_uid.get(
+                                post_uid,
+                                [],
+                            ),
+                        )
+                    else:
+                        future = Future()
+                        future.set_result(
+                            sync_semantic_docs_for_post(
+                                engine,
+                                post_uid=post_uid,
+                                final_status="relevant",
+                                prefetched_post=prefetched_post,
+                                prefetched_assertion_rows=prefetched_assertion_rows,
+                                apply=False,
+                            )
+                        )
                     futures.append((post_uid, future))
                 for post_uid, future in futures:
                     result = future.result()
                     scanned_posts += 1
                     synced_docs += int(getattr(result, "doc_count"))
                     embedded_docs += int(getattr(result, "embedded_count"))
-                    if resume and not target_post_uids:
-                        progress_state[source.schema] = post_uid
-                        _save_progress_state(progress_file, progress_state)
                     logger.info(
                         "schema=%s scanned_posts=%s doc_count=%s embedded_count=%s dry_run=%s post_uid=%s",
                         source.schema,
@@ -350,18 +356,36 @@ def _backfill_source(
                         "0" if apply else "1",
                         post_uid,
                     )
-        except BaseException:
-            failed_post_uid = progress_state.get(source.schema, "")
-            if scanned_posts < len(post_uids):
-                next_index = min(scanned_posts, len(post_uids) - 1)
-                failed_post_uid = post_uids[next_index]
-            logger.exception(
-                "schema=%s failed_post_uid=%s scanned_posts=%s",
-                source.schema,
-                failed_post_uid,
-                scanned_posts,
-            )
-            raise
+                if zilliz_writer is not None:
+                    zilliz_writer.flush()
+                if resume and not target_post_uids:
+                    progress_state[source.schema] = post_uid_chunk[-1]
+                    _save_progress_state(progress_file, progress_state)
+            except BaseException:
+                failed_post_uid = progress_state.get(source.schema, "")
+                if scanned_posts < len(post_uids):
+                    next_index = min(scanned_posts, len(post_uids) - 1)
+                    failed_post_uid = post_uids[next_index]
+                logger.exception(
+                    "schema=%s failed_post_uid=%s scanned_posts=%s",
+                    source.schema,
+                    failed_post_uid,
+                    scanned_posts,
+                )
+                raise
+    finally:
+        if coalescer is not None:
+            coalescer.close()
+    if zilliz_writer is not None:
+        stats = zilliz_writer.stats()
+        logger.info(
+            "schema=%s zilliz_docs=%s zilliz_deleted=%s upserts=%s docs_per_sec=%s",
+            source.schema,
+            stats["docs"],
+            stats["deleted_docs"],
+            stats["upsert_calls"],
+            stats["docs_per_sec"],
+        )
     return scanned_posts, synced_docs, embedded_docs
 
 
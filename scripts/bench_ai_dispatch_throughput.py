@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+from pathlib import Path
+import sys
+import threading
+import time
+from typing import Any
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from alphavault.rss.utils import RateLimiter  # noqa: E402
+from alphavault.worker import periodic_jobs  # noqa: E402
+from alphavault.worker import scheduler  # noqa: E402
+
+DEFAULT_RPM = 240.0
+DEFAULT_AI_CAP = 30
+DEFAULT_LLM_SECONDS = 3.0
+DEFAULT_DURATION_SECONDS = 30.0
+# Longest idle wait between worker ticks (see worker_loop_runner._wait_after_tick).
+TICK_SECONDS = 5.0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="用假 Redis 和假 LLM 跑 AI 调度，对比每轮只派 1 条和按 RPM 批量派发的 jobs/min"
+    )
+    parser.add_argument(
+        "--rpm", type=float, default=DEFAULT_RPM, help="限流 RPM，默认 240"
+    )
+    parser.add_argument(
+        "--ai-cap", type=int, default=DEFAULT_AI_CAP, help="并发上限，默认 30"
+    )
+    parser.add_argument(
+        "--llm-seconds",
+        type=float,
+        default=DEFAULT_LLM_SECONDS,
+        help="假 LLM 每次调用耗时，默认 3 秒",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=DEFAULT_DURATION_SECONDS,
+        help="每种模式跑多少秒，默认 30",
+    )
+    return parser.parse_args(argv)
+
+
+class _SingleSlotLimiter:
+    """The pre-batching contract: one `try_reserve()` per scheduler pass."""
+
+    def __init__(self, limiter: RateLimiter) -> None:
+        self._limiter = limiter
+
+    def has_limit(self) -> bool:
+        return self._limiter.has_limit()
+
+    def try_reserve(self) -> Any:
+        return self._limiter.try_reserve()
+
+
+class _FakeStream:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.read_batches: list[int] = []
+
+    def read(self, *_args: object, count: int, **_kwargs: object) -> list[dict]:
+        with self._lock:
+            self.read_batches.append(int(count))
+            out = []
+            for _ in range(int(count)):
+                self._next_id += 1
+                out.append(
+                    {
+                        "message_id": f"{self._next_id}-0",
+                        "payload": json.dumps({"post_uid": f"weibo:{self._next_id}"}),
+                    }
+                )
+            return out
+
+
+def _run_mode(
+    *,
+    batched: bool,
+    rpm: float,
+    ai_cap: int,
+    llm_seconds: float,
+    duration: float,
+) -> tuple[float, float]:
+    # Start with an empty bucket so both modes measure steady state, not burst.
+    limiter = RateLimiter(rpm)
+    limiter.wait()
+    stream = _FakeStream()
+    done_at: list[float] = []
+    done_lock = threading.Lock()
+    wakeup_event = threading.Event()
+    inflight_futures: set[Future] = set()
+    inflight_owner_by_future: dict[Future, str] = {}
+
+    def _fake_llm_job(*, limiter: Any, **_kwargs: object) -> None:
+        limiter.wait()
+        time.sleep(llm_seconds)
+        with done_lock:
+            done_at.append(time.monotonic())
+
+    started_at = time.monotonic()
+    deadline = started_at + duration
+    with ThreadPoolExecutor(max_workers=ai_cap) as executor:
+        while time.monotonic() < deadline:
+            wakeup_event.clear()
+            scheduler.schedule_ai_from_stream(
+                executor=executor,
+                engine=object(),
+                ai_cap=ai_cap,
+                low_inflight_now_get=lambda: 0,
+                inflight_futures=inflight_futures,
+                inflight_owner_by_future=inflight_owner_by_future,
+                inflight_owner="bench",
+                consumer_name="bench:worker",
+                wakeup_event=wakeup_event,
+                config=object(),
+                limiter=limiter if batched else _SingleSlotLimiter(limiter),
+                redis_client=None,
+                redis_queue_key="bench",
+                prune_inflight_futures_fn=periodic_jobs.prune_inflight_futures,
+                compute_rss_available_slots_fn=scheduler.compute_rss_available_slots,
+                move_due_retry_to_stream_fn=lambda *_args, **_kwargs: 0,
+                claim_stuck_messages_fn=lambda *_args, **_kwargs: [],
+                read_group_messages_fn=stream.read,
+                ack_message_fn=lambda *_args, **_kwargs: None,
+                process_one_redis_payload_fn=_fake_llm_job,
+                fatal_exceptions=(KeyboardInterrupt, SystemExit, GeneratorExit),
+                stuck_seconds=3600,
+            )
+            wakeup_event.wait(timeout=TICK_SECONDS)
+        for fut in list(inflight_futures):
+            fut.cancel()
+    # Skip the first LLM round trip: nothing can finish before it.
+    window_start = started_at + llm_seconds
+    with done_lock:
+        finished = [ts for ts in done_at if window_start <= ts <= deadline]
+    window_minutes = max(0.001, (deadline - window_start) / 60.0)
+    reads = stream.read_batches
+    return len(finished) / window_minutes, sum(reads) / max(1, len(reads))
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    rpm = max(1.0, float(args.rpm))
+    for label, batched in (("single_slot", False), ("batched", True)):
+        jobs_per_min, avg_read = _run_mode(
+            batched=batched,
+            rpm=rpm,
+            ai_cap=max(1, int(args.ai_cap)),
+            llm_seconds=max(0.0, float(args.llm_seconds)),
+            duration=max(1.0, float(args.duration)),
+        )
+        print(
+            f"{label} rpm={rpm:.0f} jobs_per_min={jobs_per_min:.0f} "
+            f"ratio={jobs_per_min / rpm:.2f} avg_read_count={avg_read:.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import sys
+import time
+from uuid import uuid4
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import sqlparams  # type: ignore[import-untyped]  # noqa: E402
+
+from alphavault.db import postgres_db  # noqa: E402
+from alphavault.db.sql import source_queue as source_queue_sql  # noqa: E402
+
+DEFAULT_ITERATIONS = 20000
+DEFAULT_DB_ROWS = 2000
+_UNCACHED_NAMED_TO_PYFORMAT = sqlparams.SQLParams("named", "pyformat", escape_char=True)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="对比 insert_assertion 语句转换缓存前后的 ops/sec"
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=DEFAULT_ITERATIONS,
+        help="纯 Python 绑定参数的循环次数，默认 20000",
+    )
+    parser.add_argument(
+        "--dsn",
+        default=os.getenv("POSTGRES_DSN", ""),
+        help="可选：给了就再跑一轮真实写库（临时表），默认读 POSTGRES_DSN",
+    )
+    parser.add_argument(
+        "--db-rows",
+        type=int,
+        default=DEFAULT_DB_ROWS,
+        help="真实写库的行数，默认 2000",
+    )
+    return parser.parse_args(argv)
+
+
+def _assertion_params(idx: int) -> dict[str, object]:
+    return {
+        "assertion_id": f"bench:{idx}",
+        "post_uid": f"weibo:{idx // 4}",
+        "idx": idx % 4,
+        "action": "trade.buy",
+        "action_strength": 2,
+        "summary": "加仓",
+        "evidence": "原文片段",
+    }
+
+
+def _ops_per_sec(count: int, seconds: float) -> float:
+    return count / seconds if seconds > 0 else float("inf")
+
+
+def _bench_bind(query: str, iterations: int) -> tuple[float, float]:
+    params = [_assertion_params(idx) for idx in range(64)]
+
+    started_at = time.perf_counter()
+    for idx in range(iterations):
+        _UNCACHED_NAMED_TO_PYFORMAT.format(query, params[idx % 64])
+    uncached_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for idx in range(iterations):
+        postgres_db._bind_single(query, params[idx % 64])
+    cached_seconds = time.perf_counter() - started_at
+    return (
+        _ops_per_sec(iterations, uncached_seconds),
+        _ops_per_sec(iterations, cached_seconds),
+    )
+
+
+def _bench_db(dsn: str, rows: int) -> tuple[float, float]:
+    table_name = f"bench_assertions_{uuid4().hex[:12]}"
+    query = source_queue_sql.insert_assertion_sql(table_name)
+    engine = postgres_db.ensure_postgres_engine(dsn)
+    try:
+        with postgres_db.postgres_connect_autocommit(engine) as conn:
+            conn.execute(
+                f"""
+CREATE TEMP TABLE {table_name} (
+    assertion_id text primary key, post_uid text, idx integer, action text,
+    action_strength integer, summary text, evidence text
+)
+"""
+            )
+            started_at = time.perf_counter()
+            for idx in range(rows):
+                converted_query, converted_params = _UNCACHED_NAMED_TO_PYFORMAT.format(
+                    query, _assertion_params(idx)
+                )
+                conn.cursor().execute(
+                    str(converted_query), converted_params, prepare=False
+                )
+            uncached_seconds = time.perf_counter() - started_at
+
+            conn.execute(f"TRUNCATE {table_name}")
+            started_at = time.perf_counter()
+            for idx in range(rows):
+                conn.execute(query, _assertion_params(idx))
+            cached_seconds = time.perf_counter() - started_at
+    finally:
+        engine.dispose()
+    return _ops_per_sec(rows, uncached_seconds), _ops_per_sec(rows, cached_seconds)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    query = source_queue_sql.insert_assertion_sql("assertions")
+    before, after = _bench_bind(query, max(1, int(args.iterations)))
+    print(
+        f"bind insert_assertion before={before:.0f} ops/s "
+        f"after={after:.0f} ops/s speedup={after / before:.1f}x"
+    )
+    dsn = str(args.dsn or "").strip()
+    if not dsn:
+        print("db skipped (no --dsn / POSTGRES_DSN)")
+        return 0
+    before, after = _bench_db(dsn, max(1, int(args.db_rows)))
+    print(
+        f"db insert_assertion before={before:.0f} ops/s "
+        f"after={after:.0f} ops/s speedup={after / before:.2f}x"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+import sys
+from uuid import uuid4
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from alphavault.db import postgres_db  # noqa: E402
+
+DEFAULT_POSTS = 1_000_000
+DEFAULT_AUTHORS = 500
+DEFAULT_SPAN_DAYS = 365
+DEFAULT_WINDOW_DAYS = 1
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="用合成 posts 表对比 TEXT created_at 表达式和 created_at_ts 范围查询的 EXPLAIN"
+    )
+    parser.add_argument(
+        "--dsn",
+        default=os.getenv("POSTGRES_DSN", ""),
+        help="Postgres DSN，默认读 POSTGRES_DSN；会建一个临时 schema，跑完删除",
+    )
+    parser.add_argument(
+        "--posts",
+        type=int,
+        default=DEFAULT_POSTS,
+        help="合成帖子数，默认 1000000",
+    )
+    parser.add_argument(
+        "--authors",
+        type=int,
+        default=DEFAULT_AUTHORS,
+        help="作者数量，默认 500",
+    )
+    parser.add_argument(
+        "--window-days",
+        type=int,
+        default=DEFAULT_WINDOW_DAYS,
+        help="查询窗口天数，默认 1",
+    )
+    return parser.parse_args(argv)
+
+
+def _legacy_created_at_expr(column: str) -> str:
+    # The per-row parse every window query used before created_at_ts existed.
+    as_text = f"CAST({column} AS text)"
+    normalized = f"btrim(replace({as_text}, 'T', ' '))"
+    normalized_utc = f"replace({normalized}, 'Z', '+00:00')"
+    with_timezone = (
+        f"{normalized} ~ "
+        "'^[0-9]{4}-[0-9]{2}-[0-9]{2} "
+        "[0-9]{2}:[0-9]{2}(:[0-9]{2}(\\.[0-9]+)?)?"
+        "(Z|[+-][0-9]{2}(:?[0-9]{2})?)$'"
+    )
+    without_timezone = (
+        f"{normalized} ~ "
+        "'^[0-9]{4}-[0-9]{2}-[0-9]{2} "
+        "[0-9]{2}:[0-9]{2}(:[0-9]{2}(\\.[0-9]+)?)?$'"
+    )
+    return (
+        "CASE "
+        f"WHEN {normalized} = '' THEN NULL "
+        f"WHEN {with_timezone} THEN CAST({normalized_utc} AS timestamptz) "
+        f"WHEN {without_timezone} THEN CAST(({normalized} || '+08:00') AS timestamptz) "
+        "ELSE NULL "
+        "END"
+    )
+
+
+def _create_posts(
+    conn: postgres_db.PostgresConnection,
+    *,
+    schema_name: str,
+    posts: int,
+    authors: int,
+) -> None:
+    conn.execute(f"CREATE SCHEMA {schema_name}")
+    conn.execute(
+        f"""
+CREATE TABLE {schema_name}.posts (
+    post_uid TEXT PRIMARY KEY,
+    author TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    created_at_ts TIMESTAMPTZ,
+    processed_at TEXT
+)
+"""
+    )
+    conn.execute(
+        f"""
+INSERT INTO {schema_name}.posts(post_uid, author, created_at, created_at_ts, processed_at)
+SELECT
+    'weibo:' || g,
+    'author_' || (g % {max(1, int(authors))}),
+    to_char(ts AT TIME ZONE 'Asia/Shanghai', 'YYYY-MM-DD HH24:MI:SS'),
+    ts,
+    'done'
+FROM (
+    SELECT g, now() - (g * INTERVAL '{DEFAULT_SPAN_DAYS} days' / {max(1, int(posts))}) AS ts
+    FROM generate_series(1, {max(1, int(posts))}) AS g
+) s
+"""
+    )
+    conn.execute(
+        f"CREATE INDEX ON {schema_name}.posts(created_at)",
+    )
+    conn.execute(f"CREATE INDEX ON {schema_name}.posts(author, created_at)")
+    conn.execute(f"CREATE INDEX ON {schema_name}.posts(created_at_ts, post_uid)")
+    conn.execute(f"CREATE INDEX ON {schema_name}.posts(author, created_at_ts)")
+    conn.execute(f"ANALYZE {schema_name}.posts")
+
+
+def _explain(conn: postgres_db.PostgresConnection, sql: str) -> tuple[float, str]:
+    raw = conn.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}").scalar()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+    root = plan["Plan"]
+    node = root
+    while node.get("Plans") and node.get("Node Type") in {"Aggregate", "Limit", "Sort"}:
+        node = node["Plans"][0]
+    return float(plan["Execution Time"]), str(node.get("Node Type") or "")
+
+
+def _queries(schema_name: str, window_days: int) -> dict[str, tuple[str, str]]:
+    legacy = _legacy_created_at_expr("p.created_at")
+    cutoff = f"CURRENT_TIMESTAMP - INTERVAL '{max(1, int(window_days))} days'"
+    table = f"{schema_name}.posts"
+    return {
+        "window_count": (
+            f"SELECT COUNT(*) FROM {table} p WHERE {legacy} >= ({cutoff})",
+            f"SELECT COUNT(*) FROM {table} p WHERE p.created_at_ts >= ({cutoff})",
+        ),
+        "author_window_page": (
+            f"SELECT p.post_uid FROM {table} p WHERE p.author = 'author_7' "
+            f"AND {legacy} >= ({cutoff}) ORDER BY {legacy} DESC LIMIT 20",
+            f"SELECT p.post_uid FROM {table} p WHERE p.author = 'author_7' "
+            f"AND p.created_at_ts >= ({cutoff}) ORDER BY p.created_at_ts DESC LIMIT 20",
+        ),
+        "board_window_page": (
+            f"SELECT p.post_uid FROM {table} p WHERE {legacy} >= ({cutoff}) "
+            f"ORDER BY {legacy} DESC, p.post_uid DESC LIMIT 200",
+            f"SELECT p.post_uid FROM {table} p WHERE p.created_at_ts >= ({cutoff}) "
+            "ORDER BY p.created_at_ts DESC, p.post_uid DESC LIMIT 200",
+        ),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    dsn = str(args.dsn or "").strip()
+    if not dsn:
+        print("need --dsn or POSTGRES_DSN")
+        return 1
+    schema_name = f"bench_created_at_{uuid4().hex[:8]}"
+    engine = postgres_db.ensure_postgres_engine(dsn)
+    try:
+        with postgres_db.postgres_connect_autocommit(engine) as conn:
+            try:
+                _create_posts(
+                    conn,
+                    schema_name=schema_name,
+                    posts=int(args.posts),
+                    authors=int(args.authors),
+                )
+                for name, (before_sql, after_sql) in _queries(
+                    schema_name, int(args.window_days)
+                ).items():
+                    before_ms, before_node = _explain(conn, before_sql)
+                    after_ms, after_node = _explain(conn, after_sql)
+                    print(
+                        f"{name} before={before_ms:.1f}ms ({before_node}) "
+                        f"after={after_ms:.1f}ms ({after_node}) "
+                        f"speedup={before_ms / max(after_ms, 0.001):.0f}x"
+                    )
+            finally:
+                conn.execute(f"DROP SCHEMA IF EXISTS {schema_name} CASCADE")
+    finally:
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
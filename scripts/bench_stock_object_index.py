@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+import time
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from alphavault.domains.stock.object_index import (  # noqa: E402
+    StockObjectIndexState,
+    build_stock_object_index,
+)
+
+DEFAULT_STOCK_KEYS = 50_000
+DEFAULT_NEW_ROWS = 200
+DEFAULT_ROUNDS = 5
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="用合成观点对比全量重建和增量同步个股对象索引的耗时"
+    )
+    parser.add_argument(
+        "--stock-keys",
+        type=int,
+        default=DEFAULT_STOCK_KEYS,
+        help="不同 stock key 的数量（代码和名字各占一半），默认 50000",
+    )
+    parser.add_argument(
+        "--new-rows",
+        type=int,
+        default=DEFAULT_NEW_ROWS,
+        help="每轮增量新进窗口的观点数，默认 200",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=DEFAULT_ROUNDS, help="每种方式跑几轮，默认 5"
+    )
+    return parser.parse_args(argv)
+
+
+def _code(idx: int) -> str:
+    return f"{600000 + idx:06d}.SH"
+
+
+def _build_rows(stock_keys: int) -> list[dict[str, object]]:
+    """One coded row and one name-only row per stock, so keys split code/name."""
+    rows: list[dict[str, object]] = []
+    for idx in range(max(1, stock_keys // 2)):
+        code = _code(idx)
+        name = f"合成股份{idx}"
+        rows.append(
+            {
+                "post_uid": f"weibo:{idx}",
+                "idx": 1,
+                "entity_key": f"stock:{code}",
+                "stock_codes": [code],
+                "stock_names": [name],
+            }
+        )
+        rows.append(
+            {
+                "post_uid": f"weibo:{idx}",
+                "idx": 2,
+                "entity_key": f"stock:{name}",
+                "stock_codes": [],
+                "stock_names": [name],
+            }
+        )
+    return rows
+
+
+def _new_rows(batch: int, count: int, offset: int) -> list[dict[str, object]]:
+    return [
+        {
+            "post_uid": f"weibo:new-{batch}-{idx}",
+            "idx": 1,
+            "entity_key": f"stock:{_code((offset + idx) % 500_000)}",
+            "stock_codes": [_code((offset + idx) % 500_000)],
+            "stock_names": [],
+        }
+        for idx in range(count)
+    ]
+
+
+def _timed_ms(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    rows = _build_rows(int(args.stock_keys))
+    rounds = max(1, int(args.rounds))
+    new_rows = max(1, int(args.new_rows))
+
+    full_ms = sum(
+        _timed_ms(lambda: build_stock_object_index(rows)) for _ in range(rounds)
+    )
+    full_ms /= rounds
+
+    state = StockObjectIndexState()
+    state.sync_assertions(rows)
+    state.index()
+    unchanged_ms = sum(
+        _timed_ms(lambda: (state.sync_assertions(rows), state.index()))
+        for _ in range(rounds)
+    )
+    unchanged_ms /= rounds
+
+    window = list(rows)
+    incremental_ms = 0.0
+    for batch in range(rounds):
+        window = window[new_rows:] + _new_rows(batch, new_rows, len(rows) + batch)
+        incremental_ms += _timed_ms(
+            lambda: (state.sync_assertions(window), state.index())
+        )
+    incremental_ms /= rounds
+
+    payload = ""
+
+    def _dump() -> None:
+        nonlocal payload
+        payload = json.dumps(state.to_snapshot(), ensure_ascii=False)
+
+    save_ms = _timed_ms(_dump)
+    load_ms = _timed_ms(
+        lambda: StockObjectIndexState.from_snapshot(json.loads(payload))
+    )
+
+    index = state.index()
+    print(
+        f"rows={len(window)} stock_keys={len(index.object_key_by_member)} "
+        f"objects={len(index.member_keys_by_object_key)} "
+        f"snapshot_bytes={len(payload.encode('utf-8'))}"
+    )
+    print(
+        f"full_build={full_ms:.1f}ms unchanged_sync={unchanged_ms:.1f}ms "
+        f"incremental_sync={incremental_ms:.1f}ms "
+        f"snapshot_save={save_ms:.1f}ms snapshot_load={load_ms:.1f}ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import sys
+import time
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from alphavault.db.post_thread_trees import render_post_thread_tree_rows  # noqa: E402
+from alphavault.domains.thread_tree.api import CSV_RAW_FIELDS_MARKER  # noqa: E402
+from alphavault_reflex.services.stock_hot_read import (  # noqa: E402
+    _enrich_signal_rows_with_tree,
+)
+from alphavault_reflex.services.stock_related_feed import (  # noqa: E402
+    build_related_feed,
+)
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_TEXT_CHARS = 400
+DEFAULT_ROUNDS = 20
+AUTHORS = ["老王", "小李", "张三", "韭菜甲", "价值派"]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="用合成个股页对比每次现渲染对话树和读 post_thread_trees 缓存的页面渲染耗时"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help="每页帖子数，默认 50",
+    )
+    parser.add_argument(
+        "--text-chars",
+        type=int,
+        default=DEFAULT_TEXT_CHARS,
+        help="每条帖子正文长度，默认 400",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=DEFAULT_ROUNDS, help="每种方式跑几轮，默认 20"
+    )
+    return parser.parse_args(argv)
+
+
+def _build_page(
+    *, page_size: int, text_chars: int
+) -> tuple[list[dict[str, object]], list[dict[str, str]]]:
+    """Half originals, half reposts whose CSV fields point at an original."""
+    rnd = random.Random(23)
+    alphabet = "茅台五粮液加仓减仓估值分红回购，。abc123"
+
+    def text() -> str:
+        return "".join(rnd.choice(alphabet) for _ in range(text_chars))
+
+    posts: list[dict[str, object]] = []
+    rows: list[dict[str, str]] = []
+    for idx in range(max(1, page_size)):
+        platform_post_id = str(50_000 + idx)
+        author = AUTHORS[idx % len(AUTHORS)]
+        raw_text = text()
+        if idx % 2:
+            parent = posts[rnd.randrange(len(posts))]
+            csv_fields = {
+                "源微博id": parent["platform_post_id"],
+                "源用户昵称": parent["author"],
+                "源微博正文": str(parent["raw_text"])[:80],
+            }
+            raw_text = (
+                f"{raw_text}\n{CSV_RAW_FIELDS_MARKER} "
+                f"{json.dumps(csv_fields, ensure_ascii=False)}"
+            )
+        post_uid = f"weibo:{platform_post_id}"
+        created_at = f"2026-04-{1 + idx // 60:02d} 10:{idx % 60:02d}:00"
+        posts.append(
+            {
+                "post_uid": post_uid,
+                "platform_post_id": platform_post_id,
+                "author": author,
+                "created_at": created_at,
+                "url": "",
+                "raw_text": raw_text,
+            }
+        )
+        rows.append(
+            {
+                "post_uid": post_uid,
+                "summary": f"观点 {idx}",
+                "action": "trade.buy",
+                "match_kind": "assertion",
+            }
+        )
+    return posts, rows
+
+
+def _render_page(
+    rows: list[dict[str, str]],
+    *,
+    posts: list[dict[str, object]],
+    cached_trees: dict[str, tuple[str, str]] | None,
+) -> int:
+    signals = _enrich_signal_rows_with_tree(
+        rows, posts=posts, cached_trees=cached_trees
+    )
+    feed = build_related_feed(
+        signals=signals, related_filter="all", limit=max(len(signals), 1)
+    )
+    return len(feed.rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    posts, rows = _build_page(
+        page_size=int(args.page_size), text_chars=max(1, int(args.text_chars))
+    )
+    rounds = max(1, int(args.rounds))
+    posts_by_id = {str(post["platform_post_id"]): post for post in posts}
+    # What the AI-done write stores; readers fetch it with one indexed lookup.
+    cached_trees = {
+        str(row["post_uid"]): (str(row["tree_label"]), str(row["tree_text"]))
+        for row in render_post_thread_tree_rows(
+            posts, parents_by_id=posts_by_id, updated_at="bench"
+        )
+    }
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        live_items = _render_page(rows, posts=posts, cached_trees=None)
+    live_ms = (time.perf_counter() - started) * 1000 / rounds
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        cached_items = _render_page(rows, posts=posts, cached_trees=cached_trees)
+    cached_ms = (time.perf_counter() - started) * 1000 / rounds
+
+    print(f"page_size={len(rows)} live_items={live_items} cached_items={cached_items}")
+    print(
+        f"live={live_ms:.1f}ms cached={cached_ms:.1f}ms "
+        f"speedup={live_ms / max(cached_ms, 0.001):.1f}x"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from alphavault.ai.topic_prompt_v4 import build_topic_prompt  # noqa: E402
+from alphavault.weibo.topic_prompt_tree import (  # noqa: E402
+    MAX_TOPIC_PROMPT_CHARS,
+    build_topic_runtime_context,
+    thread_root_info_for_post,
+)
+from alphavault.worker.topic_prompt_v4 import (  # noqa: E402
+    build_topic_prompt_v4_with_prompt_chars_limit,
+    max_message_tree_text_len,
+)
+
+DEFAULT_POSTS = 60
+DEFAULT_SEGMENTS = 6
+DEFAULT_SEGMENT_CHARS = 300
+DEFAULT_ROUNDS = 5
+SPEAKERS = ["老王", "小李", "张三", "韭菜甲", "价值派"]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="用合成长回复链对比逐次重建二分和增量估算两种 prompt 截断方式的耗时"
+    )
+    parser.add_argument(
+        "--posts", type=int, default=DEFAULT_POSTS, help="线程帖子数，默认 60"
+    )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=DEFAULT_SEGMENTS,
+        help="每条帖子的回复链段数，默认 6",
+    )
+    parser.add_argument(
+        "--segment-chars",
+        type=int,
+        default=DEFAULT_SEGMENT_CHARS,
+        help="每段文字长度，默认 300",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=DEFAULT_ROUNDS, help="每种方式跑几轮，默认 5"
+    )
+    return parser.parse_args(argv)
+
+
+def _build_thread(*, posts: int, segments: int, segment_chars: int) -> dict[str, Any]:
+    rnd = random.Random(17)
+    alphabet = '茅台五粮液加仓减仓估值分红 "回购"，。abc123'
+
+    def text() -> str:
+        return "".join(rnd.choice(alphabet) for _ in range(segment_chars))
+
+    root = f"老王：{text()}"
+    rows: list[dict[str, object]] = []
+    for idx in range(max(1, posts)):
+        chain = [root]
+        chain += [f"{rnd.choice(SPEAKERS)}：{text()}" for _ in range(segments - 1)]
+        chain.append(f"老王：{text()}")
+        rows.append(
+            {
+                "platform_post_id": str(10_000 + idx),
+                "author": "老王",
+                "created_at": f"2026-04-01 10:{idx % 60:02d}:00",
+                "raw_text": "\n---\n".join(chain),
+            }
+        )
+    root_key, root_segment, root_content_key = thread_root_info_for_post(
+        raw_text=root, author="老王"
+    )
+    return {
+        "root_key": root_key,
+        "root_segment": root_segment,
+        "root_content_key": root_content_key,
+        "focus_username": "老王",
+        "posts": rows,
+    }
+
+
+def _rebuild_each_probe(
+    *, max_prompt_chars: int, **kwargs: Any
+) -> tuple[str, int, bool]:
+    """The pre-size-model search: full context and prompt rebuild per probe."""
+
+    def build(node_chars: int, include_comments: bool, compact: bool) -> tuple:
+        ctx, _truncated = build_topic_runtime_context(
+            include_virtual_comments=include_comments,
+            max_node_text_chars=node_chars,
+            **kwargs,
+        )
+        prompt = build_topic_prompt(
+            ai_topic_package=ctx.ai_topic_package, compact_json=compact
+        )
+        return ctx, prompt
+
+    for include_comments in (True, False):
+        for compact in (False, True):
+            ctx, prompt = build(0, include_comments, compact)
+            if len(prompt) <= max_prompt_chars:
+                return prompt, 0, include_comments
+        lo, hi = 1, max(1, max_message_tree_text_len(ctx.message_tree))
+        best: tuple[str, int, bool] | None = None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            _ctx, prompt = build(mid, include_comments, True)
+            if len(prompt) <= max_prompt_chars:
+                best = (prompt, mid, include_comments)
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        if best is not None:
+            return best
+    raise RuntimeError("topic_prompt_too_long")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    kwargs = _build_thread(
+        posts=int(args.posts),
+        segments=max(1, int(args.segments)),
+        segment_chars=max(1, int(args.segment_chars)),
+    )
+    rounds = max(1, int(args.rounds))
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        before_prompt, before_cap, _before_comments = _rebuild_each_probe(
+            max_prompt_chars=MAX_TOPIC_PROMPT_CHARS, **kwargs
+        )
+    before_ms = (time.perf_counter() - started) * 1000 / rounds
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = build_topic_prompt_v4_with_prompt_chars_limit(
+            max_prompt_chars=MAX_TOPIC_PROMPT_CHARS, **kwargs
+        )
+    after_ms = (time.perf_counter() - started) * 1000 / rounds
+
+    after_prompt, after_cap = result[2], result[4]
+    print(
+        f"node_chars_cap before={before_cap} after={after_cap} "
+        f"same_prompt={before_prompt == after_prompt} "
+        f"prompt_chars={len(after_prompt)} include_comments={result[6]}"
+    )
+    print(
+        f"before={before_ms:.1f}ms after={after_ms:.1f}ms "
+        f"speedup={before_ms / max(after_ms, 0.001):.1f}x"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
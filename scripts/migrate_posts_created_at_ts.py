@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from alphavault.constants import SCHEMA_WEIBO, SCHEMA_XUEQIU  # noqa: E402
+from alphavault.db.postgres_db import (  # noqa: E402
+    PostgresConnection,
+    ensure_postgres_engine,
+    postgres_connect_autocommit,
+    qualify_postgres_table,
+)
+from alphavault.db.postgres_env import PostgresSource  # noqa: E402
+from alphavault.db.postgres_env import load_configured_postgres_sources_from_env  # noqa: E402
+from alphavault.db.sql_rows import read_sql_rows  # noqa: E402
+from alphavault.env import load_dotenv_if_present  # noqa: E402
+from alphavault.logging_config import add_log_level_argument  # noqa: E402
+from alphavault.logging_config import configure_logging  # noqa: E402
+from alphavault.logging_config import get_logger  # noqa: E402
+from alphavault.timeutil import parse_post_created_at  # noqa: E402
+
+DEFAULT_BATCH_SIZE = 2000
+SOURCE_SCHEMAS = frozenset((SCHEMA_WEIBO, SCHEMA_XUEQIU))
+logger = get_logger(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="给 posts 加 created_at_ts 列、回填并建时间窗口索引"
+    )
+    parser.add_argument(
+        "--schema",
+        choices=(*sorted(SOURCE_SCHEMAS), "all"),
+        default="all",
+        help="只处理某个 source schema，默认 all",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="每批扫描多少行，默认 2000",
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="真的写库；默认只做 dry-run",
+    )
+    add_log_level_argument(parser)
+    return parser.parse_args(argv)
+
+
+def _configured_sources(target_schema: str) -> list[PostgresSource]:
+    sources = [
+        source
+        for source in load_configured_postgres_sources_from_env()
+        if source.schema in SOURCE_SCHEMAS
+    ]
+    if target_schema == "all":
+        return sources
+    return [source for source in sources if source.schema == target_schema]
+
+
+def _posts_table(source: PostgresSource) -> str:
+    return qualify_postgres_table(source.schema, "posts")
+
+
+def _has_created_at_ts(conn: PostgresConnection, *, source: PostgresSource) -> bool:
+    rows = read_sql_rows(
+        conn,
+        """
+SELECT 1 AS found
+FROM information_schema.columns
+WHERE table_schema = :schema_name
+  AND table_name = 'posts'
+  AND column_name = 'created_at_ts'
+""",
+        params={"schema_name": source.schema},
+    )
+    return bool(rows)
+
+
+def _ensure_column(conn: PostgresConnection, *, source: PostgresSource) -> None:
+    conn.execute(
+        f"ALTER TABLE {_posts_table(source)} "
+        "ADD COLUMN IF NOT EXISTS created_at_ts TIMESTAMPTZ"
+    )
+
+
+def _ensure_indexes(conn: PostgresConnection, *, source: PostgresSource) -> None:
+    for index_name, columns in (
+        ("idx_posts_created_at_ts_post_uid", "created_at_ts, post_uid"),
+        ("idx_posts_author_created_at_ts", "author, created_at_ts"),
+    ):
+        conn.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+            f"ON {_posts_table(source)}({columns})"
+        )
+        logger.info("schema=%s index=%s ready", source.schema, index_name)
+    conn.execute(f"ANALYZE {_posts_table(source)}")
+
+
+def _scan_rows(
+    conn: PostgresConnection,
+    *,
+    source: PostgresSource,
+    after_post_uid: str,
+    batch_size: int,
+    only_missing: bool,
+) -> list[dict[str, object]]:
+    missing_clause = "AND created_at_ts IS NULL" if only_missing else ""
+    sql = f"""
+SELECT post_uid, created_at
+FROM {_posts_table(source)}
+WHERE post_uid > :after_post_uid
+  {missing_clause}
+ORDER BY post_uid ASC
+LIMIT :limit
+"""
+    return read_sql_rows(
+        conn,
+        sql,
+        params={
+            "after_post_uid": after_post_uid,
+            "limit": max(1, int(batch_size)),
+        },
+    )
+
+
+def _update_rows(
+    conn: PostgresConnection,
+    *,
+    source: PostgresSource,
+    rows: list[dict[str, object]],
+) -> int:
+    if not rows:
+        return 0
+    sql = f"""
+UPDATE {_posts_table(source)}
+SET created_at_ts = :created_at_ts
+WHERE post_uid = :post_uid
+"""
+    conn.execute(sql, rows)
+    return len(rows)
+
+
+def _migrate_source(
+    source: PostgresSource,
+    *,
+    batch_size: int,
+    apply: bool,
+) -> tuple[int, int, int]:
+    engine = ensure_postgres_engine(source.url, schema_name=source.schema)
+    scanned_rows = 0
+    updated_rows = 0
+    unparsed_rows = 0
+    after_post_uid = ""
+    with postgres_connect_autocommit(engine) as conn:
+        has_column = _has_created_at_ts(conn, source=source)
+        if apply and not has_column:
+            _ensure_column(conn, source=source)
+            has_column = True
+        while True:
+            rows = _scan_rows(
+                conn,
+                source=source,
+                after_post_uid=after_post_uid,
+                batch_size=batch_size,
+                only_missing=has_column,
+            )
+            if not rows:
+                break
+            after_post_uid = str(rows[-1].get("post_uid") or "").strip()
+            scanned_rows += len(rows)
+            update_payload: list[dict[str, object]] = []
+            for row in rows:
+                created_at_ts = parse_post_created_at(row.get("created_at"))
+                if created_at_ts is None:
+                    unparsed_rows += 1
+                    continue
+                update_payload.append(
+                    {
+                        "post_uid": str(row.get("post_uid") or "").strip(),
+                        "created_at_ts": created_at_ts,
+                    }
+                )
+            if apply:
+                updated_rows += _update_rows(conn, source=source, rows=update_payload)
+            else:
+                updated_rows += len(update_payload)
+            logger.info(
+                "schema=%s scanned=%s updated=%s unparsed=%s dry_run=%s",
+                source.schema,
+                scanned_rows,
+                updated_rows,
+                unparsed_rows,
+                "0" if apply else "1",
+            )
+        if apply:
+            _ensure_indexes(conn, source=source)
+    return scanned_rows, updated_rows, unparsed_rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    configure_logging(level=args.log_level)
+    load_dotenv_if_present()
+    sources = _configured_sources(args.schema)
+    if not sources:
+        logger.error("没有可用的 source schema，先检查 POSTGRES_DSN。")
+        return 1
+
+    total_scanned = 0
+    total_updated = 0
+    total_unparsed = 0
+    for source in sources:
+        scanned_rows, updated_rows, unparsed_rows = _migrate_source(
+            source,
+            batch_size=max(1, int(args.batch_size)),
+            apply=bool(args.apply),
+        )
+        total_scanned += scanned_rows
+        total_updated += updated_rows
+        total_unparsed += unparsed_rows
+    logger.info(
+        "finished scanned=%s updated=%s unparsed=%s dry_run=%s",
+        total_scanned,
+        total_updated,
+        total_unparsed,
+        "0" if args.apply else "1",
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
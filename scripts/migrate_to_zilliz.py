@@ -48,6 +48,7 @@ from alphavault.db.postgres_db import (
 )
 from alphavault.db.postgres_env import require_postgres_source_from_env
 from alphavault.db.sql_rows import read_sql_rows
+from alphavault.db.zilliz_writer import ZillizSemanticDocWriter
 from alphavault.env import load_dotenv_if_present
 
 
@@ -75,32 +76,18 @@ class MigrationStats:
 
     def report(self) -> str:
         elapsed = time.time() - self.start_time
+        docs_per_sec = self.migrated_count / elapsed if elapsed > 0 else 0.0
         return (
             f"迁移统计:\n"
             f"  总记录数: {self.total_count}\n"
             f"  已迁移: {self.migrated_count}\n"
             f"  跳过: {self.skipped_count}\n"
             f"  错误: {self.error_count}\n"
-            f"  耗时: {elapsed:.1f}秒"
+            f"  耗时: {elapsed:.1f}秒\n"
+            f"  吞吐: {docs_per_sec:.1f} docs/秒"
         )
 
 
-def parse_vector_text(value: object) -> list[float]:
-    """解析 Postgres 向量文本格式 '[0.1,0.2,...]' 为 Python list"""
-    text = str(value or "").strip()
-    if not text:
-        return []
-    # 去掉前后的 '[' 和 ']'
-    if text.startswith("[") and text.endswith("]"):
-        text = text[1:-1]
-    if not text:
-        return []
-    try:
-        return [float(x.strip()) for x in text.split(",") if x.strip()]
-    except ValueError:
-        return []
-
-
 def load_migration_state(state_file: str) -> dict[str, set[str]]:
     """加载迁移状态（已迁移的 doc_id）"""
     if not os.path.exists(state_file):
@@ -166,7 +153,7 @@ def fetch_semantic_docs_from_postgres(
         doc_text,
         content_hash,
         embedding_model,
-        CAST(embedding AS TEXT) AS embedding_text,
+        halfvec_send(embedding) AS embedding,
         updated_at
     FROM {schema}.semantic_docs
     ORDER BY created_at_ts DESC, doc_id ASC
@@ -245,121 +232,6 @@ def create_zilliz_collection(
             pass
 
 
-def migrate_batch_to_zilliz(
-    client: Any,
-    collection_name: str,
-    rows: list[dict[str, Any]],
-    vector_dim: int,
-    dry_run: bool = False,
-    max_retries: int = 3,
-) -> tuple[int, int]:
-    """批量迁移到 Zilliz（返回成功数和失败数，支持重试）"""
-    if not rows:
-        return 0, 0
-
-    # 准备批量插入数据
-    data: dict[str, list[Any]] = {
-        "doc_id": [],
-        "post_uid": [],
-        "assertion_id": [],
-        "doc_kind": [],
-        "chunk_seq": [],
-        "platform": [],
-        "author": [],
-        "created_at": [],
-        "action": [],
-        "action_strength": [],
-        "doc_text": [],
-        "content_hash": [],
-        "embedding_model": [],
-        "embedding": [],
-    }
-
-    success_count = 0
-    error_count = 0
-
-    for row in rows:
-        try:
-            # 解析 embedding
-            embedding = parse_vector_text(row.get("embedding_text"))
-            if len(embedding) != vector_dim:
-                print(
-                    f"⚠️  跳过 {row.get('doc_id')}: embedding 维度不匹配 "
-                    f"(期望 {vector_dim}, 实际 {len(embedding)})"
-                )
-                error_count += 1
-                continue
-
-            # 填充数据
-            data["doc_id"].append(str(row.get("doc_id") or ""))
-            data["post_uid"].append(str(row.get("post_uid") or ""))
-            data["assertion_id"].append(str(row.get("assertion_id") or ""))
-            data["doc_kind"].append(str(row.get("doc_kind") or ""))
-            data["chunk_seq"].append(int(row.get("chunk_seq") or 1))
-            data["platform"].append(str(row.get("platform") or ""))
-            data["author"].append(str(row.get("author") or "")[:255])  # 截断
-            data["created_at"].append(str(row.get("created_at") or ""))
-            data["action"].append(str(row.get("action") or ""))
-            data["action_strength"].append(int(row.get("action_strength") or 0))
-            # doc_text 截断到 65535 字符
-            doc_text = str(row.get("doc_text") or "")[:65535]
-            data["doc_text"].append(doc_text)
-            data["content_hash"].append(str(row.get("content_hash") or ""))
-            data["embedding_model"].append(str(row.get("embedding_model") or ""))
-            data["embedding"].append(embedding)
-
-            success_count += 1
-
-        except Exception as e:
-            print(f"⚠️  处理记录失败 {row.get('doc_id')}: {e}")
-            error_count += 1
-
-    # 批量插入（带重试）
-    if success_count > 0 and not dry_run:
-        # 转换为 list of dicts
-        rows_to_insert = []
-        for i in range(success_count):
-            rows_to_insert.append(
-                {
-                    "doc_id": data["doc_id"][i],
-                    "post_uid": data["post_uid"][i],
-                    "assertion_id": data["assertion_id"][i],
-                    "doc_kind": data["doc_kind"][i],
-                    "chunk_seq": data["chunk_seq"][i],
-                    "platform": data["platform"][i],
-                    "author": data["author"][i],
-                    "created_at": data["created_at"][i],
-                    "action": data["action"][i],
-                    "action_strength": data["action_strength"][i],
-                    "doc_text": data["doc_text"][i],
-                    "content_hash": data["content_hash"][i],
-                    "embedding_model": data["embedding_model"][i],
-                    "embedding": data["embedding"][i],
-                }
-            )
-
-        # 使用 upsert 而不是 insert，避免重复插入（重试逻辑）
-        for attempt in range(max_retries):
-            try:
-                client.upsert(collection_name=collection_name, data=rows_to_insert)
-                break  # 成功则退出重试
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    import time
-
-                    wait_time = 2**attempt  # 指数退避: 1s, 2s, 4s
-                    print(
-                        f"⚠️  upsert 失败 (尝试 {attempt + 1}/{max_retries}), {wait_time}秒后重试: {e}"
-                    )
-                    time.sleep(wait_time)
-                else:
-                    print(f"❌ 批量 upsert 最终失败: {e}")
-                    error_count += success_count
-                    success_count = 0
-
-    return success_count, error_count
-
-
 def migrate_schema_to_zilliz(
     client: Any,
     engine: PostgresEngine,
@@ -395,9 +267,16 @@ def migrate_schema_to_zilliz(
 
     stats.total_count += total_to_process
 
-    # 3. 流式读取并迁移
+    # 3. 流式读取并迁移：向量按 pgvector 二进制读出，直接转 float32 按主键 upsert
     pg_batch_size = 1000  # 每次从 Postgres 读取 1000 条
-    zilliz_batch_size = config.batch_size  # 每次向 Zilliz 写入的批次
+    writer = ZillizSemanticDocWriter(
+        schema,
+        client=client,
+        max_batch_docs=config.batch_size,  # 每次向 Zilliz 写入的批次
+        dimensions=config.vector_dim,
+        retries=2,
+        dry_run=config.dry_run,
+    )
     offset = 0
     processed = 0
 
@@ -428,18 +307,18 @@ def migrate_schema_to_zilliz(
             print(f"  [跳过] {skipped} 条已迁移的记录")
 
         if rows_to_migrate:
-            # 分批次写入 Zilliz
-            for i in range(0, len(rows_to_migrate), zilliz_batch_size):
-                batch = rows_to_migrate[i : i + zilliz_batch_size]
-                success, errors = migrate_batch_to_zilliz(
-                    client, collection_name, batch, config.vector_dim, config.dry_run
-                )
-                stats.migrated_count += success
+            try:
+                doc_ids = writer.upsert_docs(rows_to_migrate)
+                writer.flush()
+            except Exception as e:
+                print(f"❌ 批量 upsert 最终失败: {e}")
+                stats.error_count += len(rows_to_migrate)
+            else:
+                # 维度不匹配 / 向量为空的记录会被写入器跳过
+                errors = len(rows_to_migrate) - len(doc_ids)
+                stats.migrated_count += len(doc_ids)
                 stats.error_count += errors
-
-                # 更新状态
-                for row in batch[:success]:
-                    migrated_doc_ids.add(str(row.get("doc_id")))
+                migrated_doc_ids.update(doc_ids)
 
                 # 显示进度
                 already_migrated_before_start = (
@@ -449,15 +328,13 @@ def migrate_schema_to_zilliz(
                 progress_pct = (stats.migrated_count / total_to_process) * 100
                 print(
                     f"  进度: {stats.migrated_count}/{total_to_process} ({progress_pct:.1f}%) "
-                    f"- 本批: 成功 {success}, 失败 {errors} "
-                    f"| 累计: {total_now_migrated} (含之前 {already_migrated_before_start})"
+                    f"- 本批: 成功 {len(doc_ids)}, 失败 {errors} "
+                    f"| 累计: {total_now_migrated} (含之前 {already_migrated_before_start}) "
+                    f"| {writer.stats()['docs_per_sec']} docs/秒"
                 )
 
-                # 定期保存状态
-                if (
-                    stats.migrated_count % (zilliz_batch_size * 10) == 0
-                    and not config.dry_run
-                ):
+                # 每页写完保存一次状态
+                if not config.dry_run:
                     save_migration_state(
                         config.state_file,
                         {"xueqiu": migrated_doc_ids, "weibo": migrated_doc_ids},
@@ -13,6 +13,7 @@ if str(ROOT_DIR) not in sys.path:
 from alphavault.ai.analyze import AI_MODE_COMPLETION, AI_MODE_RESPONSES  # noqa: E402
 from alphavault.env import load_dotenv_if_present  # noqa: E402
 from alphavault.infra.ai import relation_candidate_ranker  # noqa: E402
+from alphavault.infra.ai.distributed_limiter import build_ai_rate_limiter  # noqa: E402
 from alphavault.infra.ai.runtime_config import (  # noqa: E402
     AI_REASONING_EFFORT_CHOICES,
     AI_TASK_RELATION_CANDIDATE_RANK,
@@ -34,7 +35,6 @@ from alphavault.research_workbench import (  # noqa: E402
     should_auto_accept_relation_candidate_row,
     upsert_relation_candidate,
 )
-from alphavault.rss.utils import RateLimiter  # noqa: E402
 
 DEFAULT_AI_BATCH_SIZE = int(relation_candidate_ranker.AI_RANK_BATCH_CAP)
 DEFAULT_MAX_ROUNDS = 0
@@ -339,7 +339,13 @@ def _run_one_round(
         ],
     )
 
-    limiter = RateLimiter(float(runtime_config.ai_rpm))
+    limiter = build_ai_rate_limiter(
+        rpm=float(runtime_config.ai_rpm),
+        burst=runtime_config.ai_burst,
+        limit_group_name=runtime_config.limit_group_name,
+        max_inflight=runtime_config.ai_max_inflight,
+        timeout_seconds=runtime_config.timeout_seconds,
+    )
     batch_rows_list = _chunk_rows(target_rows, chunk_size=ai_batch_size)
     futures: list[Future[list[dict[str, Any]]]] = []
     enriched_rows: list[dict[str, Any]] = []
@@ -10,6 +10,8 @@ _SOURCE_TABLES = {
     "assertions",
     "assertion_mentions",
     "assertion_entities",
+    "assertion_rollups",
+    "post_thread_trees",
     "post_context_runs",
     "post_context_mentions",
     "post_context_entities",
@@ -160,6 +162,7 @@ def test_apply_cloud_schema_posts_table_has_no_ai_runtime_columns(pg_conn) -> No
         "platform_post_id",
         "author",
         "created_at",
+        "created_at_ts",
         "url",
         "raw_text",
         "raw_text_search_norm",
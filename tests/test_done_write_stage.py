@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from alphavault.db.source_queue import AssertionsDoneWriteRow
+from alphavault.worker import done_write_stage as stage_module
+
+
+def _row(post_uid: str) -> AssertionsDoneWriteRow:
+    return AssertionsDoneWriteRow(
+        post_uid=post_uid,
+        final_status="relevant",
+        invest_score=0.5,
+        processed_at="2026-04-09 12:00:00",
+        model="m1",
+        prompt_version="p1",
+        archived_at="",
+        assertions=[],
+    )
+
+
+def _write_concurrently(
+    stage: stage_module.DoneWriteCommitStage, post_uids: list[str]
+) -> dict[str, BaseException | None]:
+    results: dict[str, BaseException | None] = {}
+    engine = object()
+
+    def _run(post_uid: str) -> None:
+        try:
+            stage.write(engine, _row(post_uid))  # type: ignore[arg-type]
+        except Exception as err:
+            results[post_uid] = err
+        else:
+            results[post_uid] = None
+
+    threads = [threading.Thread(target=_run, args=(uid,)) for uid in post_uids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+def test_concurrent_writes_commit_as_one_batch(monkeypatch) -> None:
+    batches: list[list[str]] = []
+    monkeypatch.setattr(
+        stage_module,
+        "write_assertions_and_mark_done_batch",
+        lambda _engine, *, rows: batches.append([row.post_uid for row in rows]),
+    )
+    stage = stage_module.DoneWriteCommitStage(batch_size=3, max_latency_seconds=5)
+
+    results = _write_concurrently(stage, ["weibo:1", "weibo:2", "weibo:3"])
+    stage.close(timeout=5)
+
+    assert results == {"weibo:1": None, "weibo:2": None, "weibo:3": None}
+    assert [sorted(batch) for batch in batches] == [["weibo:1", "weibo:2", "weibo:3"]]
+    assert stage.stats()["batches"] == 1
+
+
+def test_failed_batch_retries_rows_one_by_one(monkeypatch) -> None:
+    def _fail_batch(_engine, *, rows) -> None:
+        raise RuntimeError("copy_failed")
+
+    def _write_one(_engine, *, post_uid: str, **_kwargs) -> None:
+        if post_uid == "weibo:2":
+            raise ValueError("bad_row")
+
+    monkeypatch.setattr(
+        stage_module, "write_assertions_and_mark_done_batch", _fail_batch
+    )
+    monkeypatch.setattr(stage_module, "write_assertions_and_mark_done", _write_one)
+    stage = stage_module.DoneWriteCommitStage(batch_size=2, max_latency_seconds=5)
+
+    results = _write_concurrently(stage, ["weibo:1", "weibo:2"])
+    stage.close(timeout=5)
+
+    assert results["weibo:1"] is None
+    assert isinstance(results["weibo:2"], ValueError)
+    assert stage.stats()["batch_fallbacks"] == 1
+    with pytest.raises(RuntimeError, match="done_write_stage_closed"):
+        stage.write(object(), _row("weibo:3"))  # type: ignore[arg-type]
@@ -237,6 +237,7 @@ def test_manual_process_metrics_returns_result_when_key_valid(monkeypatch) -> No
     assert payload.get("memory_limit_mb") == 512.0
     assert payload.get("memory_used_mb") == 128.0
     assert payload.get("memory_remaining_mb") == 384.0
+    assert {"hits", "misses", "stale"} <= set(payload.get("stock_view_cache") or {})
 
 
 def test_manual_process_metrics_returns_500_when_reader_raises(monkeypatch) -> None:
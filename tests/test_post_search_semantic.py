@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+from typing import cast
+
+from alphavault.capabilities import post_search_semantic
+from alphavault.db.postgres_db import PostgresEngine
+from alphavault.infra.ai.embedding_runtime_config import EmbeddingRuntimeConfig
+from alphavault.infra.ai.query_embedding_cache import (
+    QueryEmbeddingCache,
+    query_embedding_key,
+)
+from alphavault.infra.search_snapshot_cache import SearchSnapshotStore
+from alphavault.rss.utils import RateLimiter
+
+_FAKE_ENGINE = cast(PostgresEngine, object())
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    def set(self, key: str, value: str, ex: int) -> None:
+        self.values[key] = value
+        self.ttls[key] = ex
+
+
+def _runtime(cache: QueryEmbeddingCache):
+    return post_search_semantic.SemanticQueryEmbeddingRuntime(
+        config=EmbeddingRuntimeConfig(
+            api_key="k",
+            model="m1",
+            dimensions=3,
+            base_url="",
+            timeout_seconds=1.0,
+            retries=0,
+            rpm=0.0,
+            max_inflight=1,
+            batch_size=1,
+            task_key="semantic_query",
+            profile_name="default",
+            limit_group_name="default",
+        ),
+        limiter=RateLimiter(0.0),
+        cache=cache,
+    )
+
+
+def _candidate_rows() -> list[dict[str, object]]:
+    return [
+        {
+            "post_uid": f"weibo:{idx}",
+            "platform": "weibo",
+            "author": "老王",
+            "created_at": "2026-04-09 10:00:00",
+            "raw_text": "茅台",
+            "doc_kind": "assertion",
+            "match_doc_text": "茅台",
+            "semantic_score": 1.0 - idx / 10,
+        }
+        for idx in range(5)
+    ]
+
+
+def _patch_search(
+    monkeypatch, *, snapshot_store: SearchSnapshotStore
+) -> dict[str, list[object]]:
+    calls: dict[str, list[object]] = {"embed": [], "load": []}
+
+    def _fake_embed(**kwargs):
+        calls["embed"].append(list(kwargs["texts"]))
+        return [[0.1, 0.2, 0.3]]
+
+    def _fake_load(**kwargs):
+        calls["load"].append(kwargs["candidate_limit"])
+        return _candidate_rows()
+
+    runtime = _runtime(QueryEmbeddingCache(max_size=8, ttl_seconds=0))
+    monkeypatch.setattr(post_search_semantic, "embed_texts_with_openai", _fake_embed)
+    monkeypatch.setattr(
+        post_search_semantic,
+        "embedding_task_runtime_config_is_configured",
+        lambda **_kwargs: (True, ""),
+    )
+    monkeypatch.setattr(
+        post_search_semantic,
+        "semantic_query_embedding_runtime_from_env",
+        lambda: runtime,
+    )
+    monkeypatch.setattr(post_search_semantic, "_load_candidate_rows", _fake_load)
+    monkeypatch.setattr(
+        post_search_semantic,
+        "_semantic_query_reranker_runtime_from_env",
+        lambda: None,
+    )
+    monkeypatch.setattr(
+        post_search_semantic, "_search_snapshot_store", lambda: snapshot_store
+    )
+    return calls
+
+
+def _collect_pages(query: str, *, after_page=None) -> list[str]:
+    seen: list[str] = []
+    cursor = ""
+    while True:
+        result = post_search_semantic.search_posts_semantic(
+            query, limit=2, cursor=cursor
+        )
+        assert result["error"] == ""
+        seen.extend(row["post_uid"] for row in result["rows"])
+        cursor = result["next_cursor"]
+        if not result["has_more"]:
+            return seen
+        if after_page is not None:
+            after_page()
+
+
+def test_paged_semantic_search_embeds_query_once(monkeypatch) -> None:
+    calls = _patch_search(
+        monkeypatch,
+        snapshot_store=SearchSnapshotStore(ttl_seconds=0, redis_factory=None),
+    )
+
+    seen = _collect_pages("  茅台   怎么看 ")
+    post_search_semantic.search_posts_semantic("茅台 怎么看", limit=2)
+
+    assert seen == [f"weibo:{idx}" for idx in range(5)]
+    assert calls["embed"] == [["茅台 怎么看"]]
+    assert len(calls["load"]) == 4
+
+
+def test_paged_semantic_search_slices_snapshot_until_expired(monkeypatch) -> None:
+    now = [0.0]
+    calls = _patch_search(
+        monkeypatch,
+        snapshot_store=SearchSnapshotStore(
+            ttl_seconds=60, redis_factory=None, clock=lambda: now[0]
+        ),
+    )
+
+    assert _collect_pages("茅台") == [f"weibo:{idx}" for idx in range(5)]
+    assert len(calls["load"]) == 1
+
+    def _expire() -> None:
+        now[0] += 61
+
+    assert _collect_pages("茅台", after_page=_expire) == [
+        f"weibo:{idx}" for idx in range(5)
+    ]
+    assert len(calls["load"]) == 4
+
+
+def test_query_embedding_cache_uses_redis_tier_across_processes() -> None:
+    fake_redis = _FakeRedis()
+    key = query_embedding_key("茅台", model="m1", dimensions=3)
+    embed_calls: list[str] = []
+
+    def _embed(query: str) -> list[float]:
+        embed_calls.append(query)
+        return [0.5, 0.25, 0.125]
+
+    first = QueryEmbeddingCache(
+        max_size=8, ttl_seconds=60, redis_factory=lambda: (fake_redis, "q")
+    )
+    second = QueryEmbeddingCache(
+        max_size=8, ttl_seconds=60, redis_factory=lambda: (fake_redis, "q")
+    )
+
+    assert first.get_or_embed(key, _embed) == [0.5, 0.25, 0.125]
+    assert second.get_or_embed(key, _embed) == [0.5, 0.25, 0.125]
+    assert embed_calls == ["茅台"]
+    assert list(fake_redis.ttls.values()) == [60]
+    other_model = query_embedding_key("茅台", model="m2", dimensions=3)
+    second.get_or_embed(other_model, _embed)
+    assert len(embed_calls) == 2
+
+
+def test_semantic_doc_coalescer_batches_posts_and_skips_unchanged_docs(
+    monkeypatch,
+) -> None:
+    from alphavault import semantic_doc_coalescer
+    from alphavault.db.semantic_docs import SemanticAssertionSourceRow
+    from alphavault.db.source_queue import CloudPost
+    from alphavault.semantic_docs import SemanticDocEmbeddingRuntime
+
+    embed_calls: list[list[str]] = []
+    applied: dict[str, int] = {}
+
+    def _fake_embed(*, texts: list[str], **_kwargs: object) -> list[list[float]]:
+        embed_calls.append(list(texts))
+        return [[float(len(text)), 0.0, 1.0] for text in texts]
+
+    def _fake_apply(
+        _engine, *, plan, embeddings, redis_client=None, zilliz_writer=None
+    ):  # type: ignore[no-untyped-def]
+        del redis_client, zilliz_writer
+        applied[plan.post_uid] = len(embeddings)
+        return plan.post_uid
+
+    monkeypatch.setattr(semantic_doc_coalescer, "embed_texts_with_openai", _fake_embed)
+    monkeypatch.setattr(
+        semantic_doc_coalescer, "apply_semantic_doc_sync_plan", _fake_apply
+    )
+    runtime = SemanticDocEmbeddingRuntime(
+        config=EmbeddingRuntimeConfig(
+            api_key="k",
+            model="m1",
+            dimensions=3,
+            base_url="",
+            timeout_seconds=1.0,
+            retries=0,
+            rpm=0.0,
+            max_inflight=2,
+            batch_size=4,
+        ),
+        limiter=RateLimiter(0),
+    )
+
+    def _post(post_uid: str) -> CloudPost:
+        return CloudPost(
+            post_uid=post_uid,
+            platform="weibo",
+            platform_post_id=post_uid.split(":")[-1],
+            author="老王",
+            created_at="2026-04-07 10:00:00",
+            url="",
+            raw_text=f"老王：{post_uid} 茅台长期持有，分红稳定，估值合理，继续拿着不动。",
+            ai_retry_count=0,
+        )
+
+    def _rows(post_uid: str) -> list[SemanticAssertionSourceRow]:
+        return [
+            SemanticAssertionSourceRow(
+                assertion_id=f"{post_uid}#1",
+                post_uid=post_uid,
+                idx=1,
+                action="trade.hold",
+                action_strength=2,
+                summary="拿着",
+                evidence="继续拿着",
+                mention_texts=("茅台",),
+                entity_keys=("stock:600519.SH",),
+            )
+        ]
+
+    coalescer = semantic_doc_coalescer.SemanticDocEmbeddingCoalescer(
+        runtime, max_latency_seconds=30.0
+    )
+    try:
+        first = coalescer.submit(
+            _FAKE_ENGINE,
+            post_uid="weibo:1",
+            prefetched_post=_post("weibo:1"),
+            prefetched_assertion_rows=_rows("weibo:1"),
+            prefetched_stored_rows=[],
+        )
+        second = coalescer.submit(
+            _FAKE_ENGINE,
+            post_uid="weibo:2",
+            prefetched_post=_post("weibo:2"),
+            prefetched_assertion_rows=_rows("weibo:2"),
+            prefetched_stored_rows=[],
+        )
+        assert first.result(timeout=5) == "weibo:1"
+        assert second.result(timeout=5) == "weibo:2"
+        assert embed_calls and len(embed_calls[0]) == 4
+        # Re-synced against stale stored rows: same content_hash, no re-embed.
+        again = coalescer.submit(
+            _FAKE_ENGINE,
+            post_uid="weibo:1",
+            prefetched_post=_post("weibo:1"),
+            prefetched_assertion_rows=_rows("weibo:1"),
+            prefetched_stored_rows=[],
+        )
+        assert not again.done()
+    finally:
+        coalescer.close(timeout=5)
+    assert again.result(timeout=0) == "weibo:1"
+    assert applied == {"weibo:1": 2, "weibo:2": 2}
+    stats = coalescer.stats()
+    assert len(embed_calls) == 1
+    assert stats["posts"] == 3
+    assert stats["requests"] == 1
+    assert stats["texts"] == 4
+    assert stats["reused"] == 2
+
+
+def test_semantic_doc_coalescer_delete_supersedes_queued_upsert(monkeypatch) -> None:
+    from alphavault import semantic_doc_coalescer, semantic_docs
+    from alphavault.db.semantic_docs import SemanticAssertionSourceRow
+    from alphavault.db.source_queue import CloudPost
+    from alphavault.semantic_docs import SemanticDocEmbeddingRuntime
+
+    events: list[str] = []
+
+    def _fake_embed(*, texts: list[str], **_kwargs: object) -> list[list[float]]:
+        return [[1.0, 0.0, 1.0] for _ in texts]
+
+    def _fake_apply(
+        _engine, *, plan, embeddings, redis_client=None, zilliz_writer=None
+    ):  # type: ignore[no-untyped-def]
+        del embeddings, redis_client, zilliz_writer
+        events.append(f"upsert:{plan.post_uid}")
+        return plan.post_uid
+
+    def _fake_delete(_engine, *, post_uid, redis_client=None):  # type: ignore[no-untyped-def]
+        del redis_client
+        events.append(f"delete:{post_uid}")
+        return 2
+
+    monkeypatch.setattr(semantic_doc_coalescer, "embed_texts_with_openai", _fake_embed)
+    monkeypatch.setattr(
+        semantic_doc_coalescer, "apply_semantic_doc_sync_plan", _fake_apply
+    )
+    monkeypatch.setattr(semantic_docs, "delete_semantic_docs_by_post_uid", _fake_delete)
+    runtime = SemanticDocEmbeddingRuntime(
+        config=EmbeddingRuntimeConfig(
+            api_key="k",
+            model="m1",
+            dimensions=3,
+            base_url="",
+            timeout_seconds=1.0,
+            retries=0,
+            rpm=0.0,
+            max_inflight=1,
+            batch_size=8,
+        ),
+        limiter=RateLimiter(0),
+    )
+    post = CloudPost(
+        post_uid="weibo:1",
+        platform="weibo",
+        platform_post_id="1",
+        author="老王",
+        created_at="2026-04-07 10:00:00",
+        url="",
+        raw_text="老王：茅台长期持有，分红稳定，估值合理，继续拿着不动。",
+        ai_retry_count=0,
+    )
+    rows = [
+        SemanticAssertionSourceRow(
+            assertion_id="weibo:1#1",
+            post_uid="weibo:1",
+            idx=1,
+            action="trade.hold",
+            action_strength=2,
+            summary="拿着",
+            evidence="继续拿着",
+            mention_texts=("茅台",),
+            entity_keys=("stock:600519.SH",),
+        )
+    ]
+
+    coalescer = semantic_doc_coalescer.SemanticDocEmbeddingCoalescer(
+        runtime, max_latency_seconds=30.0
+    )
+    try:
+        upsert = coalescer.submit(
+            _FAKE_ENGINE,
+            post_uid="weibo:1",
+            prefetched_post=post,
+            prefetched_assertion_rows=rows,
+            prefetched_stored_rows=[],
+        )
+        assert not upsert.done()
+        deleted = coalescer.submit(
+            _FAKE_ENGINE, post_uid="weibo:1", final_status="irrelevant"
+        )
+        assert deleted.result(timeout=0).deleted_count == 2
+        assert upsert.result(timeout=0).applied is False
+    finally:
+        coalescer.close(timeout=5)
+    # The queued upsert never lands after the delete.
+    assert events == ["delete:weibo:1"]
+    assert coalescer.stats()["pending_texts"] == 0
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+
+from alphavault.constants import SCHEMA_WEIBO
+from alphavault.db.cloud_schema import apply_cloud_schema
+from alphavault.db.post_thread_trees import load_post_thread_trees
+from alphavault.db.postgres_db import PostgresConnection
+from alphavault.db.source_queue import (
+    AssertionsDoneWriteRow,
+    write_assertions_and_mark_done_batch,
+)
+from alphavault.domains.thread_tree.service import build_post_tree_map
+
+
+def _source_conn(pg_conn) -> PostgresConnection:
+    apply_cloud_schema(pg_conn, target="source", schema_name=SCHEMA_WEIBO)
+    pg_conn.execute("TRUNCATE TABLE weibo.posts, weibo.post_thread_trees")
+    return PostgresConnection(pg_conn, schema_name=SCHEMA_WEIBO)
+
+
+def _insert_post(
+    conn: PostgresConnection, *, platform_post_id: str, author: str, raw_text: str
+) -> None:
+    conn.execute(
+        """
+INSERT INTO weibo.posts(
+  post_uid, platform, platform_post_id, author, created_at, url, raw_text,
+  final_status, archived_at, ingested_at
+)
+VALUES (
+  :post_uid, 'weibo', :platform_post_id, :author, :created_at, '', :raw_text,
+  'irrelevant', '', 1
+)
+""",
+        {
+            "post_uid": f"weibo:{platform_post_id}",
+            "platform_post_id": platform_post_id,
+            "author": author,
+            "created_at": f"2026-04-09 1{platform_post_id}:00:00",
+            "raw_text": raw_text,
+        },
+    )
+
+
+def _mark_done(conn: PostgresConnection, post_uid: str) -> None:
+    write_assertions_and_mark_done_batch(
+        conn,
+        rows=[
+            AssertionsDoneWriteRow(
+                post_uid=post_uid,
+                final_status="irrelevant",
+                invest_score=0.0,
+                processed_at="2026-04-09 12:00:00",
+                model="m1",
+                prompt_version="p1",
+                archived_at="",
+                assertions=[],
+            )
+        ],
+    )
+
+
+def test_done_posts_persist_trees_and_late_parent_rerenders_child(pg_conn) -> None:
+    conn = _source_conn(pg_conn)
+    csv_fields = {"源微博id": "1", "源用户昵称": "老王", "源微博正文": "茅台加仓"}
+    _insert_post(
+        conn, platform_post_id="1", author="老王", raw_text="茅台加仓，长期持有"
+    )
+    _insert_post(
+        conn,
+        platform_post_id="2",
+        author="小李",
+        raw_text="跟一手\n[CSV原始字段] " + json.dumps(csv_fields, ensure_ascii=False),
+    )
+
+    _mark_done(conn, "weibo:2")
+    label, tree_text = load_post_thread_trees(conn, post_uids=["weibo:2"])["weibo:2"]
+    assert "小李" in label
+    assert tree_text.startswith("茅台加仓 [源帖 ID: 1]")
+
+    _mark_done(conn, "weibo:1")
+    trees = load_post_thread_trees(conn, post_uids=["weibo:1", "weibo:2", "weibo:9"])
+
+    assert sorted(trees) == ["weibo:1", "weibo:2"]
+    label, tree_text = trees["weibo:2"]
+    assert "老王" in label
+    assert tree_text.splitlines() == [
+        "茅台加仓，长期持有 [原帖 ID: 1]",
+        "└── 跟一手 [转发 ID: 2]",
+    ]
+
+
+def test_build_post_tree_map_renders_only_uncached_posts() -> None:
+    posts: list[dict[str, object]] = [
+        {
+            "post_uid": "weibo:1",
+            "platform_post_id": "1",
+            "author": "老王",
+            "created_at": "2026-04-09 10:00:00",
+            "raw_text": "茅台加仓",
+        }
+    ]
+
+    tree_map = build_post_tree_map(
+        post_uids=["weibo:1", "weibo:2"],
+        posts=posts,
+        cached={"weibo:2": ("cached label", "cached tree")},
+    )
+
+    assert tree_map["weibo:2"] == ("cached label", "cached tree")
+    assert "茅台加仓" in tree_map["weibo:1"][1]
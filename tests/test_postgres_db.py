@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from uuid import uuid4
 
+import psycopg
 import pytest
 
 from alphavault.db.postgres_db import (
     ensure_postgres_engine,
     postgres_connect_autocommit,
+    postgres_statement_timeout,
     run_postgres_transaction,
 )
 
@@ -165,3 +167,78 @@ def test_run_postgres_transaction_rolls_back_on_error(postgres_dsn: str) -> None
         with postgres_connect_autocommit(engine) as conn:
             conn.execute(f"DROP TABLE IF EXISTS {table_name}")
         engine.dispose()
+
+
+def test_postgres_statement_cache_compiles_named_and_qmark_params() -> None:
+    from alphavault.db import postgres_db
+
+    query, params, prepare = postgres_db._bind_single(
+        "SELECT :a, :b, :a, '100%' WHERE x = :c",
+        {"a": 1, "b": 2, "c": 3, "unused": 4},
+    )
+    assert query == "SELECT %s, %s, %s, '100%%' WHERE x = %s"
+    assert params == (1, 2, 1, 3)
+    assert prepare is None
+
+    query, many = postgres_db._bind_many(
+        "INSERT INTO t(a, b) VALUES (?, ?)", [(1, "x"), (2, "y")]
+    )
+    assert query == "INSERT INTO t(a, b) VALUES (%s, %s)"
+    assert many == [(1, "x"), (2, "y")]
+
+
+def test_postgres_execute_prepares_hot_statements(postgres_dsn: str) -> None:
+    from alphavault.db import postgres_db
+
+    engine = ensure_postgres_engine(postgres_dsn)
+    table_name = f"test_prepare_{uuid4().hex}"
+    insert_sql = f"INSERT INTO {table_name}(id, v) VALUES (:id, :v)"
+    try:
+        with postgres_connect_autocommit(engine) as conn:
+            conn.execute(f"CREATE TABLE {table_name}(id integer primary key, v text)")
+            prepare_flags = []
+            for idx in range(6):
+                prepare_flags.append(
+                    postgres_db._bind_single(insert_sql, {"id": idx, "v": "x"})[2]
+                )
+                conn.execute(insert_sql, {"id": idx, "v": f"v{idx}"})
+            assert prepare_flags[0] is None
+            assert prepare_flags[-1] is True
+            assert conn.execute(f"SELECT COUNT(*) FROM {table_name}").scalar() == 6
+    finally:
+        with postgres_connect_autocommit(engine) as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+        engine.dispose()
+
+
+def test_postgres_stream_mappings_yields_pages_and_stops_early(
+    postgres_dsn: str,
+) -> None:
+    engine = ensure_postgres_engine(postgres_dsn)
+    try:
+        with postgres_connect_autocommit(engine) as conn:
+            sql = "SELECT n FROM generate_series(1, :count) AS n ORDER BY n"
+            pages = list(conn.stream_mappings(sql, {"count": 5}, page_size=2))
+            assert pages == [[{"n": 1}, {"n": 2}], [{"n": 3}, {"n": 4}], [{"n": 5}]]
+
+            stream = conn.stream_mappings(sql, {"count": 5}, page_size=2)
+            assert next(stream) == [{"n": 1}, {"n": 2}]
+            stream.close()
+            assert conn.execute("SELECT 1").scalar() == 1
+            assert str(conn.info.transaction_status.name) == "IDLE"
+    finally:
+        engine.dispose()
+
+
+def test_postgres_statement_timeout_cancels_slow_query_and_resets(
+    postgres_dsn: str,
+) -> None:
+    engine = ensure_postgres_engine(postgres_dsn)
+    try:
+        with postgres_connect_autocommit(engine) as conn:
+            with pytest.raises(psycopg.errors.QueryCanceled):
+                with postgres_statement_timeout(conn, 0.05):
+                    conn.execute("SELECT pg_sleep(2)")
+            assert conn.execute("SHOW statement_timeout").scalar() == "0"
+    finally:
+        engine.dispose()
@@ -1,8 +1,28 @@
 from __future__ import annotations
 
+import json
+
+import pytest
+
 from alphavault.worker import redis_stream_queue
 
 
+def _lua_redis():  # type: ignore[no-untyped-def]
+    """In-process Redis that runs the real Lua scripts."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def _stream_fields(client, queue_key: str) -> list[dict[str, str]]:  # type: ignore[no-untyped-def]
+    return [
+        fields
+        for _id, fields in client.xrange(
+            redis_stream_queue.redis_ai_stream_key(queue_key)
+        )
+    ]
+
+
 def test_redis_try_push_ai_message_status_dedups_and_pushes() -> None:
     class _FakeClient:
         def __init__(self) -> None:
@@ -129,6 +149,143 @@ def test_redis_try_push_ai_message_status_returns_error_when_backlog_is_full() -
     ]
 
 
+class _FakeBatchPushClient:
+    """Runs the batch push script semantics in Python."""
+
+    def __init__(self, *, backlog: int = 0) -> None:
+        self.backlog = backlog
+        self.dedup_keys: set[str] = set()
+        self.xadd_calls: list[dict[str, str]] = []
+        self.group_create_calls = 0
+        self.script_calls = 0
+
+    def xgroup_create(
+        self, stream: str, group: str, id: str = "0", mkstream: bool = False
+    ) -> bool:
+        del stream, group, id, mkstream
+        self.group_create_calls += 1
+        return True
+
+    def register_script(self, script: str):
+        assert "XADD" in script
+
+        def _run(*, keys: list[str], args: list[object]) -> list[str]:
+            self.script_calls += 1
+            assert keys[:2] == ["queue:ai:stream", "queue:ai:retry"]
+            maxlen = int(str(args[1]))
+            statuses: list[str] = []
+            for idx, dedup_key in enumerate(keys[2:]):
+                post_uid, payload = args[2 + idx * 2], args[3 + idx * 2]
+                if dedup_key in self.dedup_keys:
+                    statuses.append("duplicate")
+                    continue
+                if maxlen > 0 and self.backlog >= maxlen:
+                    statuses.append("error")
+                    continue
+                self.dedup_keys.add(dedup_key)
+                self.xadd_calls.append(
+                    {"payload": str(payload), "post_uid": str(post_uid)}
+                )
+                self.backlog += 1
+                statuses.append("pushed")
+            return statuses
+
+        return _run
+
+
+def test_redis_try_push_ai_messages_status_batches_in_one_script_call() -> None:
+    client = _FakeBatchPushClient()
+    statuses = redis_stream_queue.redis_try_push_ai_messages_status(
+        client,
+        "queue",
+        items=[
+            ("weibo:1", {"post_uid": "weibo:1"}),
+            ("", {"post_uid": ""}),
+            ("weibo:2", {"post_uid": "weibo:2"}),
+            ("weibo:1", {"post_uid": "weibo:1"}),
+        ],
+        ttl_seconds=60,
+        queue_maxlen=999,
+    )
+
+    assert statuses == ["pushed", "error", "pushed", "duplicate"]
+    assert client.script_calls == 1
+    assert [call["post_uid"] for call in client.xadd_calls] == ["weibo:1", "weibo:2"]
+
+
+def test_redis_try_push_ai_messages_status_stops_at_backlog_limit() -> None:
+    client = _FakeBatchPushClient(backlog=4)
+    statuses = redis_stream_queue.redis_try_push_ai_messages_status(
+        client,
+        "queue",
+        items=[("weibo:1", {}), ("weibo:2", {})],
+        ttl_seconds=60,
+        queue_maxlen=5,
+    )
+
+    assert statuses == ["pushed", "error"]
+    assert len(client.dedup_keys) == 1
+
+
+def test_redis_batch_push_lua_dedups_and_respects_backlog_limit() -> None:
+    client = _lua_redis()
+    client.zadd(redis_stream_queue.redis_ai_retry_key("queue"), {"{}": 10})
+    registered: list[str] = []
+    register_script = client.register_script
+
+    def _counting_register(script: str):  # type: ignore[no-untyped-def]
+        registered.append(script)
+        return register_script(script)
+
+    client.register_script = _counting_register
+
+    first = redis_stream_queue.redis_try_push_ai_messages_status(
+        client,
+        "queue",
+        items=[
+            ("weibo:1", {"post_uid": "weibo:1", "text": "茅台"}),
+            ("", {"post_uid": ""}),
+            ("weibo:2", {"post_uid": "weibo:2"}),
+            ("weibo:1", {"post_uid": "weibo:1"}),
+        ],
+        ttl_seconds=60,
+        queue_maxlen=3,
+    )
+    second = redis_stream_queue.redis_try_push_ai_messages_status(
+        client,
+        "queue",
+        items=[("weibo:2", {}), ("weibo:3", {"post_uid": "weibo:3"})],
+        ttl_seconds=60,
+        queue_maxlen=3,
+    )
+
+    assert first == ["pushed", "error", "pushed", "duplicate"]
+    # One retry plus two stream entries fill the backlog of 3.
+    assert second == ["duplicate", "error"]
+    assert registered == [redis_stream_queue._AI_BATCH_PUSH_LUA]
+    fields = _stream_fields(client, "queue")
+    assert [item["post_uid"] for item in fields] == ["weibo:1", "weibo:2"]
+    assert json.loads(fields[0]["payload"]) == {"post_uid": "weibo:1", "text": "茅台"}
+    dedup_key = redis_stream_queue._redis_dedup_key("queue", "weibo:1")
+    assert 0 < client.ttl(dedup_key) <= 60
+    # The rejected message released its dedup key so it can be pushed later.
+    assert not client.exists(redis_stream_queue._redis_dedup_key("queue", "weibo:3"))
+
+
+def test_redis_consumer_group_is_created_once_per_client() -> None:
+    client = _FakeBatchPushClient()
+    for post_uid in ("weibo:1", "weibo:2", "weibo:3"):
+        redis_stream_queue.redis_try_push_ai_messages_status(
+            client,
+            "queue",
+            items=[(post_uid, {})],
+            ttl_seconds=60,
+        )
+
+    assert client.group_create_calls == 1
+    assert client.script_calls == 3
+
+
 def test_redis_ai_read_group_messages_creates_group_and_reads_payloads() -> None:
     class _FakeClient:
         def __init__(self) -> None:
@@ -263,8 +420,7 @@ def test_redis_ai_claim_stuck_messages_reads_xautoclaim_result() -> None:
 def test_redis_ai_move_due_retries_to_stream_moves_messages() -> None:
     class _FakeClient:
         def __init__(self) -> None:
-            self.removed: list[str] = []
-            self.added: list[str] = []
+            self.script_calls: list[tuple[list[str], list[object]]] = []
 
         def xgroup_create(
             self, stream: str, group: str, id: str = "0", mkstream: bool = False
@@ -272,37 +428,15 @@ def test_redis_ai_move_due_retries_to_stream_moves_messages() -> None:
             del stream, group, id, mkstream
             return True
 
-        def zrangebyscore(
-            self,
-            key: str,
-            *,
-            min: str,
-            max: int,
-            start: int,
-            num: int,
-        ) -> list[str]:
-            del min, max, start, num
-            assert key == "queue:ai:retry"
-            return ['{"post_uid":"weibo:1"}', '{"post_uid":"weibo:2"}']
+        def register_script(self, script: str):
+            assert "ZRANGEBYSCORE" in script
+            assert "ZREM" in script
 
-        def zrem(self, key: str, member: str) -> int:
-            assert key == "queue:ai:retry"
-            self.removed.append(member)
-            return 1
+            def _run(*, keys: list[str], args: list[object]) -> int:
+                self.script_calls.append((list(keys), list(args)))
+                return 2
 
-        def xadd(
-            self,
-            key: str,
-            fields: dict[str, str],
-            *,
-            maxlen: int | None = None,
-            approximate: bool = True,
-        ) -> str:
-            assert maxlen is None
-            del approximate
-            assert key == "queue:ai:stream"
-            self.added.append(str(fields["payload"]))
-            return "1-0"
+            return _run
 
     client = _FakeClient()
     moved = redis_stream_queue.redis_ai_move_due_retries_to_stream(
@@ -313,8 +447,63 @@ def test_redis_ai_move_due_retries_to_stream_moves_messages() -> None:
     )
 
     assert moved == 2
-    assert client.removed == ['{"post_uid":"weibo:1"}', '{"post_uid":"weibo:2"}']
-    assert client.added == ['{"post_uid":"weibo:1"}', '{"post_uid":"weibo:2"}']
+    assert client.script_calls == [
+        (["queue:ai:retry", "queue:ai:stream"], [123, 10]),
+    ]
+
+
+def test_redis_ai_move_due_retries_lua_promotes_due_and_drops_bad_payloads() -> None:
+    client = _lua_redis()
+    retry_key = redis_stream_queue.redis_ai_retry_key("queue")
+    redis_stream_queue.redis_ai_push_retry(
+        client, "queue", payload={"post_uid": " weibo:1 ", "n": 1}, next_retry_at=100
+    )
+    # A numeric post_uid is written as a string, so Lua never has to format it.
+    redis_stream_queue.redis_ai_push_retry(
+        client, "queue", payload={"post_uid": 12345678901234567}, next_retry_at=101
+    )
+    client.zadd(
+        retry_key,
+        {
+            '{"post_uid": 7}': 102,
+            "not json": 103,
+            "[1, 2]": 104,
+            "   ": 105,
+            '{"post_uid": "weibo:later"}': 500,
+        },
+    )
+
+    moved = redis_stream_queue.redis_ai_move_due_retries_to_stream(
+        client, "queue", now_epoch=200, max_items=10
+    )
+
+    assert moved == 3
+    fields = _stream_fields(client, "queue")
+    assert [item["post_uid"] for item in fields] == [
+        "weibo:1",
+        "12345678901234567",
+        "",
+    ]
+    assert json.loads(fields[0]["payload"]) == {"post_uid": " weibo:1 ", "n": 1}
+    assert client.zrange(retry_key, 0, -1) == ["   ", '{"post_uid": "weibo:later"}']
+    assert (
+        redis_stream_queue.redis_ai_move_due_retries_to_stream(
+            client, "queue", now_epoch=200, max_items=10
+        )
+        == 0
+    )
+
+
+def test_redis_ai_move_due_retries_to_stream_skips_when_max_items_is_zero() -> None:
+    assert (
+        redis_stream_queue.redis_ai_move_due_retries_to_stream(
+            object(),
+            "queue",
+            now_epoch=123,
+            max_items=0,
+        )
+        == 0
+    )
 
 
 def test_redis_ai_ack_and_push_retry_runs_in_one_transaction() -> None:
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import psycopg
+import pytest
+
+from alphavault.constants import SCHEMA_WEIBO
+from alphavault.db.cloud_schema import apply_cloud_schema
+from alphavault.db.postgres_db import (
+    ensure_postgres_engine,
+    postgres_connect_autocommit,
+)
+from alphavault.db.source_queue import (
+    AssertionsDoneWriteRow,
+    upsert_pending_post,
+    write_assertions_and_mark_done_batch,
+)
+from alphavault_reflex.services import source_loader
+from alphavault_reflex.services.resident_cache import (
+    ResidentRowCache,
+    resident_cache_stats,
+)
+
+
+def _seed_posts(postgres_dsn: str, *, days_ago_by_uid: dict[str, int]) -> None:
+    with psycopg.connect(postgres_dsn, autocommit=True) as raw_conn:
+        apply_cloud_schema(raw_conn, target="source", schema_name=SCHEMA_WEIBO)
+        raw_conn.execute(
+            "TRUNCATE TABLE weibo.posts, weibo.assertions, weibo.assertion_rollups"
+        )
+    now = datetime.now(timezone.utc)
+    engine = ensure_postgres_engine(postgres_dsn, schema_name=SCHEMA_WEIBO)
+    with postgres_connect_autocommit(engine) as conn:
+        for post_uid, days_ago in days_ago_by_uid.items():
+            upsert_pending_post(
+                conn,
+                post_uid=post_uid,
+                platform="weibo",
+                platform_post_id=post_uid.removeprefix("weibo:"),
+                author="老王",
+                created_at=(now - timedelta(days=days_ago)).isoformat(),
+                url=f"https://example.com/{post_uid}",
+                raw_text=f"{post_uid} 茅台加仓",
+                archived_at="",
+                ingested_at=1,
+            )
+        write_assertions_and_mark_done_batch(
+            conn,
+            rows=[
+                AssertionsDoneWriteRow(
+                    post_uid=post_uid,
+                    final_status="relevant",
+                    invest_score=0.8,
+                    processed_at="2026-04-09 10:05:00",
+                    model="m1",
+                    prompt_version="p1",
+                    archived_at="",
+                    assertions=[
+                        {
+                            "action": "trade.buy",
+                            "action_strength": 2,
+                            "summary": f"{post_uid} 加仓",
+                            "evidence": "加仓",
+                        }
+                    ],
+                )
+                for post_uid in days_ago_by_uid
+            ],
+            persist_entity_match_followups=False,
+        )
+
+
+@pytest.fixture()
+def trade_source_caches():
+    source_loader.clear_trade_source_caches()
+    yield
+    source_loader.clear_trade_source_caches()
+
+
+def test_trade_assertion_window_streams_recent_rows_and_loads_posts_lazily(
+    postgres_dsn: str, monkeypatch, trade_source_caches
+) -> None:
+    _seed_posts(
+        postgres_dsn,
+        days_ago_by_uid={"weibo:1": 1, "weibo:2": 2, "weibo:3": 3, "weibo:old": 400},
+    )
+    monkeypatch.setenv(source_loader.ENV_REFLEX_TRADE_SOURCE_WINDOW_DAYS, "30")
+    monkeypatch.setattr(source_loader, "TRADE_SOURCE_PAGE_SIZE", 1)
+
+    rows = source_loader.load_trade_assertion_rows_cached(postgres_dsn, "", "weibo")
+
+    assert [row["post_uid"] for row in rows] == ["weibo:1", "weibo:2", "weibo:3"]
+    assert rows[0]["author"] == "老王"
+    assert rows[0]["url"] == "https://example.com/weibo:1"
+    assert rows[0]["raw_text"] == ""
+    assert (
+        source_loader.load_trade_assertion_rows_cached(postgres_dsn, "", "weibo")
+        is rows
+    )
+
+    posts = source_loader.load_trade_posts_by_uid_cached(
+        postgres_dsn, "", "weibo", ["weibo:2", "weibo:missing", "weibo:2"]
+    )
+
+    assert [(row["post_uid"], row["raw_text"]) for row in posts] == [
+        ("weibo:2", "weibo:2 茅台加仓")
+    ]
+    stats = resident_cache_stats()
+    assert stats["trade_assertion_windows"]["rows"] == 3
+    assert stats["trade_assertion_windows"]["hits"] >= 1
+    assert stats["trade_posts_by_uid"]["entries"] == 2
+    assert stats["trade_posts_by_uid"]["resident_bytes"] > 0
+
+    monkeypatch.setenv(source_loader.ENV_REFLEX_TRADE_SOURCE_MAX_ROWS, "2")
+    source_loader.clear_trade_source_caches()
+
+    capped = source_loader.load_trade_assertion_rows_cached(postgres_dsn, "", "weibo")
+
+    assert [row["post_uid"] for row in capped] == ["weibo:1", "weibo:2"]
+
+
+def test_resident_row_cache_hands_out_read_only_rows() -> None:
+    cache = ResidentRowCache("test_rows", max_entries=2)
+    loaded = [{"post_uid": "weibo:1", "cluster_keys": ["白酒"]}]
+
+    rows = cache.get_or_load("k", lambda: loaded)
+    loaded[0]["post_uid"] = "weibo:changed"
+
+    assert cache.get("k") is rows
+    assert rows[0]["post_uid"] == "weibo:1"
+    with pytest.raises(TypeError):
+        rows[0]["post_uid"] = "weibo:2"  # type: ignore[index]
+    assert cache.stats()["resident_bytes"] > 0
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import cast
+
+from alphavault.infra import hot_view_cache
+from alphavault_reflex.services import research_page_loader
+
+
+def test_sector_page_threads_include_parents_without_sector_assertions(
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(hot_view_cache, "get_hot_view_redis", lambda: None)
+    csv_fields = {"源微博id": "1", "源用户昵称": "老王", "源微博正文": "茅台加仓"}
+    posts_by_uid: dict[str, dict[str, object]] = {
+        "weibo:1": {
+            "post_uid": "weibo:1",
+            "platform_post_id": "1",
+            "author": "老王",
+            "created_at": "2026-04-09 10:00:00",
+            "raw_text": "茅台加仓，长期持有",
+        },
+        "weibo:2": {
+            "post_uid": "weibo:2",
+            "platform_post_id": "2",
+            "author": "小李",
+            "created_at": "2026-04-09 11:00:00",
+            "raw_text": "跟一手\n[CSV原始字段] "
+            + json.dumps(csv_fields, ensure_ascii=False),
+        },
+    }
+    requested: list[list[str]] = []
+
+    def _load_posts(post_uids: list[str]):  # type: ignore[no-untyped-def]
+        requested.append(list(post_uids))
+        return [posts_by_uid[uid] for uid in post_uids if uid in posts_by_uid], ""
+
+    monkeypatch.setattr(
+        research_page_loader,
+        "_load_source_read_module",
+        lambda: SimpleNamespace(
+            load_trade_assertions_from_env=lambda: (
+                [
+                    {
+                        "post_uid": "weibo:2",
+                        "idx": 1,
+                        "entity_key": "stock:600519.SH",
+                        "action": "trade.buy",
+                        "summary": "跟着加仓",
+                        "cluster_keys": ["白酒"],
+                    }
+                ],
+                "",
+            ),
+            load_trade_posts_by_uid_from_env=_load_posts,
+        ),
+    )
+
+    view = research_page_loader.load_sector_page_view("白酒")
+
+    assert requested == [["weibo:2"], ["weibo:1"]]
+    signals = cast(list[dict[str, str]], view["signals"])
+    assert [row["post_uid"] for row in signals] == ["weibo:2"]
+    assert "茅台加仓，长期持有" in signals[0]["tree_text"]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+from typing import cast
+
+from alphavault_reflex.research_state import ResearchState
+
+
+class _FakeStateProxy:
+    def __init__(self) -> None:
+        self.load_error = ""
+        self.loading = True
+        self.related_loading = True
+        self.extras_loading = True
+        self.signal_pagination_loading_direction = "next"
+
+    async def __aenter__(self) -> _FakeStateProxy:
+        return self
+
+    async def __aexit__(self, *_exc: object) -> bool:
+        return False
+
+    def _fail_page_load(self, err: BaseException) -> None:
+        ResearchState._fail_page_load(cast(ResearchState, self), err)
+
+
+def _run_step(proxy: _FakeStateProxy, job, *, is_current: bool) -> tuple[bool, list]:
+    applied: list = []
+    ok = asyncio.run(
+        ResearchState._run_page_load_step(
+            cast(ResearchState, proxy),
+            job,
+            applied.append,
+            is_current=lambda: is_current,
+        )
+    )
+    return ok, applied
+
+
+def test_page_load_step_applies_current_result() -> None:
+    ok, applied = _run_step(_FakeStateProxy(), lambda: "view", is_current=True)
+
+    assert ok is True
+    assert applied == ["view"]
+
+
+def test_page_load_step_drops_result_of_stale_request() -> None:
+    proxy = _FakeStateProxy()
+
+    def _boom() -> str:
+        raise RuntimeError("db down")
+
+    assert _run_step(proxy, lambda: "view", is_current=False) == (False, [])
+    assert _run_step(proxy, _boom, is_current=False) == (False, [])
+    assert proxy.load_error == ""
+    assert proxy.loading is True
+
+
+def test_page_load_step_failure_clears_loading_flags() -> None:
+    proxy = _FakeStateProxy()
+
+    def _boom() -> str:
+        raise RuntimeError("db down")
+
+    assert _run_step(proxy, _boom, is_current=True) == (False, [])
+    assert proxy.load_error == "db down"
+    assert proxy.loading is False
+    assert proxy.related_loading is False
+    assert proxy.extras_loading is False
+    assert proxy.signal_pagination_loading_direction == ""
@@ -16,6 +16,16 @@ from alphavault.worker.cli import parse_args
 from alphavault.worker.cli import RSSSourceConfig
 
 
+def _patch_push_status(monkeypatch, push_one) -> None:
+    def _fake_push_many(redis_client, redis_queue_key, *, items):
+        return [
+            push_one(redis_client, redis_queue_key, post_uid=post_uid, payload=payload)
+            for post_uid, payload in items
+        ]
+
+    monkeypatch.setattr(ingest, "_try_push_many_to_redis_status", _fake_push_many)
+
+
 def test_parse_args_rss_defaults(monkeypatch) -> None:
     monkeypatch.delenv("RSS_TIMEOUT_SECONDS", raising=False)
     monkeypatch.delenv("RSS_RETRIES", raising=False)
@@ -184,7 +194,7 @@ def test_ingest_rss_many_once_redis_primary_skips_source_db_write(
         ),
         raising=False,
     )
-    monkeypatch.setattr(ingest, "_try_push_to_redis_status", _fake_push_to_redis_status)
+    _patch_push_status(monkeypatch, _fake_push_to_redis_status)
 
     accepted, enqueue_error = ingest.ingest_rss_many_once(
         rss_urls=["https://example.com/rss"],
@@ -245,11 +255,7 @@ def test_ingest_rss_many_once_ignores_enqueue_callback_and_pushes_redis_inline(
         pushed_post_uids.append("weibo:1")
         return ingest.REDIS_PUSH_STATUS_PUSHED
 
-    monkeypatch.setattr(
-        ingest,
-        "_try_push_to_redis_status",
-        _fake_push_status,
-    )
+    _patch_push_status(monkeypatch, _fake_push_status)
 
     accepted, enqueue_error = ingest.ingest_rss_many_once(
         rss_urls=["https://example.com/rss"],
@@ -322,11 +328,7 @@ def test_ingest_rss_many_once_prints_accepted_log_with_progress(
     )
     monkeypatch.setattr(ingest, "get_entry_content", lambda entry: "")
     monkeypatch.setattr(ingest, "extract_image_urls_from_html", lambda html: [])
-    monkeypatch.setattr(
-        ingest,
-        "_try_push_to_redis_status",
-        _fake_push_to_redis_status,
-    )
+    _patch_push_status(monkeypatch, _fake_push_to_redis_status)
     with caplog.at_level(logging.DEBUG):
         accepted, enqueue_error = ingest.ingest_rss_many_once(
             rss_urls=["https://example.com/rss"],
@@ -400,11 +402,7 @@ def test_ingest_rss_many_once_accepted_total_is_per_user(
     )
     monkeypatch.setattr(ingest, "get_entry_content", lambda entry: "")
     monkeypatch.setattr(ingest, "extract_image_urls_from_html", lambda html: [])
-    monkeypatch.setattr(
-        ingest,
-        "_try_push_to_redis_status",
-        _fake_push_to_redis_status,
-    )
+    _patch_push_status(monkeypatch, _fake_push_to_redis_status)
     with caplog.at_level(logging.DEBUG):
         accepted, enqueue_error = ingest.ingest_rss_many_once(
             rss_urls=[
@@ -543,11 +541,7 @@ def test_ingest_rss_many_once_calls_item_ingested_callback_on_accept(
     )
     monkeypatch.setattr(ingest, "get_entry_content", lambda entry: "")
     monkeypatch.setattr(ingest, "extract_image_urls_from_html", lambda html: [])
-    monkeypatch.setattr(
-        ingest,
-        "_try_push_to_redis_status",
-        _fake_push_to_redis_status,
-    )
+    _patch_push_status(monkeypatch, _fake_push_to_redis_status)
     accepted, enqueue_error = ingest.ingest_rss_many_once(
         rss_urls=["https://example.com/rss"],
         engine=None,
@@ -594,10 +588,8 @@ def test_ingest_rss_many_once_redis_error_sets_enqueue_error(
     )
     monkeypatch.setattr(ingest, "get_entry_content", lambda entry: "")
     monkeypatch.setattr(ingest, "extract_image_urls_from_html", lambda html: [])
-    monkeypatch.setattr(
-        ingest,
-        "_try_push_to_redis_status",
-        lambda *_args, **_kwargs: ingest.REDIS_PUSH_STATUS_ERROR,
+    _patch_push_status(
+        monkeypatch, lambda *_args, **_kwargs: ingest.REDIS_PUSH_STATUS_ERROR
     )
     monkeypatch.setattr(
         ingest,
@@ -652,10 +644,8 @@ def test_ingest_rss_many_once_redis_error_does_not_need_second_fallback(
     )
     monkeypatch.setattr(ingest, "get_entry_content", lambda entry: "")
     monkeypatch.setattr(ingest, "extract_image_urls_from_html", lambda html: [])
-    monkeypatch.setattr(
-        ingest,
-        "_try_push_to_redis_status",
-        lambda *_args, **_kwargs: ingest.REDIS_PUSH_STATUS_ERROR,
+    _patch_push_status(
+        monkeypatch, lambda *_args, **_kwargs: ingest.REDIS_PUSH_STATUS_ERROR
     )
     accepted, enqueue_error = ingest.ingest_rss_many_once(
         rss_urls=["https://example.com/rss"],
@@ -818,7 +808,7 @@ def test_ingest_rss_many_once_retry_same_item_after_enqueue_failure(
     )
     monkeypatch.setattr(ingest, "get_entry_content", lambda entry: "")
     monkeypatch.setattr(ingest, "extract_image_urls_from_html", lambda html: [])
-    monkeypatch.setattr(ingest, "_try_push_to_redis_status", _fake_push)
+    _patch_push_status(monkeypatch, _fake_push)
 
     accepted, enqueue_error = ingest.ingest_rss_many_once(
         rss_urls=["https://example.com/rss"],
@@ -973,10 +963,8 @@ def test_ingest_rss_many_once_redis_error_does_not_fall_back_to_source_db_inline
         ),
         raising=False,
     )
-    monkeypatch.setattr(
-        ingest,
-        "_try_push_to_redis_status",
-        lambda *_args, **_kwargs: ingest.REDIS_PUSH_STATUS_ERROR,
+    _patch_push_status(
+        monkeypatch, lambda *_args, **_kwargs: ingest.REDIS_PUSH_STATUS_ERROR
     )
 
     accepted, enqueue_error = ingest.ingest_rss_many_once(
@@ -1036,10 +1024,8 @@ def test_ingest_rss_many_once_redis_duplicate_is_skipped_without_error(
         ),
         raising=False,
     )
-    monkeypatch.setattr(
-        ingest,
-        "_try_push_to_redis_status",
-        lambda *_args, **_kwargs: ingest.REDIS_PUSH_STATUS_DUPLICATE,
+    _patch_push_status(
+        monkeypatch, lambda *_args, **_kwargs: ingest.REDIS_PUSH_STATUS_DUPLICATE
     )
 
     accepted, enqueue_error = ingest.ingest_rss_many_once(
@@ -1091,10 +1077,8 @@ def test_ingest_rss_many_once_redis_duplicate_keeps_enqueue_error_false(
     )
     monkeypatch.setattr(ingest, "get_entry_content", lambda entry: "")
     monkeypatch.setattr(ingest, "extract_image_urls_from_html", lambda html: [])
-    monkeypatch.setattr(
-        ingest,
-        "_try_push_to_redis_status",
-        lambda *_args, **_kwargs: ingest.REDIS_PUSH_STATUS_DUPLICATE,
+    _patch_push_status(
+        monkeypatch, lambda *_args, **_kwargs: ingest.REDIS_PUSH_STATUS_DUPLICATE
     )
 
     accepted, enqueue_error = ingest.ingest_rss_many_once(
@@ -1113,3 +1097,365 @@ def test_ingest_rss_many_once_redis_duplicate_keeps_enqueue_error_false(
 
     assert accepted == 0
     assert enqueue_error is False
+
+
+def test_ingest_rss_many_once_concurrent_fetch_keeps_feed_order(
+    monkeypatch, tmp_path, caplog
+) -> None:
+    import threading
+
+    release_first = threading.Event()
+    fetch_sessions: list[object] = []
+    sleep_calls: list[float] = []
+    pushed_post_uids: list[str] = []
+
+    def _fake_fetch_feed(
+        url: str, timeout: float, *, retries: int = 0, session=None
+    ) -> SimpleNamespace:
+        del timeout, retries
+        fetch_sessions.append(session)
+        if url.endswith("/a"):
+            # The first feed finishes last; enqueue order must not change.
+            release_first.wait(timeout=5.0)
+        else:
+            release_first.set()
+        return SimpleNamespace(
+            entries=[{"link": f"{url}/post", "title": url}],
+            feed={},
+        )
+
+    def _fake_push_to_redis_status(
+        redis_client, redis_queue_key, *, post_uid: str, payload
+    ) -> str:
+        del redis_client, redis_queue_key, payload
+        pushed_post_uids.append(post_uid)
+        return ingest.REDIS_PUSH_STATUS_PUSHED
+
+    monkeypatch.setattr(ingest, "fetch_feed", _fake_fetch_feed)
+    monkeypatch.setattr(
+        ingest,
+        "build_ids",
+        lambda entry, link, feed_user_id, platform: ("1", f"weibo:{link}", ""),
+    )
+    monkeypatch.setattr(ingest, "parse_datetime", lambda entry: "2026-03-28 10:00:00")
+    monkeypatch.setattr(
+        ingest, "choose_author", lambda entry, feed, author, platform: "博主"
+    )
+    monkeypatch.setattr(ingest, "get_entry_content", lambda entry: "正文")
+    monkeypatch.setattr(ingest, "extract_image_urls_from_html", lambda html: [])
+    _patch_push_status(monkeypatch, _fake_push_to_redis_status)
+    monkeypatch.setattr(ingest.time, "sleep", lambda sec: sleep_calls.append(sec))
+    monkeypatch.setenv("RSS_HOST_MIN_INTERVAL_SECONDS", "0")
+
+    with caplog.at_level(logging.INFO):
+        accepted, enqueue_error = ingest.ingest_rss_many_once(
+            rss_urls=["https://example.com/rss/a", "https://example.com/rss/b"],
+            engine=None,
+            spool_dir=tmp_path,
+            redis_client=object(),
+            redis_queue_key="k",
+            platform="weibo",
+            author="",
+            user_id=None,
+            limit=None,
+            rss_timeout=60.0,
+            rss_retries=5,
+            rss_feed_sleep_seconds=10.0,
+            rss_fetch_concurrency=2,
+        )
+
+    assert accepted == 2
+    assert enqueue_error is False
+    assert pushed_post_uids == [
+        "weibo:https://example.com/rss/a/post",
+        "weibo:https://example.com/rss/b/post",
+    ]
+    assert len(fetch_sessions) == 2
+    assert fetch_sessions[0] is not None
+    assert fetch_sessions[0] is fetch_sessions[1]
+    assert sleep_calls == []
+    assert "[rss] feed_sleep" not in caplog.text
+    assert "concurrency=2" in caplog.text
+
+
+def test_ingest_rss_many_once_cycle_done_log_has_wall_and_fetch_latency(
+    monkeypatch, tmp_path, caplog
+) -> None:
+    def _fake_fetch_feed(
+        url: str, timeout: float, *, retries: int = 0
+    ) -> SimpleNamespace:
+        del url, timeout, retries
+        return SimpleNamespace(entries=[])
+
+    monkeypatch.setattr(ingest, "fetch_feed", _fake_fetch_feed)
+
+    with caplog.at_level(logging.INFO):
+        ingest.ingest_rss_many_once(
+            rss_urls=["https://example.com/rss/a"],
+            engine=None,
+            spool_dir=tmp_path,
+            redis_client=None,
+            redis_queue_key="",
+            platform="weibo",
+            author="",
+            user_id=None,
+            limit=None,
+            rss_timeout=60.0,
+            rss_retries=5,
+            rss_fetch_concurrency=1,
+        )
+
+    cycle_lines = [
+        line for line in caplog.text.splitlines() if "[rss] cycle_done" in line
+    ]
+    assert len(cycle_lines) == 1
+    assert "wall=" in cycle_lines[0]
+    assert "fetch_avg=" in cycle_lines[0]
+    assert "fetch_max=" in cycle_lines[0]
+
+
+def test_rss_fetch_pool_spaces_requests_to_the_same_host(monkeypatch) -> None:
+    from alphavault.rss import fetch_pool
+
+    sleep_calls: list[float] = []
+    clock = {"now": 100.0}
+    monkeypatch.setattr(fetch_pool.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(fetch_pool.time, "sleep", lambda sec: sleep_calls.append(sec))
+
+    pool = fetch_pool.RssFetchPool(
+        max_workers=1,
+        host_concurrency=1,
+        host_min_interval_seconds=2.0,
+        fetch_fn=lambda url, **_kwargs: SimpleNamespace(entries=[], url=url),
+    )
+    results = list(
+        pool.fetch_in_order(
+            [
+                "https://a.example.com/rss/1",
+                "https://a.example.com/rss/2",
+                "https://b.example.com/rss/1",
+            ],
+            timeout=1.0,
+            retries=0,
+        )
+    )
+
+    assert [result.rss_url for result in results] == [
+        "https://a.example.com/rss/1",
+        "https://a.example.com/rss/2",
+        "https://b.example.com/rss/1",
+    ]
+    assert all(result.error is None for result in results)
+    assert sleep_calls == [2.0]
+
+
+def test_fetch_rss_timed_unpacks_conditional_fetch_and_keeps_errors() -> None:
+    from alphavault.rss.fetch_pool import fetch_rss_timed
+
+    feed = SimpleNamespace(entries=[])
+    conditional = rss_utils.ConditionalFeedFetch(
+        feed=feed, validators=rss_utils.FeedValidators(etag='"v1"')
+    )
+    fetched = fetch_rss_timed(
+        lambda url, **_kwargs: conditional, "https://a.example.com/rss"
+    )
+    assert fetched.feed is feed
+    assert fetched.conditional is conditional
+
+    plain = fetch_rss_timed(lambda url, **_kwargs: feed, "https://a.example.com/rss")
+    assert plain.feed is feed
+    assert plain.conditional is None
+
+    def _boom(url: str, **_kwargs: object) -> None:
+        raise TimeoutError("slow")
+
+    failed = fetch_rss_timed(_boom, "https://a.example.com/rss", timeout=1.0)
+    assert failed.feed is None
+    assert isinstance(failed.error, TimeoutError)
+
+
+class _FakeFeedStateRedis:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.expire_calls: list[tuple[str, int]] = []
+
+    def pipeline(self, transaction: bool = True):  # type: ignore[no-untyped-def]
+        del transaction
+        client = self
+        ops: list = []
+
+        class _Pipe:
+            def hgetall(self, key: str) -> None:
+                ops.append(lambda: dict(client.hashes.get(key, {})))
+
+            def hset(self, key: str, *, mapping: dict[str, str]) -> None:
+                ops.append(lambda: client.hashes.setdefault(key, {}).update(mapping))
+
+            def expire(self, key: str, seconds: int) -> None:
+                ops.append(lambda: client.expire_calls.append((key, seconds)))
+
+            def execute(self) -> list:
+                return [op() for op in ops]
+
+        return _Pipe()
+
+
+def _fake_response(*, status_code: int, content: bytes, headers=None):  # type: ignore[no-untyped-def]
+    return SimpleNamespace(
+        status_code=status_code,
+        content=content,
+        headers=dict(headers or {}),
+        raise_for_status=lambda: None,
+    )
+
+
+def test_fetch_feed_conditional_sends_validators_and_skips_parse_on_304(
+    monkeypatch,
+) -> None:
+    seen_headers: list[dict[str, str]] = []
+
+    def _fake_get(url: str, *, headers, timeout: float):  # type: ignore[no-untyped-def]
+        del url, timeout
+        seen_headers.append(dict(headers))
+        return _fake_response(status_code=304, content=b"")
+
+    monkeypatch.setattr(rss_utils.requests, "get", _fake_get)
+    monkeypatch.setattr(
+        rss_utils.feedparser,
+        "parse",
+        lambda content: (_ for _ in ()).throw(AssertionError("should not parse")),
+    )
+
+    result = rss_utils.fetch_feed_conditional(
+        "https://example.com/rss",
+        timeout=5.0,
+        retries=0,
+        validators=rss_utils.FeedValidators(
+            etag='"abc"', last_modified="Sat, 28 Mar 2026 10:00:00 GMT"
+        ),
+    )
+
+    assert seen_headers[0]["If-None-Match"] == '"abc"'
+    assert seen_headers[0]["If-Modified-Since"] == "Sat, 28 Mar 2026 10:00:00 GMT"
+    assert result.feed is None
+    assert result.unchanged_reason == rss_utils.FEED_UNCHANGED_NOT_MODIFIED
+    assert result.validators.etag == '"abc"'
+
+
+def test_fetch_feed_conditional_skips_parse_when_body_hash_is_unchanged(
+    monkeypatch,
+) -> None:
+    body = b"<rss><channel></channel></rss>"
+    monkeypatch.setattr(
+        rss_utils.requests,
+        "get",
+        lambda url, *, headers, timeout: _fake_response(
+            status_code=200, content=body, headers={"ETag": '"v2"'}
+        ),
+    )
+    parse_calls: list[bytes] = []
+
+    def _fake_parse(content: bytes) -> SimpleNamespace:
+        parse_calls.append(content)
+        return SimpleNamespace(entries=[])
+
+    monkeypatch.setattr(rss_utils.feedparser, "parse", _fake_parse)
+
+    first = rss_utils.fetch_feed_conditional(
+        "https://example.com/rss", timeout=5.0, retries=0
+    )
+    second = rss_utils.fetch_feed_conditional(
+        "https://example.com/rss",
+        timeout=5.0,
+        retries=0,
+        validators=first.validators,
+    )
+
+    assert first.feed is not None
+    assert first.validators.etag == '"v2"'
+    assert first.validators.body_hash
+    assert second.feed is None
+    assert second.unchanged_reason == rss_utils.FEED_UNCHANGED_SAME_BODY
+    assert parse_calls == [body]
+
+
+def test_ingest_rss_many_once_skips_unchanged_feed_and_seen_entries(
+    monkeypatch, tmp_path, caplog
+) -> None:
+    redis_client = _FakeFeedStateRedis()
+    feed_bodies = {"current": b"v1"}
+    feed_entries = {
+        b"v1": [{"id": "e1", "link": "https://example.com/p/1", "title": "一"}],
+        b"v2": [
+            {"id": "e2", "link": "https://example.com/p/2", "title": "二"},
+            {"id": "e1", "link": "https://example.com/p/1", "title": "一"},
+        ],
+    }
+    build_ids_links: list[str] = []
+    pushed_post_uids: list[str] = []
+
+    def _fake_get(url: str, *, headers, timeout: float):  # type: ignore[no-untyped-def]
+        del url, headers, timeout
+        return _fake_response(status_code=200, content=feed_bodies["current"])
+
+    def _fake_build_ids(entry, link, feed_user_id, platform):  # type: ignore[no-untyped-def]
+        del entry, feed_user_id, platform
+        build_ids_links.append(link)
+        return ("1", f"weibo:{link}", "")
+
+    def _fake_push_to_redis_status(
+        redis_client, redis_queue_key, *, post_uid: str, payload
+    ) -> str:
+        del redis_client, redis_queue_key, payload
+        pushed_post_uids.append(post_uid)
+        return ingest.REDIS_PUSH_STATUS_PUSHED
+
+    monkeypatch.setattr(rss_utils.requests, "get", _fake_get)
+    monkeypatch.setattr(
+        rss_utils.feedparser,
+        "parse",
+        lambda content: SimpleNamespace(entries=feed_entries[content], feed={}),
+    )
+    monkeypatch.setattr(ingest, "build_ids", _fake_build_ids)
+    monkeypatch.setattr(ingest, "parse_datetime", lambda entry: "2026-03-28 10:00:00")
+    monkeypatch.setattr(
+        ingest, "choose_author", lambda entry, feed, author, platform: "博主"
+    )
+    monkeypatch.setattr(ingest, "get_entry_content", lambda entry: "正文")
+    monkeypatch.setattr(ingest, "extract_image_urls_from_html", lambda html: [])
+    _patch_push_status(monkeypatch, _fake_push_to_redis_status)
+
+    def _run_once() -> int:
+        accepted, enqueue_error = ingest.ingest_rss_many_once(
+            rss_urls=["https://example.com/rss"],
+            engine=None,
+            spool_dir=tmp_path,
+            redis_client=redis_client,
+            redis_queue_key="k",
+            platform="weibo",
+            author="",
+            user_id=None,
+            limit=None,
+            rss_timeout=60.0,
+            rss_retries=0,
+            rss_fetch_concurrency=1,
+        )
+        assert enqueue_error is False
+        return accepted
+
+    assert _run_once() == 1
+    with caplog.at_level(logging.INFO):
+        assert _run_once() == 0
+    assert "unchanged=same_body" in caplog.text
+
+    feed_bodies["current"] = b"v2"
+    assert _run_once() == 1
+
+    assert pushed_post_uids == [
+        "weibo:https://example.com/p/1",
+        "weibo:https://example.com/p/2",
+    ]
+    assert build_ids_links == [
+        "https://example.com/p/1",
+        "https://example.com/p/2",
+    ]
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import cast
+
+from alphavault.constants import SCHEMA_WEIBO
+from alphavault.db.cloud_schema import apply_cloud_schema
+from alphavault.db.postgres_db import PostgresConnection
+from alphavault.db.sql.ui import build_assertions_query
+from alphavault.db.source_queue import (
+    AssertionsDoneWriteRow,
+    PostContextWriteRow,
+    upsert_pending_post,
+    write_assertions_and_mark_done,
+    write_assertions_and_mark_done_batch,
+    write_post_context_results_batch,
+)
+
+
+def _source_conn(pg_conn) -> PostgresConnection:
+    apply_cloud_schema(pg_conn, target="source", schema_name=SCHEMA_WEIBO)
+    pg_conn.execute(
+        """
+TRUNCATE TABLE
+  weibo.posts, weibo.assertions, weibo.assertion_mentions,
+  weibo.assertion_entities, weibo.assertion_rollups, weibo.post_context_runs,
+  weibo.post_context_mentions, weibo.post_context_entities
+"""
+    )
+    return PostgresConnection(pg_conn, schema_name=SCHEMA_WEIBO)
+
+
+def _insert_post(conn: PostgresConnection, post_uid: str) -> None:
+    conn.execute(
+        """
+INSERT INTO weibo.posts(
+  post_uid, platform, platform_post_id, author, created_at, url, raw_text,
+  final_status, archived_at, ingested_at
+)
+VALUES (
+  :post_uid, 'weibo', :post_uid, '老王', '2026-04-09 10:00:00',
+  'https://example.com/post', '茅台我先看看', 'irrelevant', '', 1
+)
+""",
+        {"post_uid": post_uid},
+    )
+
+
+def _assertion(summary: str) -> dict[str, object]:
+    return {
+        "action": "trade.buy",
+        "action_strength": 2,
+        "summary": summary,
+        "evidence": "原文\t带制表符",
+        "assertion_mentions": [
+            {"mention_text": "茅台", "mention_type": "stock_name", "confidence": 0.9}
+        ],
+        "assertion_entities": [
+            {"entity_key": "stock:600519.SH", "entity_type": "stock", "is_primary": 1}
+        ],
+    }
+
+
+def _snapshot(conn: PostgresConnection) -> dict[str, list[tuple[object, ...]]]:
+    queries = {
+        "posts": "SELECT post_uid, final_status, invest_score, processed_at, model "
+        "FROM weibo.posts ORDER BY post_uid",
+        "assertions": "SELECT assertion_id, post_uid, idx, summary, evidence "
+        "FROM weibo.assertions ORDER BY assertion_id",
+        "mentions": "SELECT assertion_id, mention_seq, mention_text, confidence "
+        "FROM weibo.assertion_mentions ORDER BY assertion_id, mention_seq",
+        "entities": "SELECT assertion_id, entity_key, is_primary "
+        "FROM weibo.assertion_entities ORDER BY assertion_id, entity_key",
+        "rollups": "SELECT assertion_id, post_uid, entity_key, stock_codes, "
+        "stock_names FROM weibo.assertion_rollups ORDER BY assertion_id",
+        "context_runs": "SELECT post_uid, model FROM weibo.post_context_runs "
+        "ORDER BY post_uid",
+        "context_mentions": "SELECT post_uid, mention_seq, mention_text "
+        "FROM weibo.post_context_mentions ORDER BY post_uid, mention_seq",
+    }
+    return {
+        name: [tuple(row) for row in conn.execute(sql).fetchall()]
+        for name, sql in queries.items()
+    }
+
+
+def _done_row(post_uid: str, summaries: list[str]) -> AssertionsDoneWriteRow:
+    return AssertionsDoneWriteRow(
+        post_uid=post_uid,
+        final_status="relevant",
+        invest_score=0.8,
+        processed_at="2026-04-09 10:05:00",
+        model="m1",
+        prompt_version="p1",
+        archived_at="2026-04-09 10:06:00",
+        assertions=[_assertion(summary) for summary in summaries],
+        context_run={"model": "ctx", "prompt_version": "p1", "processed_at": "t"},
+        context_mentions=[{"mention_text": "白酒", "mention_type": "industry"}],
+    )
+
+
+def test_write_assertions_and_mark_done_batch_matches_single_writes(pg_conn) -> None:
+    conn = _source_conn(pg_conn)
+    for post_uid in ("weibo:1", "weibo:2"):
+        _insert_post(conn, post_uid)
+    rows = [_done_row("weibo:1", ["a", "b"]), _done_row("weibo:2", ["c"])]
+
+    for row in rows:
+        write_assertions_and_mark_done(
+            conn,
+            post_uid=row.post_uid,
+            final_status=row.final_status,
+            invest_score=row.invest_score,
+            processed_at=row.processed_at,
+            model=row.model,
+            prompt_version=row.prompt_version,
+            archived_at=row.archived_at,
+            assertions=row.assertions,
+            context_run=row.context_run,
+            context_mentions=row.context_mentions,
+            context_entities=row.context_entities,
+        )
+    expected = _snapshot(conn)
+
+    conn.execute("DELETE FROM weibo.assertion_mentions")
+    conn.execute("DELETE FROM weibo.assertion_entities")
+    conn.execute("DELETE FROM weibo.assertions")
+    conn.execute("DELETE FROM weibo.assertion_rollups")
+    conn.execute("DELETE FROM weibo.post_context_mentions")
+    conn.execute("DELETE FROM weibo.post_context_runs")
+    conn.execute("UPDATE weibo.posts SET final_status = 'irrelevant', model = NULL")
+
+    assert write_assertions_and_mark_done_batch(conn, rows=rows) == 2
+    assert _snapshot(conn) == expected
+    assert len(expected["assertions"]) == 3
+
+
+def test_write_assertions_and_mark_done_batch_replaces_previous_rows(pg_conn) -> None:
+    conn = _source_conn(pg_conn)
+    _insert_post(conn, "weibo:1")
+
+    write_assertions_and_mark_done_batch(
+        conn, rows=[_done_row("weibo:1", ["a", "b", "c"])]
+    )
+    write_assertions_and_mark_done_batch(conn, rows=[_done_row("weibo:1", ["z"])])
+
+    snapshot = _snapshot(conn)
+    assert [row[3] for row in snapshot["assertions"]] == ["z"]
+    assert len(snapshot["mentions"]) == 1
+    assert len(snapshot["entities"]) == 1
+    assert [row[0] for row in snapshot["rollups"]] == ["weibo:1#1"]
+    assert snapshot["context_runs"] == [("weibo:1", "ctx")]
+
+
+def test_write_post_context_results_batch_replaces_context_rows(pg_conn) -> None:
+    conn = _source_conn(pg_conn)
+    _insert_post(conn, "weibo:1")
+
+    def _row(mention_text: str) -> PostContextWriteRow:
+        return PostContextWriteRow(
+            post_uid="weibo:1",
+            model="ctx",
+            prompt_version="p1",
+            processed_at="t",
+            mentions=[{"mention_text": mention_text, "mention_type": "industry"}],
+            entities=[],
+        )
+
+    write_post_context_results_batch(conn, rows=[_row("白酒")])
+    write_post_context_results_batch(conn, rows=[_row("旧"), _row("半导体")])
+
+    snapshot = _snapshot(conn)
+    assert snapshot["context_runs"] == [("weibo:1", "ctx")]
+    assert snapshot["context_mentions"] == [("weibo:1", 1, "半导体")]
+
+
+def test_assertion_rollups_feed_assertions_query(pg_conn) -> None:
+    conn = _source_conn(pg_conn)
+    conn.execute("TRUNCATE TABLE weibo.topic_cluster_topics")
+    _insert_post(conn, "weibo:1")
+    assertion = _assertion("a")
+    cast(list, assertion["assertion_mentions"]).append(
+        {"mention_text": "白酒", "mention_type": "keyword", "confidence": 0.4}
+    )
+    cast(list, assertion["assertion_entities"]).append(
+        {"entity_key": "industry:白酒", "entity_type": "industry"}
+    )
+    write_assertions_and_mark_done_batch(
+        conn,
+        rows=[replace(_done_row("weibo:1", []), assertions=[assertion])],
+    )
+    conn.execute(
+        """
+INSERT INTO weibo.topic_cluster_topics(topic_key, cluster_key, created_at)
+VALUES ('industry:白酒', 'consumer', 't')
+"""
+    )
+
+    query = build_assertions_query(
+        [
+            "assertion_id",
+            "entity_key",
+            "confidence",
+            "stock_codes",
+            "stock_names",
+            "industries_json",
+            "keywords_json",
+            "cluster_keys_json",
+        ],
+        posts_table="weibo.posts",
+        assertions_table="weibo.assertions",
+        assertion_rollups_table="weibo.assertion_rollups",
+        topic_cluster_topics_table="weibo.topic_cluster_topics",
+    )
+    rows = [tuple(row) for row in conn.execute(query).fetchall()]
+
+    assert rows == [
+        (
+            "weibo:1#1",
+            "stock:600519.SH",
+            0.9,
+            '["600519.SH"]',
+            '["茅台"]',
+            '["白酒"]',
+            '["白酒"]',
+            '["consumer"]',
+        )
+    ]
+
+
+def test_upsert_pending_post_stores_typed_created_at(pg_conn) -> None:
+    conn = _source_conn(pg_conn)
+    for post_uid, created_at in (
+        ("weibo:1", "2026-04-09 10:00:00"),
+        ("weibo:2", "2026-04-09T02:30:00Z"),
+        ("weibo:3", "昨天 10:00"),
+    ):
+        upsert_pending_post(
+            conn,
+            post_uid=post_uid,
+            platform="weibo",
+            platform_post_id=post_uid,
+            author="老王",
+            created_at=created_at,
+            url="https://example.com/post",
+            raw_text="茅台",
+            archived_at="",
+            ingested_at=1,
+        )
+
+    rows = conn.execute(
+        "SELECT post_uid, created_at_ts FROM weibo.posts ORDER BY post_uid"
+    ).fetchall()
+
+    assert [(row[0], row[1]) for row in rows] == [
+        ("weibo:1", datetime(2026, 4, 9, 2, 0, tzinfo=timezone.utc)),
+        ("weibo:2", datetime(2026, 4, 9, 2, 30, tzinfo=timezone.utc)),
+        ("weibo:3", None),
+    ]
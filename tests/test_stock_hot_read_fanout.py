@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import cast
+
+from alphavault.db.postgres_env import PostgresSource
+from alphavault.db.source_queue import invalidate_stock_hot_views
+from alphavault.infra import hot_view_cache
+from alphavault_reflex.services import research_page_loader, stock_hot_read
+
+
+def _sources() -> list[PostgresSource]:
+    return [
+        PostgresSource(name="weibo", dsn="postgresql://x", schema="weibo"),
+        PostgresSource(name="xueqiu", dsn="postgresql://x", schema="xueqiu"),
+    ]
+
+
+def _patch_stock_context(monkeypatch, *, alias_keys: tuple[str, ...] = ()) -> None:
+    monkeypatch.setattr(stock_hot_read, "load_dotenv_if_present", lambda: None)
+    monkeypatch.setattr(stock_hot_read, "_load_source_schemas_from_env", _sources)
+    monkeypatch.setattr(
+        stock_hot_read,
+        "_resolve_stock_query_context",
+        lambda normalized, view_scope: (
+            {
+                "requested_stock_key": normalized,
+                "query_keys": [normalized, *alias_keys],
+                "covered_stock_keys": [normalized],
+                "same_company_stocks": [],
+                "official_names": {},
+                "page_title": "贵州茅台",
+            },
+            "",
+        ),
+    )
+
+
+def _signal(platform: str, post_uid: str, created_at: str) -> dict[str, str]:
+    return {"platform": platform, "post_uid": post_uid, "created_at": created_at}
+
+
+def _signal_post_uids(view: dict[str, object]) -> list[object]:
+    return [row["post_uid"] for row in cast(list[dict[str, object]], view["signals"])]
+
+
+def test_stock_page_reads_sources_concurrently_and_merges(monkeypatch) -> None:
+    _patch_stock_context(monkeypatch)
+    barrier = threading.Barrier(2, timeout=2)
+
+    def _fake_page(source, **_kwargs):
+        barrier.wait()
+        if source.name == "weibo":
+            return [_signal("weibo", "weibo:1", "2026-04-09 10:00:00")], 1
+        return [_signal("xueqiu", "xueqiu:1", "2026-04-09 11:00:00")], 1
+
+    monkeypatch.setattr(stock_hot_read, "_load_source_signal_page", _fake_page)
+
+    view = stock_hot_read.load_stock_page_rows_from_env(
+        "stock:600519.SH", signal_page=1, signal_page_size=20
+    )
+
+    assert _signal_post_uids(view) == ["xueqiu:1", "weibo:1"]
+    assert view["signal_total"] == 2
+    assert view["load_error"] == ""
+    assert view["load_warning"] == ""
+
+
+def test_stock_page_returns_partial_rows_when_source_is_slow(monkeypatch) -> None:
+    _patch_stock_context(monkeypatch)
+    monkeypatch.setenv(stock_hot_read.ENV_REFLEX_STOCK_SOURCE_TIMEOUT_SEC, "0.2")
+    release = threading.Event()
+
+    def _fake_page(source, **_kwargs):
+        if source.name == "xueqiu":
+            release.wait(5)
+        return [_signal(source.name, f"{source.name}:1", "2026-04-09 10:00:00")], 1
+
+    monkeypatch.setattr(stock_hot_read, "_load_source_signal_page", _fake_page)
+
+    started_at = time.monotonic()
+    try:
+        view = stock_hot_read.load_stock_page_rows_from_env(
+            "stock:600519.SH", signal_page=1, signal_page_size=20
+        )
+    finally:
+        release.set()
+
+    assert time.monotonic() - started_at < 2
+    assert _signal_post_uids(view) == ["weibo:1"]
+    assert view["load_error"] == ""
+    assert "xueqiu" in str(view["load_warning"])
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    def mget(self, keys: list[str]) -> list[str | None]:
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key: str, value: str, ex: int) -> None:
+        self.values[key] = value
+
+    def incr(self, key: str) -> None:
+        self.values[key] = str(int(self.values.get(key) or 0) + 1)
+
+    def expire(self, key: str, seconds: int) -> None:
+        return None
+
+    def pipeline(self, transaction: bool = False) -> "_FakeRedis":
+        return self
+
+    def execute(self) -> list[object]:
+        return []
+
+
+def _patch_fake_redis(monkeypatch) -> _FakeRedis:
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(stock_hot_read, "get_hot_view_redis", lambda: fake_redis)
+    monkeypatch.setattr(hot_view_cache, "_shared_redis", lambda: fake_redis)
+    return fake_redis
+
+
+def _load_cached() -> dict[str, object]:
+    return stock_hot_read.load_stock_cached_view_from_env(
+        "stock:600519.SH", signal_page=1, signal_page_size=20
+    )
+
+
+def test_stock_cached_view_serves_from_redis_until_stock_is_written(
+    monkeypatch,
+) -> None:
+    _patch_stock_context(monkeypatch)
+    _patch_fake_redis(monkeypatch)
+    loads: list[str] = []
+
+    def _fake_page(source, **_kwargs):
+        loads.append(source.name)
+        return [_signal(source.name, f"{source.name}:1", "2026-04-09 10:00:00")], 1
+
+    monkeypatch.setattr(stock_hot_read, "_load_source_signal_page", _fake_page)
+
+    _load = _load_cached
+
+    first = _load()
+    assert _load() == first
+    assert len(loads) == 2
+
+    invalidate_stock_hot_views(
+        [{"entity_key": "stock:600519.SH", "entity_type": "stock"}]
+    )
+    assert _load() == first
+    assert len(loads) == 4
+
+    stock_hot_read.clear_stock_hot_read_caches()
+    _load()
+    assert len(loads) == 6
+
+
+def test_stock_cached_view_skips_views_with_a_failed_source(monkeypatch) -> None:
+    _patch_stock_context(monkeypatch)
+    _patch_fake_redis(monkeypatch)
+    loads: list[str] = []
+
+    def _fake_page(source, **_kwargs):
+        loads.append(source.name)
+        if source.name == "xueqiu":
+            raise OSError("connection refused")
+        return [_signal("weibo", "weibo:1", "2026-04-09 10:00:00")], 1
+
+    monkeypatch.setattr(stock_hot_read, "_load_source_signal_page", _fake_page)
+
+    view = _load_cached()
+    assert view["load_error"] == ""
+    assert _signal_post_uids(view) == ["weibo:1"]
+    _load_cached()
+    assert len(loads) == 4
+
+
+def test_stock_cached_view_tags_alias_generations_before_querying(
+    monkeypatch,
+) -> None:
+    _patch_stock_context(monkeypatch, alias_keys=("stock:茅台",))
+    _patch_fake_redis(monkeypatch)
+    loads: list[str] = []
+
+    def _fake_page(source, **_kwargs):
+        loads.append(source.name)
+        if len(loads) == 1:
+            # An alias key is written while the first read is still running.
+            invalidate_stock_hot_views(
+                [{"entity_key": "stock:茅台", "entity_type": "stock"}]
+            )
+        return [_signal(source.name, f"{source.name}:1", "2026-04-09 10:00:00")], 1
+
+    monkeypatch.setattr(stock_hot_read, "_load_source_signal_page", _fake_page)
+    monkeypatch.setattr(
+        stock_hot_read,
+        "_fan_out_sources",
+        lambda sources, load_one, timeout_seconds: (
+            [load_one(source) for source in sources],
+            [],
+            [],
+        ),
+    )
+
+    _load_cached()
+    _load_cached()
+    assert len(loads) == 4
+    _load_cached()
+    assert len(loads) == 4
+
+
+def test_sector_page_view_is_cached_until_assertions_are_written(
+    monkeypatch,
+) -> None:
+    fake_redis = _patch_fake_redis(monkeypatch)
+    monkeypatch.setattr(hot_view_cache, "get_hot_view_redis", lambda: fake_redis)
+    loads: list[str] = []
+
+    def _load_assertions():
+        loads.append("assertions")
+        return [
+            {
+                "post_uid": "weibo:1",
+                "idx": 1,
+                "entity_key": "stock:600519.SH",
+                "action": "trade.buy",
+                "cluster_keys": ["白酒"],
+            }
+        ], ""
+
+    monkeypatch.setattr(
+        research_page_loader,
+        "_load_source_read_module",
+        lambda: SimpleNamespace(
+            load_trade_assertions_from_env=_load_assertions,
+            load_trade_posts_by_uid_from_env=lambda post_uids: ([], ""),
+        ),
+    )
+
+    first = research_page_loader.load_sector_page_view("白酒")
+    assert research_page_loader.load_sector_page_view("白酒") == first
+    assert loads == ["assertions"]
+
+    # Context-only writes leave sector views alone.
+    invalidate_stock_hot_views(
+        [{"entity_key": "stock:600519.SH", "entity_type": "stock"}]
+    )
+    research_page_loader.load_sector_page_view("白酒")
+    assert loads == ["assertions"]
+
+    invalidate_stock_hot_views([], assertions_written=True)
+    assert research_page_loader.load_sector_page_view("白酒") == first
+    assert loads == ["assertions", "assertions"]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from alphavault.domains.stock.object_index import (
+    StockObjectIndex,
+    StockObjectIndexState,
+    build_stock_object_index,
+)
+from alphavault_reflex.services import stock_object_index_cache
+
+
+def _row(post_uid: str, entity_key: str, *, code: str = "", name: str = "") -> dict:
+    return {
+        "post_uid": post_uid,
+        "idx": 1,
+        "entity_key": entity_key,
+        "stock_codes": [code] if code else [],
+        "stock_names": [name] if name else [],
+    }
+
+
+_ROWS = [
+    _row("weibo:1", "stock:601899.SH", code="601899.SH", name="紫金矿业"),
+    _row("weibo:2", "stock:紫金", name="紫金矿业"),
+    _row("weibo:3", "stock:600519.SH", code="600519.SH", name="贵州茅台"),
+    _row("weibo:4", "stock:茅子"),
+]
+_ALIAS_RELATION: dict[str, object] = {
+    "relation_type": "stock_alias",
+    "left_key": "stock:600519.SH",
+    "right_key": "stock:茅子",
+}
+
+
+def _as_tuple(index: StockObjectIndex) -> tuple[object, ...]:
+    return (
+        index.object_key_by_member,
+        index.member_keys_by_object_key,
+        index.display_name_by_object_key,
+        index.search_text_by_object_key,
+    )
+
+
+def test_names_join_their_code_object() -> None:
+    index = build_stock_object_index(_ROWS, stock_relations=[_ALIAS_RELATION])
+
+    assert index.resolve("stock:紫金") == "stock:601899.SH"
+    assert index.resolve("stock:紫金矿业") == "stock:601899.SH"
+    assert index.resolve("stock:茅子") == "stock:600519.SH"
+    assert index.page_title("stock:茅子") == "贵州茅台 (600519.SH)"
+
+
+def test_incremental_sync_and_snapshot_match_a_full_rebuild() -> None:
+    state = StockObjectIndexState()
+    state.sync_assertions(_ROWS[:2])
+    assert state.index().resolve("stock:茅子") == "stock:茅子"
+
+    assert state.sync_assertions(_ROWS) == (2, 0)
+    assert state.sync_stock_relations([_ALIAS_RELATION]) is True
+    assert _as_tuple(state.index()) == _as_tuple(
+        build_stock_object_index(_ROWS, stock_relations=[_ALIAS_RELATION])
+    )
+
+    restored = StockObjectIndexState.from_snapshot(state.to_snapshot())
+    assert restored.sync_assertions(_ROWS[2:]) == (0, 2)
+    assert _as_tuple(restored.index()) == _as_tuple(
+        build_stock_object_index(_ROWS[2:], stock_relations=[_ALIAS_RELATION])
+    )
+    assert _as_tuple(restored.index(include_relations=False)) == _as_tuple(
+        build_stock_object_index(_ROWS[2:])
+    )
+
+
+def test_shared_index_starts_from_snapshot(monkeypatch, tmp_path) -> None:
+    path = tmp_path / "stock_index.json"
+    monkeypatch.setenv(
+        stock_object_index_cache.ENV_REFLEX_STOCK_INDEX_SNAPSHOT_PATH, str(path)
+    )
+    monkeypatch.setattr(stock_object_index_cache, "_state", None)
+    monkeypatch.setattr(stock_object_index_cache, "_last_saved_at", -1e9)
+
+    first = stock_object_index_cache.load_shared_stock_object_index(
+        _ROWS, stock_relations=[_ALIAS_RELATION]
+    )
+    assert path.exists()
+
+    monkeypatch.setattr(stock_object_index_cache, "_state", None)
+    loaded = stock_object_index_cache.load_stock_index_snapshot(path)
+    assert loaded is not None and loaded.assertion_count == len(_ROWS)
+    second = stock_object_index_cache.load_shared_stock_object_index(
+        _ROWS, stock_relations=[_ALIAS_RELATION]
+    )
+    assert _as_tuple(second) == _as_tuple(first)
+    assert stock_object_index_cache.stock_object_index_stats()["rows"] == len(_ROWS)
+
+
+def test_sync_recounts_a_row_whose_stock_columns_changed() -> None:
+    first = [*_ROWS[:3], _row("weibo:4", "stock:茅子", name="贵州茅台")]
+    rewritten = [*_ROWS[:3], _row("weibo:4", "stock:茅子", name="平安银行")]
+    rewritten.append(
+        _row("weibo:5", "stock:000001.SZ", code="000001.SZ", name="平安银行")
+    )
+    state = StockObjectIndexState()
+    state.sync_assertions(first)
+    assert state.index().resolve("stock:茅子") == "stock:600519.SH"
+
+    assert state.sync_assertions(rewritten) == (2, 1)
+    assert state.sync_assertions(rewritten) == (0, 0)
+    assert state.index().resolve("stock:茅子") == "stock:000001.SZ"
+    assert _as_tuple(state.index()) == _as_tuple(build_stock_object_index(rewritten))
+
+    restored = StockObjectIndexState.from_snapshot(state.to_snapshot())
+    assert _as_tuple(restored.index()) == _as_tuple(build_stock_object_index(rewritten))
+
+
+def test_name_claimed_by_two_codes_stays_with_its_raw_owner() -> None:
+    rows = [
+        _row("weibo:1", "stock:茅台", code="601899.SH", name="茅台"),
+        _row("weibo:2", "stock:sh600519", code="sh600519", name="茅台"),
+    ]
+    for ordered in (rows, rows[::-1]):
+        index = build_stock_object_index(ordered)
+        # The name ties between both codes; the row that used it as its own
+        # key keeps it instead of whichever code is visited last.
+        assert index.resolve("stock:茅台") == "stock:601899.SH"
+        assert "stock:茅台" in index.member_keys_by_object_key["stock:600519.SH"]
+
+
+def test_display_name_ties_across_raw_code_spellings_are_stable() -> None:
+    rows = [
+        _row("weibo:1", "stock:sh600519", code="sh600519", name="贵州茅台"),
+        _row("weibo:2", "stock:600519.SH", code="600519.SH", name="茅台"),
+    ]
+    for ordered in (rows, rows[::-1]):
+        index = build_stock_object_index(ordered)
+        # Both spellings map to stock:600519.SH with one vote each; the name
+        # of the smallest raw code wins, not the one seen last.
+        assert index.display_name("stock:600519.SH") == "茅台"
+        assert index.page_title("stock:sh600519") == "茅台 (600519.SH)"
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import Any, cast
 
+import pytest
+
 from alphavault.constants import SCHEMA_STANDARD, SCHEMA_WEIBO
 from alphavault.db.cloud_schema import apply_cloud_schema
 from alphavault.db.postgres_db import PostgresConnection
@@ -1599,3 +1601,376 @@ def test_resolve_rows_entity_matches_attaches_alias_task_sample_context(
         ]
     finally:
         conn.close()
+
+
+def test_speculative_post_context_runs_on_own_group_and_counts_waste(
+    monkeypatch,
+) -> None:
+    import threading
+    import time
+
+    from alphavault.infra.ai.runtime_config import AiRuntimeConfig
+    from alphavault.worker import post_context_speculation
+
+    release = threading.Event()
+    seen_gates: list[object] = []
+
+    def _fake_extract(_engine, *, post, request_gate=None, **_kwargs):  # type: ignore[no-untyped-def]
+        seen_gates.append(request_gate)
+        release.wait(5)
+        return post.post_uid
+
+    monkeypatch.setattr(
+        post_context_speculation, "extract_post_context_result", _fake_extract
+    )
+    monkeypatch.setattr(
+        post_context_speculation,
+        "_stats",
+        dict.fromkeys(post_context_speculation._stats, 0),
+    )
+    runtime_config = AiRuntimeConfig(
+        api_key="k",
+        model="context-model",
+        base_url="",
+        api_mode="responses",
+        temperature=0.1,
+        reasoning_effort="",
+        timeout_seconds=30.0,
+        retries=0,
+        ai_rpm=0.0,
+        ai_max_inflight=2,
+        limit_group_name="context_lane",
+        speculative=True,
+    )
+    post = CloudPost(
+        post_uid="weibo:1",
+        platform="weibo",
+        platform_post_id="1001",
+        author="老王",
+        created_at="2026-04-07 10:00:00",
+        url="",
+        raw_text="茅台",
+        ai_retry_count=0,
+    )
+
+    assert (
+        post_context_speculation.start_speculative_post_context(
+            object(),
+            post=post,
+            runtime_config=runtime_config,
+            topic_limit_group_name="context_lane",
+        )
+        is None
+    )
+
+    used = post_context_speculation.start_speculative_post_context(
+        object(), post=post, runtime_config=runtime_config, topic_limit_group_name=""
+    )
+    wasted = post_context_speculation.start_speculative_post_context(
+        object(), post=post, runtime_config=runtime_config, topic_limit_group_name=""
+    )
+    assert used is not None and wasted is not None
+    time.sleep(0.05)
+    topic_finished_at = time.monotonic()
+    release.set()
+
+    assert used.result(topic_finished_at=topic_finished_at) == "weibo:1"
+    wasted.discard(reason="irrelevant")
+    stats = post_context_speculation.speculative_context_stats()
+    assert stats["started"] == 2
+    assert stats["used"] == 1
+    assert stats["wasted"] == 1
+    assert stats["saved_seconds"] > 0
+    assert len(seen_gates) == 2 and all(callable(gate) for gate in seen_gates)
+
+
+def _legacy_serialize_tree(node: Any) -> dict[str, Any]:
+    from alphavault.weibo.topic_prompt_tree import _sorted_children
+
+    out: dict[str, Any] = {
+        "source_kind": str(node.payload.get("source_kind") or "").strip(),
+        "source_id": str(node.payload.get("source_id") or "").strip(),
+        "speaker": str(node.payload.get("speaker") or "").strip(),
+        "text": str(node.payload.get("text") or "").strip(),
+    }
+    quoted_text = str(node.payload.get("quoted_text") or "").strip()
+    if quoted_text:
+        out["quoted_text"] = quoted_text
+    children = [_legacy_serialize_tree(child) for child in _sorted_children(node)]
+    if children:
+        out["children"] = children
+    return out
+
+
+def _legacy_topic_runtime_context(
+    *,
+    root_key: str,
+    root_segment: str,
+    root_content_key: str,
+    focus_username: str,
+    posts: list[dict[str, object]],
+    manual_feedback_hint: dict[str, object] | None = None,
+    include_virtual_comments: bool = True,
+    max_node_text_chars: int = 0,
+) -> tuple[Any, int]:
+    """Frozen copy of build_topic_runtime_context from before the draft split:
+    node texts are truncated while parsing, then serialized."""
+    from alphavault.ai.contracts import AiTopicPackage, AiTopicRuntimeContext
+    from alphavault.domains.thread_tree.parse import (
+        content_key_for_compare,
+        extract_speaker_name,
+        make_synthetic_source_id,
+        parse_thread_segments,
+        strip_leading_speaker,
+        to_one_line_text,
+    )
+    from alphavault.weibo.topic_prompt_tree import (
+        _clean_manual_feedback_hint,
+        _ensure_thread_text,
+        _insert_path,
+        _TreeNode,
+        _truncate_text,
+        build_message_lookup_from_tree,
+    )
+
+    focus = str(focus_username or "").strip()
+    root_speaker = extract_speaker_name(root_segment) or focus or "未知"
+    root_source_id = str(root_key or "root").strip() or "root"
+    root_created_at = ""
+    root_text = strip_leading_speaker(root_segment, author_hint=root_speaker) or ""
+
+    root_post_row: dict[str, object] | None = None
+    for row in posts:
+        platform_post_id = str(row.get("platform_post_id") or "").strip()
+        if not platform_post_id:
+            continue
+        author = str(row.get("author") or "").strip()
+        raw_text = str(row.get("raw_text") or "")
+        thread_text = _ensure_thread_text(raw_text=raw_text, author=author)
+        segments = parse_thread_segments(thread_text) if thread_text.strip() else []
+        if len(segments) != 1:
+            continue
+        seg_key = content_key_for_compare(
+            segments[0], author_hint=extract_speaker_name(segments[0])
+        )
+        if seg_key and seg_key == root_content_key:
+            if root_post_row is None:
+                root_post_row = row
+                continue
+            current_ts = str(root_post_row.get("created_at") or "").strip()
+            candidate_ts = str(row.get("created_at") or "").strip()
+            if candidate_ts and (not current_ts or candidate_ts < current_ts):
+                root_post_row = row
+
+    if root_post_row is not None:
+        root_source_id = (
+            str(root_post_row.get("platform_post_id") or "").strip() or root_source_id
+        )
+        root_created_at = str(root_post_row.get("created_at") or "").strip()
+        root_speaker = str(root_post_row.get("author") or "").strip() or root_speaker
+        thread_text = _ensure_thread_text(
+            raw_text=str(root_post_row.get("raw_text") or ""),
+            author=root_speaker,
+        )
+        segments = parse_thread_segments(thread_text) if thread_text.strip() else []
+        if segments:
+            root_text = (
+                strip_leading_speaker(segments[-1], author_hint=root_speaker)
+                or root_text
+            )
+
+    root_text, root_truncated = _truncate_text(root_text, max_chars=max_node_text_chars)
+    root_node = _TreeNode(
+        payload={
+            "source_kind": "topic_post",
+            "source_id": root_source_id,
+            "speaker": root_speaker,
+            "created_at": root_created_at,
+            "text": root_text,
+        },
+        children={},
+    )
+    truncated_nodes = 1 if root_truncated else 0
+
+    for row in posts:
+        platform_post_id = str(row.get("platform_post_id") or "").strip()
+        if not platform_post_id or platform_post_id == root_source_id:
+            continue
+        author = str(row.get("author") or "").strip()
+        created_at = str(row.get("created_at") or "").strip()
+        raw_text = str(row.get("raw_text") or "")
+        thread_text = _ensure_thread_text(raw_text=raw_text, author=author)
+        segments = parse_thread_segments(thread_text) if thread_text.strip() else []
+        if not segments:
+            segments = [f"{author}：{to_one_line_text(raw_text)}".strip("：")]
+
+        leaf_text = strip_leading_speaker(segments[-1], author_hint=author) or ""
+        leaf_text, leaf_truncated = _truncate_text(
+            leaf_text, max_chars=max_node_text_chars
+        )
+        if leaf_truncated:
+            truncated_nodes += 1
+        leaf_payload = {
+            "source_kind": "status",
+            "source_id": platform_post_id,
+            "speaker": author or focus or "未知",
+            "created_at": created_at,
+            "text": leaf_text,
+        }
+
+        virtual_segments = segments[:-1] if include_virtual_comments else []
+        if virtual_segments and root_content_key:
+            first_key = content_key_for_compare(
+                virtual_segments[0],
+                author_hint=extract_speaker_name(virtual_segments[0]),
+            )
+            if first_key and first_key == root_content_key:
+                virtual_segments = virtual_segments[1:]
+
+        path_payloads: list[dict[str, Any]] = []
+        for seg in virtual_segments:
+            speaker = extract_speaker_name(seg).strip()
+            if not speaker:
+                continue
+            node_text = strip_leading_speaker(seg, author_hint=speaker) or ""
+            node_text, node_truncated = _truncate_text(
+                node_text, max_chars=max_node_text_chars
+            )
+            if node_truncated:
+                truncated_nodes += 1
+            path_payloads.append(
+                {
+                    "source_kind": "talk_reply"
+                    if focus and speaker == focus
+                    else "comment",
+                    "source_id": make_synthetic_source_id(seg),
+                    "speaker": speaker,
+                    "created_at": created_at,
+                    "text": node_text,
+                }
+            )
+        path_payloads.append(leaf_payload)
+        _insert_path(root_node, path_payloads)
+
+    message_tree = _legacy_serialize_tree(root_node)
+    runtime_context = AiTopicRuntimeContext(
+        root_key=str(root_key or "").strip(),
+        root_source_id=root_source_id,
+        focus_username=focus,
+        message_tree=message_tree,
+        message_lookup=build_message_lookup_from_tree(message_tree),
+        ai_topic_package=AiTopicPackage(
+            topic_status_id=root_source_id,
+            focus_username=focus,
+            message_tree=message_tree,
+            manual_feedback_hint=_clean_manual_feedback_hint(manual_feedback_hint),
+        ),
+    )
+    return runtime_context, truncated_nodes
+
+
+def _rebuild_each_probe_prompt(
+    *, max_prompt_chars: int, **kwargs: Any
+) -> tuple[Any, ...]:
+    """The pre-size-model search: full context and prompt rebuild per probe."""
+    from alphavault.ai.topic_prompt_v4 import build_topic_prompt
+    from alphavault.worker.topic_prompt_v4 import max_message_tree_text_len
+
+    def build(node_chars: int, include_comments: bool, compact: bool):  # type: ignore[no-untyped-def]
+        ctx, truncated = _legacy_topic_runtime_context(
+            include_virtual_comments=include_comments,
+            max_node_text_chars=node_chars,
+            **kwargs,
+        )
+        prompt = build_topic_prompt(
+            ai_topic_package=ctx.ai_topic_package, compact_json=compact
+        )
+        return ctx, truncated, prompt
+
+    for include_comments in (True, False):
+        for compact in (False, True):
+            ctx, truncated, prompt = build(0, include_comments, compact)
+            if max_prompt_chars <= 0 or len(prompt) <= max_prompt_chars:
+                return ctx, truncated, prompt, len(prompt), 0, compact, include_comments
+        lo, hi, best = 1, max(1, max_message_tree_text_len(ctx.message_tree)), None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            ctx, truncated, prompt = build(mid, include_comments, True)
+            if len(prompt) <= max_prompt_chars:
+                best = (
+                    ctx,
+                    truncated,
+                    prompt,
+                    len(prompt),
+                    mid,
+                    True,
+                    include_comments,
+                )
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        if best is not None:
+            return best
+    raise RuntimeError("topic_prompt_too_long")
+
+
+def test_topic_prompt_chars_limit_matches_rebuild_each_probe_output() -> None:
+    from alphavault.ai.topic_prompt_v4 import build_prompt_header
+    from alphavault.weibo.topic_prompt_tree import thread_root_info_for_post
+    from alphavault.worker.topic_prompt_v4 import (
+        build_topic_prompt_v4_with_prompt_chars_limit,
+    )
+
+    root = '老王：茅台 "估值" 还能看 \\ 先拿着   '
+    posts: list[dict[str, object]] = []
+    for idx in range(12):
+        segments = [root] if idx % 3 else []
+        segments += [
+            f'小李{idx % 4}：{"回复" * (idx + 3)} "引号" 反斜杠\\ 尾部空格    x',
+            f"老王：{'五粮液 加仓 ' * (idx * 5 + 1)}\x01 完",
+        ]
+        posts.append(
+            {
+                "platform_post_id": str(2000 + idx),
+                "author": "老王",
+                "created_at": f"2026-04-0{1 + idx % 9} 10:00:00",
+                "raw_text": "\n---\n".join(segments),
+            }
+        )
+    root_key, root_segment, root_content_key = thread_root_info_for_post(
+        raw_text=root, author="老王"
+    )
+    kwargs: dict[str, Any] = {
+        "root_key": root_key,
+        "root_segment": root_segment,
+        "root_content_key": root_content_key,
+        "focus_username": "老王",
+        "posts": posts,
+        "manual_feedback_hint": {"feedback_tag": "wrong", "feedback_note": '别"漏"'},
+    }
+    uncapped = len(_rebuild_each_probe_prompt(max_prompt_chars=0, **kwargs)[2])
+    header = len(build_prompt_header(focus_username="老王"))
+    seen_modes: set[tuple[bool, bool, bool]] = set()
+    for step in range(0, 40):
+        max_prompt_chars = uncapped - (uncapped - header) * step // 40
+        try:
+            expected = _rebuild_each_probe_prompt(
+                max_prompt_chars=max_prompt_chars, **kwargs
+            )
+        except RuntimeError:
+            with pytest.raises(RuntimeError, match="topic_prompt_too_long"):
+                build_topic_prompt_v4_with_prompt_chars_limit(
+                    max_prompt_chars=max_prompt_chars, **kwargs
+                )
+            continue
+        got = build_topic_prompt_v4_with_prompt_chars_limit(
+            max_prompt_chars=max_prompt_chars, **kwargs
+        )
+        assert got[1:] == expected[1:]
+        got_ctx = cast(Any, got[0])
+        expected_ctx = cast(Any, expected[0])
+        assert got_ctx.message_lookup == expected_ctx.message_lookup
+        assert got_ctx.ai_topic_package == expected_ctx.ai_topic_package
+        seen_modes.add((int(got[4]) > 0, bool(got[5]), bool(got[6])))
+    assert (True, True, True) in seen_modes
+    assert (True, True, False) in seen_modes
@@ -6,6 +6,8 @@ import logging
 import threading
 from typing import Callable
 
+import pytest
+
 from alphavault.rss.utils import RateLimiter
 from alphavault.worker import periodic_jobs
 from alphavault.worker import scheduler as scheduler_module
@@ -407,7 +409,7 @@ def test_schedule_ai_from_stream_empty_poll_releases_reserved_request_slot() ->
     assert first_has_error is False
     assert second_scheduled == 1
     assert second_has_error is False
-    assert read_counts == [("first", 1), ("second", 1)]
+    assert read_counts == [("first", 2), ("second", 2)]
     assert len(executor.scheduled_payloads) == 1
 
 
@@ -476,3 +478,458 @@ def test_prune_inflight_futures_logs_exception_and_clears_future(
     assert "[ai] future_error owner=xueqiu RuntimeError: boom" in caplog.text
     assert inflight_futures == set()
     assert inflight_owner_by_future == {}
+
+
+def test_rate_limiter_spends_burst_then_refills_at_rpm() -> None:
+    now = [0.0]
+    slept: list[float] = []
+
+    def _sleep(seconds: float) -> None:
+        slept.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(12, burst=3, clock=lambda: now[0], sleep=_sleep)
+
+    for _ in range(3):
+        limiter.wait()
+    assert slept == []
+
+    limiter.wait()
+    assert slept == [5.0]
+
+    now[0] += 60.0
+    assert limiter.stats()["tokens_available"] == 3.0
+    assert limiter.stats()["total_wait_seconds"] == 5.0
+
+
+def test_rate_limiter_try_reserve_is_not_blocked_by_sleeping_waiter() -> None:
+    limiter = RateLimiter(60, burst=1)
+    limiter.wait()
+    sleeping = threading.Event()
+    release = threading.Event()
+
+    def _sleep(_seconds: float) -> None:
+        sleeping.set()
+        release.wait(5)
+
+    limiter._sleep = _sleep
+    waiter = threading.Thread(target=limiter.wait)
+    waiter.start()
+    try:
+        assert sleeping.wait(2)
+        assert limiter.stats()["waiters"] == 1
+        assert limiter.try_reserve() is None
+        assert limiter.stats()["rejected"] == 1
+    finally:
+        release.set()
+        waiter.join(5)
+    assert limiter.stats()["waiters"] == 0
+
+
+def test_rate_limiter_cancelled_slot_refunds_token() -> None:
+    limiter = RateLimiter(12, burst=2, clock=lambda: 0.0)
+
+    first = limiter.try_reserve()
+    second = limiter.try_reserve()
+    assert first is not None and second is not None
+    assert limiter.try_reserve() is None
+
+    second.cancel()
+    assert limiter.stats()["tokens_available"] == 1.0
+    assert limiter.try_reserve() is not None
+
+
+class _FakeLimitRedis:
+    def __init__(self, *, rate_waits_ms: list[int], fail: bool = False) -> None:
+        self.rate_waits_ms = list(rate_waits_ms)
+        self.fail = fail
+        self.leases: set[str] = set()
+        self.calls: list[str] = []
+
+    def eval(self, script: str, numkeys: int, key: str, *args):  # type: ignore[no-untyped-def]
+        del numkeys
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.calls.append(key)
+        if key.endswith(":rate"):
+            return self.rate_waits_ms.pop(0)
+        if len(self.leases) >= int(args[0]):
+            return 0
+        self.leases.add(str(args[2]))
+        return 1
+
+    def zrem(self, key: str, member: str) -> None:
+        del key
+        self.leases.discard(member)
+
+
+def test_distributed_limiter_shares_rate_and_inflight_through_redis() -> None:
+    from alphavault.ai._openai import _release_request_gate
+    from alphavault.infra.ai.distributed_limiter import DistributedRateLimiter
+
+    fake_redis = _FakeLimitRedis(rate_waits_ms=[0, 2500])
+    slept: list[float] = []
+    limiter = DistributedRateLimiter(
+        12,
+        burst=2,
+        name="shared",
+        max_inflight=1,
+        lease_seconds=60,
+        redis_client_fn=lambda: fake_redis,
+        sleep=slept.append,
+    )
+
+    limiter.wait()
+    assert len(fake_redis.leases) == 1
+    _release_request_gate(limiter.wait)
+    assert fake_redis.leases == set()
+
+    limiter.wait()
+    assert slept == [2.5]
+    assert fake_redis.calls == [
+        "av:ai_limit:shared:rate",
+        "av:ai_limit:shared:inflight",
+        "av:ai_limit:shared:rate",
+        "av:ai_limit:shared:inflight",
+    ]
+    assert limiter.stats()["backend"] == "redis"
+
+
+def _lua_redis():  # type: ignore[no-untyped-def]
+    """In-process Redis that runs the real Lua scripts."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def test_distributed_limiter_gcra_lua_rejects_past_max_wait_and_refunds() -> None:
+    from alphavault.infra.ai.distributed_limiter import DistributedRateLimiter
+
+    lua_redis = _lua_redis()
+    slept: list[float] = []
+    limiter = DistributedRateLimiter(
+        60,
+        name="shared",
+        max_inflight=1,
+        lease_seconds=60,
+        redis_client_fn=lambda: lua_redis,
+        sleep=slept.append,
+    )
+
+    slot = limiter.try_reserve()
+    assert slot is not None
+    assert limiter.try_reserve() is None
+    assert limiter.stats()["rejected"] == 1
+
+    slot.cancel()
+    refunded = limiter.try_reserve()
+    assert refunded is not None
+    refunded.cancel()
+
+    limiter.try_reserve()
+    limiter.wait()
+    assert len(slept) == 1 and 0.9 <= slept[0] <= 1.0
+    assert limiter.stats()["backend"] == "redis"
+
+
+def test_distributed_limiter_lease_lua_caps_inflight_and_expires() -> None:
+    import time
+
+    from alphavault.infra.ai.distributed_limiter import _LEASE_ACQUIRE_SCRIPT
+
+    lua_redis = _lua_redis()
+
+    def _acquire(lease_id: str) -> int:
+        return int(lua_redis.eval(_LEASE_ACQUIRE_SCRIPT, 1, "inflight", 1, 50, lease_id))
+
+    assert _acquire("a") == 1
+    assert _acquire("b") == 0
+    assert _acquire("a") == 1
+    time.sleep(0.12)
+    assert _acquire("b") == 1
+    assert lua_redis.zrange("inflight", 0, -1) == ["b"]
+
+
+def test_distributed_limiter_bounds_lease_wait_and_refunds_rate_token() -> None:
+    from alphavault.infra.ai.distributed_limiter import DistributedRateLimiter
+
+    lua_redis = _lua_redis()
+    now = [0.0]
+    slept: list[float] = []
+
+    def _sleep(seconds: float) -> None:
+        slept.append(seconds)
+        now[0] += seconds
+
+    def _limiter() -> DistributedRateLimiter:
+        return DistributedRateLimiter(
+            60,
+            burst=2,
+            name="shared",
+            max_inflight=1,
+            lease_seconds=1,
+            redis_client_fn=lambda: lua_redis,
+            clock=lambda: now[0],
+            sleep=_sleep,
+        )
+
+    holder = _limiter()
+    holder.wait()
+    booked_tat = lua_redis.get("av:ai_limit:shared:rate")
+
+    waiter = _limiter()
+    with pytest.raises(TimeoutError, match="ai_inflight_wait_timeout:shared"):
+        waiter.wait()
+
+    assert slept == [0.25, 0.25, 0.25, 0.25]
+    assert lua_redis.get("av:ai_limit:shared:rate") == booked_tat
+    assert lua_redis.zcard("av:ai_limit:shared:inflight") == 1
+    assert waiter.stats()["rejected"] == 1
+
+
+def test_distributed_limiter_falls_back_to_local_bucket_when_redis_fails() -> None:
+    from alphavault.infra.ai.distributed_limiter import DistributedRateLimiter
+
+    now = [0.0]
+    slept: list[float] = []
+
+    def _sleep(seconds: float) -> None:
+        slept.append(seconds)
+        now[0] += seconds
+
+    limiter = DistributedRateLimiter(
+        12,
+        name="shared",
+        max_inflight=1,
+        lease_seconds=60,
+        redis_client_fn=lambda: _FakeLimitRedis(rate_waits_ms=[], fail=True),
+        clock=lambda: now[0],
+        sleep=_sleep,
+    )
+
+    limiter.wait()
+    limiter.wait()
+
+    assert slept == [5.0]
+    stats = limiter.stats()
+    assert stats["backend"] == "local"
+    assert stats["redis_errors"] == 1
+    assert stats["fallback_waits"] == 2
+
+
+def test_schedule_ai_from_stream_dispatches_batch_of_future_dated_slots() -> None:
+    now = [0.0]
+    slept: list[float] = []
+    limiter = RateLimiter(
+        120, burst=2, clock=lambda: now[0], sleep=lambda s: slept.append(s)
+    )
+    submitted: list[dict[str, object]] = []
+
+    class _FakeExecutor:
+        def submit(self, fn, **kwargs):  # type: ignore[no-untyped-def]
+            del fn
+            submitted.append(kwargs)
+            fut: Future = Future()
+            fut.set_result(None)
+            return fut
+
+    read_counts: list[int] = []
+
+    def _read(*_args, **kwargs) -> list[dict[str, str]]:
+        count = int(kwargs.get("count") or 0)
+        read_counts.append(count)
+        return [
+            {
+                "message_id": f"{idx}-0",
+                "payload": json.dumps({"post_uid": f"weibo:{idx}"}),
+            }
+            for idx in range(count)
+        ]
+
+    scheduled, has_error = scheduler_module.schedule_ai_from_stream(
+        executor=_FakeExecutor(),
+        engine=object(),
+        ai_cap=4,
+        low_inflight_now_get=lambda: 0,
+        inflight_futures=set(),
+        inflight_owner_by_future={},
+        inflight_owner="weibo",
+        consumer_name="weibo:worker",
+        wakeup_event=threading.Event(),
+        config=object(),
+        limiter=limiter,
+        redis_client=object(),
+        redis_queue_key="queue",
+        prune_inflight_futures_fn=lambda futures, owners: None,
+        compute_rss_available_slots_fn=lambda **_kwargs: 4,
+        move_due_retry_to_stream_fn=lambda *_args, **_kwargs: 0,
+        claim_stuck_messages_fn=lambda *_args, **_kwargs: [],
+        read_group_messages_fn=_read,
+        ack_message_fn=lambda *_args, **_kwargs: None,
+        process_one_redis_payload_fn=lambda **_kwargs: None,
+        fatal_exceptions=(KeyboardInterrupt, SystemExit, GeneratorExit),
+        stuck_seconds=1000,
+    )
+
+    assert (scheduled, has_error) == (4, False)
+    assert read_counts == [4]
+    for kwargs in submitted:
+        kwargs["limiter"].wait()  # type: ignore[attr-defined]
+    assert slept == [0.5, 1.0]
+    assert limiter.try_reserve() is None
+
+
+def test_pooled_openai_client_reuses_keepalive_connection_per_limit_group() -> None:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from alphavault.ai import _openai
+    from alphavault.ai.embedding import embed_texts_with_openai
+
+    class _EmbeddingHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length") or 0)
+            inputs = json.loads(self.rfile.read(length))["input"]
+            body = json.dumps(
+                {
+                    "object": "list",
+                    "model": "m",
+                    "data": [
+                        {"object": "embedding", "index": i, "embedding": [0.5]}
+                        for i, _ in enumerate(inputs)
+                    ],
+                    "usage": {"prompt_tokens": 1, "total_tokens": 1},
+                }
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args: object) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EmbeddingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    limiter = RateLimiter(0, name="embed_lane", max_inflight=3)
+    try:
+        for _ in range(3):
+            assert embed_texts_with_openai(
+                texts=["a", "b"],
+                model_name="m",
+                dimensions=1,
+                base_url=base_url,
+                api_key="secret-key",
+                timeout_seconds=5.0,
+                retry_count=0,
+                request_gate=limiter.wait,
+            ) == [[0.5], [0.5]]
+        embed_texts_with_openai(
+            texts=["a"],
+            model_name="m",
+            dimensions=1,
+            base_url=base_url,
+            api_key="secret-key",
+            timeout_seconds=5.0,
+            retry_count=0,
+        )
+        stats = {
+            item["limit_group"]: item
+            for item in _openai.openai_client_pool_stats()
+            if item["base_url"] == base_url
+        }
+        assert stats["embed_lane"]["max_connections"] == 3
+        assert stats["embed_lane"]["requests"] == 3
+        assert stats["embed_lane"]["connections_opened"] == 1
+        assert stats["embed_lane"]["reused"] == 2
+        assert stats["-"]["requests"] == 1
+        assert "secret-key" not in repr(list(_openai._openai_clients))
+    finally:
+        _openai.close_openai_clients()
+        server.shutdown()
+        server.server_close()
+    assert _openai.openai_client_pool_stats() == []
+
+
+def test_reserved_slot_gate_uses_its_limit_group_pool() -> None:
+    from alphavault.ai import _openai
+
+    limiter = RateLimiter(12, burst=2, name="topic_lane", max_inflight=2)
+    slot = limiter.try_reserve()
+    assert slot is not None
+    try:
+        _openai._pooled_openai_client(
+            api_key="k",
+            base_url="http://slot.invalid/v1",
+            timeout_seconds=5.0,
+            request_gate=slot.wait,
+        )
+        [stats] = [
+            item
+            for item in _openai.openai_client_pool_stats()
+            if item["base_url"] == "http://slot.invalid/v1"
+        ]
+        assert stats["limit_group"] == "topic_lane"
+        assert stats["max_connections"] == 2
+    finally:
+        _openai.close_openai_clients()
+
+
+def test_streamed_ai_text_closes_stream_that_fails_partway() -> None:
+    from alphavault.ai._extract import _collect_streamed_ai_text
+
+    class _BrokenStream:
+        closed = False
+
+        def __iter__(self):  # type: ignore[no-untyped-def]
+            yield {"choices": [{"delta": {"content": "{"}}]}
+            raise ConnectionError("stream reset")
+
+        def close(self) -> None:
+            self.closed = True
+
+    stream = _BrokenStream()
+    with pytest.raises(ConnectionError):
+        _collect_streamed_ai_text(stream, api_mode="chat_completions")
+    assert stream.closed
+
+
+def test_embedding_and_reranker_limiters_share_budget_under_own_keys(
+    monkeypatch,
+) -> None:
+    from alphavault.capabilities import post_search_semantic
+    from alphavault.infra.ai import distributed_limiter
+    from alphavault.semantic_docs import semantic_doc_embedding_runtime_from_env
+
+    fake_redis = _FakeLimitRedis(rate_waits_ms=[0, 0])
+    monkeypatch.setenv("AI_DISTRIBUTED_LIMIT", "1")
+    monkeypatch.setattr(
+        distributed_limiter, "_default_redis_client", lambda: fake_redis
+    )
+
+    doc_limiter = semantic_doc_embedding_runtime_from_env.__wrapped__().limiter
+    query_limiter = post_search_semantic.semantic_query_embedding_runtime_from_env.__wrapped__().limiter
+    assert isinstance(doc_limiter, distributed_limiter.DistributedRateLimiter)
+    assert isinstance(query_limiter, distributed_limiter.DistributedRateLimiter)
+
+    doc_limiter.wait()
+    assert fake_redis.calls == [
+        "av:embedding_limit:default:rate",
+        "av:embedding_limit:default:inflight",
+    ]
+    reranker = distributed_limiter.build_ai_rate_limiter(
+        rpm=60,
+        burst=1.0,
+        limit_group_name="default",
+        max_inflight=2,
+        timeout_seconds=10,
+        key_prefix=distributed_limiter.RERANKER_LIMIT_KEY_PREFIX,
+    )
+    reranker.wait()
+    assert fake_redis.calls[-2:] == [
+        "av:reranker_limit:default:rate",
+        "av:reranker_limit:default:inflight",
+    ]
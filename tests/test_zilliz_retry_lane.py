@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+
+from alphavault.db import zilliz_retry_queue
+from alphavault.worker.zilliz_retry_lane import ZillizRetryLane
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.zset: dict[str, float] = {}
+        self.failed: list[str] = []
+
+    def zadd(self, _key: str, mapping: dict[str, float]) -> None:
+        self.zset.update(mapping)
+
+    def zrem(self, _key: str, member: str) -> None:
+        self.zset.pop(member, None)
+
+    def zrangebyscore(self, _key, low, high, *, start=0, num=None):
+        due = sorted(
+            (score, member)
+            for member, score in self.zset.items()
+            if low <= score <= high
+        )
+        return [member for _score, member in due][start : start + num]
+
+    def zcard(self, _key: str) -> int:
+        return len(self.zset)
+
+    def rpush(self, _key: str, value: str) -> None:
+        self.failed.append(value)
+
+    def llen(self, _key: str) -> int:
+        return len(self.failed)
+
+
+def _task(post_uid: str) -> str:
+    return json.dumps(
+        {
+            "operation": "replace",
+            "schema": "weibo",
+            "post_uid": post_uid,
+            "rows": [{"doc_id": f"{post_uid}:1"}],
+            "retry_count": 0,
+        }
+    )
+
+
+def test_zilliz_retry_lane_retries_due_tasks_and_reports_backlog(monkeypatch) -> None:
+    redis = _FakeRedis()
+    for idx in range(3):
+        redis.zadd("q", {_task(f"weibo:{idx}"): 1})
+    calls: list[tuple[str, float | None]] = []
+
+    def _replace(schema, *, post_uid, rows, timeout_seconds=None):
+        calls.append((post_uid, timeout_seconds))
+
+    monkeypatch.setattr(zilliz_retry_queue, "replace_semantic_docs_in_zilliz", _replace)
+    lane = ZillizRetryLane(redis, workers=2, timeout_seconds=3.0)
+    try:
+        lane.run_pass()
+        stats = lane.stats()
+    finally:
+        lane.stop()
+
+    assert sorted(calls) == [("weibo:0", 3.0), ("weibo:1", 3.0), ("weibo:2", 3.0)]
+    assert stats["retry_queue_len"] == 0
+    assert stats["success"] == 3
+    assert stats["breaker"] == "closed"
+
+
+def test_zilliz_retry_lane_breaker_opens_then_probes_one_task(monkeypatch) -> None:
+    redis = _FakeRedis()
+    for idx in range(4):
+        redis.zadd("q", {_task(f"weibo:{idx}"): 1})
+    now = [100.0]
+    calls: list[str] = []
+    healthy = [False]
+
+    def _replace(schema, *, post_uid, rows, timeout_seconds=None):
+        calls.append(post_uid)
+        if not healthy[0]:
+            raise TimeoutError("zilliz down")
+
+    monkeypatch.setattr(zilliz_retry_queue, "replace_semantic_docs_in_zilliz", _replace)
+    monkeypatch.setattr(zilliz_retry_queue, "ZILLIZ_RETRY_MIN_BACKOFF", 0)
+    lane = ZillizRetryLane(
+        redis,
+        workers=1,
+        breaker_failures=2,
+        breaker_cooldown_seconds=60.0,
+        clock=lambda: now[0],
+    )
+    try:
+        lane.run_pass()
+        assert len(calls) == 2
+        assert lane.stats()["breaker"] == "open"
+        assert lane.stats()["deferred"] == 2
+
+        lane.run_pass()
+        assert len(calls) == 2
+        assert lane.stats()["breaker_skipped_passes"] == 1
+
+        now[0] += 61.0
+        healthy[0] = True
+        lane.run_pass()
+        assert len(calls) == 3
+        assert lane.stats()["breaker"] == "closed"
+
+        lane.run_pass()
+        stats = lane.stats()
+    finally:
+        lane.stop()
+
+    assert len(calls) == 6
+    assert stats["retry_queue_len"] == 0
+    assert stats["success"] == 4
+    assert stats["retry"] == 2
+
+
+def test_zilliz_retry_lane_moves_malformed_head_task_without_tripping_breaker(
+    monkeypatch,
+) -> None:
+    redis = _FakeRedis()
+    redis.zadd("q", {"{not json": 1})
+    redis.zadd("q", {_task("weibo:1"): 2})
+    now = [100.0]
+    calls: list[str] = []
+
+    def _replace(schema, *, post_uid, rows, timeout_seconds=None):
+        calls.append(post_uid)
+
+    monkeypatch.setattr(zilliz_retry_queue, "replace_semantic_docs_in_zilliz", _replace)
+    lane = ZillizRetryLane(
+        redis,
+        workers=1,
+        breaker_failures=1,
+        breaker_cooldown_seconds=60.0,
+        clock=lambda: now[0],
+    )
+    # Cooldown over: the next pass probes only the earliest due task.
+    lane._breaker_open_until = now[0]
+    try:
+        lane.run_pass()
+        assert calls == []
+        assert lane.stats()["breaker"] == "half_open"
+        assert "{not json" not in redis.zset
+
+        lane.run_pass()
+        stats = lane.stats()
+    finally:
+        lane.stop()
+
+    assert calls == ["weibo:1"]
+    assert stats["breaker"] == "closed"
+    assert stats["invalid"] == 1
+    assert stats["retry_queue_len"] == 0
+    assert json.loads(redis.failed[0])["raw_task"] == "{not json"
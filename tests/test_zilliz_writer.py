@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from alphavault.db.zilliz_retry_queue import ZILLIZ_RETRY_SORTED_SET
+from alphavault.db.zilliz_writer import (
+    ZillizSemanticDocWriter,
+    semantic_doc_vector_float32,
+)
+
+
+class _FakeMilvusClient:
+    def __init__(self, stored: dict[str, str], *, failing_upserts: int = 0) -> None:
+        self.stored = dict(stored)
+        self.calls: list[tuple[str, dict]] = []
+        self.failing_upserts = failing_upserts
+
+    def upsert(self, *, collection_name, data, timeout=None):
+        if self.failing_upserts:
+            self.failing_upserts -= 1
+            raise ConnectionError("zilliz down")
+        self.calls.append(
+            ("upsert", {"collection_name": collection_name, "data": data})
+        )
+        for row in data:
+            self.stored[row["doc_id"]] = row["post_uid"]
+
+    def query(self, *, collection_name, filter, output_fields, timeout=None):
+        self.calls.append(("query", {"filter": filter}))
+        return [
+            {"doc_id": doc_id}
+            for doc_id, post_uid in self.stored.items()
+            if f'"{post_uid}"' in filter
+        ]
+
+    def delete(self, *, collection_name, filter, timeout=None):
+        self.calls.append(("delete", {"filter": filter}))
+        self.stored = {
+            doc_id: post_uid
+            for doc_id, post_uid in self.stored.items()
+            if f'"{doc_id}"' not in filter
+        }
+
+
+def _row(doc_id: str, post_uid: str, embedding: object) -> dict[str, object]:
+    return {
+        "doc_id": doc_id,
+        "post_uid": post_uid,
+        "doc_kind": "assertion",
+        "chunk_seq": 1,
+        "embedding": embedding,
+    }
+
+
+def test_semantic_doc_vector_float32_decodes_pgvector_binary_and_text() -> None:
+    halfvec = struct.pack(">hh", 3, 0) + np.array([0.5, -1, 2], dtype=">f2").tobytes()
+    vector = struct.pack(">hh", 2, 0) + np.array([0.25, 4], dtype=">f4").tobytes()
+
+    assert semantic_doc_vector_float32(halfvec).tolist() == [0.5, -1.0, 2.0]
+    assert semantic_doc_vector_float32(vector).tolist() == [0.25, 4.0]
+    assert semantic_doc_vector_float32("[0.5,1.5]").tolist() == [0.5, 1.5]
+    assert semantic_doc_vector_float32([1, 2]).dtype == np.float32
+    assert semantic_doc_vector_float32("[0.5,oops]").size == 0
+    assert semantic_doc_vector_float32("[0.5,1.5,]").size == 0
+    assert semantic_doc_vector_float32("[0.5;1.5]").size == 0
+    assert semantic_doc_vector_float32(b"\x00").size == 0
+
+
+def test_writer_batches_posts_into_one_upsert_and_deletes_only_vanished_docs() -> None:
+    client = _FakeMilvusClient(
+        {"weibo:1:a": "weibo:1", "weibo:1:old": "weibo:1", "weibo:9:a": "weibo:9"}
+    )
+    writer = ZillizSemanticDocWriter("weibo", client=client, max_batch_docs=100)
+
+    writer.replace_post(
+        "weibo:1",
+        [_row("weibo:1:a", "weibo:1", "[0.1,0.2]")],
+    )
+    writer.replace_post(
+        "weibo:2",
+        [_row("weibo:2:a", "weibo:2", "")],
+        embeddings_by_doc_id={"weibo:2:a": [0.3, 0.4]},
+    )
+    writer.replace_post("weibo:3", [])
+    assert client.calls == []
+
+    assert writer.flush() == 2
+
+    assert [name for name, _kwargs in client.calls] == ["upsert", "query", "delete"]
+    upserted = client.calls[0][1]["data"]
+    assert client.calls[0][1]["collection_name"] == "alphavault_weibo_semantic"
+    assert [row["doc_id"] for row in upserted] == ["weibo:1:a", "weibo:2:a"]
+    assert all(row["embedding"].dtype == np.float32 for row in upserted)
+    assert client.calls[2][1]["filter"] == 'doc_id in ["weibo:1:old"]'
+    assert sorted(client.stored) == ["weibo:1:a", "weibo:2:a", "weibo:9:a"]
+    stats = writer.stats()
+    assert stats["docs"] == 2
+    assert stats["deleted_docs"] == 1
+    assert stats["upsert_calls"] == 1
+
+
+def test_writer_flushes_on_size_and_latency_and_skips_bad_dimensions() -> None:
+    now = [0.0]
+    client = _FakeMilvusClient({})
+    writer = ZillizSemanticDocWriter(
+        "xueqiu",
+        client=client,
+        max_batch_docs=2,
+        max_latency_seconds=5.0,
+        dimensions=2,
+        clock=lambda: now[0],
+    )
+
+    assert writer.upsert_docs(
+        [_row("a", "p1", [1, 2]), _row("bad", "p1", [1, 2, 3])]
+    ) == ["a"]
+    assert client.calls == []
+    writer.upsert_docs([_row("b", "p2", [1, 2])])
+    assert len(client.calls) == 1
+
+    writer.upsert_docs([_row("c", "p3", [1, 2])])
+    now[0] += 6.0
+    writer.upsert_docs([_row("d", "p4", [1, 2])])
+
+    assert [len(kwargs["data"]) for _name, kwargs in client.calls] == [2, 2]
+    assert writer.stats()["skipped"] == 1
+    assert writer.stats()["pending_docs"] == 0
+
+
+class _FakeRetryRedis:
+    def __init__(self) -> None:
+        self.tasks: list[dict[str, object]] = []
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> None:
+        assert key == ZILLIZ_RETRY_SORTED_SET
+        self.tasks.extend(json.loads(task) for task in mapping)
+
+
+def test_writer_keeps_failed_batch_for_the_next_flush() -> None:
+    client = _FakeMilvusClient({"weibo:1:old": "weibo:1"}, failing_upserts=1)
+    writer = ZillizSemanticDocWriter("weibo", client=client, max_batch_docs=100)
+    writer.replace_post("weibo:1", [_row("weibo:1:a", "weibo:1", [0.1, 0.2])])
+
+    with pytest.raises(ConnectionError):
+        writer.flush()
+    assert writer.stats()["pending_docs"] == 1
+
+    assert writer.flush() == 1
+    assert sorted(client.stored) == ["weibo:1:a"]
+    assert writer.stats()["failed_flushes"] == 1
+
+
+def test_writer_enqueues_replaced_posts_of_a_failed_flush() -> None:
+    client = _FakeMilvusClient({}, failing_upserts=1)
+    redis_client = _FakeRetryRedis()
+    writer = ZillizSemanticDocWriter(
+        "weibo", client=client, max_batch_docs=100, redis_client=redis_client
+    )
+    writer.replace_post("weibo:1", [_row("weibo:1:a", "weibo:1", [0.1, 0.2])])
+    writer.replace_post("weibo:2", [])
+    writer.upsert_docs([_row("weibo:3:a", "weibo:3", [0.5, 0.6])])
+
+    with pytest.raises(ConnectionError):
+        writer.flush()
+
+    assert [(task["post_uid"], task["operation"]) for task in redis_client.tasks] == [
+        ("weibo:1", "replace"),
+        ("weibo:2", "replace"),
+    ]
+    retry_rows = redis_client.tasks[0]["rows"]
+    assert isinstance(retry_rows, list)
+    assert retry_rows[0]["doc_id"] == "weibo:1:a"
+    assert retry_rows[0]["embedding"] == pytest.approx([0.1, 0.2])
+    assert redis_client.tasks[1]["rows"] == []
+    # Upsert-only docs are not whole-post replacements; they stay buffered.
+    assert writer.stats()["pending_docs"] == 1
+    writer.flush()
+    assert sorted(client.stored) == ["weibo:3:a"]
+
+
+def test_writer_keeps_zilliz_docs_whose_new_rows_were_skipped() -> None:
+    client = _FakeMilvusClient(
+        {"weibo:1:a": "weibo:1", "weibo:1:b": "weibo:1", "weibo:1:gone": "weibo:1"}
+    )
+    writer = ZillizSemanticDocWriter(
+        "weibo", client=client, max_batch_docs=100, dimensions=2
+    )
+
+    assert (
+        writer.replace_post(
+            "weibo:1",
+            [_row("weibo:1:a", "weibo:1", ""), _row("weibo:1:b", "weibo:1", [1, 2, 3])],
+        )
+        == 0
+    )
+    writer.flush()
+
+    assert sorted(client.stored) == ["weibo:1:a", "weibo:1:b"]
+    assert writer.stats()["skipped"] == 2